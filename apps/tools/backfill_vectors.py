@@ -3,15 +3,14 @@ from __future__ import annotations
 import asyncio
 import os
 
-import asyncpg
-
+from sakhi.apps.api.core.db import close_pool, get_pool
 from sakhi.libs.embeddings import embed_text
 
 DATABASE_URL = os.environ["DATABASE_URL"]
 
 
 async def run() -> None:
-    pool = await asyncpg.create_pool(DATABASE_URL)
+    pool = await get_pool(DATABASE_URL)
     try:
         async with pool.acquire() as connection:
             rows = await connection.fetch(
@@ -32,7 +31,7 @@ async def run() -> None:
                     row["id"],
                 )
     finally:
-        await pool.close()
+        await close_pool()
     print("Done.")
 
 
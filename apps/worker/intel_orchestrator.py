@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 
 from redis import asyncio as aioredis
 import asyncpg
+from sakhi.apps.api.core.db import close_pool, get_pool
 from sakhi.apps.api.core.metrics import aw_events_written, derivatives_written, ingest_latency
 
 REDIS_URL = os.environ["REDIS_URL"]
@@ -16,7 +17,7 @@ GOAL_RE = re.compile(r"\b(i (want|plan|need|aim) to)\s+(?P<title>[^.!?\n]{3,120}
 
 
 async def pool() -> asyncpg.pool.Pool:
-    return await asyncpg.create_pool(DATABASE_URL)
+    return await get_pool(DATABASE_URL)
 
 
 def _parse_event_ts(value: object) -> datetime | None:
@@ -190,7 +191,7 @@ async def main() -> None:
             async with pool_obj.acquire() as connection:
                 await handle_aw_event(connection, event)
     finally:
-        await pool_obj.close()
+        await close_pool()
 
 
 if __name__ == "__main__":
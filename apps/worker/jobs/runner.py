@@ -10,13 +10,14 @@ import asyncpg
 
 from apps.worker.enrich.short_horizon_aggregator import update_short_horizon
 from apps.worker.jobs.consolidate import consolidate_person
+from sakhi.apps.api.core.db import close_pool as close_shared_pool, get_pool
 
 LOGGER = logging.getLogger("worker.consolidator")
 logging.basicConfig(level=logging.INFO)
 
 
 async def _pool() -> asyncpg.Pool:
-    return await asyncpg.create_pool(os.environ["DATABASE_URL"])
+    return await get_pool(os.environ["DATABASE_URL"])
 
 
 async def _person_ids(pool: asyncpg.Pool) -> List[str]:
@@ -41,7 +42,7 @@ async def run_once(pool: asyncpg.Pool | None = None) -> None:
         LOGGER.info("consolidator_run_complete", extra={"count": len(persons)})
     finally:
         if close_pool:
-            await pool.close()
+            await close_shared_pool()
 
 
 async def main() -> None:
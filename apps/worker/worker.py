@@ -18,13 +18,14 @@ from apps.worker.enrich.observations_object import write_object_observations_heu
 from apps.worker.enrich.anchor_observations import write_anchor_observations
 from apps.worker.enrich.llm_extract import run_extraction_llm
 from apps.worker.enrich.state_vector import compute_state_vector
+from sakhi.apps.api.core.db import get_pool
 from sakhi.apps.api.core.llm import set_router as set_llm_router
 from sakhi.apps.api.core.llm_schemas import ExtractionOutput
 from sakhi.apps.worker.jobs import _get_router
 
 
 async def _db_pool() -> asyncpg.Pool:
-    return await asyncpg.create_pool(os.environ["DATABASE_URL"])
+    return await get_pool(os.environ["DATABASE_URL"])
 
 
 async def publish_event(redis, topic: str, payload: dict) -> None:
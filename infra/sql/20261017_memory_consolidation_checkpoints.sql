@@ -0,0 +1,13 @@
+-- Incremental memory-node consolidation: each run compares only nodes created after
+-- the person's (created_at, id) cursor, then advances it in the merge transaction.
+
+CREATE TABLE IF NOT EXISTS memory_consolidation_checkpoints (
+    person_id UUID PRIMARY KEY,
+    last_created_at TIMESTAMPTZ NOT NULL,
+    last_node_id UUID,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Serves the "nodes after the cursor" scan.
+CREATE INDEX IF NOT EXISTS idx_memory_nodes_person_created
+    ON memory_nodes (person_id, created_at, id);
@@ -0,0 +1,40 @@
+-- Bulk graph writes (upsert_nodes / upsert_edges) upsert with ON CONFLICT on these keys.
+-- Existing duplicates are collapsed first so the unique indexes can be built:
+-- edges move to the oldest node of each (person_id, node_kind, label) group.
+-- One transaction, with writers locked out until the indexes exist: a duplicate
+-- inserted after the cleanup would fail the index build, and a half-applied run
+-- would leave the upserts without the keys their ON CONFLICT clauses name.
+
+BEGIN;
+
+LOCK TABLE memory_nodes, memory_edges IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TEMP TABLE memory_node_duplicates AS
+SELECT id, keep_id
+FROM (
+    SELECT id,
+           first_value(id) OVER (PARTITION BY person_id, node_kind, label ORDER BY created_at, id) AS keep_id
+    FROM memory_nodes
+) ranked
+WHERE id <> keep_id;
+
+UPDATE memory_edges e SET from_node = d.keep_id FROM memory_node_duplicates d WHERE e.from_node = d.id;
+UPDATE memory_edges e SET to_node = d.keep_id FROM memory_node_duplicates d WHERE e.to_node = d.id;
+DELETE FROM memory_nodes n USING memory_node_duplicates d WHERE n.id = d.id;
+DROP TABLE memory_node_duplicates;
+
+-- Of repeated edges keep the strongest one.
+DELETE FROM memory_edges e
+USING (
+    SELECT ctid,
+           row_number() OVER (PARTITION BY from_node, to_node, relation ORDER BY weight DESC NULLS LAST) AS rank
+    FROM memory_edges
+) ranked
+WHERE e.ctid = ranked.ctid AND ranked.rank > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_memory_nodes_person_kind_label
+    ON memory_nodes (person_id, node_kind, label);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_memory_edges_from_to_relation
+    ON memory_edges (from_node, to_node, relation);
+
+COMMIT;
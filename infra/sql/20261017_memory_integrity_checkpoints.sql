@@ -0,0 +1,19 @@
+-- Streaming memory integrity scan: pages through each table by id and records the
+-- phase and last id it finished, so an interrupted run resumes from there.
+
+CREATE TABLE IF NOT EXISTS memory_integrity_checkpoints (
+    person_id UUID PRIMARY KEY,
+    phase TEXT NOT NULL,
+    last_id UUID,
+    report JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    completed_at TIMESTAMPTZ
+);
+
+-- Keyset pages: WHERE person_id = $1 AND id > $2 ORDER BY id.
+CREATE INDEX IF NOT EXISTS idx_memory_nodes_person_id_id ON memory_nodes (person_id, id);
+CREATE INDEX IF NOT EXISTS idx_memory_edges_person_id_id ON memory_edges (person_id, id);
+CREATE INDEX IF NOT EXISTS idx_journal_entries_user_id_id ON journal_entries (user_id, id);
+-- Dangling-node check looks edges up by either endpoint; from_node is covered
+-- by the (from_node, to_node, relation) unique index.
+CREATE INDEX IF NOT EXISTS idx_memory_edges_to_node ON memory_edges (to_node);
@@ -0,0 +1,26 @@
+-- Recall ranks journal vectors inside Postgres (SAKHI_RECALL_MODE=sql):
+-- ORDER BY embedding_vec <=> $query over the person's whole history.
+--
+-- The index is shared by every person and the person filter runs on what the
+-- scan returns, so recall sets hnsw.iterative_scan per query to keep scanning
+-- until enough of that person's rows are found. That setting needs
+-- pgvector >= 0.8.0; refuse to migrate onto anything older.
+DO $$
+DECLARE
+    installed text;
+BEGIN
+    SELECT extversion INTO installed FROM pg_extension WHERE extname = 'vector';
+    IF installed IS NULL
+       OR string_to_array(split_part(installed, '-', 1), '.')::int[] < ARRAY[0, 8, 0] THEN
+        RAISE EXCEPTION 'recall needs pgvector >= 0.8.0 (found %); run ALTER EXTENSION vector UPDATE', coalesce(installed, 'none');
+    END IF;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_journal_embeddings_vec_hnsw
+    ON journal_embeddings USING hnsw (embedding_vec vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Person filter for the nearest-neighbour join and the in-process fallback.
+CREATE INDEX IF NOT EXISTS idx_journal_entries_user_ts
+    ON journal_entries (user_id, ts DESC);
@@ -0,0 +1,37 @@
+-- Lexical leg of hybrid recall (SAKHI_RECALL_LEXICAL): every recall surface gets a
+-- stored tsvector with a GIN index, so matching never runs to_tsvector at query time.
+-- journal_entries.fts and its index already exist (0002_retrieval_view.sql).
+
+ALTER TABLE reflections
+    ADD COLUMN IF NOT EXISTS fts tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, '') || ' ' || coalesce(theme, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_reflections_fts ON reflections USING GIN (fts);
+
+ALTER TABLE themes
+    ADD COLUMN IF NOT EXISTS fts tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_themes_fts ON themes USING GIN (fts);
+
+ALTER TABLE facts
+    ADD COLUMN IF NOT EXISTS fts tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(key, '') || ' ' || coalesce(value::text, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_facts_fts ON facts USING GIN (fts);
+
+ALTER TABLE memory_nodes
+    ADD COLUMN IF NOT EXISTS fts tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(label, ''))) STORED;
+CREATE INDEX IF NOT EXISTS idx_memory_nodes_fts ON memory_nodes USING GIN (fts);
+
+-- HybridRetriever reads the journal through this view; expose the stored tsvector.
+CREATE OR REPLACE VIEW journal_documents AS
+SELECT
+  je.id,
+  je.user_id,
+  je.content AS content,
+  je.created_at,
+  je.facets,
+  je.title,
+  emb.embedding,
+  je.fts
+FROM journal_entries je
+JOIN journal_embeddings emb ON emb.entry_id = je.id;
@@ -0,0 +1 @@
+"""Offline benchmarks that replay recorded traffic against the API in-process."""
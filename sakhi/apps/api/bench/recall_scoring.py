@@ -0,0 +1,146 @@
+"""
+Benchmark recall scoring: the per-candidate scorer and greedy diversity filter
+recall used before, against the vectorized scorer and MMR in `recall`.
+
+Candidates are random vectors with a share of near-duplicates, so both
+diversity filters have real work to do. Their vectors are float32 arrays, as
+the pgvector codec decodes them. Timings are best-of-N milliseconds.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from sakhi.apps.api.services.memory import recall
+from sakhi.libs.pgvector import as_vector
+
+Scored = List[Tuple[float, Dict[str, Any]]]
+
+
+def _legacy_sim(a: Sequence[float], b: Sequence[float]) -> float:
+    va = np.array(a, dtype=float)
+    vb = np.array(b, dtype=float)
+    denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+    if denom == 0:
+        return 0.0
+    return float(np.dot(va, vb) / denom)
+
+
+def _legacy_recency(ts: Any) -> float:
+    if not ts:
+        return 1.0
+    now = dt.datetime.now(dt.timezone.utc)
+    return float(0.5 ** ((now - ts).days / recall.RECENCY_HALFLIFE_DAYS))
+
+
+def legacy_score(sources: List[Dict[str, Any]], query_vec: List[float]) -> Scored:
+    scored: Scored = []
+    for src in sources:
+        weight = recall.SURFACE_WEIGHTS.get(src["type"], 1.0)
+        recency = _legacy_recency(src.get("ts"))
+        vec = src.get("vec") or []
+        if not vec:
+            continue
+        sim = _legacy_sim(query_vec, vec)
+        scored.append((sim * weight * recency, {**src, "raw_similarity": sim}))
+    return scored
+
+
+def legacy_diversity(scored_items: Scored, top_k: int) -> List[Dict[str, Any]]:
+    selected: List[Dict[str, Any]] = []
+    taken: List[Dict[str, Any]] = []
+    vecs: List[Sequence[float]] = []
+    for score, item in scored_items:
+        if len(selected) >= top_k:
+            break
+        vec = item.get("vec")
+        if not vec:
+            continue
+        if all(_legacy_sim(prev, vec) <= recall.DUPLICATE_THRESHOLD for prev in vecs):
+            selected.append({"score": score, **item})
+            taken.append(item)
+            vecs.append(vec)
+    if len(selected) < top_k:
+        for score, item in scored_items:
+            if len(selected) >= top_k:
+                break
+            if not any(item is prev for prev in taken):
+                selected.append({"score": score, **item})
+                taken.append(item)
+    return selected[:top_k]
+
+
+def synthetic_sources(count: int, *, dim: int = 1536, duplicate_share: float = 0.2, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    base = rng.standard_normal((count, dim)).astype(np.float32)
+    duplicates = rng.random(count) < duplicate_share
+    for index in np.flatnonzero(duplicates):
+        base[index] = base[index - 1] + 0.01 * rng.standard_normal(dim).astype(np.float32) if index else base[index]
+    now = dt.datetime.now(dt.timezone.utc)
+    return [
+        {
+            "type": "journal",
+            "id": f"j{index}",
+            "text": f"entry {index}",
+            "vec": as_vector(base[index]),
+            "ts": now - dt.timedelta(days=int(rng.integers(0, 720))),
+        }
+        for index in range(count)
+    ]
+
+
+def _best_ms(fn: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+@dataclass
+class ScoringResult:
+    candidates: int
+    legacy_ms: float
+    vectorized_ms: float
+
+    @property
+    def speedup(self) -> float:
+        return self.legacy_ms / self.vectorized_ms if self.vectorized_ms else float("inf")
+
+
+def benchmark(sizes: Sequence[int] = (1_000, 10_000), *, k: int = 8, dim: int = 1536, repeats: int = 3) -> List[ScoringResult]:
+    results: List[ScoringResult] = []
+    query = np.random.default_rng(1).standard_normal(dim).astype(np.float32).tolist()
+    for size in sizes:
+        sources = synthetic_sources(size, dim=dim)
+
+        def legacy() -> List[Dict[str, Any]]:
+            scored = legacy_score(sources, query)
+            scored.sort(key=lambda item: item[0], reverse=True)
+            return legacy_diversity(scored, k)
+
+        def vectorized() -> List[Dict[str, Any]]:
+            scored = recall._score_sources(sources, query)
+            scored.sort(key=lambda item: item[0], reverse=True)
+            return recall._diversity_filter(scored, k)
+
+        results.append(ScoringResult(size, _best_ms(legacy, repeats), _best_ms(vectorized, repeats)))
+    return results
+
+
+def format_results(results: Sequence[ScoringResult]) -> str:
+    lines = [f"{'candidates':>10}  {'legacy ms':>10}  {'vectorized ms':>13}  {'speedup':>7}"]
+    for result in results:
+        lines.append(
+            f"{result.candidates:>10}  {result.legacy_ms:>10.1f}  {result.vectorized_ms:>13.1f}  {result.speedup:>6.1f}x"
+        )
+    return "\n".join(lines)
+
+
+__all__ = ["ScoringResult", "benchmark", "format_results", "legacy_diversity", "legacy_score", "synthetic_sources"]
@@ -0,0 +1,355 @@
+"""
+In-process stand-ins for the services a turn talks to.
+
+They replace Postgres, Redis, the RQ turn queue, the LLM router and the
+embedding API so a turn can be replayed on one machine with no network.
+Every call sleeps for a configurable latency and is counted against the
+turn currently being measured (see `TurnSample`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from sakhi.apps.api.core.db import statement_kind
+from sakhi.libs.llm_router.base import BaseProvider
+from sakhi.libs.llm_router.router import LLMRouter
+from sakhi.libs.llm_router.types import LLMResponse, Task
+
+_EMBED_DIM = 1536
+
+
+@dataclass
+class TurnSample:
+    """Everything measured for one replayed turn."""
+
+    spans: Dict[str, List[float]] = field(default_factory=dict)
+    db_round_trips: int = 0
+    reply_db_round_trips: int = 0
+    db_statements: Dict[str, int] = field(default_factory=dict)
+    redis_ops: int = 0
+    jobs_enqueued: int = 0
+    llm_calls: int = 0
+    embed_calls: int = 0
+
+    def add_span(self, name: str, elapsed_ms: float) -> None:
+        self.spans.setdefault(name, []).append(elapsed_ms)
+
+
+_current_sample: ContextVar[TurnSample | None] = ContextVar("bench_turn_sample", default=None)
+
+
+def current_sample() -> TurnSample | None:
+    return _current_sample.get()
+
+
+@contextmanager
+def measuring(sample: TurnSample) -> Iterator[TurnSample]:
+    """Attribute stand-in calls (and tasks spawned from here) to `sample`."""
+
+    token = _current_sample.set(sample)
+    try:
+        yield sample
+    finally:
+        _current_sample.reset(token)
+
+
+class _Latency:
+    def __init__(self, mean_s: float, jitter: float = 0.2, seed: int = 0) -> None:
+        self.mean_s = max(0.0, mean_s)
+        self.jitter = max(0.0, jitter)
+        self._rng = random.Random(seed)
+
+    async def wait(self) -> None:
+        if self.mean_s <= 0:
+            await asyncio.sleep(0)
+            return
+        spread = self.mean_s * self.jitter
+        await asyncio.sleep(max(0.0, self._rng.uniform(self.mean_s - spread, self.mean_s + spread)))
+
+
+class StandInDatabase:
+    """
+    Answers asyncpg calls from canned rows.
+
+    `fixtures` is a list of `{"match": <regex>, "rows": [...]}` entries tried in
+    order against each statement; unmatched reads return no rows (a new user)
+    and `RETURNING` writes return a generated id.
+    """
+
+    def __init__(self, *, latency_s: float = 0.0005, fixtures: Sequence[Dict[str, Any]] = (), seed: int = 0) -> None:
+        self._latency = _Latency(latency_s, seed=seed)
+        self._fixtures: List[Tuple[re.Pattern[str], List[Dict[str, Any]]]] = [
+            (re.compile(item["match"], re.IGNORECASE | re.DOTALL), list(item.get("rows") or []))
+            for item in fixtures
+        ]
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs: Any) -> "StandInDatabase":
+        return cls(fixtures=json.loads(Path(path).read_text(encoding="utf-8")), **kwargs)
+
+    def rows_for(self, sql: str) -> List[Dict[str, Any]]:
+        for pattern, rows in self._fixtures:
+            if pattern.search(sql):
+                return [dict(row) for row in rows]
+        if "returning" in sql.lower():
+            return [{"id": str(uuid.uuid4())}]
+        return []
+
+    async def round_trip(self, sql: str) -> List[Dict[str, Any]]:
+        sample = current_sample()
+        if sample is not None:
+            sample.db_round_trips += 1
+            kind = statement_kind(sql)
+            sample.db_statements[kind] = sample.db_statements.get(kind, 0) + 1
+        await self._latency.wait()
+        return self.rows_for(sql)
+
+
+class _StandInTransaction:
+    async def __aenter__(self) -> "_StandInTransaction":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def start(self) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+    async def rollback(self) -> None:
+        return None
+
+
+class StandInConnection:
+    def __init__(self, db: StandInDatabase) -> None:
+        self._db = db
+
+    async def fetch(self, sql: str, *args: Any) -> List[Dict[str, Any]]:
+        return await self._db.round_trip(sql)
+
+    async def fetchrow(self, sql: str, *args: Any) -> Dict[str, Any] | None:
+        rows = await self._db.round_trip(sql)
+        return rows[0] if rows else None
+
+    async def fetchval(self, sql: str, *args: Any, column: int = 0) -> Any:
+        rows = await self._db.round_trip(sql)
+        return list(rows[0].values())[column] if rows else None
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        await self._db.round_trip(sql)
+        return f"{statement_kind(sql).split()[0].upper()} 1"
+
+    async def executemany(self, sql: str, args: Sequence[Sequence[Any]]) -> None:
+        await self._db.round_trip(sql)
+
+    def transaction(self) -> _StandInTransaction:
+        return _StandInTransaction()
+
+    async def close(self) -> None:
+        return None
+
+
+class _Acquire:
+    """Result of `pool.acquire()`: usable with `await` and `async with`."""
+
+    def __init__(self, connection: StandInConnection) -> None:
+        self._connection = connection
+
+    def __await__(self):
+        async def _get() -> StandInConnection:
+            return self._connection
+
+        return _get().__await__()
+
+    async def __aenter__(self) -> StandInConnection:
+        return self._connection
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+class StandInPool:
+    def __init__(self, db: StandInDatabase) -> None:
+        self._db = db
+
+    def acquire(self) -> _Acquire:
+        return _Acquire(StandInConnection(self._db))
+
+    async def release(self, connection: StandInConnection) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def fetch(self, sql: str, *args: Any) -> List[Dict[str, Any]]:
+        return await self._db.round_trip(sql)
+
+    async def fetchrow(self, sql: str, *args: Any) -> Dict[str, Any] | None:
+        rows = await self._db.round_trip(sql)
+        return rows[0] if rows else None
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        await self._db.round_trip(sql)
+        return "OK"
+
+
+class StandInRedis:
+    """Accepts any (async) redis command, counts it and returns None."""
+
+    def __init__(self, *, latency_s: float = 0.0002) -> None:
+        self._latency = _Latency(latency_s)
+
+    def __getattr__(self, command: str):
+        async def call(*args: Any, **kwargs: Any) -> None:
+            sample = current_sample()
+            if sample is not None:
+                sample.redis_ops += 1
+            await self._latency.wait()
+            return None
+
+        return call
+
+
+class StandInQueue:
+    """RQ-compatible `enqueue` that only records the job."""
+
+    def __init__(self) -> None:
+        self.jobs: List[Tuple[str, Dict[str, Any]]] = []
+
+    def enqueue(self, func: str, *args: Any, **kwargs: Any) -> None:
+        self.jobs.append((func, kwargs))
+        sample = current_sample()
+        if sample is not None:
+            sample.jobs_enqueued += 1
+
+
+class StubLLMProvider(BaseProvider):
+    """LLM provider with configurable latency; JSON requests get `{}`."""
+
+    def __init__(self, *, latency_s: float = 0.4, jitter: float = 0.25, seed: int = 0) -> None:
+        super().__init__(name="bench")
+        self._latency = _Latency(latency_s, jitter=jitter, seed=seed)
+
+    async def chat(self, *, messages, model: str, tools=None, **kwargs: Any) -> LLMResponse:
+        sample = current_sample()
+        if sample is not None:
+            sample.llm_calls += 1
+        await self._latency.wait()
+        if kwargs.get("response_format"):
+            text = "{}"
+        else:
+            last = (messages[-1].get("content") if messages else "") or ""
+            text = f"I hear you. {str(last)[:80]}"
+        return LLMResponse(model=model, task=Task.CHAT, text=text, provider=self.name, usage={"provider": "bench"})
+
+
+def stub_embeddings(*, latency_s: float = 0.05):
+    """Replacement for `sakhi.libs.embeddings._call_openai` returning stable vectors."""
+
+    latency = _Latency(latency_s)
+
+    async def _call(texts: Sequence[str]) -> List[List[float]]:
+        sample = current_sample()
+        if sample is not None:
+            sample.embed_calls += 1
+        await latency.wait()
+        vectors = []
+        for text in texts:
+            rng = random.Random(hashlib.sha256(str(text).encode("utf-8")).digest())
+            vectors.append([rng.uniform(-1.0, 1.0) for _ in range(_EMBED_DIM)])
+        return vectors
+
+    return _call
+
+
+@dataclass
+class StandInConfig:
+    db_latency_s: float = 0.0005
+    redis_latency_s: float = 0.0002
+    llm_latency_s: float = 0.4
+    embed_latency_s: float = 0.05
+    db_fixtures: Sequence[Dict[str, Any]] = ()
+    seed: int = 0
+
+
+def _patch(stack: ExitStack, target: Any, attr: str, value: Any) -> None:
+    original = getattr(target, attr)
+    setattr(target, attr, value)
+    stack.callback(setattr, target, attr, original)
+
+
+@contextmanager
+def stand_ins(config: StandInConfig | None = None) -> Iterator[Dict[str, Any]]:
+    """Swap every external dependency of a turn for its stand-in; restored on exit."""
+
+    from sakhi.apps.api.core import db as db_module
+    from sakhi.apps.api.core import events as events_module
+    from sakhi.apps.api.core import llm as llm_module
+    from sakhi.apps.api.services.turn import async_triggers
+    from sakhi.libs import embedding_cache as embedding_cache_module
+    from sakhi.libs import embeddings as embeddings_module
+
+    config = config or StandInConfig()
+    database = StandInDatabase(latency_s=config.db_latency_s, fixtures=config.db_fixtures, seed=config.seed)
+    queue = StandInQueue()
+    router = LLMRouter()
+    router.register_provider("bench", StubLLMProvider(latency_s=config.llm_latency_s, seed=config.seed))
+    router.set_policy(Task.CHAT, ["bench"])
+    router.set_policy(Task.TOOL, ["bench"])
+
+    with ExitStack() as stack:
+        _patch(stack, db_module, "POOL", StandInPool(database))
+        _patch(stack, events_module, "_redis", StandInRedis(latency_s=config.redis_latency_s))
+        _patch(stack, async_triggers, "_get_queue", lambda: queue)
+        _patch(stack, llm_module, "_ROUTER", router)
+        _patch(stack, embeddings_module, "_call_openai", stub_embeddings(latency_s=config.embed_latency_s))
+        # Fresh, memory-only embedding cache so every replay starts cold.
+        _patch(stack, embedding_cache_module, "_CACHE", embedding_cache_module.EmbeddingCache(redis_url=None))
+        yield {"database": database, "queue": queue, "router": router}
+
+
+def timed(fn: Any, span: str) -> Any:
+    """Wrap an async callable so each call is recorded as `span` on the current sample."""
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            sample = current_sample()
+            if sample is not None:
+                sample.add_span(span, (time.perf_counter() - started) * 1000.0)
+
+    wrapper.__wrapped__ = fn  # type: ignore[attr-defined]
+    return wrapper
+
+
+__all__ = [
+    "StandInConfig",
+    "StandInDatabase",
+    "StandInPool",
+    "StandInQueue",
+    "StandInRedis",
+    "StubLLMProvider",
+    "TurnSample",
+    "current_sample",
+    "measuring",
+    "stand_ins",
+    "statement_kind",
+    "stub_embeddings",
+    "timed",
+]
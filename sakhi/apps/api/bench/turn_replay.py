@@ -0,0 +1,259 @@
+"""
+Record anonymized user turns and replay them through `/v2/turn`.
+
+`record` pulls recent user messages from `conversation_turns`, replaces
+person ids with stable pseudonyms and scrubs contact details and numbers.
+`replay` posts each recorded text to the in-process app with Postgres,
+Redis, the job queue, the LLM and embeddings swapped for stand-ins (see
+`standins`), then reports p50/p95/p99 per stage together with DB round
+trips per turn. Stage timings come from `observe_stages`; the orchestrator
+steps and the reply generator are wrapped as extra spans.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from sakhi.apps.api.bench.standins import (
+    StandInConfig,
+    TurnSample,
+    current_sample,
+    measuring,
+    stand_ins,
+    timed,
+)
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+_URL = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+_PHONE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_DIGITS = re.compile(r"\d{2,}")
+
+# Module-level collaborators of orchestrate_turn, timed as `orchestrate.<name>`.
+_ORCHESTRATOR_STEPS = (
+    "observe_entry",
+    "enrich_journal_entry",
+    "generate_journal_embedding",
+    "extract_topics_for_entry",
+    "detect_emotion_for_entry",
+    "enrich_short_term_memory",
+    "extract_intents_for_entry",
+    "store_intent",
+    "plan_from_intents",
+    "store_planned_items",
+    "apply_rhythm_triggers",
+    "apply_meta_reflection_triggers",
+    "compute_triggers",
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+def scrub_text(text: str) -> str:
+    text = _EMAIL.sub("<email>", text)
+    text = _URL.sub("<url>", text)
+    text = _PHONE.sub("<phone>", text)
+    return _DIGITS.sub("<n>", text)
+
+
+def pseudonym(person_id: Any, salt: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{salt}:{person_id}"))
+
+
+async def record_turns(path: str | Path, *, limit: int = 500, salt: str | None = None) -> int:
+    """Write the latest `limit` user turns to `path` as anonymized JSONL."""
+
+    from sakhi.apps.api.core.db import q
+
+    salt = salt or os.getenv("SAKHI_BENCH_SALT") or uuid.uuid4().hex
+    rows = await q(
+        """
+        SELECT user_id, text, created_at
+        FROM conversation_turns
+        WHERE role = 'user' AND coalesce(text, '') <> ''
+        ORDER BY created_at DESC
+        LIMIT $1
+        """,
+        limit,
+    )
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as handle:
+        for row in reversed(rows or []):
+            record = {"person": pseudonym(row["user_id"], salt), "text": scrub_text(row["text"])}
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return len(rows or [])
+
+
+def load_turns(path: str | Path, *, limit: int | None = None) -> List[Dict[str, Any]]:
+    turns = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line:
+            turns.append(json.loads(line))
+    return turns[:limit] if limit else turns
+
+
+@dataclass
+class ReplayReport:
+    turns: int
+    errors: int
+    wall_s: float
+    samples: List[TurnSample] = field(repr=False)
+
+    def span_percentiles(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles over all calls of each span, plus `turn.total`."""
+
+        values: Dict[str, List[float]] = {}
+        for sample in self.samples:
+            for name, timings in sample.spans.items():
+                values.setdefault(name, []).extend(timings)
+        return {name: _percentiles(timings) for name, timings in sorted(values.items())}
+
+    def round_trip_percentiles(self, *, reply_path: bool = False) -> Dict[str, float]:
+        """DB round trips per turn; `reply_path` counts only those before the response."""
+
+        if reply_path:
+            return _percentiles([sample.reply_db_round_trips for sample in self.samples])
+        return _percentiles([sample.db_round_trips for sample in self.samples])
+
+    def top_statements(self, limit: int = 10) -> List[tuple[str, float]]:
+        totals: Dict[str, int] = {}
+        for sample in self.samples:
+            for kind, count in sample.db_statements.items():
+                totals[kind] = totals.get(kind, 0) + count
+        per_turn = [(kind, count / max(1, len(self.samples))) for kind, count in totals.items()]
+        return sorted(per_turn, key=lambda item: -item[1])[:limit]
+
+    def p95(self, span: str = "turn.total") -> float:
+        return self.span_percentiles().get(span, {}).get("p95", 0.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        count = max(1, len(self.samples))
+        return {
+            "turns": self.turns,
+            "errors": self.errors,
+            "wall_s": round(self.wall_s, 3),
+            "spans_ms": self.span_percentiles(),
+            "db_round_trips": self.round_trip_percentiles(),
+            "db_round_trips_reply_path": self.round_trip_percentiles(reply_path=True),
+            "db_statements_per_turn": dict(self.top_statements()),
+            "llm_calls_per_turn": sum(s.llm_calls for s in self.samples) / count,
+            "embed_calls_per_turn": sum(s.embed_calls for s in self.samples) / count,
+            "redis_ops_per_turn": sum(s.redis_ops for s in self.samples) / count,
+            "jobs_per_turn": sum(s.jobs_enqueued for s in self.samples) / count,
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'span':<48}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}"]
+        for name, stats in self.span_percentiles().items():
+            lines.append(
+                f"{name:<48}{int(stats['n']):>6}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}"
+            )
+        lines.append("")
+        for label, trips in (
+            ("db round trips/turn (reply)", self.round_trip_percentiles(reply_path=True)),
+            ("db round trips/turn (total)", self.round_trip_percentiles()),
+        ):
+            lines.append(f"{label:<30}p50={trips['p50']:.0f} p95={trips['p95']:.0f} p99={trips['p99']:.0f}")
+        for kind, per_turn in self.top_statements():
+            lines.append(f"  {kind:<46}{per_turn:>8.1f}/turn")
+        lines.append(f"turns={self.turns} errors={self.errors} wall={self.wall_s:.2f}s")
+        return "\n".join(lines)
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {"n": 0, **{f"p{p}": 0.0 for p in PERCENTILES}}
+    points = np.percentile(np.asarray(values, dtype=float), PERCENTILES)
+    return {"n": len(values), **{f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, points)}}
+
+
+def _instrument(stack: ExitStack) -> None:
+    from sakhi.apps.api.routes import turn_v2
+    from sakhi.apps.api.services.conversation import orchestrator
+    from sakhi.apps.api.services.turn.stages import observe_stages
+
+    def patch(target: Any, attr: str, span: str) -> None:
+        original = getattr(target, attr)
+        setattr(target, attr, timed(original, span))
+        stack.callback(setattr, target, attr, original)
+
+    for name in _ORCHESTRATOR_STEPS:
+        patch(orchestrator, name, f"orchestrate.{name}")
+    patch(turn_v2, "orchestrate_turn", "turn.orchestrate_turn")
+    patch(turn_v2, "generate_reply", "turn.generate_reply")
+
+    def on_stage(label: str, outcome: Any) -> None:
+        sample = current_sample()
+        if sample is not None:
+            sample.add_span(f"{label}.{outcome.name}", outcome.elapsed_ms)
+
+    stack.enter_context(observe_stages(on_stage))
+
+
+async def replay_turns(
+    turns: Iterable[Dict[str, Any]],
+    *,
+    config: StandInConfig | None = None,
+    concurrency: int = 1,
+    user: str = "a",
+) -> ReplayReport:
+    """Post every turn to `/v2/turn` in-process and collect per-turn samples."""
+
+    import httpx
+
+    from sakhi.apps.api.main import app
+    from sakhi.apps.api.services.turn.post_response import post_response_supervisor
+
+    turns = list(turns)
+    samples: List[TurnSample] = []
+    errors = 0
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(client: "httpx.AsyncClient", turn: Dict[str, Any]) -> None:
+        nonlocal errors
+        sample = TurnSample()
+        async with gate:
+            with measuring(sample):
+                started = time.perf_counter()
+                response = await client.post("/v2/turn", params={"user": user}, json={"text": turn["text"]})
+                sample.add_span("turn.total", (time.perf_counter() - started) * 1000.0)
+                sample.reply_db_round_trips = sample.db_round_trips
+        if response.status_code != 200:
+            errors += 1
+        samples.append(sample)
+
+    with ExitStack() as stack:
+        stack.enter_context(stand_ins(config))
+        _instrument(stack)
+        transport = httpx.ASGITransport(app=app)
+        started = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            await asyncio.gather(*(one(client, turn) for turn in turns))
+            # Post-response work was submitted under each turn's sample, so
+            # draining here completes the per-turn round-trip counts.
+            await post_response_supervisor.drain(timeout=60)
+        wall_s = time.perf_counter() - started
+
+    return ReplayReport(turns=len(turns), errors=errors, wall_s=wall_s, samples=samples)
+
+
+__all__ = [
+    "ReplayReport",
+    "load_turns",
+    "pseudonym",
+    "record_turns",
+    "replay_turns",
+    "scrub_text",
+]
@@ -1,12 +1,68 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
 import os
+import random
+import re
+import time
 import uuid
-from typing import Any, Sequence
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterator, List, Sequence, Tuple
 
 import asyncpg
 
-POOL: asyncpg.Pool | None = None
+from sakhi.apps.api.core.metrics import (
+    db_pool_acquire_timeouts,
+    db_pool_connections,
+    db_pool_queue_wait,
+    db_pool_waiting,
+    db_query_latency,
+    db_query_rows,
+)
+from sakhi.apps.api.core.jsonutil import dump_json, load_json
+from sakhi.libs.pgvector import register_vector_codec
+
+LOGGER = logging.getLogger(__name__)
+
+POOL: "InstrumentedPool | None" = None
+_POOL_LOCK = asyncio.Lock()
+
+WriteObserver = Callable[[str], None]
+_write_observers: ContextVar[tuple[WriteObserver, ...]] = ContextVar("db_write_observers", default=())
+_WRITE_PREFIXES = ("insert", "update", "delete", "with")
+
+
+@contextmanager
+def observe_writes(observer: WriteObserver) -> Iterator[None]:
+    """Call `observer(sql)` for every write statement issued in the current context."""
+    token = _write_observers.set(_write_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _write_observers.reset(token)
+
+
+def _is_write(sql: str) -> bool:
+    return sql.lstrip()[:6].lower().startswith(_WRITE_PREFIXES)
+
+
+def _notify_write(sql: str) -> None:
+    """
+    Tell observers about a write. Helpers call it before the statement runs and
+    again once it has landed, so a read racing the write cannot cache the old
+    row as fresh.
+    """
+    observers = _write_observers.get()
+    if not observers or not _is_write(sql):
+        return
+    for observer in observers:
+        observer(sql)
 
 
 def _normalize_arg(val: Any) -> Any:
@@ -15,24 +71,311 @@ def _normalize_arg(val: Any) -> Any:
     return val
 
 
-async def get_pool() -> asyncpg.Pool:
+_SQL_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$.])\d+(?:\.\d+)?")
+_SQL_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+SLOW_QUERY_MS = float(os.getenv("SAKHI_DB_SLOW_QUERY_MS", "250"))
+SLOW_QUERY_SAMPLE = float(os.getenv("SAKHI_DB_SLOW_QUERY_SAMPLE", "1.0"))
+
+
+@dataclass(frozen=True)
+class QueryFingerprint:
+    id: str
+    statement: str
+    text: str
+
+
+def statement_kind(sql: str) -> str:
+    """Short label for a statement: verb plus main table, e.g. `select personal_model`."""
+    words = _SQL_WHITESPACE.split(sql.strip().lower())
+    verb = words[0] if words else "?"
+    marker = {"update": "update", "insert": "into"}.get(verb, "from")
+    if marker in words:
+        index = words.index(marker) + 1
+        if index < len(words):
+            return f"{verb} {words[index].strip('(,;')}"
+    return verb
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> QueryFingerprint:
+    """Normalize literals, IN-lists, comments and whitespace so equivalent queries share one key."""
+    text = _SQL_COMMENTS.sub(" ", sql)
+    text = _SQL_LITERALS.sub("?", text)
+    text = _SQL_WHITESPACE.sub(" ", text).strip().lower()
+    text = _SQL_IN_LISTS.sub("(?)", text)
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+    return QueryFingerprint(id=digest, statement=statement_kind(text), text=text)
+
+
+@dataclass
+class QueryTally:
+    """Queries issued inside one `track_queries` scope, by fingerprint."""
+
+    label: str
+    count: int = 0
+    elapsed_ms: float = 0.0
+    by_fingerprint: Counter = field(default_factory=Counter)
+    _fingerprints: dict = field(default_factory=dict, repr=False)
+
+    def add(self, fp: QueryFingerprint, elapsed_s: float) -> None:
+        self.count += 1
+        self.elapsed_ms += elapsed_s * 1000.0
+        self.by_fingerprint[fp.id] += 1
+        self._fingerprints[fp.id] = fp
+
+    def top(self, n: int = 5) -> List[Tuple[QueryFingerprint, int]]:
+        return [(self._fingerprints[key], count) for key, count in self.by_fingerprint.most_common(n)]
+
+
+_query_tally: ContextVar[QueryTally | None] = ContextVar("db_query_tally", default=None)
+
+
+@contextmanager
+def track_queries(label: str) -> Iterator[QueryTally]:
+    """Count every helper-issued query in the current context (and tasks it spawns)."""
+    tally = QueryTally(label=label)
+    token = _query_tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _query_tally.reset(token)
+
+
+def _row_count(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, str):
+        tail = result.rsplit(" ", 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def _record_query(sql: str, elapsed_s: float, result: Any) -> None:
+    fp = fingerprint(sql)
+    rows = _row_count(result)
+    db_query_latency.labels(fingerprint=fp.id, statement=fp.statement).observe(elapsed_s)
+    db_query_rows.labels(fingerprint=fp.id, statement=fp.statement).observe(rows)
+    tally = _query_tally.get()
+    if tally is not None:
+        tally.add(fp, elapsed_s)
+    elapsed_ms = elapsed_s * 1000.0
+    if elapsed_ms >= SLOW_QUERY_MS and random.random() < SLOW_QUERY_SAMPLE:
+        LOGGER.warning(
+            "[db] slow query %.1fms rows=%s fingerprint=%s sql=%s",
+            elapsed_ms,
+            rows,
+            fp.id,
+            fp.text[:500],
+        )
+
+
+async def _timed(sql: str, call: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    started = time.perf_counter()
+    result = None
+    try:
+        result = await call(sql, *args, **kwargs)
+        return result
+    finally:
+        _record_query(sql, time.perf_counter() - started, result)
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw not in (None, "") else default
+    except ValueError:
+        return default
+
+
+# The shared pool replaced three pools of 10 (core, schemas, retriever).
+_BASE_POOL_MAX = 30
+# Extra connections per post-response pipeline allowed to run at once.
+_POOL_PER_PIPELINE = 2
+
+
+def default_pool_max() -> int:
+    """
+    Default SAKHI_DB_POOL_MAX: the old combined capacity for foreground
+    work, plus headroom for the post-response pipelines that run beside it
+    (SAKHI_POST_RESPONSE_CONCURRENCY, 8 by default, so 46 in total).
+    """
+    pipelines = int(_env_number("SAKHI_POST_RESPONSE_CONCURRENCY", 8))
+    return _BASE_POOL_MAX + _POOL_PER_PIPELINE * max(0, pipelines)
+
+
+def pool_settings() -> dict[str, Any]:
+    """
+    Pool sizing and timeouts from the environment (SAKHI_DB_POOL_*).
+
+    Acquires wait for a free connection unless SAKHI_DB_ACQUIRE_TIMEOUT_S
+    is set, as the core pool always did.
+    """
+    min_size = int(_env_number("SAKHI_DB_POOL_MIN", 1))
+    max_size = max(min_size, int(_env_number("SAKHI_DB_POOL_MAX", default_pool_max())))
+    return {
+        "min_size": min_size,
+        "max_size": max_size,
+        "acquire_timeout": _env_number("SAKHI_DB_ACQUIRE_TIMEOUT_S", 0.0) or None,
+        "command_timeout": _env_number("SAKHI_DB_COMMAND_TIMEOUT_S", 60.0) or None,
+        "max_inactive_connection_lifetime": _env_number("SAKHI_DB_POOL_MAX_INACTIVE_S", 300.0),
+    }
+
+
+class _PoolAcquire:
+    """`pool.acquire()` result: usable as `await pool.acquire()` or `async with pool.acquire()`."""
+
+    def __init__(self, pool: "InstrumentedPool", timeout: float | None) -> None:
+        self._pool = pool
+        self._timeout = timeout
+        self._connection: asyncpg.Connection | None = None
+
+    def __await__(self):
+        return self._pool._acquire(self._timeout).__await__()
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        self._connection = await self._pool._acquire(self._timeout)
+        return self._connection
+
+    async def __aexit__(self, *exc: Any) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await self._pool.release(connection)
+
+
+class InstrumentedPool:
+    """
+    The process-wide asyncpg pool with acquire metrics.
+
+    Every acquire is bounded by the configured acquire timeout and records
+    how long it queued for a connection; in-use/idle gauges read the pool
+    at scrape time. Anything not wrapped here is passed to the asyncpg pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, *, acquire_timeout: float | None = None) -> None:
+        self._pool = pool
+        self.acquire_timeout = acquire_timeout
+        db_pool_connections.labels(state="in_use").set_function(self.in_use)
+        db_pool_connections.labels(state="idle").set_function(self.idle)
+
+    @property
+    def raw(self) -> asyncpg.Pool:
+        return self._pool
+
+    def in_use(self) -> int:
+        return self._pool.get_size() - self._pool.get_idle_size()
+
+    def idle(self) -> int:
+        return self._pool.get_idle_size()
+
+    def acquire(self, *, timeout: float | None = None) -> _PoolAcquire:
+        return _PoolAcquire(self, self.acquire_timeout if timeout is None else timeout)
+
+    async def _acquire(self, timeout: float | None) -> asyncpg.Connection:
+        started = time.perf_counter()
+        db_pool_waiting.inc()
+        try:
+            return await self._pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            db_pool_acquire_timeouts.inc()
+            raise
+        finally:
+            db_pool_waiting.dec()
+            db_pool_queue_wait.observe(time.perf_counter() - started)
+
+    async def release(self, connection: asyncpg.Connection) -> None:
+        await self._pool.release(connection)
+
+    async def fetch(self, sql: str, *args: Any, **kwargs: Any) -> list[asyncpg.Record]:
+        async with self.acquire() as connection:
+            return await _timed(sql, connection.fetch, *args, **kwargs)
+
+    async def fetchrow(self, sql: str, *args: Any, **kwargs: Any) -> asyncpg.Record | None:
+        async with self.acquire() as connection:
+            return await _timed(sql, connection.fetchrow, *args, **kwargs)
+
+    async def fetchval(self, sql: str, *args: Any, **kwargs: Any) -> Any:
+        async with self.acquire() as connection:
+            return await _timed(sql, connection.fetchval, *args, **kwargs)
+
+    async def execute(self, sql: str, *args: Any, **kwargs: Any) -> str:
+        async with self.acquire() as connection:
+            return await _timed(sql, connection.execute, *args, **kwargs)
+
+    async def executemany(self, sql: str, args: Any, **kwargs: Any) -> None:
+        async with self.acquire() as connection:
+            await _timed(sql, connection.executemany, args, **kwargs)
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+def encode_jsonb(value: Any) -> str:
+    """Parameter encoder for json/jsonb: Python objects are serialized, JSON text passes through."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8")
+    return dump_json(value).decode("utf-8")
+
+
+async def _init_connection(connection: asyncpg.Connection) -> None:
+    # json/jsonb columns come back as dicts/lists and accept Python objects.
+    for type_name in ("jsonb", "json"):
+        await connection.set_type_codec(
+            type_name,
+            encoder=encode_jsonb,
+            decoder=load_json,
+            schema="pg_catalog",
+        )
+    # vector columns decode to float32 arrays and accept arrays (binary, no text formatting).
+    await register_vector_codec(connection)
+
+
+async def create_pool(dsn: str | None = None, **overrides: Any) -> InstrumentedPool:
+    """Open an instrumented pool; API, retrieval and workers share one via `get_pool`."""
+    dsn = dsn or os.getenv("DATABASE_URL")
+    if not dsn:
+        raise RuntimeError("Missing required env var: DATABASE_URL")
+    settings = {**pool_settings(), **overrides}
+    acquire_timeout = settings.pop("acquire_timeout")
+    settings.setdefault("init", _init_connection)
+    raw = await asyncpg.create_pool(dsn, statement_cache_size=0, **settings)
+    return InstrumentedPool(raw, acquire_timeout=acquire_timeout)
+
+
+async def get_pool(dsn: str | None = None) -> InstrumentedPool:
     global POOL
     if POOL is None:
-        dsn = os.getenv("DATABASE_URL")
-        if not dsn:
-            raise RuntimeError("Missing required env var: DATABASE_URL")
-        POOL = await asyncpg.create_pool(
-            dsn,
-            statement_cache_size=0,
-        )
+        async with _POOL_LOCK:
+            if POOL is None:
+                POOL = await create_pool(dsn)
     return POOL
 
 
+async def close_pool() -> None:
+    global POOL
+    pool, POOL = POOL, None
+    if pool is not None:
+        await pool.close()
+
+
 async def q(sql: str, *args: Any, one: bool = False) -> Any:
+    _notify_write(sql)
     pool = await get_pool()
     normalized_args = tuple(_normalize_arg(arg) for arg in args)
-    async with pool.acquire() as connection:
-        rows: Sequence[asyncpg.Record] = await connection.fetch(sql, *normalized_args)
+    try:
+        async with pool.acquire() as connection:
+            rows: Sequence[asyncpg.Record] = await _timed(sql, connection.fetch, *normalized_args)
+    finally:
+        _notify_write(sql)
     if one:
         record = rows[0] if rows else None
         return dict(record) if isinstance(record, asyncpg.Record) else record
@@ -40,10 +383,14 @@ async def q(sql: str, *args: Any, one: bool = False) -> Any:
 
 
 async def exec(sql: str, *args: Any) -> str:
+    _notify_write(sql)
     pool = await get_pool()
     normalized_args = tuple(_normalize_arg(arg) for arg in args)
-    async with pool.acquire() as connection:
-        return await connection.execute(sql, *normalized_args)
+    try:
+        async with pool.acquire() as connection:
+            return await _timed(sql, connection.execute, *normalized_args)
+    finally:
+        _notify_write(sql)
 
 
 async def dbfetchrow(sql: str, *args: Any) -> Any:
@@ -52,25 +399,44 @@ async def dbfetchrow(sql: str, *args: Any) -> Any:
 
 
 class DBSession:
-    def __init__(self, pool: asyncpg.Pool, connection: asyncpg.Connection) -> None:
+    def __init__(self, pool: InstrumentedPool, connection: asyncpg.Connection) -> None:
         self._pool = pool
         self._connection = connection
+        # Writes inside an open transaction, re-announced once it ends.
+        self._uncommitted: list[str] = []
 
-    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+    async def _run(self, method: Callable[..., Awaitable[Any]], sql: str, args: tuple) -> Any:
+        _notify_write(sql)
         normalized_args = tuple(_normalize_arg(arg) for arg in args)
-        rows = await self._connection.fetch(sql, *normalized_args)
+        try:
+            return await _timed(sql, method, *normalized_args)
+        finally:
+            self._written(sql)
+
+    def _written(self, sql: str) -> None:
+        if _is_write(sql):
+            self._uncommitted.append(sql)
+        if self._connection.is_in_transaction():
+            return
+        pending, self._uncommitted = self._uncommitted, []
+        for statement in pending:
+            _notify_write(statement)
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+        rows = await self._run(self._connection.fetch, sql, args)
         return [dict(row) for row in rows]
 
     async def fetchrow(self, sql: str, *args: Any) -> dict[str, Any] | None:
-        normalized_args = tuple(_normalize_arg(arg) for arg in args)
-        row = await self._connection.fetchrow(sql, *normalized_args)
+        row = await self._run(self._connection.fetchrow, sql, args)
         return dict(row) if row else None
 
     async def execute(self, sql: str, *args: Any) -> str:
-        normalized_args = tuple(_normalize_arg(arg) for arg in args)
-        return await self._connection.execute(sql, *normalized_args)
+        return await self._run(self._connection.execute, sql, args)
 
     async def close(self) -> None:
+        pending, self._uncommitted = self._uncommitted, []
+        for statement in pending:
+            _notify_write(statement)
         await self._pool.release(self._connection)
 
 
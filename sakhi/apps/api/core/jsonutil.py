@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import datetime as dt
+import enum
+import json
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import orjson
+
+
+def _default(value: Any) -> Any:
+    """Encode the values our payloads carry beyond plain JSON types."""
+
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    if isinstance(value, (dt.datetime, dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "model_dump"):  # pydantic v2 models
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dump_json(payload: Any) -> bytes:
+    """Serialize a payload to UTF-8 JSON with orjson."""
+
+    try:
+        return orjson.dumps(
+            payload,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    except (TypeError, orjson.JSONEncodeError):
+        pass  # e.g. integers beyond 64 bits; the stdlib path handles them
+    return json.dumps(payload, ensure_ascii=False, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(data: str | bytes) -> Any:
+    """Parse JSON text with orjson."""
+
+    return orjson.loads(data)
+
+
+__all__ = ["dump_json", "load_json"]
@@ -10,6 +10,7 @@ from pydantic import BaseModel, ValidationError
 
 from sakhi.apps.api.middleware.auth_pilot import _mask_pii
 from sakhi.libs.llm_router.router import LLMRouter
+from sakhi.libs.llm_router.streaming import TokenCallback
 from sakhi.libs.llm_router.context_builder import build_meta_context
 _ROUTER: LLMRouter | None = None
 
@@ -32,6 +33,7 @@ async def call_llm(
     max_repair_attempts: int = 1,
     person_id: str | None = None,
     context: Mapping[str, Any] | None = None,
+    on_token: TokenCallback | None = None,
     **kwargs: Any,
 ) -> Any:
     if _ROUTER is None:
@@ -100,6 +102,9 @@ async def call_llm(
     request_kwargs = dict(kwargs)
     if response_format is not None:
         request_kwargs["response_format"] = response_format
+    elif on_token is not None:
+        # Only free-text replies stream; JSON answers must be validated whole.
+        request_kwargs["on_token"] = on_token
 
     last_error: str | None = None
     last_text: str = ""
@@ -1,8 +1,113 @@
 from __future__ import annotations
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 episodes_written = Counter("episodes_written_total", "Episodes recorded")
 aw_events_written = Counter("aw_events_written_total", "Awareness events recorded")
 derivatives_written = Counter("derivatives_written_total", "Derivatives (mi/es/en/insight) recorded")
 ingest_latency = Histogram("aw_ingest_seconds", "Event to derivative processing latency in seconds")
+turn_stage_latency = Histogram(
+    "turn_stage_seconds",
+    "Latency of individual turn stages in seconds",
+    ["stage", "status"],
+)
+post_response_runs = Counter(
+    "post_response_runs_total",
+    "Post-response pipelines by outcome",
+    ["label", "status"],
+)
+post_response_inflight = Gauge("post_response_inflight", "Post-response pipelines submitted but not finished")
+post_response_dropped = Counter(
+    "post_response_dropped_total",
+    "Post-response pipelines skipped because the pending queue was full",
+    ["label"],
+)
+post_response_queue_wait = Histogram(
+    "post_response_queue_seconds",
+    "Time a post-response pipeline waited for a concurrency slot",
+)
+turn_deadline_skips = Counter(
+    "turn_deadline_skips_total",
+    "Optional turn stages cancelled or skipped at the turn deadline",
+    ["stage"],
+)
+turn_degraded = Counter("turn_degraded_total", "Turns answered with degraded (deadline-cut) stages", ["route"])
+db_pool_queue_wait = Histogram(
+    "db_pool_acquire_seconds",
+    "Time spent waiting for a pooled Postgres connection",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+db_pool_acquire_timeouts = Counter("db_pool_acquire_timeouts_total", "Pool acquires that hit the acquire timeout")
+db_pool_waiting = Gauge("db_pool_waiting", "Callers currently queued for a pooled connection")
+db_pool_connections = Gauge("db_pool_connections", "Pooled Postgres connections by state", ["state"])
+db_query_latency = Histogram(
+    "db_query_seconds",
+    "Latency of helper-issued queries by normalized fingerprint",
+    ["fingerprint", "statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+db_query_rows = Histogram(
+    "db_query_rows",
+    "Rows returned or affected per query by normalized fingerprint",
+    ["fingerprint", "statement"],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+db_query_budget_exceeded = Counter(
+    "db_query_budget_exceeded_total",
+    "Requests that issued more queries than the per-request budget",
+    ["route"],
+)
+embedding_cache_lookups = Counter(
+    "embedding_cache_lookups_total",
+    "Embedding cache lookups by tier (memory, redis) and result (hit, miss)",
+    ["tier", "result"],
+)
+embedding_requests_coalesced = Counter(
+    "embedding_requests_coalesced_total",
+    "Embedding misses served by an identical request already in flight",
+)
+embedding_batch_size = Histogram(
+    "embedding_batch_size",
+    "Texts sent per batched embedding API request",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+embedding_batch_latency = Histogram(
+    "embedding_batch_seconds",
+    "Latency of one batched embedding API request, retries included",
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+embedding_batch_queue_wait = Histogram(
+    "embedding_batch_queue_wait_seconds",
+    "Time a text waited in the micro-batch window before its batch was sent",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+vector_index_lookups = Counter(
+    "vector_index_lookups_total",
+    "Per-person vector index lookups by result (hit, warm, coalesced)",
+    ["result"],
+)
+vector_index_warm_latency = Histogram(
+    "vector_index_warm_seconds",
+    "Time to load one person's journal vectors into the in-process index",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+coalesced_triggers = Counter(
+    "coalesced_triggers_total",
+    "Background task triggers by outcome (scheduled, merged into a pending run, dropped)",
+    ["task", "outcome"],
+)
+coalesced_runs = Counter(
+    "coalesced_runs_total",
+    "Coalesced background task runs by status (ok, error)",
+    ["task", "status"],
+)
+graph_cache_lookups = Counter(
+    "graph_cache_lookups_total",
+    "Per-person memory graph cache lookups by result (hit, warm, coalesced)",
+    ["result"],
+)
+graph_cache_warm_latency = Histogram(
+    "graph_cache_warm_seconds",
+    "Time to load one person's memory graph into the in-process cache",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sakhi.apps.api.core.db import observe_writes, q
+
+LOGGER = logging.getLogger(__name__)
+
+# Every column a full turn reads from personal_model (turn_v2, tone, empathy,
+# microreg and the LLM meta context). One row fetch covers all of them.
+TURN_COLUMNS: Tuple[str, ...] = (
+    "long_term",
+    "nudge_state",
+    "forecast_state",
+    "coherence_state",
+    "alignment_state",
+    "conflict_state",
+    "emotion_state",
+    "empathy_state",
+    "persona_state",
+    "body_state",
+    "mind_state",
+    "rhythm_state",
+    "soul_state",
+    "goals_state",
+)
+
+_UPDATE_RE = re.compile(r"^\s*UPDATE\s+personal_model\s+SET\s+(.*?)(?:\s+WHERE\s|$)", re.IGNORECASE | re.DOTALL)
+_ASSIGN_RE = re.compile(r"(?:^|,)\s*(\w+)\s*=")
+_UNDEFINED_COLUMN = "42703"
+# Older schemas lack some TURN_COLUMNS; once Postgres says so we read `*`.
+_SELECT_STAR = False
+
+Fetch = Callable[..., Awaitable[Any]]
+
+
+def _written_columns(sql: str) -> Optional[Set[str]]:
+    """
+    Columns a statement writes to personal_model.
+
+    Returns an empty set when the statement does not touch the table and None
+    when it does but the columns cannot be told (INSERT/upsert/CTE), meaning
+    "assume everything changed".
+    """
+
+    if "personal_model" not in sql.lower():
+        return set()
+    match = _UPDATE_RE.match(sql)
+    if not match:
+        return None
+    return {col.lower() for col in _ASSIGN_RE.findall(match.group(1))}
+
+
+class PersonalModelMemo:
+    """
+    Read-through memo of one person's personal_model row for a single turn.
+
+    Concurrent readers share a single fetch. Writes observed through
+    `observe_writes` mark just the columns they set as stale, so the next
+    reader of those columns re-fetches while everyone else keeps the cache.
+    """
+
+    def __init__(self, person_id: str, columns: Iterable[str] = TURN_COLUMNS) -> None:
+        self.person_id = str(person_id)
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.fetches = 0
+        self.closed = False
+        self._row: Dict[str, Any] | None = None
+        self._loaded = False
+        self._stale: Set[str] = set()
+        # Bumped by whole-row invalidations; a fetch that overlaps one is not kept.
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, columns: Optional[Iterable[str]] = None) -> None:
+        if columns is None:
+            self._generation += 1
+            self._loaded = False
+            self._stale.clear()
+            return
+        self._stale.update(columns)
+
+    def observe(self, sql: str) -> None:
+        written = _written_columns(sql)
+        if written is None:
+            self.invalidate()
+        elif written:
+            self.invalidate(written)
+
+    def _fresh(self, columns: Iterable[str]) -> bool:
+        return self._loaded and not self._stale.intersection(columns)
+
+    def _store(self, row: Any, generation: int) -> None:
+        self._row = dict(row) if row else None
+        self._loaded = generation == self._generation
+
+    async def _fetch(self, fetch: Fetch) -> None:
+        global _SELECT_STAR
+        # Writes landing while the fetch is in flight re-mark their columns;
+        # a whole-row invalidation leaves the result unloaded.
+        self._stale.clear()
+        generation = self._generation
+        self.fetches += 1
+        if not _SELECT_STAR:
+            try:
+                row = await fetch(
+                    f"SELECT {', '.join(self.columns)} FROM personal_model WHERE person_id = $1",
+                    self.person_id,
+                    one=True,
+                )
+            except Exception as exc:
+                if getattr(exc, "sqlstate", None) != _UNDEFINED_COLUMN:
+                    raise
+                LOGGER.info("[personal_model_memo] falling back to SELECT *: %s", exc)
+                _SELECT_STAR = True
+            else:
+                self._store(row, generation)
+                return
+        row = await fetch("SELECT * FROM personal_model WHERE person_id = $1", self.person_id, one=True)
+        self._store(row, generation)
+
+    async def get(self, columns: Iterable[str], *, fetch: Fetch = q) -> Dict[str, Any] | None:
+        """Return `columns` of the row (None if the person has no row)."""
+
+        columns = tuple(columns)
+        if not self._fresh(columns):
+            async with self._lock:
+                if not self._fresh(columns):
+                    await self._fetch(fetch)
+        if self._row is None:
+            return None
+        return {column: self._row.get(column) for column in columns}
+
+
+_current_memo: ContextVar[PersonalModelMemo | None] = ContextVar("personal_model_memo", default=None)
+
+
+def current_personal_model_memo(person_id: str | None = None) -> PersonalModelMemo | None:
+    """The active memo, if any, optionally only when it belongs to `person_id`."""
+
+    memo = _current_memo.get()
+    if memo is None or memo.closed:
+        return None
+    if person_id is not None and str(person_id) != memo.person_id:
+        return None
+    return memo
+
+
+@asynccontextmanager
+async def personal_model_scope(person_id: str, columns: Iterable[str] = TURN_COLUMNS) -> AsyncIterator[PersonalModelMemo]:
+    """Install a memo for `person_id` for the duration of the block."""
+
+    memo = PersonalModelMemo(person_id, columns)
+    token = _current_memo.set(memo)
+    try:
+        with observe_writes(memo.observe):
+            yield memo
+    finally:
+        # Background tasks copied this context; they must not read a turn-old row.
+        memo.closed = True
+        _current_memo.reset(token)
+
+
+__all__ = [
+    "PersonalModelMemo",
+    "TURN_COLUMNS",
+    "current_personal_model_memo",
+    "personal_model_scope",
+]
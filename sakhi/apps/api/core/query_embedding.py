@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Dict, Iterator, List
+
+from sakhi.libs.embeddings import embed_text
+
+
+class TurnEmbeddings:
+    """
+    Embeddings computed during one turn, keyed by stripped text.
+
+    The journal write, recall and reply context all embed the user's message;
+    through this memo they share a single embedding call. Concurrent callers
+    await the same computation.
+    """
+
+    def __init__(self) -> None:
+        self.computed = 0
+        self._vectors: Dict[str, asyncio.Future] = {}
+
+    def _forget_failed(self, key: str, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self._vectors.pop(key, None)
+
+    async def get(self, text: str) -> List[float]:
+        key = (text or "").strip()
+        if not key:
+            return await embed_text(key)
+        future = self._vectors.get(key)
+        if future is None:
+            self.computed += 1
+            future = asyncio.ensure_future(embed_text(key))
+            future.add_done_callback(partial(self._forget_failed, key))
+            self._vectors[key] = future
+        # Copies: some callers normalize the vector in place.
+        return list(await asyncio.shield(future))
+
+
+_current_embeddings: ContextVar[TurnEmbeddings | None] = ContextVar("turn_embeddings", default=None)
+
+
+def current_turn_embeddings() -> TurnEmbeddings | None:
+    return _current_embeddings.get()
+
+
+@contextmanager
+def turn_embedding_scope() -> Iterator[TurnEmbeddings]:
+    """
+    Share query embeddings for the duration of the block. Unlike the personal
+    model memo it stays usable from copied contexts (post-response stages):
+    an embedding of the same text never goes stale.
+    """
+
+    memo = TurnEmbeddings()
+    token = _current_embeddings.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_embeddings.reset(token)
+
+
+async def embed_query(text: str) -> List[float]:
+    """`embed_text` for one string, reusing the turn's vector when a scope is active."""
+
+    memo = _current_embeddings.get()
+    if memo is None:
+        return await embed_text(text)
+    return await memo.get(text)
+
+
+__all__ = ["TurnEmbeddings", "current_turn_embeddings", "embed_query", "turn_embedding_scope"]
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import math
 from datetime import datetime, timezone
-from typing import Any, Callable, Iterable, List
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Sequence
+
+import numpy as np
 
 
 def recency_decay(days: float, tau: float) -> float:
@@ -58,6 +60,118 @@ def should_surface(score: float, *, intent: bool = False, domain: bool = False)
     return score >= THRESH_SOFT or (score >= 0.50 and (intent or domain))
 
 
+# ---------------------------------------------------------------------------
+# Vectorized scoring: one float32 matrix per candidate set instead of a
+# Python-level cosine per pair.
+# ---------------------------------------------------------------------------
+
+
+def stack_vectors(vectors: Sequence[Sequence[float]], dim: int | None = None) -> np.ndarray:
+    """
+    Stack vectors into an (n, dim) float32 matrix with unit-length rows.
+    Short vectors are zero-padded, long ones truncated; empty or zero rows stay zero.
+    """
+
+    if dim is None:
+        dim = max((len(vec) for vec in vectors), default=0)
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for row, vec in enumerate(vectors):
+        count = min(len(vec), dim)
+        if count:
+            matrix[row, :count] = np.asarray(vec, dtype=np.float32)[:count]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def cosine_scores(query: Sequence[float], matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of `query` to every row of a `stack_vectors` matrix (one matmul)."""
+
+    unit = stack_vectors([query], dim=matrix.shape[1])[0]
+    return matrix @ unit
+
+
+def recency_weights(timestamps: Sequence[Any], halflife_days: float, *, now: datetime | None = None) -> np.ndarray:
+    """
+    0.5 ** (age_days / halflife_days) per timestamp, with whole days of age.
+    Missing or unparseable timestamps weigh 1.0; naive ones are taken as UTC.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    ages = np.zeros(len(timestamps), dtype=np.float64)
+    for index, ts in enumerate(timestamps):
+        if isinstance(ts, str):
+            try:
+                ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+        if not isinstance(ts, datetime):
+            continue
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        ages[index] = (now - ts).days
+    return np.power(0.5, ages / float(halflife_days))
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    similarity: np.ndarray,
+    k: int,
+    *,
+    lambda_: float = 0.7,
+    duplicate_threshold: float = 0.92,
+) -> List[int]:
+    """
+    Maximal marginal relevance over a precomputed (n, n) similarity matrix.
+
+    Each step picks argmax(lambda * relevance - (1 - lambda) * max similarity
+    to the picks so far), skipping near-duplicates (similarity above
+    `duplicate_threshold`). When only near-duplicates remain, the rest of the
+    k slots are filled in relevance order. Returns candidate indices.
+    """
+
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    relevance = np.asarray(relevance, dtype=np.float32)
+    max_sim = np.zeros(n, dtype=np.float32)
+    eligible = np.ones(n, dtype=bool)
+    picked: List[int] = []
+    while len(picked) < k and eligible.any():
+        mmr = lambda_ * relevance - (1.0 - lambda_) * max_sim
+        index = int(np.argmax(np.where(eligible, mmr, -np.inf)))
+        picked.append(index)
+        max_sim = np.maximum(max_sim, similarity[index])
+        eligible[index] = False
+        eligible &= max_sim <= duplicate_threshold
+    if len(picked) < k:
+        taken = set(picked)
+        for index in np.argsort(-relevance, kind="stable"):
+            if len(picked) >= k:
+                break
+            if int(index) not in taken:
+                picked.append(int(index))
+    return picked
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], *, k: int = 60) -> Dict[Hashable, float]:
+    """
+    Reciprocal-rank fusion of best-first key lists: each ranking adds
+    1 / (k + rank) per key. Scaled by (k + 1) / len(rankings) so a key ranked
+    first by every list scores 1.0 and fused scores stay in (0, 1].
+    """
+
+    fused: Dict[Hashable, float] = {}
+    if not rankings:
+        return fused
+    scale = (k + 1) / len(rankings)
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + scale / (k + rank)
+    return fused
+
+
 __all__ = [
     "recency_decay",
     "fatigue_penalty",
@@ -66,4 +180,9 @@ __all__ = [
     "score_ltm",
     "dedupe_keep_top",
     "should_surface",
+    "stack_vectors",
+    "cosine_scores",
+    "recency_weights",
+    "mmr_select",
+    "reciprocal_rank_fusion",
 ]
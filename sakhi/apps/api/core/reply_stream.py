@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Set, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from sakhi.apps.api.core.jsonutil import dump_json
+from sakhi.libs.llm_router.streaming import TokenCallback
+
+LOGGER = logging.getLogger(__name__)
+
+# Set only while a streaming request runs; the reply-producing LLM call reads it.
+_reply_sink: ContextVar[TokenCallback | None] = ContextVar("reply_sink", default=None)
+# Handlers keep running after a client disconnects so their writes still land.
+_INFLIGHT: Set["asyncio.Task[None]"] = set()
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def current_reply_sink() -> TokenCallback | None:
+    """Token callback of the active streaming request, if any."""
+
+    return _reply_sink.get()
+
+
+def wants_event_stream(request: Request | None) -> bool:
+    """True for `?stream=1` or an `Accept: text/event-stream` request."""
+
+    if request is None:
+        return False
+    flag = (request.query_params.get("stream") or "").lower()
+    if flag in {"1", "true", "yes"}:
+        return True
+    return "text/event-stream" in (request.headers.get("accept") or "").lower()
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dump_json(data) + b"\n\n"
+
+
+def stream_reply(handler: Callable[[], Awaitable[Any]]) -> StreamingResponse:
+    """
+    Run `handler` with a reply sink installed and stream it as server-sent events.
+
+    Reply text arrives as `token` events while the LLM produces it; the value
+    `handler` returns (the usual JSON body) follows as one `done` event, or an
+    `error` event carrying `status` and `detail` if it raised.
+    """
+
+    queue: asyncio.Queue[Tuple[str, Any]] = asyncio.Queue()
+
+    async def sink(delta: str) -> None:
+        queue.put_nowait(("token", {"text": delta}))
+
+    async def run() -> None:
+        try:
+            queue.put_nowait(("done", await handler()))
+        except HTTPException as exc:
+            queue.put_nowait(("error", {"status": exc.status_code, "detail": exc.detail}))
+        except Exception:
+            LOGGER.exception("[reply_stream] handler failed")
+            queue.put_nowait(("error", {"status": 500, "detail": "Internal Server Error"}))
+
+    token = _reply_sink.set(sink)
+    try:
+        task = asyncio.create_task(run())
+    finally:
+        _reply_sink.reset(token)
+    _INFLIGHT.add(task)
+    task.add_done_callback(_INFLIGHT.discard)
+
+    async def body() -> AsyncIterator[bytes]:
+        while True:
+            event, data = await queue.get()
+            yield sse_event(event, data)
+            if event != "token":
+                return
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+__all__ = ["current_reply_sink", "sse_event", "stream_reply", "wants_event_stream"]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response
+
+from sakhi.apps.api.core.jsonutil import dump_json, load_json
+
+PROFILES = ("lean", "full", "debug")
+# What a chat client renders for a turn.
+LEAN_FIELDS: Tuple[str, ...] = (
+    "reply",
+    "sessionId",
+    "entry_id",
+    "tone",
+    "mood",
+    "micro_journey",
+    "degraded",
+)
+# `debug` keeps the historical payload (engine snapshots included) unless overridden.
+DEFAULT_PROFILE = os.getenv("SAKHI_TURN_PROFILE", "debug")
+
+
+@dataclass(frozen=True)
+class ResponseShape:
+    """
+    Which parts of a turn response a caller wants.
+
+    `lean` returns LEAN_FIELDS, `full` every field but with the debug section
+    left unbuilt, `debug` everything. An explicit `fields` list wins over the
+    profile; the debug section is built only when it is listed.
+    """
+
+    profile: str = DEFAULT_PROFILE
+    fields: Tuple[str, ...] | None = None
+
+    @property
+    def wants_debug(self) -> bool:
+        if self.fields is not None:
+            return "debug" in self.fields
+        return self.profile == "debug"
+
+    def project(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is not None:
+            keys = self.fields
+        elif self.profile == "lean":
+            keys = LEAN_FIELDS
+        else:
+            return payload
+        return {key: payload[key] for key in keys if key in payload}
+
+
+def response_shape(request: Request | None) -> ResponseShape:
+    """Read `?profile=lean|full|debug` and `?fields=a,b,c` from the request."""
+
+    if request is None:
+        return ResponseShape()
+    profile = (request.query_params.get("profile") or DEFAULT_PROFILE).lower()
+    if profile not in PROFILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"profile must be one of {', '.join(PROFILES)}",
+        )
+    raw_fields = request.query_params.get("fields")
+    fields = None
+    if raw_fields is not None:
+        fields = tuple(dict.fromkeys(name.strip() for name in raw_fields.split(",") if name.strip()))
+    return ResponseShape(profile=profile, fields=fields)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+__all__ = [
+    "DEFAULT_PROFILE",
+    "FastJSONResponse",
+    "LEAN_FIELDS",
+    "PROFILES",
+    "ResponseShape",
+    "dump_json",
+    "load_json",
+    "response_shape",
+]
@@ -5,6 +5,8 @@ import re
 
 from dateutil import parser as dtp
 
+from sakhi.libs.phrase_index import register_phrases
+
 ACTION_WORDS = {"schedule", "remind", "block", "book", "create", "plan", "buy", "pay"}
 MOOD_LEX = {
     "overwhelmed": (-0.6, "tense"),
@@ -16,6 +18,17 @@ MOOD_LEX = {
     "happy": (0.5, "calm"),
 }
 
+_ACTION = register_phrases("extract.action", sorted(ACTION_WORDS))
+_REFLECT = register_phrases("extract.reflect", ["i feel", "feeling", "felt", "mood", "today i"])
+_FINANCE = register_phrases(
+    "extract.finance", ["buy", "pay", "budget", "₹", "rs ", "inr", "emi", "down payment"]
+)
+_TIME_WINDOWS = register_phrases(
+    "extract.time_window",
+    ["tomorrow", "today", "next week", "this week", "tonight", "this evening", "this morning"],
+)
+_MOODS = register_phrases("extract.mood", MOOD_LEX)
+
 
 def try_parse_time(text: str, ref: dt.datetime | None = None) -> dt.datetime | None:
     ref = ref or dt.datetime.now()
@@ -36,9 +49,9 @@ def extract(message: str, now: dt.datetime | str | None = None) -> dict:
     out = {"triage": [], "slots": {}, "abstentions": []}
     lower = (message or "").lower()
 
-    is_action = any(word in lower for word in ACTION_WORDS)
-    is_reflect = any(phrase in lower for phrase in ["i feel", "feeling", "felt", "mood", "today i"])
-    is_finance = any(token in lower for token in ["buy", "pay", "budget", "₹", "rs ", "inr", "emi", "down payment"])
+    is_action = _ACTION.search(lower)
+    is_reflect = _REFLECT.search(lower)
+    is_finance = _FINANCE.search(lower)
     if is_action:
         out["triage"].append({"type": "intent_action", "confidence": 0.8})
     if is_reflect:
@@ -50,10 +63,9 @@ def extract(message: str, now: dt.datetime | str | None = None) -> dict:
     if goal_match:
         out["slots"]["goal"] = {"text": goal_match.group(3).strip(), "confidence": 0.7}
 
-    tw = None
-    for pat in ["tomorrow", "today", "next week", "this week", "tonight", "this evening", "this morning"]:
-        if pat in lower:
-            tw = pat
+    # The last listed window present wins.
+    windows = _TIME_WINDOWS.found(lower)
+    tw = windows[-1] if windows else None
     hhmm = re.search(r"(\d{1,2})(:\d{2})?\s*(am|pm)?", lower)
     if hhmm:
         t = try_parse_time(hhmm.group(0), now)
@@ -76,14 +88,15 @@ def extract(message: str, now: dt.datetime | str | None = None) -> dict:
             ref = ref
         out["slots"]["time_window"] = {"start": ref.isoformat(), "confidence": 0.6}
 
-    for word, (score, tone) in MOOD_LEX.items():
-        if word in lower:
-            out["slots"]["mood_affect"] = {"label": word, "score": score, "confidence": 0.8}
-            out["energy_tone_hint"] = {
-                "calm": 0.7 if tone == "calm" else 0.3,
-                "vital": 0.7 if tone == "vital" else 0.3,
-                "agitated": 0.7 if tone == "tense" else 0.2,
-            }
-            break
+    moods = _MOODS.found(lower)
+    if moods:
+        word = moods[0]
+        score, tone = MOOD_LEX[word]
+        out["slots"]["mood_affect"] = {"label": word, "score": score, "confidence": 0.8}
+        out["energy_tone_hint"] = {
+            "calm": 0.7 if tone == "calm" else 0.3,
+            "vital": 0.7 if tone == "vital" else 0.3,
+            "agitated": 0.7 if tone == "tense" else 0.2,
+        }
 
     return out
@@ -136,9 +136,10 @@ from sakhi.apps.api.routes.experience_journal import router as experience_journa
 from sakhi.apps.api.routes.experience_weekly import router as experience_weekly_router
 from sakhi.apps.api.routers import person as person_router
 from sakhi.apps.api.routers import person_edit as person_edit_router
+from sakhi.apps.api.core.db import close_pool
 from sakhi.apps.api.core.llm import set_router as set_llm_router
 from sakhi.apps.api.core.utils import EnhancedJSONEncoder
-from sakhi.apps.api.middleware import ReplyPacingMiddleware, TelemetryMiddleware
+from sakhi.apps.api.middleware import QueryBudgetMiddleware, ReplyPacingMiddleware, TelemetryMiddleware
 from sakhi.apps.worker.jobs import enqueue_embedding_and_salience
 from sakhi.apps.worker.jobs_alignment import compute_alignment
 from sakhi.apps.api.deps.auth import get_current_user_id
@@ -149,6 +150,8 @@ from sakhi.libs.actions.intents import create_intent_from_entry
 from sakhi.libs.debug.narrative import build_narrative_debug
 from sakhi.apps.worker.jobs_goal_actions import commit_plan
 from sakhi.apps.api.services.memory.memory_ingest import ingest_journal_entry
+from sakhi.apps.api.services.memory.vector_index import start_invalidation_listener
+from sakhi.apps.api.services.turn.post_response import post_response_supervisor
 from sakhi.libs.conversation.clarify_outer import permission_prompt as clarify_permission_prompt
 from sakhi.libs.conversation.outer_flow import (
     ensure_flow as ensure_outer_flow,
@@ -187,6 +190,7 @@ if PILOT_AUTH:
 
 app.add_middleware(TelemetryMiddleware)
 app.add_middleware(ReplyPacingMiddleware)
+app.add_middleware(QueryBudgetMiddleware)
 
 
 @app.get("/health")
@@ -1369,6 +1373,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         text_column="content",
         embedding_column="embedding",
         match_count=10,
+        tsvector_column="fts",
     )
     try:
         retriever = await HybridRetriever.create(settings.postgres_dsn, config=retriever_config)
@@ -1376,11 +1381,22 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         retriever = HybridRetriever(pool=None, config=retriever_config)
     app.state.retriever = retriever
 
+    # Keeps per-person vector indexes coherent across replicas (SAKHI_VECTOR_INDEX=1).
+    vector_index_listener = start_invalidation_listener()
+
     try:
         yield
     finally:
-        if getattr(app.state, "retriever", None) and app.state.retriever._pool is not None:
-            await app.state.retriever._pool.close()
+        if vector_index_listener is not None:
+            vector_index_listener.cancel()
+        # Let post-response turn bookkeeping finish before pools go away.
+        still_running = await post_response_supervisor.drain(
+            timeout=float(os.getenv("SAKHI_POST_RESPONSE_DRAIN_S", "10"))
+        )
+        if still_running:
+            LOGGER.warning("Shutdown with %s post-response pipelines still running", still_running)
+        # The retriever shares the process-wide pool with every DB helper.
+        await close_pool()
         redis_conn: Redis | None = getattr(app.state, "redis", None)
         if redis_conn is not None:
             redis_conn.close()
@@ -1468,9 +1484,11 @@ app.include_router(person_router.router)
 
 LOGGER.info("Printing registered routes (startup debug)")
 for r in app.routes:
-    LOGGER.info("route %s %s", r.methods, r.path)
+    methods = getattr(r, "methods", None)
+    path = getattr(r, "path", "")
+    LOGGER.info("route %s %s", methods, path)
     # Also print directly to stdout so Railway captures it even if logger config filters JSON logs
-    print(f"{r.methods} {r.path}")
+    print(f"{methods} {path}")
 
 
 @app.get("/beats", tags=["rhythm"])
@@ -2,6 +2,7 @@
 
 from .auth_pilot import PilotAuthAndRateLimit
 from .pacing import ReplyPacingMiddleware
+from .query_budget import QueryBudgetMiddleware
 from .telemetry import TelemetryMiddleware
 
-__all__ = ["PilotAuthAndRateLimit", "ReplyPacingMiddleware", "TelemetryMiddleware"]
+__all__ = ["PilotAuthAndRateLimit", "QueryBudgetMiddleware", "ReplyPacingMiddleware", "TelemetryMiddleware"]
@@ -0,0 +1,74 @@
+"""Flag requests that issue more DB queries than expected (N+1 fan-outs)."""
+
+from __future__ import annotations
+
+import logging
+import os
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from sakhi.apps.api.core.db import QueryTally, track_queries
+from sakhi.apps.api.core.metrics import db_query_budget_exceeded
+
+LOGGER = logging.getLogger(__name__)
+
+
+def report_query_budget(tally: QueryTally, budget: int, *, top: int = 5) -> bool:
+    """Log the most repeated fingerprints when `tally` exceeds `budget`; True if it did."""
+
+    if budget <= 0 or tally.count <= budget:
+        return False
+    db_query_budget_exceeded.labels(route=tally.label).inc()
+    repeated = ", ".join(f"{count}x {fp.id} [{fp.text[:160]}]" for fp, count in tally.top(top))
+    LOGGER.warning(
+        "[db] %s issued %s queries (budget %s, %.1fms in DB); top repeats: %s",
+        tally.label,
+        tally.count,
+        budget,
+        tally.elapsed_ms,
+        repeated,
+    )
+    return True
+
+
+class QueryBudgetMiddleware:
+    """
+    Count queries per request and warn above SAKHI_DB_QUERY_BUDGET (0 disables).
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses are
+    counted to the end: the tally is reported once the final
+    `http.response.body` has been sent (or the app fails before sending it).
+    """
+
+    def __init__(self, app: ASGIApp, budget: int | None = None) -> None:
+        self.app = app
+        self.budget = budget if budget is not None else int(os.getenv("SAKHI_DB_QUERY_BUDGET", "40"))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.budget <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        reported = False
+
+        def report(tally: QueryTally) -> None:
+            nonlocal reported
+            if reported:
+                return
+            reported = True
+            # Label by route template (set once routing ran) to keep the metric bounded.
+            route = scope.get("route")
+            tally.label = f"{scope['method']} {getattr(route, 'path', None) or scope['path']}"
+            report_query_budget(tally, self.budget)
+
+        with track_queries(scope["path"]) as tally:
+
+            async def send_and_report(message: Message) -> None:
+                await send(message)
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    report(tally)
+
+            try:
+                await self.app(scope, receive, send_and_report)
+            finally:
+                report(tally)
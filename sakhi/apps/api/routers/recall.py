@@ -5,6 +5,7 @@ from typing import Any, Dict
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
+from sakhi.apps.api.core.response_shape import FastJSONResponse
 from sakhi.apps.api.services.memory.recall import unified_recall
 
 router = APIRouter(prefix="/recall", tags=["recall"])
@@ -20,4 +21,4 @@ class RecallIn(BaseModel):
 @router.post("/search")
 async def search(body: RecallIn) -> Dict[str, Any]:
     results = await unified_recall(body.person_id, body.query, limit=body.limit)
-    return {"results": results}
+    return FastJSONResponse({"results": results})
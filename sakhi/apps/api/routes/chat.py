@@ -13,6 +13,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import httpx
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
 from sakhi.libs.llm_router import LLMRouter
 from sakhi.libs.llm_router.tool_runner import run_tool
@@ -44,6 +45,7 @@ from sakhi.libs.memory import capture_salient_memory, fetch_recent_memories
 from sakhi.libs.logging_utils import colorize
 from sakhi.libs.debug.narrative import build_narrative_debug
 from sakhi.apps.api.services.persona import select_archetype_from_context
+from sakhi.apps.api.core.reply_stream import current_reply_sink, stream_reply, wants_event_stream
 from sakhi.apps.worker.tasks.update_conversation_state import (
     update_conversation_state,
 )
@@ -272,7 +274,7 @@ async def chat(
     request: Request,
     router: LLMRouter = Depends(_get_router),
     idempotency_key: str | None = Header(default=None, alias="X-Idempotency-Key"),
-) -> ChatResponse:
+) -> ChatResponse | StreamingResponse:
     """Route chat requests through the shared LLM router."""
 
     settings = get_settings()
@@ -653,12 +655,16 @@ async def chat(
             tools.extend(tool for tool in payload.tools if isinstance(tool, dict))  # type: ignore[list-item]
 
         persona = select_archetype_from_context(person_model_context)
+        # Streaming requests forward reply deltas; the final `done` message stays authoritative.
+        sink = current_reply_sink()
+        stream_kwargs: Dict[str, Any] = {"on_token": sink} if sink else {}
         response = await router.chat(
             messages=messages,
             model=settings.model_chat,
             provider=provider,
             tools=tools,
             persona=persona,
+            **stream_kwargs,
         )
         logger.info(
             colorize("LLM chat response", "red"),
@@ -721,6 +727,7 @@ async def chat(
                 model=settings.model_chat,
                 provider=provider,
                 persona=persona,
+                **stream_kwargs,
             )
             logger.info(
                 colorize("LLM chat follow-up response", "red"),
@@ -825,30 +832,37 @@ async def chat(
 
     headers = {k: v for k, v in request.headers.items() if isinstance(v, str)}
     key = idempotency_key or extract_idempotency_key(headers)
-    if not key:
+
+    async def _respond() -> ChatResponse:
+        if not key:
+            try:
+                payload_dict = await _invoke()
+            except ValueError as exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+            return ChatResponse.model_validate(payload_dict)
+
         try:
-            payload_dict = await _invoke()
+            payload_dict = await run_idempotent(
+                headers={"idempotency-key": key},
+                handler=_invoke,
+                event_type="chat_request",
+                payload={"conversation_id": payload.conversation_id},
+            )
+            return ChatResponse.model_validate(payload_dict)
         except ValueError as exc:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-        return ChatResponse.model_validate(payload_dict)
-
-    try:
-        payload_dict = await run_idempotent(
-            headers={"idempotency-key": key},
-            handler=_invoke,
-            event_type="chat_request",
-            payload={"conversation_id": payload.conversation_id},
-        )
-        return ChatResponse.model_validate(payload_dict)
-    except ValueError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    except Exception as exc:  # pragma: no cover - optional infrastructure
-        logger.warning("Idempotent execution failed, falling back to direct call: %s", exc)
-        try:
-            payload_dict = await _invoke()
-        except ValueError as inner_exc:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(inner_exc)) from inner_exc
-        return ChatResponse.model_validate(payload_dict)
+        except Exception as exc:  # pragma: no cover - optional infrastructure
+            logger.warning("Idempotent execution failed, falling back to direct call: %s", exc)
+            try:
+                payload_dict = await _invoke()
+            except ValueError as inner_exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(inner_exc)) from inner_exc
+            return ChatResponse.model_validate(payload_dict)
+
+    # Opt-in SSE: tokens as the provider produces them, then the ChatResponse as `done`.
+    if wants_event_stream(request):
+        return stream_reply(_respond)
+    return await _respond()
 def _normalize_classification(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(payload, dict):
         return payload
@@ -9,6 +9,7 @@ from sakhi.apps.api.ingest.extractor import extract
 from sakhi.libs.embeddings import embed_normalized, to_pgvector
 from sakhi.apps.api.services.ingestion.unified_ingest import _hash_text, _normalize_text, _existing_vector
 from sakhi.apps.api.services.memory.stm_config import compute_expires_at
+from sakhi.apps.api.services.memory.vector_index import note_journal_vector
 from sakhi.apps.api.utils.person_resolver import resolve_person
 import logging
 
@@ -76,6 +77,7 @@ async def create_experience_journal(request: Request, payload: Dict[str, Any]) -
             vec_literal,
             content_hash,
         )
+        await note_journal_vector(person_id, entry_id, vec)
 
     expires_at = compute_expires_at(ts)
 
@@ -7,6 +7,7 @@ import uuid
 from fastapi import APIRouter, Query, Request
 
 from sakhi.apps.api.services.memory.recall import recall_advanced
+from sakhi.apps.api.services.memory.vector_index import forget_journal_vectors
 from sakhi.apps.api.services.memory.memory_episodic import build_episodic_from_journals_v2
 from sakhi.apps.api.services.memory.synthesis import (
     fetch_monthly_recaps,
@@ -20,6 +21,7 @@ from sakhi.apps.worker.tasks.turn_personal_model_update import run_turn_personal
 from sakhi.apps.worker.tasks.weekly_reflection import generate_weekly_reflection, _fetch_weekly_signals
 from sakhi.libs.schemas.settings import get_settings
 from sakhi.apps.api.core.db import q, exec as dbexec
+from sakhi.apps.api.core.response_shape import FastJSONResponse
 from sakhi.apps.api.utils.person_resolver import resolve_person
 
 router = APIRouter(tags=["memory"])
@@ -28,7 +30,7 @@ logger = logging.getLogger(__name__)
 
 @router.get("/memory/recall")
 async def recall_api(person_id: str = Query(...), q: str = Query(...), k: int = Query(5, ge=1, le=25)):
-    return await recall_advanced(person_id, q, k=k)
+    return FastJSONResponse(await recall_advanced(person_id, q, k=k))
 
 
 @router.post("/memory/{person_id}/synthesis")
@@ -311,6 +313,7 @@ async def reset_weekly_flow_dev(request: Request):
 
     if entry_ids:
         await dbexec("DELETE FROM journal_embeddings WHERE entry_id = ANY($1::uuid[])", entry_ids)
+        await forget_journal_vectors(target_person, entry_ids)
         await dbexec("DELETE FROM memory_episodic WHERE entry_id = ANY($1::uuid[])", entry_ids)
 
     await dbexec(
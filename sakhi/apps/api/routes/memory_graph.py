@@ -3,12 +3,17 @@ from __future__ import annotations
 from fastapi import APIRouter, Query
 
 from sakhi.apps.api.core.db import q as db_fetch
+from sakhi.apps.api.services.memory_graph import cache as graph_cache
 
 router = APIRouter(prefix="/memory-graph", tags=["Memory Graph"])
 
 
 @router.get("/overview")
 async def get_graph_overview(person_id: str = Query(...)):
+    if graph_cache.ENABLED:
+        graph = await graph_cache.get_graph_cache().get(person_id)
+        nodes = [{"id": n["id"], "node_kind": n.get("node_kind"), "label": n.get("label")} for n in graph.nodes()]
+        return {"nodes": nodes, "edges": graph.edges()}
     nodes = await db_fetch(
         "SELECT id, node_kind, label FROM memory_nodes WHERE person_id = $1",
         person_id,
@@ -4,17 +4,23 @@ import os
 import datetime
 import logging
 import asyncio
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
 
 from copy import deepcopy
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from uuid import uuid4
 
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.apps.api.core.events import publish, MEMORY_EVENT
+from sakhi.apps.api.core.personal_model_memo import current_personal_model_memo, personal_model_scope
+from sakhi.apps.api.core.query_embedding import turn_embedding_scope
+from sakhi.apps.api.core.metrics import turn_degraded
+from sakhi.apps.api.core.reply_stream import stream_reply, wants_event_stream
+from sakhi.apps.api.core.response_shape import FastJSONResponse, ResponseShape, response_shape
 from sakhi.apps.api.services.conversation.orchestrator import orchestrate_turn
 from sakhi.apps.api.services.conversation_v2.conversation_engine import generate_reply
 from sakhi.apps.api.services.memory.recall import memory_recall
@@ -28,9 +34,14 @@ from sakhi.libs.debug.narrative_unified import build_unified_narrative
 from sakhi.apps.api.services.turn.context_loader import load_memory_context
 from sakhi.apps.api.services.turn.reply_service import build_turn_reply
 from sakhi.apps.api.services.turn.async_triggers import enqueue_turn_jobs
+from sakhi.apps.api.services.turn.deadline import TurnDeadline, request_tier, resolve_turn_budget, turn_deadline
+from sakhi.apps.api.services.turn.stages import TurnStage, run_stages
+from sakhi.apps.api.services.turn.post_response import post_response_supervisor
+from sakhi.apps.api.services.surface_caches import SURFACE_CACHES, apply_hour_gates, load_surface_caches
 from sakhi.apps.api.services.conversation.topic_manager import extract_topics
 from sakhi.apps.logic.harmony.orchestrator import run_unified_turn
 from sakhi.core.soul.narrative_engine import compute_fast_narrative
+from sakhi.libs.phrase_index import register_phrases
 from sakhi.core.soul.alignment_engine import compute_alignment
 from sakhi.core.rhythm.rhythm_soul_engine import compute_fast_rhythm_soul_frame
 from sakhi.core.emotion.emotion_soul_rhythm_engine import compute_fast_esr_frame
@@ -100,6 +111,13 @@ class TurnIn(BaseModel):
     capture_only: bool = False
 
 
+async def _read_personal_model(person_id: str, columns: tuple[str, ...]) -> Dict[str, Any] | None:
+    memo = current_personal_model_memo(person_id)
+    if memo is not None:
+        return await memo.get(columns, fetch=q)
+    return await q(f"SELECT {', '.join(columns)} FROM personal_model WHERE person_id = $1", person_id, one=True)
+
+
 async def _load_internal_state(person_id: str) -> Dict[str, Any]:
     state = {
         "emotion": None,
@@ -114,11 +132,7 @@ async def _load_internal_state(person_id: str) -> Dict[str, Any]:
         "identity_graph": None,
     }
     try:
-        row = await q(
-            "SELECT long_term FROM personal_model WHERE person_id = $1",
-            person_id,
-            one=True,
-        )
+        row = await _read_personal_model(person_id, ("long_term",))
         if row and row.get("long_term"):
             long_term = row["long_term"]
             layers = long_term.get("layers") if isinstance(long_term, dict) else {}
@@ -170,11 +184,7 @@ async def _load_internal_state(person_id: str) -> Dict[str, Any]:
             state["mind"] = None
     if not state.get("soul_values"):
         try:
-            row = await q(
-                "SELECT long_term FROM personal_model WHERE person_id = $1",
-                person_id,
-                one=True,
-            )
+            row = await _read_personal_model(person_id, ("long_term",))
             if row and row.get("long_term"):
                 long_term = row["long_term"]
                 layers = long_term.get("layers") if isinstance(long_term, dict) else {}
@@ -190,6 +200,484 @@ async def _load_internal_state(person_id: str) -> Dict[str, Any]:
 
     return state
 
+
+_STAGE_TIMEOUT_S = float(os.getenv("SAKHI_TURN_STAGE_TIMEOUT_S", "8"))
+
+_MICRO_GOAL_TRIGGERS = register_phrases("turn_v2.micro_goal", [
+    "i want", "i need to", "i should", "i must", "i plan to", "i wish i could",
+    "buy", "fix", "join", "start", "learn", "upgrade", "clean", "improve", "reduce", "increase",
+])
+_RESTART_PHRASES = register_phrases(
+    "turn_v2.restart", ["restart", "where were we", "how do i restart", "let's continue", "resume"]
+)
+_FOCUS_PATTERNS = register_phrases(
+    "turn_v2.focus", ["help me focus", "where do i start", "work on", "help me begin", "focus on"]
+)
+_FLOW_PATTERNS = register_phrases(
+    "turn_v2.flow", ["short routine", "start flow", "10 minute", "focus for 10", "give me a short routine"]
+)
+
+
+def _build_turn_stages(user_id: str, text: str) -> list[TurnStage]:
+    """
+    Declare the read-side work of a full turn as independent stages.
+
+    Every stage keeps the fallback the inline code used before, so the
+    response shape is unchanged; only the scheduling differs.
+    """
+
+    text_lower = (text or "").lower()
+    today = datetime.date.today()
+
+    async def orchestration() -> Dict[str, Any]:
+        return await run_unified_turn(user_id, text)
+
+    async def triage_local(orchestration: Dict[str, Any]) -> Dict[str, Any]:
+        return (orchestration.get("triage") or {}) or extract(text, datetime.datetime.utcnow())
+
+    async def inner_dialogue(orchestration: Dict[str, Any], triage_local: Dict[str, Any]) -> Dict[str, Any]:
+        behavior_profile = orchestration.get("behavior_profile") or {}
+        return await inner_dialogue_engine.compute_inner_dialogue(
+            user_id, text, {"triage": triage_local, "behavior_profile": behavior_profile}
+        )
+
+    async def internal_state() -> Dict[str, Any]:
+        return await _load_internal_state(user_id)
+
+    async def microreg() -> Dict[str, Any]:
+        return await compute_microreg(user_id, text)
+
+    async def tone() -> Dict[str, Any]:
+        return await compute_tone(user_id)
+
+    async def nudge_state() -> Dict[str, Any]:
+        nudge_row = await _read_personal_model(user_id, ("nudge_state",)) or {}
+        return nudge_row.get("nudge_state") or {}
+
+    async def empathy() -> Dict[str, Any]:
+        return await compute_empathy(user_id, text)
+
+    async def micro_goals() -> Any:
+        if _MICRO_GOAL_TRIGGERS.search(text_lower):
+            return await micro_goals_service.create_micro_goals(user_id, text)
+        return None
+
+    async def continuity() -> Dict[str, Any]:
+        return await load_continuity(user_id)
+
+    async def surface_caches() -> Dict[str, Any]:
+        return apply_hour_gates(await load_surface_caches(user_id, today))
+
+    async def recovery(surface_caches: Dict[str, Any]) -> Dict[str, Any]:
+        # gap_hours/gap_reason survive a failed recovery lookup; moment_model needs them.
+        state: Dict[str, Any] = {
+            "gap_hours": None,
+            "gap_reason": _RESTART_PHRASES.search(text_lower),
+            "micro_recovery": {},
+        }
+        try:
+            last_turn_row = await q(
+                "SELECT created_at FROM conversation_turns WHERE user_id=$1 ORDER BY created_at DESC LIMIT 1",
+                user_id,
+                one=True,
+            )
+            if last_turn_row and last_turn_row.get("created_at"):
+                delta = datetime.datetime.utcnow() - last_turn_row["created_at"]
+                state["gap_hours"] = delta.total_seconds() / 3600.0
+            gap_hours = state["gap_hours"]
+            if state["gap_reason"] or (gap_hours is not None and gap_hours > 3) or datetime.datetime.utcnow().hour >= 14:
+                state["micro_recovery"] = surface_caches["micro_recovery"] or {}
+        except Exception:
+            state["micro_recovery"] = {}
+        return state
+
+    async def focus_path(surface_caches: Dict[str, Any]) -> Any:
+        if _FOCUS_PATTERNS.search(text_lower):
+            path = await generate_focus_path(user_id, intent_text=text)
+            await persist_focus_path(user_id, path)
+            if path:
+                return path
+        return surface_caches["focus_path"] or {}
+
+    async def mini_flow(surface_caches: Dict[str, Any]) -> Any:
+        if _FLOW_PATTERNS.search(text_lower):
+            flow = await generate_mini_flow(user_id)
+            await persist_mini_flow(user_id, flow)
+            if flow:
+                return flow
+        return surface_caches["mini_flow"] or {}
+
+    async def state_row() -> Dict[str, Any]:
+        return await _read_personal_model(user_id, ("forecast_state", "coherence_state", "alignment_state")) or {}
+
+    async def evidence_pack() -> Any:
+        return await select_evidence_anchors(user_id)
+
+    async def reflection_hint() -> Any:
+        summary_row = await q(
+            """
+            SELECT summary
+            FROM meta_reflections
+            WHERE person_id = $1
+            ORDER BY created_at DESC
+            LIMIT 1
+            """,
+            user_id,
+        )
+        if summary_row:
+            return (summary_row[0]["summary"] or "").strip()[:200]
+        return None
+
+    timeout = _STAGE_TIMEOUT_S
+    return [
+        TurnStage("orchestration", orchestration, critical=True),
+        TurnStage("triage_local", triage_local, requires=("orchestration",), critical=True),
+        TurnStage("inner_dialogue", inner_dialogue, requires=("orchestration", "triage_local"), timeout=timeout, default_factory=dict),
+        TurnStage("internal_state", internal_state, timeout=timeout, default_factory=dict),
+        TurnStage("microreg", microreg, timeout=timeout, default_factory=dict),
+        TurnStage("tone", tone, timeout=timeout, default_factory=dict),
+        TurnStage("nudge_state", nudge_state, timeout=timeout, default_factory=dict),
+        TurnStage("empathy", empathy, timeout=timeout, default_factory=dict),
+        TurnStage("micro_goals", micro_goals, timeout=timeout),
+        TurnStage("continuity", continuity, timeout=timeout, default_factory=lambda: CONTINUITY_DEFAULT),
+        TurnStage(
+            "surface_caches",
+            surface_caches,
+            timeout=timeout,
+            default_factory=lambda: dict.fromkeys(SURFACE_CACHES),
+        ),
+        TurnStage(
+            "recovery",
+            recovery,
+            requires=("surface_caches",),
+            timeout=timeout,
+            default_factory=lambda: {
+                "gap_hours": None,
+                "gap_reason": _RESTART_PHRASES.search(text_lower),
+                "micro_recovery": {},
+            },
+        ),
+        TurnStage("focus_path", focus_path, requires=("surface_caches",), timeout=timeout, default_factory=dict),
+        TurnStage("mini_flow", mini_flow, requires=("surface_caches",), timeout=timeout, default_factory=dict),
+        TurnStage("state_row", state_row, timeout=timeout, default_factory=dict),
+        TurnStage("evidence_pack", evidence_pack, timeout=timeout, default_factory=dict),
+        TurnStage("reflection_hint", reflection_hint, timeout=timeout),
+    ]
+
+
+_POST_STAGE_TIMEOUT_S = float(os.getenv("SAKHI_POST_RESPONSE_STAGE_TIMEOUT_S", "30"))
+_TURN_JOBS = [
+    "turn_memory_update",
+    "turn_planner_update",
+    "turn_rhythm_update",
+    "turn_persona_update",
+    "turn_insight_update",
+    "brain_refresh",
+]
+_DIALOG_FIELDS = ("lastObjective", "tone", "mood", "clarityHint", "suggestions", "decisions")
+
+
+@dataclass(frozen=True)
+class _PostTurn:
+    """What the post-response stages need from a finished turn."""
+
+    user_id: str
+    text: str
+    minimal_mode: bool
+    # The orchestrator's embedding of `text`; recall reuses it instead of re-embedding.
+    query_vec: List[float]
+    behavior_profile: Dict[str, Any]
+    reply_meta: Dict[str, Any]
+    reflection_hint: Any
+    response_text: str
+    session_id: Any
+    entry_id: Any
+    emotion: Any
+    topics: Any
+    stored_intents: Any
+    generated_plans: Any
+    triage: Any
+    planner_payload: Any
+    tone_state: Any
+    empathy_state: Any
+    microreg_state: Any
+    brain: Dict[str, Any]
+    emotion_update: Dict[str, Any]
+
+
+def _build_post_response_stages(
+    turn: _PostTurn,
+    *,
+    timeout: float | None = None,
+    critical_writes: bool = True,
+) -> list[TurnStage]:
+    """
+    Declare the bookkeeping that follows a reply: memory, continuity, traces,
+    the MEMORY_EVENT publish and worker enqueue.
+
+    None of it changes the reply. With `critical_writes` a failing
+    write_turn_memory aborts the run (the inline behaviour); deferred runs
+    isolate it like every other stage.
+    """
+
+    user_id, text = turn.user_id, turn.text
+    dev_debug = os.getenv("SAKHI_DEV_DEBUG") == "1"
+
+    async def memory_context() -> str:
+        if turn.minimal_mode:
+            return ""
+        try:
+            return await synthesize_memory_context(
+                person_id=user_id, user_query=text, limit=350, query_vec=turn.query_vec or None
+            )
+        except Exception:
+            return ""
+
+    async def reasoning(memory_context: str) -> Dict[str, Any]:
+        # Build 50: avoid heavy reasoning unless reflective/stress/growth
+        profile = turn.behavior_profile
+        if not (
+            profile.get("conversation_depth") == "reflective"
+            or profile.get("session_context", {}).get("reason") in {"stress", "growth"}
+        ):
+            return {}
+        try:
+            return await run_reasoning(person_id=user_id, query=text, memory_context=memory_context)
+        except Exception as exc:  # pragma: no cover - do not break turn flow
+            return {
+                "insights": [],
+                "contradictions": [],
+                "opportunities": [],
+                "open_loops": [],
+                "error": str(exc),
+            }
+
+    async def memory_recall_stage() -> Any:
+        # Patch DD — Memory recall (can be expensive: includes query embedding).
+        if turn.minimal_mode:
+            return []
+        try:
+            return await memory_recall(person_id=user_id, query=text, limit=5, query_vec=turn.query_vec or None)
+        except Exception as exc:  # pragma: no cover - best effort
+            return {"error": str(exc)}
+
+    async def persona_update() -> Any:
+        try:
+            return await update_session_persona(user_id, text)
+        except Exception as exc:  # pragma: no cover - best effort
+            return {"error": str(exc)}
+
+    async def topic_state() -> Any:
+        try:
+            return await update_conversation_topics(user_id, text)
+        except Exception as exc:  # pragma: no cover - best effort
+            return {"error": str(exc)}
+
+    async def topics_for_signals(topic_state: Any) -> Any:
+        # Backup topic extraction if state is empty for signals
+        found = topic_state.get("topics") if isinstance(topic_state, dict) else []
+        if not found:
+            try:
+                found = await extract_topics(text)
+            except Exception:
+                found = []
+        return found
+
+    async def memory_write(reasoning: Dict[str, Any]) -> Any:
+        meta = turn.reply_meta
+        dialog_state = {
+            "intent": meta.get("lastObjective"),
+            "tone": meta.get("tone"),
+            "emotion": meta.get("mood"),
+            "context": {
+                "reasoning": reasoning,
+                "clarity_hint": meta.get("clarityHint"),
+                "suggestions": meta.get("suggestions"),
+                "decisions": meta.get("decisions"),
+                "reflection_hint": turn.reflection_hint,
+            },
+            "response_preview": turn.response_text[:120],
+        }
+        return await write_turn_memory(
+            person_id=user_id,
+            dialog_state=dialog_state,
+            reasoning=reasoning,
+            entry_id=turn.session_id,
+            user_text=text,
+        )
+
+    async def continuity() -> None:
+        # Best-effort continuity update with latest emotion/tone/empathy/forecast snapshot
+        try:
+            await update_continuity(
+                user_id,
+                {
+                    "type": "text_message",
+                    "text": text,
+                    "ts": datetime.datetime.utcnow().isoformat(),
+                    "emotion": turn.emotion,
+                    "tone_state": turn.tone_state,
+                    "empathy_state": turn.empathy_state,
+                    "microreg_state": turn.microreg_state,
+                    "forecast_state": turn.brain.get("forecast_state") or {},
+                },
+                memory_short_term=[],
+                pattern_sense=turn.brain.get("pattern_sense"),
+            )
+        except Exception:
+            pass
+
+    async def human_insights() -> Any:
+        if not dev_debug:
+            return None
+        try:
+            payload = await assemble_human_debug_panel(
+                person_id=user_id,
+                input_text=text,
+                reply_text=turn.response_text,
+            )
+        except Exception as exc:  # pragma: no cover - best effort
+            payload = {"error": str(exc)}
+        return payload or None
+
+    async def narrative_trace(memory_context: str, reasoning: Dict[str, Any]) -> Any:
+        # NEW: Narrative Trace (non-technical explanation)
+        try:
+            from sakhi.libs.reasoning.narrative import build_narrative_trace
+        except Exception:  # pragma: no cover - import guards
+            return None
+        try:
+            return await build_narrative_trace(
+                person_id=user_id,
+                text=text,
+                reply=turn.response_text,
+                memory_context=memory_context,
+                reasoning=reasoning,
+                intents=turn.stored_intents,
+                emotion=turn.emotion,
+                topics=turn.topics,
+            )
+        except Exception:  # pragma: no cover - best effort
+            return None
+
+    async def unified_narrative(memory_context: str, reasoning: Dict[str, Any], persona_update: Any) -> Any:
+        if not dev_debug:
+            return None
+        try:
+            return build_unified_narrative(
+                {
+                    "person_id": user_id,
+                    "input_text": text,
+                    "reply_text": turn.response_text,
+                    "triage": turn.triage,
+                    "intents": turn.stored_intents,
+                    "emotion": turn.emotion,
+                    "topics": turn.topics,
+                    "memory_context": memory_context,
+                    "reasoning": reasoning,
+                    "personal_model": persona_update,
+                    "planner": turn.planner_payload,
+                    "layer": "conversation",
+                }
+            )
+        except Exception as exc:
+            return {"error": str(exc)}
+
+    async def memory_event() -> None:
+        try:
+            await publish(
+                MEMORY_EVENT,
+                {
+                    "person_id": user_id,
+                    "entry_id": str(turn.entry_id) if turn.entry_id else None,
+                    "text": text,
+                    "layer": "conversation",
+                    "ts": datetime.datetime.utcnow().isoformat(),
+                },
+            )
+        except Exception:
+            pass
+
+    async def unified_ingest() -> None:
+        entry_id = turn.entry_id
+        if os.getenv("SAKHI_UNIFIED_INGEST") != "1" or not entry_id or turn.minimal_mode:
+            return
+        if not await _unified_ingest_schema_ok():
+            logger.warning(
+                "[UnifiedIngest] Skipping ingest_heavy: DB schema missing memory_short_term.entry_id (set SAKHI_UNIFIED_INGEST=0 or migrate schema)",
+            )
+            return
+        try:
+            asyncio.create_task(
+                ingest_heavy(
+                    person_id=user_id,
+                    entry_id=entry_id,
+                    text=text,
+                    ts=datetime.datetime.utcnow(),
+                )
+            )
+        except Exception as exc:
+            logger.warning(
+                "[UnifiedIngest] turn_v2 ingest_heavy enqueue failed user=%s entry=%s error=%s",
+                user_id,
+                entry_id,
+                exc,
+            )
+
+    async def worker_jobs(persona_update: Any, topics_for_signals: Any) -> None:
+        turn_id = str(turn.entry_id) if turn.entry_id else str(uuid4())
+        stored_intents = turn.stored_intents
+        inferred_intent = stored_intents[0] if stored_intents else (topics_for_signals[0] if topics_for_signals else None)
+        facets_for_worker = {
+            "emotion": turn.emotion,
+            "intents": stored_intents,
+            "intent": inferred_intent,
+            "topics": topics_for_signals or turn.topics,
+            "plans": turn.generated_plans,
+            "triage": turn.triage,
+        }
+        if os.getenv("SAKHI_DISABLE_QUEUE") == "1":
+            logger.error("[turn_v2] queue disabled via SAKHI_DISABLE_QUEUE, skipping enqueue turn_id=%s", turn_id)
+            return
+        enqueue_turn_jobs(
+            turn_id,
+            user_id,
+            list(_TURN_JOBS),
+            {
+                "text": text,
+                "ts": datetime.datetime.utcnow().isoformat(),
+                "facets": facets_for_worker,
+                "thread_id": user_id,
+                "behavior_profile": turn.behavior_profile,
+                "mode": "today",
+                "emotion_update": turn.emotion_update,
+                "persona_update": persona_update,
+            },
+        )
+
+    return [
+        TurnStage("memory_context", memory_context, timeout=timeout, default_factory=str),
+        TurnStage("reasoning", reasoning, requires=("memory_context",), timeout=timeout, default_factory=dict),
+        TurnStage("memory_recall", memory_recall_stage, timeout=timeout, default_factory=list),
+        TurnStage("persona_update", persona_update, timeout=timeout),
+        TurnStage("topic_state", topic_state, timeout=timeout),
+        TurnStage("topics_for_signals", topics_for_signals, requires=("topic_state",), timeout=timeout, default_factory=list),
+        TurnStage("memory_write", memory_write, requires=("reasoning",), timeout=timeout, critical=critical_writes),
+        TurnStage("continuity", continuity, timeout=timeout),
+        TurnStage("human_insights", human_insights, timeout=timeout),
+        TurnStage("narrative_trace", narrative_trace, requires=("memory_context", "reasoning"), timeout=timeout),
+        TurnStage(
+            "unified_narrative",
+            unified_narrative,
+            requires=("memory_context", "reasoning", "persona_update"),
+            timeout=timeout,
+        ),
+        TurnStage("memory_event", memory_event, timeout=timeout),
+        TurnStage("unified_ingest", unified_ingest, timeout=timeout),
+        TurnStage("worker_jobs", worker_jobs, requires=("persona_update", "topics_for_signals"), timeout=timeout),
+    ]
+
+
 async def _turn_lightweight(body: TurnIn, user_id: str) -> Dict[str, Any]:
     context_snapshot = await load_memory_context(user_id)
     triage = extract(body.text, datetime.datetime.utcnow())
@@ -246,8 +734,129 @@ async def _turn_lightweight(body: TurnIn, user_id: str) -> Dict[str, Any]:
 
 
 @router.post("/turn")
-async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(default=None)):
-    user_id, person_label, person_key = resolve_person(request, user)
+async def turn_v2(
+    body: TurnIn,
+    request: Request,
+    background_tasks: BackgroundTasks = None,
+    user: str | None = Query(default=None),
+):
+    person = resolve_person(request, user)
+    user_id = person[0]
+
+    streaming = wants_event_stream(request)
+
+    # Bookkeeping after the reply starts once the response is flushed;
+    # ?sync=1 (debug console) keeps it inline and returns its results. A
+    # stream's handler outlives the response's background tasks (and a client
+    # that disconnects early), so streamed turns submit directly.
+    def defer(post_stages: List[TurnStage]) -> None:
+        if background_tasks is None or streaming:
+            post_response_supervisor.submit(post_stages, label="turn_v2_post")
+        else:
+            background_tasks.add_task(post_response_supervisor.start, post_stages, label="turn_v2_post")
+
+    # ?profile=lean|full|debug or ?fields=reply,tone,... trims the body; the
+    # debug section (engine snapshots) is only built when it will be sent.
+    shape = response_shape(request)
+    # Optional stages still running when the budget is spent are cancelled and
+    # the response is marked degraded instead of making the user wait.
+    budget_s = resolve_turn_budget("turn_v2", request_tier(request))
+
+    async def run() -> Dict[str, Any]:
+        with turn_deadline(TurnDeadline.after(budget_s) if budget_s else None), turn_embedding_scope():
+            # One personal_model read serves every engine in the turn; writes made
+            # during the turn invalidate the columns they touch.
+            async with personal_model_scope(user_id):
+                response = await _turn_v2(
+                    body,
+                    request,
+                    user,
+                    person=person,
+                    defer=None if _wants_sync(request) else defer,
+                    shape=shape,
+                )
+        return shape.project(response)
+
+    # Opt-in SSE: reply tokens stream as they are generated, the usual body follows as `done`.
+    if streaming:
+        return stream_reply(run)
+    return FastJSONResponse(await run())
+
+
+def _wants_sync(request: Request | None) -> bool:
+    if request is None:
+        return True
+    return (request.query_params.get("sync") or "").lower() in {"1", "true", "yes"}
+
+
+def _turn_debug(
+    result: Dict[str, Any],
+    *,
+    text: str,
+    clarity_phrase: str | None,
+    reasoning: Any,
+    topic_state: Any,
+    behavior_profile: Any,
+    activation: Any,
+    triage: Any,
+    insight_bundle: Any,
+    mem_context: Any,
+    persona_update: Any,
+    reflection_trace_payload: Any,
+) -> Dict[str, Any]:
+    """Debug panel for a turn; snapshots `result`, so only built when it is returned."""
+
+    engine_snapshot = deepcopy(result)
+
+    debug_section = {
+        "input_text": text,
+        "raw_engine_output": engine_snapshot,
+        "reasoning": reasoning,
+        "topics": topic_state,
+        "behavior_profile": behavior_profile,
+        "activation": activation,
+        "triage": triage,
+        "insights": insight_bundle,
+        "flags": {
+            "clarity_hint_applied": bool(clarity_phrase),
+            "has_intents": bool(result.get("intents")),
+            "has_memory_updates": bool(result.get("memoryUpdate")),
+        },
+    }
+
+    if isinstance(result.get("debug"), dict):
+        existing = result["debug"]
+        existing.update(debug_section)
+        result["debug"] = existing
+    else:
+        result["debug"] = debug_section
+
+    return {
+        "reasoning": reasoning,
+        "engine_raw": engine_snapshot,
+        "loop_trace": debug_section,
+        "memory_context": mem_context,
+        "persona": persona_update,
+        "topics": topic_state,
+        "behavior_profile": behavior_profile,
+        "insights": insight_bundle,
+        "activation": activation,
+        "triage": triage,
+        "reflection_trace": reflection_trace_payload,
+    }
+
+
+async def _turn_v2(
+    body: TurnIn,
+    request: Request,
+    user: str | None,
+    *,
+    person: Tuple[str, str, str],
+    defer: Callable[[List[TurnStage]], None] | None = None,
+    shape: ResponseShape | None = None,
+) -> Dict[str, Any]:
+    shape = shape or ResponseShape()
+    user_id, person_label, person_key = person
     logger.error("[turn_v2] entry start user=%s person_id=%s label=%s", user, user_id, person_label)
     logger.info("ACTIVE_DEV_PERSON", extra={"person_id": user_id, "person_label": person_label, "person_key": person_key})
 
@@ -336,20 +945,21 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
     except Exception:
         behavior_profile = {}
 
-    orchestration = await run_unified_turn(user_id, body.text)
+    stages = await run_stages(_build_turn_stages(user_id, body.text), label="turn_v2")
+    orchestration = stages["orchestration"]
     behavior_profile = orchestration.get("behavior_profile") or {}
     planner_payload = orchestration.get("planner")
     insight_bundle = orchestration.get("insight")
     activation = orchestration.get("activation") or {}
     triage = orchestration.get("triage") or {}
-    triage_local = triage or extract(body.text, datetime.datetime.utcnow())
+    triage_local = stages["triage_local"]
     mood_affect = (triage_local.get("slots") or {}).get("mood_affect") if isinstance(triage_local, dict) else {}
     emotion_update = {
         "summary": (mood_affect or {}).get("label"),
         "confidence": float((mood_affect or {}).get("score") or 0.5),
     }
 
-    internal_state = await _load_internal_state(user_id)
+    internal_state = stages["internal_state"]
 
     fast_narrative = compute_fast_narrative([], (orchestration.get("brain") or {}).get("soul_state") or {})
     alignment = compute_alignment(
@@ -380,284 +990,66 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
         (orchestration.get("brain") or {}).get("rhythm_state") or {},
         (orchestration.get("brain") or {}).get("identity_momentum_state") or {},
     )
-    try:
-        inner_dialogue = await inner_dialogue_engine.compute_inner_dialogue(
-            user_id, body.text, {"triage": triage_local, "behavior_profile": behavior_profile}
-        )
-    except Exception:
-        inner_dialogue = {}
-    try:
-        microreg_state = await compute_microreg(user_id, body.text)
-    except Exception:
-        microreg_state = {}
-    try:
-        tone_state = await compute_tone(user_id)
-    except Exception:
-        tone_state = {}
-    try:
-        nudge_row = await q("SELECT nudge_state FROM personal_model WHERE person_id = $1", user_id, one=True) or {}
-        nudge_state = nudge_row.get("nudge_state") or {}
-    except Exception:
-        nudge_state = {}
-    try:
-        empathy_state = await compute_empathy(user_id, body.text)
-    except Exception:
-        empathy_state = {}
-
-    micro_goals_meta = None
-    text_lower = (body.text or "").lower()
-    trigger_phrases = [
-        "i want", "i need to", "i should", "i must", "i plan to", "i wish i could",
-        "buy", "fix", "join", "start", "learn", "upgrade", "clean", "improve", "reduce", "increase",
-    ]
-    if any(p in text_lower for p in trigger_phrases):
-        try:
-            micro_goals_meta = await micro_goals_service.create_micro_goals(user_id, body.text)
-        except Exception:
-            micro_goals_meta = None
-
-    try:
-        continuity_state = await load_continuity(user_id)
-    except Exception:
-        continuity_state = CONTINUITY_DEFAULT
-    try:
-        today = datetime.date.today()
-        reflection_rows = await q(
-            """
-            SELECT summary, reflection_date, generated_at
-            FROM daily_reflection_cache
-            WHERE person_id = $1 AND reflection_date = $2
-            """,
-            user_id,
-            today,
-        )
-        daily_reflection = reflection_rows[0] if reflection_rows else None
-    except Exception:
-        daily_reflection = None
+    inner_dialogue = stages["inner_dialogue"]
+    microreg_state = stages["microreg"]
+    tone_state = stages["tone"]
+    nudge_state = stages["nudge_state"]
+    empathy_state = stages["empathy"]
+    micro_goals_meta = stages["micro_goals"]
+    continuity_state = stages["continuity"]
+
+    surface = stages["surface_caches"]
+    daily_reflection = surface["daily_reflection"]
     daily_reflection_guard = (
         "Use this reflection only as surface context. "
         "Do not infer emotions, causes, diagnoses, or psychological interpretations."
     )
-    evening_closure = None
+    evening_closure = surface["evening_closure"]
     closure_guard = (
         "Evening closure is surface-level only. "
         "Do not infer emotions, causes, diagnoses, or psychological interpretations."
     )
-    try:
-        if datetime.datetime.utcnow().hour >= 20:
-            closure_rows = await q(
-                """
-                SELECT completed, pending, signals, summary, closure_date, generated_at
-                FROM daily_closure_cache
-                WHERE person_id = $1 AND closure_date = $2
-                """,
-                user_id,
-                today,
-            )
-            evening_closure = closure_rows[0] if closure_rows else None
-    except Exception:
-        evening_closure = None
-    morning_preview = {}
+    morning_preview = surface["morning_preview"] or {}
     morning_preview_guard = (
         "Use morning preview only as surface-level context. "
         "Do not infer mood, meaning, or causes."
     )
-    morning_ask = {}
+    morning_ask = surface["morning_ask"] or {}
     morning_ask_guard = (
         "Use morning ask only as surface-level context. "
         "Do not infer mood, meaning, or causes."
     )
-    morning_momentum = {}
+    morning_momentum = surface["morning_momentum"] or {}
     morning_momentum_guard = (
         "Use morning momentum only as surface-level context. "
         "Do not infer mood, meaning, or causes."
     )
-    micro_momentum = {}
+    micro_momentum = surface["micro_momentum"] or {}
     micro_momentum_guard = (
         "Use micro momentum only as small optional suggestions. "
         "Do not infer mood, meaning, or causes."
     )
-    micro_recovery = {}
+    recovery = stages["recovery"]
+    gap_hours = recovery["gap_hours"]
+    gap_reason = recovery["gap_reason"]
+    micro_recovery = recovery["micro_recovery"]
     micro_recovery_guard = (
         "Micro-recovery is optional and surface-level. "
         "No emotion inference or meaning attribution."
     )
-    mini_flow = {}
+    mini_flow = stages["mini_flow"]
     mini_flow_guard = (
         "Mini-flow is a 10–20 minute routine. Use only as surface context; do not infer emotions or causes."
     )
-    micro_journey = {}
-    micro_journey_guard = (
-        "Micro-journey is deterministic and read-only. Do not infer emotions, causes, or modify the flows."
-    )
-    micro_journey = {}
+    micro_journey = surface["micro_journey"] or {}
     micro_journey_guard = (
         "Micro-journey is deterministic and read-only. Do not infer emotions, causes, or modify the flows."
     )
-    focus_path = {}
+    focus_path = stages["focus_path"]
     focus_path_guard = (
         "Focus path is a simple 3-step plan. Use only as surface context; do not infer emotions or causes."
     )
-    try:
-        if datetime.datetime.utcnow().hour <= 11:
-            preview_rows = await q(
-                """
-                SELECT focus_areas, key_tasks, reminders, rhythm_hint, summary, preview_date, generated_at
-                FROM morning_preview_cache
-                WHERE person_id = $1 AND preview_date = $2
-                """,
-                user_id,
-                today,
-            )
-            morning_preview = preview_rows[0] if preview_rows else {}
-            ask_rows = await q(
-                """
-                SELECT question, reason, ask_date, generated_at
-                FROM morning_ask_cache
-                WHERE person_id = $1 AND ask_date = $2
-                """,
-                user_id,
-                today,
-            )
-            morning_ask = ask_rows[0] if ask_rows else {}
-            momentum_rows = await q(
-                """
-                SELECT momentum_hint, suggested_start, reason, momentum_date, generated_at
-                FROM morning_momentum_cache
-                WHERE person_id = $1 AND momentum_date = $2
-                """,
-                user_id,
-                today,
-            )
-            morning_momentum = momentum_rows[0] if momentum_rows else {}
-    except Exception:
-        morning_preview = {}
-        morning_ask = {}
-        morning_momentum = {}
-    try:
-        if datetime.datetime.utcnow().hour <= 15:
-            micro_rows = await q(
-                """
-                SELECT nudge, reason, nudge_date, generated_at
-                FROM micro_momentum_cache
-                WHERE person_id = $1 AND nudge_date = $2
-                """,
-                user_id,
-                today,
-            )
-        micro_momentum = micro_rows[0] if micro_rows else {}
-    except Exception:
-        micro_momentum = {}
-    gap_hours = None
-    try:
-        text_lower = (body.text or "").lower()
-        restart_phrases = ["restart", "where were we", "how do i restart", "let's continue", "resume"]
-        gap_reason = any(p in text_lower for p in restart_phrases)
-        last_turn_row = await q(
-            "SELECT created_at FROM conversation_turns WHERE user_id=$1 ORDER BY created_at DESC LIMIT 1",
-            user_id,
-            one=True,
-        )
-        if last_turn_row and last_turn_row.get("created_at"):
-            delta = datetime.datetime.utcnow() - last_turn_row["created_at"]
-            gap_hours = delta.total_seconds() / 3600.0
-        if gap_reason or (gap_hours is not None and gap_hours > 3) or datetime.datetime.utcnow().hour >= 14:
-            recovery_rows = await q(
-                """
-                SELECT nudge, reason, recovery_date, generated_at
-                FROM micro_recovery_cache
-                WHERE person_id = $1 AND recovery_date = $2
-                """,
-                user_id,
-                today,
-            )
-            micro_recovery = recovery_rows[0] if recovery_rows else {}
-    except Exception:
-        micro_recovery = {}
-    try:
-        text_lower = (body.text or "").lower()
-        focus_patterns = ["help me focus", "where do i start", "work on", "help me begin", "focus on"]
-        trigger_focus = any(p in text_lower for p in focus_patterns)
-        if trigger_focus:
-            path = await generate_focus_path(user_id, intent_text=body.text)
-            await persist_focus_path(user_id, path)
-            focus_path = path
-        if not focus_path:
-            path_rows = await q(
-                """
-                SELECT anchor_step, progress_step, closure_step, intent_source, path_date, generated_at
-                FROM focus_path_cache
-                WHERE person_id = $1 AND path_date = $2
-                """,
-                user_id,
-                today,
-            )
-            focus_path = path_rows[0] if path_rows else {}
-    except Exception:
-        focus_path = {}
-    try:
-        flow_patterns = ["short routine", "start flow", "10 minute", "focus for 10", "give me a short routine"]
-        flow_trigger = any(p in (body.text or "").lower() for p in flow_patterns)
-        if flow_trigger:
-            flow = await generate_mini_flow(user_id)
-            await persist_mini_flow(user_id, flow)
-            mini_flow = flow
-        if not mini_flow:
-            flow_rows = await q(
-                """
-                SELECT warmup_step, focus_block_step, closure_step, optional_reward, source, flow_date, generated_at, rhythm_slot
-                FROM mini_flow_cache
-                WHERE person_id = $1 AND flow_date = $2
-                """,
-                user_id,
-                today,
-            )
-            mini_flow = flow_rows[0] if flow_rows else {}
-    except Exception:
-        mini_flow = {}
-    try:
-        journey_rows = await q(
-            """
-            SELECT flow_count, rhythm_slot, journey, generated_at
-            FROM micro_journey_cache
-            WHERE person_id = $1
-            """,
-            user_id,
-        )
-        micro_journey = journey_rows[0] if journey_rows else {}
-    except Exception:
-        micro_journey = {}
-    try:
-        if isinstance(micro_journey, dict) and micro_journey.get("journey"):
-            structure = micro_journey.get("journey", {}).get("structure") or {}
-            micro_journey["total_estimated_minutes"] = structure.get("total_estimated_minutes")
-            micro_journey["pacing"] = structure.get("pacing") or {}
-    except Exception:
-        pass
-    try:
-        journey_rows = await q(
-            """
-            SELECT flow_count, rhythm_slot, journey, generated_at
-            FROM micro_journey_cache
-            WHERE person_id = $1
-            """,
-            user_id,
-        )
-        micro_journey = journey_rows[0] if journey_rows else {}
-    except Exception:
-        micro_journey = {}
-    try:
-        state_row = await q(
-            """
-            SELECT forecast_state, coherence_state, alignment_state
-            FROM personal_model
-            WHERE person_id = $1
-            """,
-            user_id,
-            one=True,
-        ) or {}
-    except Exception:
-        state_row = {}
+    state_row = stages["state_row"]
 
     try:
         moment_model = compute_moment_model(
@@ -668,7 +1060,7 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
             forecast_state=state_row.get("forecast_state") or {},
             continuity_state=continuity_state or {},
             gap_hours=gap_hours,
-            restart=gap_reason if "gap_reason" in locals() else False,
+            restart=gap_reason,
             active_scaffolds={
                 "focus_path": bool(focus_path),
                 "mini_flow": bool(mini_flow),
@@ -677,10 +1069,7 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
         )
     except Exception:
         moment_model = {}
-    try:
-        evidence_pack = await select_evidence_anchors(user_id)
-    except Exception:
-        evidence_pack = {}
+    evidence_pack = stages["evidence_pack"]
     try:
         deliberation_scaffold = compute_deliberation_scaffold(
             moment_model=moment_model,
@@ -829,311 +1218,90 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
     }
 
     session_id = result.get("sessionId") or result.get("session_id")
-    reflection_hint = None
-    try:
-        summary_row = await q(
-            """
-            SELECT summary
-            FROM meta_reflections
-            WHERE person_id = $1
-            ORDER BY created_at DESC
-            LIMIT 1
-            """,
-            user_id,
-        )
-        if summary_row:
-            reflection_hint = (summary_row[0]["summary"] or "").strip()[:200]
-    except Exception:
-        reflection_hint = None
-
-    if minimal_mode:
-        mem_context = ""
-    else:
-        try:
-            mem_context = await synthesize_memory_context(
-                person_id=user_id,
-                user_query=body.text,
-                limit=350,
-            )
-        except Exception:
-            mem_context = ""
-
-    # Patch AA — unified reasoning engine
-    reasoning = {}
-    # Build 50: avoid heavy reasoning unless reflective/stress/growth
-    if behavior_profile.get("conversation_depth") == "reflective" or behavior_profile.get("session_context", {}).get("reason") in {"stress", "growth"}:
-        try:
-            reasoning = await run_reasoning(person_id=user_id, query=body.text, memory_context=mem_context)
-        except Exception as exc:  # pragma: no cover - do not break turn flow
-            reasoning = {
-                "insights": [],
-                "contradictions": [],
-                "opportunities": [],
-                "open_loops": [],
-                "error": str(exc),
-            }
+    reflection_hint = stages["reflection_hint"]
+    response_text = (result.get("reply") or "").strip()
 
-    # Patch DD — Memory recall (can be expensive: includes query embedding).
-    if minimal_mode:
-        recall = []
+    post_stages = _build_post_response_stages(
+        _PostTurn(
+            user_id=user_id,
+            text=body.text,
+            minimal_mode=minimal_mode,
+            query_vec=list(embedding),
+            behavior_profile=behavior_profile,
+            reply_meta={key: result.get(key) for key in _DIALOG_FIELDS},
+            reflection_hint=reflection_hint,
+            response_text=response_text,
+            session_id=session_id,
+            entry_id=entry_id,
+            emotion=emotion,
+            topics=topics,
+            stored_intents=stored_intents,
+            generated_plans=generated_plans,
+            triage=turn_context.get("triage"),
+            planner_payload=planner_payload,
+            tone_state=tone_state,
+            empathy_state=empathy_state,
+            microreg_state=microreg_state,
+            brain=orchestration.get("brain") or {},
+            emotion_update=emotion_update,
+        ),
+        timeout=None if defer is None else _POST_STAGE_TIMEOUT_S,
+        critical_writes=defer is None,
+    )
+    degraded = stages.degraded() + list(orchestration.get("degraded") or [])
+    if defer is None:
+        # Bookkeeping is not reply work; like the deferred path it runs outside the turn budget.
+        with turn_deadline(None):
+            post_report = await run_stages(post_stages, label="turn_v2_post")
+        post: Dict[str, Any] = {name: outcome.value for name, outcome in post_report.outcomes.items()}
+        degraded += post_report.degraded()
     else:
-        try:
-            recall = await memory_recall(person_id=user_id, query=body.text, limit=5)
-        except Exception as exc:  # pragma: no cover - best effort
-            recall = {"error": str(exc)}
-
-    # Planner work is deferred to workers; keep payload None to avoid inline heavy calls.
-
-    try:
-        persona_update = await update_session_persona(user_id, body.text)
-    except Exception as exc:  # pragma: no cover - best effort
-        persona_update = {"error": str(exc)}
-
-    try:
-        topic_state = await update_conversation_topics(user_id, body.text)
-    except Exception as exc:  # pragma: no cover - best effort
-        topic_state = {"error": str(exc)}
-
-    # Backup topic extraction if state is empty for signals
-    topics_for_signals = topic_state.get("topics") if isinstance(topic_state, dict) else []
-    if not topics_for_signals:
-        try:
-            topics_for_signals = await extract_topics(body.text)
-        except Exception:
-            topics_for_signals = []
+        # Bookkeeping runs after the response is flushed; its debug-only results are not returned.
+        defer(post_stages)
+        post = dict.fromkeys(stage.name for stage in post_stages)
+
+    mem_context = post["memory_context"]
+    reasoning = post["reasoning"]
+    recall = post["memory_recall"]
+    persona_update = post["persona_update"]
+    topic_state = post["topic_state"]
+    memory_write = post["memory_write"]
+    human_insights = post["human_insights"]
+    narrative_trace = post["narrative_trace"]
+    unified_narrative = post["unified_narrative"]
 
     result["topics"] = topic_state
 
     # Inline insight generation removed (Build 50); worker handles insight creation.
     insight_bundle = None
 
-    response_text = (result.get("reply") or "").strip()
-    dialog_state = {
-        "intent": result.get("lastObjective"),
-        "tone": result.get("tone"),
-        "emotion": result.get("mood"),
-        "context": {
-            "reasoning": reasoning,
-            "clarity_hint": result.get("clarityHint"),
-            "suggestions": result.get("suggestions"),
-            "decisions": result.get("decisions"),
-            "reflection_hint": reflection_hint,
-        },
-        "response_preview": response_text[:120],
-    }
-
-    memory_write = await write_turn_memory(
-        person_id=user_id,
-        dialog_state=dialog_state,
-        reasoning=reasoning,
-        entry_id=session_id,
-        user_text=body.text,
-    )
-
-    # Best-effort continuity update with latest emotion/tone/empathy/forecast snapshot
-    try:
-        await update_continuity(
-            user_id,
-            {
-                "type": "text_message",
-                "text": body.text,
-                "ts": datetime.datetime.utcnow().isoformat(),
-                "emotion": emotion,
-                "tone_state": tone_state,
-                "empathy_state": empathy_state,
-                "microreg_state": microreg_state,
-                "forecast_state": (orchestration.get("brain") or {}).get("forecast_state") or {},
-            },
-            memory_short_term=[],
-            pattern_sense=(orchestration.get("brain") or {}).get("pattern_sense"),
-        )
-    except Exception:
-        pass
-
     # ----------------------------------------------------------------------
     # Patch BB — Expose reasoning in the debug panel
     # ----------------------------------------------------------------------
-    engine_snapshot = deepcopy(result)
-
-    debug_section = {
-        "input_text": body.text,
-        "raw_engine_output": engine_snapshot,
-        "reasoning": reasoning,
-        "topics": topic_state,
-        "behavior_profile": behavior_profile,
-        "activation": activation,
-        "triage": triage,
-        "insights": insight_bundle,
-        "flags": {
-            "clarity_hint_applied": bool(body.clarity_phrase),
-            "has_intents": bool(result.get("intents")),
-            "has_memory_updates": bool(result.get("memoryUpdate")),
-        },
-    }
-
-    if isinstance(result.get("debug"), dict):
-        existing = result["debug"]
-        existing.update(debug_section)
-        result["debug"] = existing
-    else:
-        result["debug"] = debug_section
-
-    api_debug = {
-        "reasoning": reasoning,
-        "engine_raw": engine_snapshot,
-        "loop_trace": debug_section,
-        "memory_context": mem_context,
-        "persona": persona_update,
-        "topics": topic_state,
-        "behavior_profile": behavior_profile,
-        "insights": insight_bundle,
-        "activation": activation,
-        "triage": triage,
-        "reflection_trace": reflection_trace_payload,
-    }
-
-    human_insights = None
-    if os.getenv("SAKHI_DEV_DEBUG") == "1":
-        try:
-            payload = await assemble_human_debug_panel(
-                person_id=user_id,
-                input_text=body.text,
-                reply_text=response_text,
-            )
-        except Exception as exc:  # pragma: no cover - best effort
-            payload = {"error": str(exc)}
-        human_insights = payload or None
-
-    # ----------------------------------------------------------------------
-    # NEW: Narrative Trace (non-technical explanation)
-    # ----------------------------------------------------------------------
-    try:
-        from sakhi.libs.reasoning.narrative import build_narrative_trace
-    except Exception:  # pragma: no cover - import guards
-        build_narrative_trace = None
-
-    narrative_trace = None
-    unified_narrative = None
-    if build_narrative_trace:
-        try:
-            narrative_trace = await build_narrative_trace(
-                person_id=user_id,
-                text=body.text,
-                reply=response_text,
-                memory_context=mem_context,
-                reasoning=reasoning,
-                intents=stored_intents,
-                emotion=emotion,
-                topics=topics,
-            )
-        except Exception:  # pragma: no cover - best effort
-            narrative_trace = None
-
-    if os.getenv("SAKHI_DEV_DEBUG") == "1":
-        try:
-            unified_narrative = build_unified_narrative(
-                {
-                    "person_id": user_id,
-                    "input_text": body.text,
-                    "reply_text": response_text,
-                    "triage": turn_context.get("triage"),
-                    "intents": stored_intents,
-                    "emotion": emotion,
-                    "topics": topics,
-                    "memory_context": mem_context,
-                    "reasoning": reasoning,
-                    "personal_model": persona_update,
-                    "planner": planner_payload,
-                    "layer": "conversation",
-                }
-            )
-        except Exception as exc:
-            unified_narrative = {"error": str(exc)}
-
-    try:
-        await publish(
-            MEMORY_EVENT,
-            {
-                "person_id": user_id,
-                "entry_id": str(entry_id) if entry_id else None,
-                "text": body.text,
-                "layer": "conversation",
-                "ts": datetime.datetime.utcnow().isoformat(),
-            },
-        )
-    except Exception:
-        pass
-
-    if os.getenv("SAKHI_UNIFIED_INGEST") == "1" and entry_id and not minimal_mode:
-        if not await _unified_ingest_schema_ok():
-            logger.warning(
-                "[UnifiedIngest] Skipping ingest_heavy: DB schema missing memory_short_term.entry_id (set SAKHI_UNIFIED_INGEST=0 or migrate schema)",
-            )
-        else:
-            try:
-                asyncio.create_task(
-                    ingest_heavy(
-                        person_id=user_id,
-                        entry_id=entry_id,
-                        text=body.text,
-                        ts=datetime.datetime.utcnow(),
-                    )
-                )
-            except Exception as exc:
-                logger.warning(
-                    "[UnifiedIngest] turn_v2 ingest_heavy enqueue failed user=%s entry=%s error=%s",
-                    user_id,
-                    entry_id,
-                    exc,
-                )
-
-    turn_id = str(entry_id) if entry_id else str(uuid4())
-    queued_jobs = [
-        "turn_memory_update",
-        "turn_planner_update",
-        "turn_rhythm_update",
-        "turn_persona_update",
-        "turn_insight_update",
-        "brain_refresh",
-    ]
-    inferred_intent = stored_intents[0] if stored_intents else (topics_for_signals[0] if topics_for_signals else None)
-    facets_for_worker = {
-        "emotion": emotion,
-        "intents": stored_intents,
-        "intent": inferred_intent,
-        "topics": topics_for_signals or topics,
-        "plans": generated_plans,
-        "triage": turn_context.get("triage"),
-    }
-    disable_queue = os.getenv("SAKHI_DISABLE_QUEUE") == "1"
-    if disable_queue:
-        logger.error("[turn_v2] queue disabled via SAKHI_DISABLE_QUEUE, skipping enqueue turn_id=%s", turn_id)
-    else:
-        enqueue_turn_jobs(
-            turn_id,
-            user_id,
-            queued_jobs,
-            {
-                "text": body.text,
-                "ts": datetime.datetime.utcnow().isoformat(),
-                "facets": facets_for_worker,
-                "thread_id": user_id,
-                "behavior_profile": behavior_profile,
-                "mode": "today",
-                "emotion_update": emotion_update,
-                "persona_update": persona_update,
-            },
-        )
+    api_debug = _turn_debug(
+        result,
+        text=body.text,
+        clarity_phrase=body.clarity_phrase,
+        reasoning=reasoning,
+        topic_state=topic_state,
+        behavior_profile=behavior_profile,
+        activation=activation,
+        triage=triage,
+        insight_bundle=insight_bundle,
+        mem_context=mem_context,
+        persona_update=persona_update,
+        reflection_trace_payload=reflection_trace_payload,
+    ) if shape.wants_debug else None
 
     logger.error(
         "[turn_v2] response snapshot entry_id=%s session_id=%s minimal_mode=%s queued_jobs=%s",
         entry_id,
         session_id,
         minimal_mode,
-        queued_jobs,
+        _TURN_JOBS,
     )
 
-    return {
+    response = {
         **result,
         "unified_fast": fast_ingest,
         "entry_id": entry_id,
@@ -1160,3 +1328,10 @@ async def turn_v2(body: TurnIn, request: Request, user: str | None = Query(defau
         "journaling_ai": journaling_ai,
         "insight_bundle": insight_bundle,
     }
+    if defer is not None:
+        response["post_response"] = {"mode": "deferred", "stages": sorted(post)}
+    if degraded:
+        turn_degraded.labels(route="turn_v2").inc()
+        response["degraded"] = True
+        response["degraded_stages"] = sorted(set(degraded))
+    return response
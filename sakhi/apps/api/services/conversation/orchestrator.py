@@ -87,9 +87,9 @@ async def orchestrate_turn(
         # emotion, intents, short-term merges) should be handled by workers/schedulers.
         if entry_id:
             try:
-                asyncio.create_task(generate_journal_embedding(entry_id, text))
+                asyncio.create_task(generate_journal_embedding(entry_id, text, person_id=person_id))
             except RuntimeError:
-                await generate_journal_embedding(entry_id, text)
+                await generate_journal_embedding(entry_id, text, person_id=person_id)
         LOGGER.info(
             "[Turn Orchestrator] entry=%s minimal_write=1 (capture_only=%s)",
             entry_id,
@@ -103,7 +103,7 @@ async def orchestrate_turn(
 
     embedding: List[float] = []
     if entry_id:
-        embedding = await generate_journal_embedding(entry_id, text) or []
+        embedding = await generate_journal_embedding(entry_id, text, person_id=person_id) or []
     result["embedding"] = embedding
 
     topics = await extract_topics_for_entry(entry_id, text)
@@ -5,6 +5,7 @@ from typing import Any, Dict
 
 from sakhi.apps.api.core.db import exec as dbexec
 from sakhi.apps.api.core.llm import call_llm
+from sakhi.apps.api.core.reply_stream import current_reply_sink
 from sakhi.apps.api.services.memory.recall import build_recall_context
 from sakhi.apps.api.services.patterns.detector import build_patterns_context
 from sakhi.apps.api.services.journaling.ai import generate_journaling_guidance
@@ -76,10 +77,12 @@ async def generate_reply(person_id: str, user_text: str, metadata: Dict[str, Any
     ]
 
     model_name = os.getenv("MODEL_CONVERSATION", "gpt-4o-mini")
+    sink = current_reply_sink()
     response = await call_llm(
         messages=messages,
         person_id=person_id,
         model=model_name,
+        **({"on_token": sink} if sink else {}),
     )
     reply = response if isinstance(response, str) else (response.get("text") or "")
     reply = reply.strip()
@@ -13,36 +13,12 @@ from sakhi.libs.embeddings import parse_pgvector
 LOGGER = logging.getLogger(__name__)
 
 
-def _coerce_vector(raw: Any) -> List[float]:
-    """Return a float vector (1536-d) from common storage formats."""
-
-    if raw is None:
-        return []
-    if isinstance(raw, list):
-        try:
-            vec = [float(x) for x in raw]
-        except (TypeError, ValueError):
-            return []
-        return vec
-
-    if isinstance(raw, (bytes, bytearray, memoryview)):
-        raw = raw.tobytes().decode("utf-8", errors="ignore")
+def _coerce_vector(raw: Any) -> np.ndarray:
+    """Return a float32 vector from a decoded column or a `[..]`/`{..}` literal."""
 
     if isinstance(raw, str):
-        parsed = parse_pgvector(raw)
-        if parsed:
-            return parsed
-        stripped = raw.strip().lstrip("[{").rstrip("}]")
-        try:
-            parts = [float(part) for part in stripped.split(",") if part.strip()]
-        except ValueError:
-            return []
-        return parts
-
-    parsed = parse_pgvector(raw)
-    if parsed:
-        return parsed
-    return []
+        raw = raw.strip().lstrip("[{").rstrip("}]")
+    return parse_pgvector(raw)
 
 
 async def consolidate_embeddings_for_user(person_id: str) -> None:
@@ -89,7 +65,7 @@ async def consolidate_embeddings_for_user(person_id: str) -> None:
             raw_value = row.get("embedding_vec") or row.get("embed_vec") or row.get("embedding")
             vec = _coerce_vector(raw_value)
             if len(vec) == 1536:
-                vectors.append(np.array(vec, dtype=float))
+                vectors.append(vec)
 
         if not vectors:
             LOGGER.warning("[Embed Consolidation] No vectors available for %s", person_id)
@@ -31,10 +31,11 @@ SOUL_KEYWORDS = (
 )
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.apps.api.services.memory.personal_model import update_personal_model
-from sakhi.libs.embeddings import embed_normalized
+from sakhi.libs.embeddings import embed_normalized, parse_pgvector
 from sakhi.apps.api.core.person_utils import resolve_person_id
 from sakhi.apps.api.services.memory.stm_config import compute_expires_at
 from sakhi.apps.api.services.memory.memory_short_term import cleanup_expired_short_term
+from sakhi.apps.api.services.memory.vector_index import note_journal_vector
 from datetime import datetime, timezone
 
 # simple in-process latching to avoid duplicate ingestion on same entry_id
@@ -68,8 +69,9 @@ async def _existing_vector(person_id: str, content_hash: str) -> Optional[List[f
         "SELECT vector_vec AS vec FROM memory_episodic WHERE content_hash = $1 AND user_id = $2 LIMIT 1",
     ):
         row = await q(sql, content_hash, person_id, one=True)
-        if row and row.get("vec"):
-            return row["vec"]
+        vec = parse_pgvector(row.get("vec")) if row else None
+        if vec is not None and vec.size:
+            return vec.tolist()
     return None
 
 
@@ -108,6 +110,7 @@ async def ingest_fast(
                 vec,
                 content_hash,
             )
+            await note_journal_vector(person_id, entry_id, vec)
         except Exception:
             pass
 
@@ -204,6 +207,7 @@ async def ingest_heavy(
                 vec,
                 content_hash,
             )
+            await note_journal_vector(person_id, entry_id, vec)
         except Exception:
             pass
 
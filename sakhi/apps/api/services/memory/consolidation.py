@@ -1,143 +1,290 @@
 from __future__ import annotations
 
+import datetime as dt
 import logging
-from typing import Any, Dict, List
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-from sakhi.apps.api.core.db import q
+from sakhi.apps.api.core.db import get_pool, q
+from sakhi.apps.api.core.recall_scoring import stack_vectors
+from sakhi.apps.api.services.memory_graph.cache import invalidate_graph
+from sakhi.apps.api.services.memory_graph.graph import upsert_edges
+from sakhi.libs.embeddings import parse_pgvector
 
 LOGGER = logging.getLogger(__name__)
 
 SIM_THRESHOLD = 0.87
 MERGE_THRESHOLD = 0.93
-MAX_BATCH = 200
+# New nodes examined per run; the checkpoint picks up the rest next time.
+MAX_BATCH = int(os.getenv("SAKHI_CONSOLIDATION_BATCH", "500"))
+# A new node without a vector yet holds the checkpoint back this long, so it is
+# compared once its embedding lands instead of being skipped for good.
+EMBED_GRACE = dt.timedelta(seconds=float(os.getenv("SAKHI_CONSOLIDATION_EMBED_GRACE_S", "3600")))
+# New-node rows per similarity block (block x all-nodes float32 scores).
+_BLOCK = 256
 
+Cursor = Tuple[Optional[dt.datetime], Optional[str]]
 
-def _sim(a: List[float], b: List[float]) -> float:
-    if not a or not b:
-        return 0.0
-    va = np.array(a, dtype=float)
-    vb = np.array(b, dtype=float)
-    denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
-    if denom == 0:
-        return 0.0
-    return float(np.dot(va, vb) / denom)
 
+def _parse_vec(raw: Any) -> np.ndarray:
+    return parse_pgvector(raw)
 
-def _parse_vec(raw: Any) -> List[float]:
-    if not raw:
-        return []
-    if isinstance(raw, list):
-        return [float(x) for x in raw]
-    if isinstance(raw, str) and raw.startswith("["):
-        body = raw[1:-1].strip()
-        if not body:
-            return []
-        try:
-            return [float(val) for val in body.split(",")]
-        except Exception:
-            return []
-    return []
-
-
-async def fetch_memory_nodes(person_id: str) -> List[Dict[str, Any]]:
+
+async def load_checkpoint(person_id: str) -> Cursor:
+    row = await q(
+        "SELECT last_created_at, last_node_id FROM memory_consolidation_checkpoints WHERE person_id = $1",
+        person_id,
+        one=True,
+    )
+    if not row:
+        return None, None
+    node_id = row.get("last_node_id")
+    return row.get("last_created_at"), str(node_id) if node_id is not None else None
+
+
+async def fetch_new_nodes(person_id: str, cursor: Cursor) -> List[Dict[str, Any]]:
+    """Nodes after the checkpoint cursor, oldest first, at most MAX_BATCH."""
+
+    created_at, node_id = cursor
     rows = await q(
         """
-        SELECT id, node_kind, label, data, embed_vec
+        SELECT id, node_kind, label, embed_vec, created_at
         FROM memory_nodes
         WHERE person_id = $1
-        ORDER BY created_at DESC
-        LIMIT $2
+          AND ($2::timestamptz IS NULL OR (created_at, id) > ($2::timestamptz, $3::uuid))
+        ORDER BY created_at, id
+        LIMIT $4
         """,
         person_id,
+        created_at,
+        node_id,
         MAX_BATCH,
     )
-    return [
-        {
-            "id": row["id"],
-            "kind": row["node_kind"],
-            "label": row["label"],
-            "data": row["data"] or {},
-            "vec": _parse_vec(row.get("embed_vec")),
-        }
-        for row in rows
-    ]
+    return [_node(row) for row in rows]
 
 
-async def merge_nodes(person_id: str, src_id: str, dst_id: str) -> None:
-    LOGGER.info("[Consolidation] merging %s → %s", src_id, dst_id)
-    await q(
-        """
-        UPDATE memory_edges
-        SET from_node = $2
-        WHERE person_id = $1 AND from_node = $3
-        """,
-        person_id,
-        dst_id,
-        src_id,
-    )
-    await q(
-        """
-        UPDATE memory_edges
-        SET to_node = $2
-        WHERE person_id = $1 AND to_node = $3
-        """,
-        person_id,
-        dst_id,
-        src_id,
-    )
-    await q(
-        """
-        UPDATE memory_nodes
-        SET data = data || (SELECT data FROM memory_nodes WHERE id = $3)
-        WHERE id = $2
-        """,
-        person_id,
-        dst_id,
-        src_id,
-    )
-    await q(
+async def fetch_vector_nodes(person_id: str) -> List[Dict[str, Any]]:
+    """Every node of the person that has a vector: the set new nodes are compared against."""
+
+    rows = await q(
         """
-        DELETE FROM memory_nodes
-        WHERE id = $2 AND person_id = $1
+        SELECT id, node_kind, label, embed_vec, created_at
+        FROM memory_nodes
+        WHERE person_id = $1
+          AND embed_vec IS NOT NULL
         """,
         person_id,
-        src_id,
     )
+    return [_node(row) for row in rows]
 
 
-async def consolidate_memory(person_id: str) -> Dict[str, Any]:
-    nodes = await fetch_memory_nodes(person_id)
-    if not nodes:
-        return {"merged": 0, "candidates": []}
-
-    merged = 0
-    candidates: List[Dict[str, Any]] = []
-
-    for i in range(len(nodes)):
-        for j in range(i + 1, len(nodes)):
-            a = nodes[i]
-            b = nodes[j]
-            sim = _sim(a["vec"], b["vec"])
-            if sim < SIM_THRESHOLD:
+def _node(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(row["id"]),
+        "kind": row.get("node_kind"),
+        "label": row.get("label") or "",
+        "vec": _parse_vec(row.get("embed_vec")),
+        "created_at": row.get("created_at"),
+    }
+
+
+def advance_cursor(
+    cursor: Cursor,
+    new_nodes: List[Dict[str, Any]],
+    *,
+    now: dt.datetime | None = None,
+) -> Cursor:
+    """
+    Move the cursor over the new nodes in order, stopping before the first one
+    still waiting for its vector (within EMBED_GRACE of its creation).
+    """
+
+    now = now or dt.datetime.now(dt.timezone.utc)
+    for node in new_nodes:
+        created_at = node.get("created_at")
+        if created_at is not None and created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=dt.timezone.utc)
+        if not node["vec"].size and created_at is not None and now - created_at < EMBED_GRACE:
+            break
+        cursor = (node.get("created_at"), node["id"])
+    return cursor
+
+
+def similar_pairs(new_nodes: List[Dict[str, Any]], nodes: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any], Dict[str, Any]]]:
+    """
+    (similarity, new, other) for every pair at or above SIM_THRESHOLD, best
+    first: one matmul per block of new nodes against all nodes, so a run costs
+    O(new x all) instead of O(all^2). A pair of two new nodes appears once.
+    """
+
+    new_nodes = [node for node in new_nodes if node["vec"].size]
+    nodes = [node for node in nodes if node["vec"].size]
+    if not new_nodes or not nodes:
+        return []
+    dim = max(node["vec"].size for node in nodes + new_nodes)
+    matrix = stack_vectors([node["vec"] for node in nodes], dim=dim)
+    position = {node["id"]: index for index, node in enumerate(nodes)}
+    new_ids = {node["id"] for node in new_nodes}
+
+    pairs: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
+    for start in range(0, len(new_nodes), _BLOCK):
+        block = new_nodes[start : start + _BLOCK]
+        sims = stack_vectors([node["vec"] for node in block], dim=dim) @ matrix.T
+        for row, col in zip(*np.nonzero(sims >= SIM_THRESHOLD)):
+            new, other = block[row], nodes[col]
+            if other["id"] == new["id"]:
                 continue
+            # Both new: keep the pair once, from the side that sorts first.
+            if other["id"] in new_ids and position.get(other["id"], -1) < position.get(new["id"], -1):
+                continue
+            pairs.append((float(sims[row, col]), new, other))
+    pairs.sort(key=lambda pair: pair[0], reverse=True)
+    return pairs
+
+
+def plan_merges(pairs: List[Tuple[float, Dict[str, Any], Dict[str, Any]]]) -> Dict[str, str]:
+    """
+    src id -> surviving dst id for pairs at or above MERGE_THRESHOLD, strongest
+    first. Chains collapse onto one survivor (union-find), so nothing is merged
+    into a node the same run deletes. The longer label survives; ties keep the
+    existing node.
+    """
+
+    parent: Dict[str, str] = {}
+    labels: Dict[str, str] = {}
+
+    def find(node_id: str) -> str:
+        while parent.get(node_id, node_id) != node_id:
+            parent[node_id] = parent.get(parent[node_id], parent[node_id])
+            node_id = parent[node_id]
+        return node_id
+
+    for similarity, new, other in pairs:
+        if similarity < MERGE_THRESHOLD:
+            continue
+        labels.setdefault(new["id"], new["label"])
+        labels.setdefault(other["id"], other["label"])
+        a, b = find(other["id"]), find(new["id"])
+        if a == b:
+            continue
+        dst, src = (a, b) if len(labels[a]) >= len(labels[b]) else (b, a)
+        parent[src] = dst
+    return {node_id: find(node_id) for node_id in parent if find(node_id) != node_id}
+
+
+_EDGES_OF_MERGED = """
+    SELECT from_node, to_node, relation, coalesce(weight, 0) AS weight
+    FROM memory_edges
+    WHERE person_id = $1 AND (from_node = ANY($2::uuid[]) OR to_node = ANY($2::uuid[]))
+"""
+_DROP_EDGES_OF_MERGED = """
+    DELETE FROM memory_edges
+    WHERE person_id = $1 AND (from_node = ANY($2::uuid[]) OR to_node = ANY($2::uuid[]))
+"""
+# Source data wins on key conflicts, as with `dst.data || src.data`.
+_MERGE_DATA = """
+    UPDATE memory_nodes n
+    SET data = coalesce(n.data, '{}'::jsonb) || merged.data
+    FROM (
+        SELECT moves.dst, jsonb_object_agg(kv.key, kv.value) AS data
+        FROM unnest($2::uuid[], $3::uuid[]) AS moves(src, dst)
+        JOIN memory_nodes src ON src.id = moves.src
+        CROSS JOIN LATERAL jsonb_each(coalesce(src.data, '{}'::jsonb)) AS kv(key, value)
+        GROUP BY moves.dst
+    ) merged
+    WHERE n.id = merged.dst AND n.person_id = $1
+"""
+_DELETE_MERGED = "DELETE FROM memory_nodes WHERE person_id = $1 AND id = ANY($2::uuid[])"
+_SAVE_CHECKPOINT = """
+    INSERT INTO memory_consolidation_checkpoints (person_id, last_created_at, last_node_id, updated_at)
+    VALUES ($1, $2, $3, now())
+    ON CONFLICT (person_id) DO UPDATE
+    SET last_created_at = EXCLUDED.last_created_at,
+        last_node_id = EXCLUDED.last_node_id,
+        updated_at = now()
+"""
+
 
-            candidates.append(
-                {
-                    "a": {"id": a["id"], "label": a["label"], "kind": a["kind"]},
-                    "b": {"id": b["id"], "label": b["label"], "kind": b["kind"]},
-                    "similarity": sim,
-                }
-            )
-
-            if sim >= MERGE_THRESHOLD:
-                dst = a if len(a["label"]) >= len(b["label"]) else b
-                src = b if dst is a else a
-                await merge_nodes(person_id, src["id"], dst["id"])
-                merged += 1
-
-    return {"merged": merged, "candidates": candidates}
+def repoint_edges(edges: List[Dict[str, Any]], merges: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Edges touching merged nodes, re-pointed at their survivors. Edges that end
+    up with the same (from, to, relation) collapse to the strongest; edges the
+    merge would turn into self-loops are dropped.
+    """
+
+    survivors = {str(src): str(dst) for src, dst in merges.items()}
+    folded: Dict[Tuple[str, str, Any], float] = {}
+    for edge in edges:
+        from_node = survivors.get(str(edge["from_node"]), str(edge["from_node"]))
+        to_node = survivors.get(str(edge["to_node"]), str(edge["to_node"]))
+        if from_node == to_node:
+            continue
+        key = (from_node, to_node, edge["relation"])
+        weight = float(edge.get("weight") or 0.0)
+        folded[key] = max(folded.get(key, weight), weight)
+    return [
+        {"from_node": from_node, "to_node": to_node, "relation": relation, "weight": weight}
+        for (from_node, to_node, relation), weight in folded.items()
+    ]
+
+
+async def apply_merges(person_id: str, merges: Dict[str, str], cursor: Cursor) -> None:
+    """
+    Re-point edges, fold data, drop merged nodes and save the checkpoint in
+    one transaction. Merged nodes' edges are replaced by re-pointed copies
+    upserted on (from, to, relation), so an edge the survivor already has is
+    reinforced (same blend as upsert_edges) instead of violating the key.
+    """
+
+    pool = await get_pool()
+    try:
+        async with pool.acquire() as connection:
+            async with connection.transaction():
+                if merges:
+                    srcs, dsts = list(merges), list(merges.values())
+                    edges = await connection.fetch(_EDGES_OF_MERGED, person_id, srcs)
+                    await connection.execute(_DROP_EDGES_OF_MERGED, person_id, srcs)
+                    await upsert_edges(connection, person_id=person_id, edges=repoint_edges(edges, merges))
+                    await connection.execute(_MERGE_DATA, person_id, srcs, dsts)
+                    await connection.execute(_DELETE_MERGED, person_id, srcs)
+                if cursor[0] is not None:
+                    await connection.execute(_SAVE_CHECKPOINT, person_id, cursor[0], cursor[1])
+    finally:
+        # Also on rollback: upsert_edges has already fed the cache.
+        if merges:
+            invalidate_graph(person_id)
+
+
+async def consolidate_memory(person_id: str) -> Dict[str, Any]:
+    """
+    Compare memory nodes created since the person's checkpoint against all of
+    their nodes; report near-duplicates and merge the closest ones.
+    """
+
+    cursor = await load_checkpoint(person_id)
+    new_nodes = await fetch_new_nodes(person_id, cursor)
+    if not new_nodes:
+        return {"merged": 0, "candidates": [], "compared": 0}
+
+    pairs = similar_pairs(new_nodes, await fetch_vector_nodes(person_id))
+    merges = plan_merges(pairs)
+    next_cursor = advance_cursor(cursor, new_nodes)
+    if merges or next_cursor != cursor:
+        await apply_merges(person_id, merges, next_cursor)
+    if merges:
+        LOGGER.info("[Consolidation] person=%s merged %s nodes", person_id, len(merges))
+
+    candidates = [
+        {
+            "a": {"id": new["id"], "label": new["label"], "kind": new["kind"]},
+            "b": {"id": other["id"], "label": other["label"], "kind": other["kind"]},
+            "similarity": similarity,
+        }
+        for similarity, new, other in pairs
+    ]
+    return {"merged": len(merges), "candidates": candidates, "compared": len(new_nodes)}
 
 
 __all__ = ["consolidate_memory"]
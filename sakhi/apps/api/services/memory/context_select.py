@@ -4,7 +4,8 @@ import logging
 from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import q as dbfetch
-from sakhi.libs.embeddings import embed_text
+from sakhi.apps.api.core.query_embedding import embed_query
+from sakhi.apps.api.services.memory import vector_index
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,9 +19,11 @@ async def fetch_relevant_long_term(
     if not person_id or not latest_text or not latest_text.strip():
         return []
 
-    latest_vec = await embed_text(latest_text)
-    if not latest_vec:
+    latest_vec = await embed_query(latest_text)
+    if not latest_vec or not any(latest_vec):
         return []
+    if vector_index.ENABLED:
+        return await _nearest_journal_entries(person_id, latest_vec, limit)
 
     try:
         rows = await dbfetch(
@@ -59,6 +62,37 @@ async def fetch_relevant_long_term(
     return results
 
 
+async def _nearest_journal_entries(person_id: str, latest_vec: List[float], limit: int) -> List[Dict[str, Any]]:
+    """Same shape as the memory_items query, answered from the person's in-process journal index."""
+
+    try:
+        index = await vector_index.get_vector_index().get(person_id)
+        nearest = index.search(latest_vec, limit)
+        if not nearest:
+            return []
+        rows = await dbfetch(
+            "SELECT id, content FROM journal_entries WHERE user_id = $1 AND id = ANY($2::uuid[])",
+            person_id,
+            [entry_id for entry_id, _ in nearest],
+        )
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        _LOGGER.debug("Index recall failed; returning empty result: %s", exc)
+        return []
+
+    content = {str(row.get("id")): row.get("content") for row in rows}
+    return [
+        {
+            "id": entry_id,
+            "type": "journal",
+            "content": content[entry_id],
+            "metadata": None,
+            "similarity": round(similarity, 3),
+        }
+        for entry_id, similarity in nearest
+        if entry_id in content
+    ]
+
+
 def _coerce_float(value: Any) -> float | None:
     if value is None:
         return None
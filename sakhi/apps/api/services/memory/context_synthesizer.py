@@ -4,6 +4,7 @@ from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import q as dbfetch
 from sakhi.apps.api.services.memory.recall import memory_recall
+from sakhi.apps.api.services.memory_graph import cache as graph_cache
 
 
 async def _latest_emotion(person_id: str) -> str | None:
@@ -51,6 +52,12 @@ async def _recent_themes(person_id: str) -> List[str]:
 
 
 async def _recent_memory_nodes(person_id: str) -> List[Dict[str, Any]]:
+    if graph_cache.ENABLED:
+        graph = await graph_cache.get_graph_cache().get(person_id)
+        return [
+            {"id": n["id"], "node_kind": n.get("node_kind"), "label": n.get("label"), "data": n.get("data")}
+            for n in graph.recent(5)
+        ]
     rows = await dbfetch(
         """
         SELECT id, node_kind, label, data
@@ -75,12 +82,13 @@ async def synthesize_memory_context(
     user_query: str,
     *,
     limit: int = 300,
+    query_vec: List[float] | None = None,
 ) -> str:
     """
     Produce a concise memory context summary for system prompts.
     """
 
-    recall = await memory_recall(person_id, user_query, limit=5)
+    recall = await memory_recall(person_id, user_query, limit=5, query_vec=query_vec)
     recent_nodes = await _recent_memory_nodes(person_id)
     goals = await _active_goals(person_id)
     emotion = await _latest_emotion(person_id) or "neutral"
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 from sakhi.apps.api.core.db import get_db
-from sakhi.libs.embeddings import embed_text, to_pgvector
+from sakhi.apps.api.core.query_embedding import embed_query
+from sakhi.apps.api.services.memory.vector_index import note_journal_vector
+from sakhi.libs.embeddings import to_pgvector
 
 JOURNAL_VECTOR_DIM = 1536
 
 
-async def generate_journal_embedding(entry_id: str, text: str):
+async def generate_journal_embedding(entry_id: str, text: str, *, person_id: str | None = None):
     """
     Compute deterministic 1536-d embedding for this entry and store it.
+    With `person_id`, the person's in-process vector index picks it up too.
     """
 
-    vector = await embed_text(text)
+    vector = await embed_query(text)
     if isinstance(vector, list) and vector and isinstance(vector[0], list):
         vector = vector[0]
     if not isinstance(vector, list):
@@ -31,6 +34,7 @@ async def generate_journal_embedding(entry_id: str, text: str):
             entry_id,
             vector_literal,
         )
+        await note_journal_vector(person_id, entry_id, vector)
         return vector
     finally:
         await db.close()
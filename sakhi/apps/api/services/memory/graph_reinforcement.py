@@ -3,47 +3,50 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import get_db
-from sakhi.apps.api.services.memory_graph.graph import get_or_create_node, upsert_edge
+from sakhi.apps.api.services.memory_graph.graph import _sanitize_kind, upsert_edges, upsert_nodes
 
 
 async def reinforce_recall_graph(person_id: str, query: str, recalled_items: List[Dict[str, Any]]) -> None:
     """
     Patch Y: Strengthen the memory graph using recall results.
+    Two round trips regardless of how many items were recalled.
     """
 
     if not recalled_items:
         return
 
-    db = await get_db()
-    try:
-        query_node_id = await get_or_create_node(
-            db,
-            person_id=person_id,
-            node_kind="reflection",
-            label=query[:80],
-            data={"query": query},
+    nodes = [
+        {
+            "kind": "reflection",
+            "label": query[:80],
+            "data": {"query": query},
+        }
+    ]
+    for item in recalled_items:
+        nodes.append(
+            {
+                "kind": _sanitize_kind(item.get("type") or "memory"),
+                "label": (item.get("text") or "")[:80],
+                "data": {"raw_text": item.get("text")},
+            }
         )
 
-        for item in recalled_items:
-            src_node_id = await get_or_create_node(
-                db,
-                person_id=person_id,
-                node_kind=item.get("type") or "memory",
-                label=(item.get("text") or "")[:80],
-                data={"raw_text": item.get("text")},
-            )
-
+    db = await get_db()
+    try:
+        query_node_id, *src_node_ids = await upsert_nodes(db, person_id=person_id, nodes=nodes)
+        edges = []
+        for item, src_node_id in zip(recalled_items, src_node_ids):
             weight = float(item.get("score") or 0.2)
             weight = max(0.05, min(weight, 1.0))
-
-            await upsert_edge(
-                db,
-                person_id=person_id,
-                from_node=src_node_id,
-                to_node=query_node_id,
-                relation="supports",
-                weight=weight,
+            edges.append(
+                {
+                    "from_node": src_node_id,
+                    "to_node": query_node_id,
+                    "relation": "supports",
+                    "weight": weight,
+                }
             )
+        await upsert_edges(db, person_id=person_id, edges=edges)
     finally:
         await db.close()
 
@@ -1,38 +1,17 @@
 from __future__ import annotations
 
-import uuid
 from typing import Any, Dict, List
 
-from sakhi.apps.api.core.db import exec as dbexec
+from sakhi.apps.api.core.db import get_db
+from sakhi.apps.api.services.memory_graph.graph import upsert_edges, upsert_nodes
 
-
-async def _add_memory_node(person_id: str, kind: str, label: str, data: Dict[str, Any]) -> str:
-    node_id = str(uuid.uuid4())
-    await dbexec(
-        """
-        INSERT INTO memory_nodes (id, person_id, node_kind, label, data)
-        VALUES ($1, $2, $3, $4, $5::jsonb)
-        """,
-        node_id,
-        person_id,
-        kind,
-        label,
-        data,
-    )
-    return node_id
-
-
-async def _add_memory_edge(person_id: str, src: str, dst: str, relation: str) -> None:
-    await dbexec(
-        """
-        INSERT INTO memory_edges (person_id, from_node, to_node, relation, weight)
-        VALUES ($1, $2, $3, $4, 0.5)
-        """,
-        person_id,
-        src,
-        dst,
-        relation,
-    )
+# reasoning key -> (node kind, results key, relation to the source turn)
+_SECTIONS = (
+    ("insights", "insight", "insight_nodes", "reflects"),
+    ("opportunities", "opportunity", "opportunity_nodes", "influences"),
+    ("contradictions", "contradiction", "contradiction_nodes", "contradicts"),
+    ("open_loops", "open_loop", "open_loop_nodes", "extends"),
+)
 
 
 def _coerce_label(item: Any, fallback: str) -> str:
@@ -67,49 +46,33 @@ async def ingest_reasoning_to_memory(
     Safe on missing fields; best-effort inserts.
     """
 
-    results = {
-        "insight_nodes": [],
-        "opportunity_nodes": [],
-        "contradiction_nodes": [],
-        "open_loop_nodes": [],
-    }
-
-    # Insights
-    for item in reasoning.get("insights") or []:
-        data = _coerce_data(item)
-        label = _coerce_label(item, "insight")
-        node_id = await _add_memory_node(person_id, "insight", label, data)
-        results["insight_nodes"].append(node_id)
-        if source_turn_id:
-            await _add_memory_edge(person_id, src=node_id, dst=source_turn_id, relation="reflects")
-
-    # Opportunities
-    for item in reasoning.get("opportunities") or []:
-        data = _coerce_data(item)
-        label = _coerce_label(item, "opportunity")
-        node_id = await _add_memory_node(person_id, "opportunity", label, data)
-        results["opportunity_nodes"].append(node_id)
-        if source_turn_id:
-            await _add_memory_edge(person_id, src=node_id, dst=source_turn_id, relation="influences")
-
-    # Contradictions
-    for item in reasoning.get("contradictions") or []:
-        data = _coerce_data(item)
-        label = _coerce_label(item, "contradiction")
-        node_id = await _add_memory_node(person_id, "contradiction", label, data)
-        results["contradiction_nodes"].append(node_id)
-        if source_turn_id:
-            await _add_memory_edge(person_id, src=node_id, dst=source_turn_id, relation="contradicts")
-
-    # Open loops
-    for item in reasoning.get("open_loops") or []:
-        data = _coerce_data(item)
-        label = _coerce_label(item, "open_loop")
-        node_id = await _add_memory_node(person_id, "open_loop", label, data)
-        results["open_loop_nodes"].append(node_id)
+    results: Dict[str, List[str]] = {key: [] for _, _, key, _ in _SECTIONS}
+    nodes: List[Dict[str, Any]] = []
+    placements: List[tuple[str, str]] = []
+    for section, kind, key, relation in _SECTIONS:
+        for item in reasoning.get(section) or []:
+            nodes.append({"kind": kind, "label": _coerce_label(item, kind), "data": _coerce_data(item)})
+            placements.append((key, relation))
+    if not nodes:
+        return results
+
+    db = await get_db()
+    try:
+        node_ids = await upsert_nodes(db, person_id=person_id, nodes=nodes)
         if source_turn_id:
-            await _add_memory_edge(person_id, src=node_id, dst=source_turn_id, relation="extends")
-
+            await upsert_edges(
+                db,
+                person_id=person_id,
+                edges=[
+                    {"from_node": node_id, "to_node": source_turn_id, "relation": relation, "weight": 0.5}
+                    for node_id, (_, relation) in zip(node_ids, placements)
+                ],
+            )
+    finally:
+        await db.close()
+
+    for node_id, (key, _) in zip(node_ids, placements):
+        results[key].append(node_id)
     return results
 
 
@@ -1,184 +1,322 @@
 from __future__ import annotations
 
+import asyncio
+import datetime as dt
 import json
 import logging
-from typing import Any, Dict, List, Sequence
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sakhi.apps.api.core.db import exec as dbexec
-from sakhi.apps.api.core.db import q, q_row
-from sakhi.libs.embeddings import embed_text, to_pgvector
+import numpy as np
+
+from sakhi.apps.api.core.db import get_pool, q
+from sakhi.apps.api.services.memory.vector_index import note_journal_vector
+from sakhi.libs.embeddings import embed_text, parse_pgvector
+from sakhi.libs.pgvector import fit_vector
 
 LOGGER = logging.getLogger(__name__)
 
+VECTOR_DIM = 1536
+# Rows per keyset page; each page is validated, repaired and checkpointed together.
+CHUNK = int(os.getenv("SAKHI_INTEGRITY_CHUNK", "500"))
+# Persons scanned at once by run_global_integrity.
+CONCURRENCY = int(os.getenv("SAKHI_INTEGRITY_CONCURRENCY", "4"))
+MAX_WARNINGS = 50
+
+# Scan order; the checkpoint records the phase and the last id it finished.
+PHASES = ("nodes", "edges", "journal", "summary")
+
+_COUNTERS = (
+    "nodes_checked",
+    "edges_checked",
+    "fixed_vectors",
+    "invalid_edges",
+    "duplicate_nodes",
+    "dangling_nodes",
+    "journal_embedding_mismatches",
+)
+
 
 # -------------------------------------------------------
-# Helpers
+# Queries
 # -------------------------------------------------------
 
-def _parse_vec(raw: Any) -> List[float]:
-    if not raw:
-        return []
-    if isinstance(raw, list):
-        return [float(x) for x in raw]
-    if isinstance(raw, str) and raw.startswith("[") and raw.endswith("]"):
-        body = raw[1:-1].strip()
-        pieces = [piece.strip() for piece in body.split(",") if piece.strip()]
-        try:
-            return [float(piece) for piece in pieces]
-        except Exception:
-            return []
-    return []
-
-
-async def _clean_vector(vec: Sequence[float]) -> List[float]:
-    """
-    Ensure vectors are floats and exactly 1536 elements.
-    """
-    try:
-        arr = [float(v) for v in vec]
-    except Exception:
-        return [0.0] * 1536
+_NODE_PAGE = """
+    SELECT n.id,
+           n.embed_vec,
+           EXISTS (SELECT 1 FROM memory_edges e WHERE e.person_id = $1 AND e.from_node = n.id)
+           OR EXISTS (SELECT 1 FROM memory_edges e WHERE e.person_id = $1 AND e.to_node = n.id) AS linked
+    FROM memory_nodes n
+    WHERE n.person_id = $1
+      AND ($2::uuid IS NULL OR n.id > $2)
+    ORDER BY n.id
+    LIMIT $3
+"""
+_EDGE_PAGE = """
+    SELECT e.id, (src.id IS NULL OR dst.id IS NULL) AS invalid
+    FROM memory_edges e
+    LEFT JOIN memory_nodes src ON src.id = e.from_node AND src.person_id = $1
+    LEFT JOIN memory_nodes dst ON dst.id = e.to_node AND dst.person_id = $1
+    WHERE e.person_id = $1
+      AND ($2::uuid IS NULL OR e.id > $2)
+    ORDER BY e.id
+    LIMIT $3
+"""
+_MISSING_EMBEDDING_PAGE = """
+    SELECT je.id, je.content
+    FROM journal_entries je
+    WHERE je.user_id = $1
+      AND ($2::uuid IS NULL OR je.id > $2)
+      AND NOT EXISTS (SELECT 1 FROM journal_embeddings emb WHERE emb.entry_id = je.id)
+    ORDER BY je.id
+    LIMIT $3
+"""
+_DUPLICATE_NODES = """
+    SELECT count(*) - count(DISTINCT (node_kind, lower(btrim(coalesce(label, ''))))) AS duplicates
+    FROM memory_nodes
+    WHERE person_id = $1
+"""
+_PERSON_PAGE = """
+    SELECT p.id
+    FROM persons p
+    LEFT JOIN memory_integrity_checkpoints c ON c.person_id = p.id
+    WHERE ($1::uuid IS NULL OR p.id > $1)
+      AND ($3::timestamptz IS NULL OR c.completed_at IS NULL OR c.completed_at < $3)
+    ORDER BY p.id
+    LIMIT $2
+"""
 
-    if len(arr) == 1536:
-        return arr
-    if len(arr) > 1536:
-        return arr[:1536]
-    pad_len = 1536 - len(arr)
-    return arr + [0.0] * pad_len
+_REPAIR_VECTOR = "UPDATE memory_nodes SET embed_vec = $2 WHERE id = $1"
+_STORE_EMBEDDING = """
+    INSERT INTO journal_embeddings (entry_id, embedding_vec)
+    VALUES ($1, $2)
+    ON CONFLICT (entry_id) DO UPDATE
+      SET embedding_vec = EXCLUDED.embedding_vec
+"""
+_SAVE_CHECKPOINT = """
+    INSERT INTO memory_integrity_checkpoints (person_id, phase, last_id, report, updated_at, completed_at)
+    VALUES ($1, $2, $3, $4::jsonb, now(), CASE WHEN $2 = 'done' THEN now() END)
+    ON CONFLICT (person_id) DO UPDATE
+    SET phase = EXCLUDED.phase,
+        last_id = EXCLUDED.last_id,
+        report = EXCLUDED.report,
+        updated_at = now(),
+        completed_at = EXCLUDED.completed_at
+"""
 
 
 # -------------------------------------------------------
-# Main integrity check
+# Helpers
 # -------------------------------------------------------
 
-async def run_memory_integrity(person_id: str, *, fix_missing_embeddings: bool = False) -> Dict[str, Any]:
+def _empty_report() -> Dict[str, Any]:
+    report: Dict[str, Any] = {name: 0 for name in _COUNTERS}
+    report["warnings"] = []
+    return report
+
+
+def _warn(report: Dict[str, Any], message: str) -> None:
+    if len(report["warnings"]) < MAX_WARNINGS:
+        report["warnings"].append(message)
+
+
+def invalid_vector_rows(vectors: List[Any], dim: int = VECTOR_DIM) -> np.ndarray:
     """
-    Validate memory graph + embeddings for a person.
-    The function performs soft fixes (vector repair, embedding regeneration)
-    and returns a structured report.
+    Positions of vectors that are not exactly `dim` finite floats. Sizes are
+    checked in one pass and values with one isfinite over the stacked
+    well-sized rows.
     """
 
-    report: Dict[str, Any] = {
-        "nodes_checked": 0,
-        "edges_checked": 0,
-        "fixed_vectors": 0,
-        "invalid_edges": 0,
-        "duplicate_nodes": 0,
-        "dangling_nodes": 0,
-        "journal_embedding_mismatches": 0,
-        "warnings": [],
-    }
-
-    nodes = await q(
-        """
-        SELECT id, node_kind, label, embed_vec
-        FROM memory_nodes
-        WHERE person_id = $1
-        """,
-        person_id,
-    )
+    parsed = [parse_pgvector(vector) for vector in vectors]
+    sizes = np.fromiter((vector.size for vector in parsed), dtype=np.int64, count=len(parsed))
+    bad = sizes != dim
+    sized = np.flatnonzero(~bad)
+    if sized.size:
+        matrix = np.stack([parsed[i] for i in sized])
+        bad[sized[~np.isfinite(matrix).all(axis=1)]] = True
+    return np.flatnonzero(bad)
 
-    seen = set()
-    for row in nodes:
-        report["nodes_checked"] += 1
-        nid = row["id"]
-        label = (row.get("label") or "").strip()
-        key = (row.get("node_kind"), label.lower())
 
-        if key in seen:
-            report["duplicate_nodes"] += 1
-        else:
-            seen.add(key)
-
-        raw_vec = row.get("embed_vec")
-        vec = _parse_vec(raw_vec)
-        clean = await _clean_vector(vec)
-
-        if clean != vec:
-            report["fixed_vectors"] += 1
-            literal = "[" + ",".join(f"{val:.6f}" for val in clean) + "]"
-            await dbexec(
-                """
-                UPDATE memory_nodes
-                SET embed_vec = $2
-                WHERE id = $1
-                """,
-                nid,
-                literal,
-            )
+def _repaired(vector: Any) -> np.ndarray:
+    return np.nan_to_num(fit_vector(vector, VECTOR_DIM), nan=0.0, posinf=0.0, neginf=0.0)
+
 
-    edges = await q(
-        """
-        SELECT id, from_node, to_node
-        FROM memory_edges
-        WHERE person_id = $1
-        """,
+async def load_checkpoint(person_id: str) -> Optional[Dict[str, Any]]:
+    row = await q(
+        "SELECT phase, last_id, report, completed_at FROM memory_integrity_checkpoints WHERE person_id = $1",
         person_id,
+        one=True,
     )
+    return dict(row) if row else None
+
 
-    node_ids = {row["id"] for row in nodes}
-    linked_ids = set()
+async def _commit_page(
+    person_id: str,
+    phase: str,
+    last_id: Any,
+    report: Dict[str, Any],
+    writes: Sequence[Tuple[str, List[Tuple[Any, ...]]]] = (),
+) -> None:
+    """Apply a page's repairs and move the checkpoint past it in one transaction."""
 
-    for row in edges:
-        report["edges_checked"] += 1
-        if row["from_node"] not in node_ids or row["to_node"] not in node_ids:
-            report["invalid_edges"] += 1
-            report["warnings"].append(
-                f"Invalid edge {row['id']}: missing from_node/to_node"
+    pool = await get_pool()
+    async with pool.acquire() as connection:
+        async with connection.transaction():
+            for sql, rows in writes:
+                if rows:
+                    await connection.executemany(sql, rows)
+            await connection.execute(
+                _SAVE_CHECKPOINT,
+                person_id,
+                phase,
+                str(last_id) if last_id is not None else None,
+                json.dumps(report),
             )
-        linked_ids.add(row["from_node"])
-        linked_ids.add(row["to_node"])
-
-    missing_emb = await q(
-        """
-        SELECT je.id
-        FROM journal_entries je
-        LEFT JOIN journal_embeddings emb ON emb.entry_id = je.id
-        WHERE je.user_id = $1
-          AND emb.entry_id IS NULL
-        """,
-        person_id,
-    )
 
-    report["journal_embedding_mismatches"] = len(missing_emb)
-    if missing_emb and not fix_missing_embeddings:
-        report["warnings"].append(
-            f"{len(missing_emb)} journal entries missing embeddings (run backfill or set fix_missing_embeddings=true)."
+
+# -------------------------------------------------------
+# Phases
+# -------------------------------------------------------
+
+async def _scan_nodes(person_id: str, last_id: Any, report: Dict[str, Any]) -> None:
+    while True:
+        rows = await q(_NODE_PAGE, person_id, last_id, CHUNK)
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        report["nodes_checked"] += len(rows)
+        report["dangling_nodes"] += sum(1 for row in rows if not row.get("linked"))
+        bad = invalid_vector_rows([row.get("embed_vec") for row in rows])
+        report["fixed_vectors"] += len(bad)
+        repairs = [(rows[i]["id"], _repaired(rows[i].get("embed_vec"))) for i in bad]
+        await _commit_page(person_id, "nodes", last_id, report, [(_REPAIR_VECTOR, repairs)])
+
+
+async def _scan_edges(person_id: str, last_id: Any, report: Dict[str, Any]) -> None:
+    while True:
+        rows = await q(_EDGE_PAGE, person_id, last_id, CHUNK)
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        report["edges_checked"] += len(rows)
+        for row in rows:
+            if row.get("invalid"):
+                report["invalid_edges"] += 1
+                _warn(report, f"Invalid edge {row['id']}: missing from_node/to_node")
+        await _commit_page(person_id, "edges", last_id, report)
+
+
+async def _scan_journal(person_id: str, last_id: Any, report: Dict[str, Any], *, fix: bool) -> None:
+    while True:
+        rows = await q(_MISSING_EMBEDDING_PAGE, person_id, last_id, CHUNK)
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        report["journal_embedding_mismatches"] += len(rows)
+        stored: List[Tuple[Any, np.ndarray]] = []
+        if fix:
+            # One list call: cache hits are served locally, misses share batched API requests.
+            vectors = await embed_text([row.get("content") or "" for row in rows])
+            stored = [(row["id"], _repaired(vector)) for row, vector in zip(rows, vectors)]
+        await _commit_page(person_id, "journal", last_id, report, [(_STORE_EMBEDDING, stored)])
+        for entry_id, vector in stored:
+            await note_journal_vector(person_id, entry_id, vector)
+
+
+async def _summarize(person_id: str, report: Dict[str, Any], *, fix: bool) -> None:
+    row = await q(_DUPLICATE_NODES, person_id, one=True)
+    report["duplicate_nodes"] = int((row or {}).get("duplicates") or 0)
+    missing = report["journal_embedding_mismatches"]
+    if missing and not fix:
+        _warn(
+            report,
+            f"{missing} journal entries missing embeddings (run backfill or set fix_missing_embeddings=true).",
         )
+    await _commit_page(person_id, "done", None, report)
 
-    if fix_missing_embeddings:
-        for row in missing_emb:
-            jid = row["id"]
-            row2 = await q_row(
-                "SELECT content FROM journal_entries WHERE id = $1",
-                jid,
-            )
-            text = (row2 or {}).get("content") or ""
-            vec = await embed_text(text)
-            if isinstance(vec, list) and vec and isinstance(vec[0], list):
-                vec = vec[0]
-            if not isinstance(vec, list):
-                vec = []
-            cleaned = await _clean_vector(vec)
-            literal = to_pgvector(cleaned, length=1536)
-
-            await dbexec(
-                """
-                INSERT INTO journal_embeddings (entry_id, embedding_vec)
-                VALUES ($1, $2)
-                ON CONFLICT (entry_id) DO UPDATE
-                  SET embedding_vec = EXCLUDED.embedding_vec
-                """,
-                jid,
-                literal,
-            )
 
-    for nid in node_ids:
-        if nid not in linked_ids:
-            report["dangling_nodes"] += 1
+# -------------------------------------------------------
+# Main integrity check
+# -------------------------------------------------------
+
+async def run_memory_integrity(
+    person_id: str,
+    *,
+    fix_missing_embeddings: bool = False,
+    resume: bool = True,
+) -> Dict[str, Any]:
+    """
+    Validate memory graph + embeddings for a person.
+    Pages through nodes, edges and unembedded journal entries by id, repairs
+    vectors and missing embeddings per page, and checkpoints after each page
+    so an interrupted run resumes where it stopped. Returns the report.
+    """
+
+    report = _empty_report()
+    phase, last_id = PHASES[0], None
+    checkpoint = await load_checkpoint(person_id) if resume else None
+    if checkpoint and checkpoint.get("phase") in PHASES:
+        phase, last_id = checkpoint["phase"], checkpoint.get("last_id")
+        saved = checkpoint.get("report")
+        report.update(json.loads(saved) if isinstance(saved, str) else saved or {})
+        LOGGER.info("[MemoryIntegrity] person=%s resuming at %s after %s", person_id, phase, last_id)
+
+    for current in PHASES[PHASES.index(phase):]:
+        cursor = last_id if current == phase else None
+        if current == "nodes":
+            await _scan_nodes(person_id, cursor, report)
+        elif current == "edges":
+            await _scan_edges(person_id, cursor, report)
+        elif current == "journal":
+            await _scan_journal(person_id, cursor, report, fix=fix_missing_embeddings)
+        else:
+            await _summarize(person_id, report, fix=fix_missing_embeddings)
 
     LOGGER.info("[MemoryIntegrity] report=%s", json.dumps(report))
     return report
 
 
-__all__ = ["run_memory_integrity"]
+async def run_global_integrity(
+    *,
+    fix_missing_embeddings: bool = False,
+    concurrency: int | None = None,
+    since: dt.datetime | None = None,
+) -> Dict[str, Any]:
+    """
+    Scan every person, `concurrency` at a time. Persons whose last complete
+    scan finished at or after `since` are skipped, so re-running with the
+    first run's `started_at` resumes an interrupted sweep.
+    """
+
+    started_at = dt.datetime.now(dt.timezone.utc)
+    limit = asyncio.Semaphore(max(1, concurrency or CONCURRENCY))
+    summary: Dict[str, Any] = {name: 0 for name in _COUNTERS}
+    summary.update({"persons": 0, "failed": 0, "started_at": started_at.isoformat()})
+
+    async def scan(person_id: str) -> Optional[Dict[str, Any]]:
+        async with limit:
+            try:
+                return await run_memory_integrity(person_id, fix_missing_embeddings=fix_missing_embeddings)
+            except Exception:
+                LOGGER.exception("[MemoryIntegrity] person=%s scan failed", person_id)
+                return None
+
+    cursor = None
+    while True:
+        rows = await q(_PERSON_PAGE, cursor, CHUNK, since)
+        if not rows:
+            break
+        cursor = rows[-1]["id"]
+        for report in await asyncio.gather(*(scan(str(row["id"])) for row in rows)):
+            summary["persons"] += 1
+            if report is None:
+                summary["failed"] += 1
+                continue
+            for name in _COUNTERS:
+                summary[name] += report.get(name, 0)
+
+    LOGGER.info("[MemoryIntegrity] global summary=%s", json.dumps(summary))
+    return summary
+
+
+__all__ = ["invalid_vector_rows", "load_checkpoint", "run_global_integrity", "run_memory_integrity"]
@@ -298,8 +298,8 @@ async def update_personal_model(
             updated_at = EXCLUDED.updated_at
         """,
         person_id,
-        json.dumps(short_term, ensure_ascii=False),
-        json.dumps(long_term, ensure_ascii=False),
+        short_term,
+        long_term,
         now,
     )
 
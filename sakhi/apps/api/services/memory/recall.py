@@ -2,12 +2,22 @@ from __future__ import annotations
 
 import logging
 import asyncio
+import os
 from typing import Any, Dict, List, Tuple
 import numpy as np
 
-from sakhi.apps.api.core.db import q
+from sakhi.apps.api.core.db import get_pool, q
+from sakhi.apps.api.core.query_embedding import embed_query
+from sakhi.apps.api.core.recall_scoring import (
+    cosine_scores,
+    mmr_select,
+    recency_weights,
+    reciprocal_rank_fusion,
+    stack_vectors,
+)
+from sakhi.apps.api.services.memory import vector_index
 from sakhi.apps.api.services.memory.graph_reinforcement import reinforce_recall_graph
-from sakhi.libs.embeddings import embed_text
+from sakhi.libs.embeddings import parse_pgvector
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,59 +29,118 @@ SURFACE_WEIGHTS = {
     "node": 0.55,
 }
 RECENCY_HALFLIFE_DAYS = 45
+# "sql": rank journal vectors in Postgres (HNSW, full history); "python": score the
+# latest 100 rows in process. SAKHI_VECTOR_INDEX=1 takes precedence over both.
+RECALL_MODE = os.getenv("SAKHI_RECALL_MODE", "sql").lower()
+# Nearest neighbours pulled through the index before recency/surface reweighting.
+ANN_CANDIDATES = int(os.getenv("SAKHI_RECALL_ANN_CANDIDATES", "200"))
+# pgvector's upper bound for hnsw.ef_search.
+MAX_EF_SEARCH = 1000
+# MMR diversity: relevance vs. novelty trade-off (1.0 = pure score order), how
+# many top candidates it considers, and the similarity treated as a duplicate.
+MMR_LAMBDA = float(os.getenv("SAKHI_RECALL_MMR_LAMBDA", "0.7"))
+MMR_POOL = int(os.getenv("SAKHI_RECALL_MMR_POOL", "256"))
+DUPLICATE_THRESHOLD = 0.92
+# Lexical leg: full-text matches on every surface (journal, reflections, themes,
+# facts, memory nodes), fused with the vector ranking by reciprocal rank.
+# Off = vector ranking only, with its raw scores.
+LEXICAL_RECALL = os.getenv("SAKHI_RECALL_LEXICAL", "1") != "0"
+LEXICAL_CANDIDATES = int(os.getenv("SAKHI_RECALL_LEXICAL_CANDIDATES", "20"))
+RRF_K = 60
+
+# Terms are OR-ed (plainto_tsquery ANDs them, which a conversational message
+# rarely satisfies); ts_rank_cd still favours rows matching more of them. Every
+# branch is served by the surface's GIN index on `fts`.
+_SQL_LEXICAL = """
+    WITH terms AS (
+        SELECT replace(plainto_tsquery('english', $2)::text, ' & ', ' | ')::tsquery AS tsq
+    )
+    (SELECT 'journal' AS type, je.id::text AS id, je.content AS text, je.ts AS ts,
+            ts_rank_cd(je.fts, terms.tsq) AS rank
+     FROM journal_entries je, terms
+     WHERE je.user_id = $1 AND je.fts @@ terms.tsq
+     ORDER BY rank DESC
+     LIMIT $3)
+    UNION ALL
+    (SELECT 'reflection' AS type, r.id::text AS id,
+            r.content || ' [' || coalesce(r.theme, 'general') || ']' AS text, r.created_at AS ts,
+            ts_rank_cd(r.fts, terms.tsq) AS rank
+     FROM reflections r, terms
+     WHERE r.user_id = $1 AND r.fts @@ terms.tsq
+     ORDER BY rank DESC
+     LIMIT $3)
+    UNION ALL
+    (SELECT 'theme' AS type, t.id::text AS id,
+            coalesce(t.name, '') || ' — ' || coalesce(t.description, '') AS text, NULL::timestamptz AS ts,
+            ts_rank_cd(t.fts, terms.tsq) AS rank
+     FROM themes t, terms
+     WHERE t.person_id = $1 AND t.fts @@ terms.tsq
+     ORDER BY rank DESC
+     LIMIT $3)
+    UNION ALL
+    (SELECT 'fact' AS type, f.id::text AS id,
+            f.key || ': ' || f.value::text AS text, NULL::timestamptz AS ts,
+            ts_rank_cd(f.fts, terms.tsq) AS rank
+     FROM facts f, terms
+     WHERE f.person_id = $1 AND f.fts @@ terms.tsq
+     ORDER BY rank DESC
+     LIMIT $3)
+    UNION ALL
+    (SELECT 'node' AS type, n.id::text AS id,
+            n.node_kind::text || ': ' || n.label AS text, NULL::timestamptz AS ts,
+            ts_rank_cd(n.fts, terms.tsq) AS rank
+     FROM memory_nodes n, terms
+     WHERE n.person_id = $1 AND n.fts @@ terms.tsq
+     ORDER BY rank DESC
+     LIMIT $3)
+"""
+
+# The index is shared by everyone, and the person filter applies to what the
+# HNSW scan returns; with the default ef_search (40) a person's own rows could be
+# crowded out entirely. The search is therefore widened to the candidate count
+# and, with pgvector >= 0.8 (enforced by 20261017_recall_hnsw_index.sql), keeps
+# scanning until enough of the person's rows pass the filter. relaxed_order may
+# return neighbours slightly out of order; the outer ORDER BY score re-sorts.
+_SQL_ANN_SETTINGS = """
+    SELECT set_config('hnsw.ef_search', $1, true),
+           set_config('hnsw.iterative_scan', 'relaxed_order', true)
+"""
+
+_SQL_RECALL = """
+    SELECT id, content, ts, vec, similarity, surface_weight, recency_weight,
+           similarity * surface_weight * recency_weight AS score
+    FROM (
+        SELECT id, content, ts, vec, similarity,
+               $4::float8 AS surface_weight,
+               CASE WHEN ts IS NULL THEN 1.0
+                    ELSE power(0.5, floor(extract(epoch FROM now() - ts) / 86400) / $5::float8)
+               END AS recency_weight
+        FROM (
+            SELECT je.id, je.content, je.ts, emb.embedding_vec AS vec,
+                   1 - (emb.embedding_vec <=> $2::vector) AS similarity
+            FROM journal_embeddings emb
+            JOIN journal_entries je ON je.id = emb.entry_id
+            WHERE je.user_id = $1
+              AND emb.embedding_vec IS NOT NULL
+            ORDER BY emb.embedding_vec <=> $2::vector
+            LIMIT $3
+        ) nearest
+    ) weighted
+    ORDER BY score DESC
+    LIMIT $6
+"""
 
 
 async def _get_embedding(text: str) -> List[float]:
     try:
-        return await embed_text(text)
+        return await embed_query(text)
     except Exception as exc:
         LOGGER.error("[Recall] Embedding failed: %s", exc)
         return [0.0] * 1536
 
 
-def _parse_vec(raw: Any) -> List[float]:
-    if not raw:
-        return []
-    if isinstance(raw, list):
-        return [float(x) for x in raw]
-    if isinstance(raw, str) and raw.startswith("[") and raw.endswith("]"):
-        body = raw[1:-1].strip()
-        if not body:
-            return []
-        try:
-            return [float(piece) for piece in body.split(",")]
-        except ValueError:
-            return []
-    return []
-
-
-def _sim(a: List[float], b: List[float]) -> float:
-    try:
-        va = np.array(a, dtype=float)
-        vb = np.array(b, dtype=float)
-        denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
-        if denom == 0:
-            return 0.0
-        return float(np.dot(va, vb) / denom)
-    except Exception:
-        return 0.0
-
-
-def _recency_weight(ts: Any) -> float:
-    import datetime
-
-    if not ts:
-        return 1.0
-    if isinstance(ts, str):
-        try:
-            ts = datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        except ValueError:
-            return 1.0
-    if ts.tzinfo is None:
-        ts = ts.replace(tzinfo=datetime.timezone.utc)
-    now = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc)
-    age_days = (now - ts).days
-    return float(0.5 ** (age_days / RECENCY_HALFLIFE_DAYS))
+def _parse_vec(raw: Any) -> np.ndarray:
+    return parse_pgvector(raw)
 
 
 def _chunk_text(text: str, max_len: int = 280) -> List[str]:
@@ -88,34 +157,26 @@ def _chunk_text(text: str, max_len: int = 280) -> List[str]:
 
 
 def _diversity_filter(scored_items: List[Tuple[float, Dict[str, Any]]], top_k: int) -> List[Dict[str, Any]]:
-    selected: List[Dict[str, Any]] = []
-    vecs: List[List[float]] = []
-
-    for score, item in scored_items:
-        if len(selected) >= top_k:
-            break
-        vec = item.get("vec")
-        if not vec:
-            continue
-        diverse = True
-        for prev in vecs:
-            if _sim(prev, vec) > 0.92:
-                diverse = False
-                break
-        if diverse:
-            selected.append({"score": score, **item})
-            vecs.append(vec)
-    if len(selected) < top_k:
-        for score, item in scored_items:
-            if len(selected) >= top_k:
-                break
-            candidate = {"score": score, **item}
-            if candidate not in selected:
-                selected.append(candidate)
-    return selected[:top_k]
+    """MMR over the best MMR_POOL candidates; `scored_items` must be sorted by score."""
+
+    pool = scored_items[: max(MMR_POOL, top_k)]
+    if not pool:
+        return []
+    matrix = stack_vectors([item.get("vec") if item.get("vec") is not None else [] for _, item in pool])
+    relevance = np.array([score for score, _ in pool], dtype=np.float32)
+    picks = mmr_select(
+        relevance,
+        matrix @ matrix.T,
+        top_k,
+        lambda_=MMR_LAMBDA,
+        duplicate_threshold=DUPLICATE_THRESHOLD,
+    )
+    return [{"score": pool[index][0], **pool[index][1]} for index in picks]
 
 
 async def _fetch_sources(person_id: str) -> List[Dict[str, Any]]:
+    """Latest journal vectors for in-process scoring; surfaces without vectors come from the lexical leg."""
+
     journals = await q(
         """
         SELECT je.id, je.content, je.ts,
@@ -129,45 +190,6 @@ async def _fetch_sources(person_id: str) -> List[Dict[str, Any]]:
         person_id,
     )
 
-    reflections = await q(
-        """
-        SELECT id, content, theme, created_at
-        FROM reflections
-        WHERE user_id = $1
-        ORDER BY created_at DESC
-        LIMIT 100
-        """,
-        person_id,
-    )
-
-    themes = await q(
-        """
-        SELECT id, name, description
-        FROM themes
-        WHERE person_id = $1
-        """,
-        person_id,
-    )
-
-    facts = await q(
-        """
-        SELECT id, key, value
-        FROM facts
-        WHERE person_id = $1
-        LIMIT 100
-        """,
-        person_id,
-    )
-
-    nodes = await q(
-        """
-        SELECT id, node_kind, label, data
-        FROM memory_nodes
-        WHERE person_id = $1
-        """,
-        person_id,
-    )
-
     sources: List[Dict[str, Any]] = []
 
     for row in journals:
@@ -181,85 +203,188 @@ async def _fetch_sources(person_id: str) -> List[Dict[str, Any]]:
             }
         )
 
-    for row in reflections:
-        sources.append(
-            {
-                "type": "reflection",
-                "id": row["id"],
-                "text": f"{row.get('content') or ''} [{row.get('theme') or 'general'}]",
-                "vec": [],
-                "ts": row.get("created_at"),
-            }
-        )
+    return sources
 
-    for row in themes:
-        sources.append(
-            {
-                "type": "theme",
-                "id": row["id"],
-                "text": f"{row.get('name') or ''} — {row.get('description') or ''}",
-                "vec": [],
-                "ts": None,
-            }
-        )
 
-    for row in facts:
-        sources.append(
-            {
-                "type": "fact",
-                "id": row["id"],
-                "text": f"{row.get('key')}: {row.get('value')}",
-                "vec": [],
-                "ts": None,
-            }
-        )
+def _score_sources(sources: List[Dict[str, Any]], query_vec: List[float]) -> List[Tuple[float, Dict[str, Any]]]:
+    # Hard rule: never embed stored rows at read-time; rows without a stored vector are skipped.
+    candidates = [src for src in sources if src.get("vec") is not None and len(src["vec"])]
+    if not candidates:
+        return []
+    similarities = cosine_scores(query_vec, stack_vectors([src["vec"] for src in candidates]))
+    surface = np.array([SURFACE_WEIGHTS.get(src["type"], 1.0) for src in candidates], dtype=np.float32)
+    recency = recency_weights([src.get("ts") for src in candidates], RECENCY_HALFLIFE_DAYS)
+    scores = similarities * surface * recency
 
-    for row in nodes:
-        sources.append(
-            {
-                "type": "node",
-                "id": row["id"],
-                "text": f"{row.get('node_kind')}: {row.get('label')}",
-                "vec": [],
-                "ts": None,
-            }
-        )
+    scored: List[Tuple[float, Dict[str, Any]]] = []
+    for index, src in enumerate(candidates):
+        for chunk in _chunk_text(src.get("text") or ""):
+            scored.append(
+                (
+                    float(scores[index]),
+                    {
+                        "type": src["type"],
+                        "id": src["id"],
+                        "text": chunk,
+                        "vec": src["vec"],
+                        "raw_similarity": float(similarities[index]),
+                        "recency_weight": float(recency[index]),
+                        "surface_weight": float(surface[index]),
+                    },
+                )
+            )
+    return scored
 
-    return sources
 
+async def _score_in_sql(person_id: str, query_vec: List[float], k: int) -> List[Tuple[float, Dict[str, Any]]]:
+    """
+    Nearest journal entries by cosine distance (index-backed, whole history),
+    reweighted by surface and recency in SQL; top k*4 come back for the
+    diversity filter.
+    """
 
-async def recall_advanced(person_id: str, query: str, *, k: int = 8) -> List[Dict[str, Any]]:
-    query_vec = await _get_embedding(query)
-    sources = await _fetch_sources(person_id)
+    candidates = max(ANN_CANDIDATES, k * 4)
+    pool = await get_pool()
+    async with pool.acquire() as connection:
+        # set_config(..., true) lasts until the end of this transaction only.
+        async with connection.transaction():
+            await connection.execute(_SQL_ANN_SETTINGS, str(min(candidates, MAX_EF_SEARCH)))
+            rows = await connection.fetch(
+                _SQL_RECALL,
+                person_id,
+                query_vec,
+                candidates,
+                SURFACE_WEIGHTS["journal"],
+                float(RECENCY_HALFLIFE_DAYS),
+                k * 4,
+            )
     scored: List[Tuple[float, Dict[str, Any]]] = []
-
-    for src in sources:
-        weight = SURFACE_WEIGHTS.get(src["type"], 1.0)
-        recency = _recency_weight(src.get("ts"))
-        chunks = _chunk_text(src.get("text") or "")
-        stored_vec = src.get("vec") or []
-        for chunk in chunks:
-            # Hard rule: never embed stored rows at read-time.
-            # If a source row does not already have a stored vector, skip it.
-            if not stored_vec:
-                continue
-            vec = stored_vec
-            sim = _sim(query_vec, vec)
-            final_score = sim * weight * recency
+    for row in rows:
+        vec = _parse_vec(row.get("vec"))
+        for chunk in _chunk_text(row.get("content") or ""):
             scored.append(
                 (
-                    final_score,
+                    float(row["score"]),
                     {
-                        "type": src["type"],
-                        "id": src["id"],
+                        "type": "journal",
+                        "id": row["id"],
                         "text": chunk,
                         "vec": vec,
-                        "raw_similarity": sim,
-                        "recency_weight": recency,
-                        "surface_weight": weight,
+                        "raw_similarity": float(row["similarity"]),
+                        "recency_weight": float(row["recency_weight"]),
+                        "surface_weight": float(row["surface_weight"]),
                     },
                 )
             )
+    return scored
+
+
+async def _score_in_index(person_id: str, query_vec: List[float], k: int) -> List[Tuple[float, Dict[str, Any]]]:
+    """Nearest journal entries from the in-process index; only their text and timestamps come from Postgres."""
+
+    index = await vector_index.get_vector_index().get(person_id)
+    nearest = index.search(query_vec, max(ANN_CANDIDATES, k * 4))
+    if not nearest:
+        return []
+    rows = await q(
+        "SELECT id, content, ts FROM journal_entries WHERE user_id = $1 AND id = ANY($2::uuid[])",
+        person_id,
+        [entry_id for entry_id, _ in nearest],
+    )
+    sources = [
+        {"type": "journal", "id": row["id"], "text": row.get("content") or "", "vec": index.vector(row["id"]), "ts": row.get("ts")}
+        for row in rows
+        if row["id"] in index
+    ]
+    return _score_sources(sources, query_vec)
+
+
+async def _lexical_candidates(person_id: str, query: str) -> List[Tuple[float, Dict[str, Any]]]:
+    """Full-text matches on every surface, weighted by surface and recency like the vector leg."""
+
+    if not LEXICAL_RECALL or not (query or "").strip():
+        return []
+    try:
+        rows = await q(_SQL_LEXICAL, person_id, query, LEXICAL_CANDIDATES)
+    except Exception as exc:
+        LOGGER.warning("[Recall] lexical search failed, vector ranking only: %s", exc)
+        return []
+    if not rows:
+        return []
+    surface = np.array([SURFACE_WEIGHTS.get(row["type"], 1.0) for row in rows], dtype=np.float32)
+    recency = recency_weights([row.get("ts") for row in rows], RECENCY_HALFLIFE_DAYS)
+    scores = np.array([float(row.get("rank") or 0.0) for row in rows], dtype=np.float32) * surface * recency
+
+    scored: List[Tuple[float, Dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        for chunk in _chunk_text(row.get("text") or ""):
+            scored.append(
+                (
+                    float(scores[index]),
+                    {
+                        "type": row["type"],
+                        "id": row["id"],
+                        "text": chunk,
+                        "vec": None,
+                        "lexical_score": float(row.get("rank") or 0.0),
+                        "recency_weight": float(recency[index]),
+                        "surface_weight": float(surface[index]),
+                    },
+                )
+            )
+    return scored
+
+
+def _fuse(vector: List[Tuple[float, Dict[str, Any]]], lexical: List[Tuple[float, Dict[str, Any]]]) -> List[Tuple[float, Dict[str, Any]]]:
+    """
+    Reciprocal-rank fusion of the two legs by document. Chunks of a document
+    share its fused score; a document both legs found keeps the vector leg's
+    chunks, which carry the embedding the diversity filter needs.
+    """
+
+    chunks: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    owner: Dict[Tuple[str, str], int] = {}
+    ranks: List[Dict[Tuple[str, str], int]] = []
+    for leg, scored in enumerate((vector, lexical)):
+        order: Dict[Tuple[str, str], int] = {}
+        for _, item in sorted(scored, key=lambda entry: entry[0], reverse=True):
+            key = (item["type"], str(item["id"]))
+            order.setdefault(key, len(order) + 1)
+            if owner.setdefault(key, leg) == leg:
+                chunks.setdefault(key, []).append(item)
+        ranks.append(order)
+
+    fused = reciprocal_rank_fusion([list(order) for order in ranks], k=RRF_K)
+    return [
+        (fused[key], {**item, "vector_rank": ranks[0].get(key), "lexical_rank": ranks[1].get(key)})
+        for key, items in chunks.items()
+        for item in items
+    ]
+
+
+async def _vector_candidates(person_id: str, query_vec: List[float], k: int) -> List[Tuple[float, Dict[str, Any]]]:
+    if vector_index.ENABLED and any(query_vec):
+        return await _score_in_index(person_id, query_vec, k)
+    if RECALL_MODE == "sql" and any(query_vec):
+        return await _score_in_sql(person_id, query_vec, k)
+    return _score_sources(await _fetch_sources(person_id), query_vec)
+
+
+async def recall_advanced(
+    person_id: str,
+    query: str,
+    *,
+    k: int = 8,
+    query_vec: List[float] | None = None,
+) -> List[Dict[str, Any]]:
+    if not query_vec:
+        query_vec = await _get_embedding(query)
+    scored, lexical = await asyncio.gather(
+        _vector_candidates(person_id, query_vec, k),
+        _lexical_candidates(person_id, query),
+    )
+    if LEXICAL_RECALL:
+        scored = _fuse(scored, lexical)
 
     scored.sort(key=lambda item: item[0], reverse=True)
     top = _diversity_filter(scored, top_k=k)
@@ -273,8 +398,8 @@ async def recall_advanced(person_id: str, query: str, *, k: int = 8) -> List[Dic
     return top
 
 
-async def build_recall_context(person_id: str, text: str) -> str:
-    top_items = await recall_advanced(person_id, text, k=5)
+async def build_recall_context(person_id: str, text: str, *, query_vec: List[float] | None = None) -> str:
+    top_items = await recall_advanced(person_id, text, k=5, query_vec=query_vec)
     if not top_items:
         return "Relevant memory: none."
 
@@ -302,12 +427,18 @@ async def build_recall_context(person_id: str, text: str) -> str:
     return summary[:1000]
 
 
-async def memory_recall(person_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+async def memory_recall(
+    person_id: str,
+    query: str,
+    limit: int = 10,
+    *,
+    query_vec: List[float] | None = None,
+) -> List[Dict[str, Any]]:
     """
     Compatibility helper for Patch DD: returns top-N recall items.
     """
 
-    items = await recall_advanced(person_id, query, k=limit)
+    items = await recall_advanced(person_id, query, k=limit, query_vec=query_vec)
     return [
         {
             "id": item.get("id"),
@@ -319,20 +450,28 @@ async def memory_recall(person_id: str, query: str, limit: int = 10) -> List[Dic
     ]
 
 
-async def unified_recall(person_id: str, query: str, *, limit: int = 10) -> List[Dict[str, Any]]:
+async def unified_recall(
+    person_id: str,
+    query: str,
+    *,
+    limit: int = 10,
+    query_vec: List[float] | None = None,
+) -> List[Dict[str, Any]]:
     """
     Highest-level recall entry:
       1. Advanced recall
       2. Falls back to hybrid journal recall (legacy) if empty
     """
 
-    top = await recall_advanced(person_id, query, k=limit)
+    if not query_vec:
+        query_vec = await _get_embedding(query)
+    top = await recall_advanced(person_id, query, k=limit, query_vec=query_vec)
     if top:
         return top
     try:
         from sakhi.libs.retrieval.recall import recall as low_recall
 
-        embedding = await _get_embedding(query)
+        embedding = query_vec
         rows = await low_recall(person_id, query, k=limit, embedding=embedding)
         return rows
     except Exception as exc:
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, List
 
 import numpy as np
 
 from sakhi.apps.api.core.cache import cached
 from sakhi.apps.api.core.db import q as dbfetch
-from sakhi.libs.embeddings import embed_text
+from sakhi.libs.embeddings import embed_text, parse_pgvector
 
 
 @cached(ttl=600)
@@ -41,7 +40,7 @@ async def get_relevant_longterm_slice(
         if embedding is None:
             continue
 
-        vector = np.array(embedding, dtype=float)
+        vector = embedding
         vector_norm = np.linalg.norm(vector)
         if vector_norm == 0 or np.isnan(vector_norm):
             continue
@@ -59,16 +58,6 @@ async def get_relevant_longterm_slice(
     return scored[: max(top_k, 0)]
 
 
-def _coerce_embedding(value: Any) -> Iterable[float] | None:
-    if value is None:
-        return None
-    if isinstance(value, (list, tuple)):
-        return value
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            if isinstance(parsed, (list, tuple)):
-                return parsed
-        except json.JSONDecodeError:
-            return None
-    return None
+def _coerce_embedding(value: Any) -> np.ndarray | None:
+    vector = parse_pgvector(value)
+    return vector if vector.size else None
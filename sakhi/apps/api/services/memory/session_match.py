@@ -3,7 +3,10 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Sequence, Tuple
 
-from sakhi.libs.embeddings import embed_text, parse_pgvector
+import numpy as np
+
+from sakhi.apps.api.core.query_embedding import embed_query
+from sakhi.libs.embeddings import parse_pgvector
 from sakhi.libs.schemas.db import get_async_pool
 
 SIM_MATCH = 0.80
@@ -40,7 +43,7 @@ async def best_match(user_id: str, text: str) -> Tuple[Optional[Dict], float]:
     if not candidates:
         return None, 0.0
 
-    query_vec = await embed_text(text)
+    query_vec = await embed_query(text)
     best: Optional[Dict] = None
     best_score = 0.0
     now = datetime.now(timezone.utc)
@@ -65,11 +68,11 @@ async def best_match(user_id: str, text: str) -> Tuple[Optional[Dict], float]:
 
 
 def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    if not a or not b:
+    va = np.asarray(a, dtype=np.float32)
+    vb = np.asarray(b, dtype=np.float32)
+    if not va.size or not vb.size:
         return 0.0
-    numerator = sum(x * y for x, y in zip(a, b))
-    denom_a = sum(x * x for x in a) ** 0.5
-    denom_b = sum(y * y for y in b) ** 0.5
-    if denom_a == 0 or denom_b == 0:
+    denom = float(np.linalg.norm(va) * np.linalg.norm(vb))
+    if denom == 0:
         return 0.0
-    return numerator / (denom_a * denom_b)
+    return float(np.dot(va, vb) / denom)
@@ -0,0 +1,404 @@
+"""
+Optional in-process index of each active person's journal vectors
+(SAKHI_VECTOR_INDEX=1).
+
+Each person's vectors live in a flat float16 matrix of unit rows, searched
+exactly with one matmul per block. Indexes sit in an LRU of active persons.
+They warm lazily from `journal_embeddings` and take new vectors write-through
+from the embedding writers. Writers publish the touched entry ids on a Redis
+channel, and every replica re-reads those rows, so replicas stay coherent. A
+TTL bounds staleness from writers that bypass these hooks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sakhi.apps.api.core.db import q
+from sakhi.apps.api.core.metrics import vector_index_lookups, vector_index_warm_latency
+from sakhi.libs.embeddings import parse_pgvector
+
+LOGGER = logging.getLogger(__name__)
+
+ENABLED = os.getenv("SAKHI_VECTOR_INDEX", "0") == "1"
+CHANNEL = "sakhi:vector-index"
+JOURNAL_VECTOR_DIM = 1536
+# Rows converted to float32 at a time while searching.
+_SEARCH_BLOCK = 4096
+_REDIS_RETRY_S = 30.0
+# Tags this process's own invalidations so the listener can skip them.
+_REPLICA_ID = uuid.uuid4().hex
+
+Loader = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+
+class PersonVectorIndex:
+    """One person's journal vectors: exact cosine search over a float16 matrix."""
+
+    def __init__(self, dim: int = JOURNAL_VECTOR_DIM) -> None:
+        self.dim = dim
+        self.loaded_at = time.monotonic()
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, dim), dtype=np.float16)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entry_id: object) -> bool:
+        return str(entry_id) in self._rows
+
+    def upsert(self, entry_id: Any, vector: Any) -> None:
+        """Add or replace one entry's vector; empty or all-zero vectors remove it."""
+
+        key = str(entry_id)
+        unit = np.zeros(self.dim, dtype=np.float32)
+        values = parse_pgvector(vector)[: self.dim]
+        unit[: values.size] = values
+        norm = float(np.linalg.norm(unit))
+        if norm == 0.0:
+            self.remove([key])
+            return
+        unit /= norm
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._matrix):
+                grown = np.zeros((max(64, row * 2), self.dim), dtype=np.float16)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._ids.append(key)
+            self._rows[key] = row
+        self._matrix[row] = unit
+
+    def remove(self, entry_ids: Iterable[Any]) -> None:
+        for entry_id in entry_ids:
+            row = self._rows.pop(str(entry_id), None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+                self._matrix[row] = self._matrix[last]
+            self._ids.pop()
+
+    def vector(self, entry_id: Any) -> Optional[np.ndarray]:
+        row = self._rows.get(str(entry_id))
+        return None if row is None else self._matrix[row].astype(np.float32)
+
+    def search(self, query: Sequence[float], n: int) -> List[Tuple[str, float]]:
+        """The `n` nearest entries to `query` as (entry_id, cosine), best first."""
+
+        size = len(self._ids)
+        unit = np.zeros(self.dim, dtype=np.float32)
+        values = np.asarray(query, dtype=np.float32)[: self.dim]
+        unit[: values.size] = values
+        norm = float(np.linalg.norm(unit))
+        if not size or n <= 0 or norm == 0.0:
+            return []
+        unit /= norm
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, _SEARCH_BLOCK):
+            stop = min(size, start + _SEARCH_BLOCK)
+            scores[start:stop] = self._matrix[start:stop].astype(np.float32) @ unit
+        n = min(n, size)
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[row], float(scores[row])) for row in top]
+
+
+async def _load_journal_vectors(person_id: str) -> List[Dict[str, Any]]:
+    return await q(
+        """
+        SELECT emb.entry_id AS id, emb.embedding_vec AS vec
+        FROM journal_embeddings emb
+        JOIN journal_entries je ON je.id = emb.entry_id
+        WHERE je.user_id = $1
+          AND emb.embedding_vec IS NOT NULL
+        """,
+        person_id,
+    )
+
+
+async def _load_entry_vectors(entry_ids: List[str]) -> List[Dict[str, Any]]:
+    return await q(
+        "SELECT entry_id AS id, embedding_vec AS vec FROM journal_embeddings WHERE entry_id = ANY($1::uuid[])",
+        entry_ids,
+    )
+
+
+def _consume_result(task: "asyncio.Task[Any]") -> None:
+    """Mark a warm-up's failure as retrieved when every caller has gone."""
+
+    if not task.cancelled():
+        task.exception()
+
+
+class VectorIndexRegistry:
+    """
+    LRU of per-person indexes. Concurrent misses for one person share a warm;
+    writes that land while it runs are replayed onto the result.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_persons: int = 64,
+        ttl_s: float = 600.0,
+        dim: int = JOURNAL_VECTOR_DIM,
+        loader: Loader | None = None,
+    ) -> None:
+        self.max_persons = max_persons
+        self.ttl_s = ttl_s
+        self.dim = dim
+        self._loader = loader or _load_journal_vectors
+        self._indexes: OrderedDict[str, PersonVectorIndex] = OrderedDict()
+        self._warming: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, List[Tuple[str, Any]]] = {}
+        self._stale: set[str] = set()
+
+    @classmethod
+    def from_env(cls) -> "VectorIndexRegistry":
+        return cls(
+            max_persons=int(os.getenv("SAKHI_VECTOR_INDEX_PERSONS", "64")),
+            ttl_s=float(os.getenv("SAKHI_VECTOR_INDEX_TTL_S", "600")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def tracks(self, person_id: str) -> bool:
+        """Whether an index for the person is loaded or being warmed."""
+
+        return self.peek(person_id) is not None or str(person_id) in self._warming
+
+    def peek(self, person_id: str) -> Optional[PersonVectorIndex]:
+        index = self._indexes.get(str(person_id))
+        if index is not None and time.monotonic() - index.loaded_at > self.ttl_s:
+            self._indexes.pop(str(person_id), None)
+            return None
+        return index
+
+    async def get(self, person_id: str) -> PersonVectorIndex:
+        key = str(person_id)
+        index = self.peek(key)
+        if index is not None:
+            self._indexes.move_to_end(key)
+            vector_index_lookups.labels(result="hit").inc()
+            return index
+        task = self._warming.get(key)
+        if task is not None:
+            vector_index_lookups.labels(result="coalesced").inc()
+        else:
+            vector_index_lookups.labels(result="warm").inc()
+            self._pending[key] = []
+            # Detached: a caller cancelled mid-warm (e.g. at a stage deadline)
+            # must not cancel the other callers waiting for the same person.
+            task = self._warming[key] = asyncio.get_running_loop().create_task(self._warm(key))
+            task.add_done_callback(_consume_result)
+        return await asyncio.shield(task)
+
+    async def _warm(self, key: str) -> PersonVectorIndex:
+        started = time.perf_counter()
+        try:
+            rows = await self._loader(key)
+            index = PersonVectorIndex(self.dim)
+            for row in rows or []:
+                index.upsert(row["id"], row.get("vec"))
+            for entry_id, vector in self._pending[key]:
+                index.upsert(entry_id, vector)
+        finally:
+            self._warming.pop(key, None)
+            self._pending.pop(key, None)
+            vector_index_warm_latency.observe(time.perf_counter() - started)
+
+        if key in self._stale:
+            self._stale.discard(key)
+        else:
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_persons:
+                self._indexes.popitem(last=False)
+        return index
+
+    def apply(self, person_id: str, entry_id: Any, vector: Any) -> None:
+        """Write-through for a vector just stored for `entry_id` (None removes it)."""
+
+        key = str(person_id)
+        if key in self._pending:
+            self._pending[key].append((str(entry_id), vector))
+        index = self.peek(key)
+        if index is not None:
+            index.upsert(entry_id, vector)
+
+    def forget(self, person_id: str, entry_ids: Iterable[Any]) -> None:
+        key = str(person_id)
+        entry_ids = [str(entry_id) for entry_id in entry_ids]
+        if key in self._pending:
+            self._pending[key].extend((entry_id, None) for entry_id in entry_ids)
+        index = self.peek(key)
+        if index is not None:
+            index.remove(entry_ids)
+
+    def invalidate(self, person_id: str) -> None:
+        key = str(person_id)
+        self._indexes.pop(key, None)
+        if key in self._warming:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+_REGISTRY: VectorIndexRegistry | None = None
+_redis = None
+_redis_down_until = 0.0
+
+
+def get_vector_index() -> VectorIndexRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = VectorIndexRegistry.from_env()
+    return _REGISTRY
+
+
+def _get_redis():
+    global _redis
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url or time.monotonic() < _redis_down_until:
+        return None
+    if _redis is None:
+        from redis import asyncio as aioredis
+
+        _redis = aioredis.from_url(redis_url, decode_responses=True)
+    return _redis
+
+
+async def _publish(person_id: str, entry_ids: Optional[List[str]]) -> None:
+    global _redis_down_until
+    redis = _get_redis()
+    if redis is None:
+        return
+    payload = {"origin": _REPLICA_ID, "person_id": str(person_id), "entry_ids": entry_ids}
+    try:
+        await redis.publish(CHANNEL, json.dumps(payload))
+    except Exception as exc:
+        LOGGER.warning("[vector-index] invalidation publish failed, retrying in %ss: %s", _REDIS_RETRY_S, exc)
+        _redis_down_until = time.monotonic() + _REDIS_RETRY_S
+
+
+async def note_journal_vector(person_id: Optional[str], entry_id: Any, vector: Any) -> None:
+    """Record a journal vector just written for `entry_id` and tell other replicas."""
+
+    if not ENABLED or not person_id or not entry_id:
+        return
+    get_vector_index().apply(person_id, entry_id, vector)
+    await _publish(person_id, [str(entry_id)])
+
+
+async def forget_journal_vectors(person_id: Optional[str], entry_ids: Iterable[Any]) -> None:
+    """Drop deleted entries from the person's index here and on other replicas."""
+
+    entry_ids = [str(entry_id) for entry_id in entry_ids]
+    if not ENABLED or not person_id or not entry_ids:
+        return
+    get_vector_index().forget(person_id, entry_ids)
+    await _publish(person_id, entry_ids)
+
+
+async def handle_invalidation(message: Dict[str, Any]) -> None:
+    """
+    Apply another replica's write: re-read the named entries (rows that are
+    gone are removed), or drop the whole index when no ids are given.
+    """
+
+    if message.get("origin") == _REPLICA_ID or not message.get("person_id"):
+        return
+    registry = get_vector_index()
+    person_id = str(message["person_id"])
+    entry_ids = [str(entry_id) for entry_id in message.get("entry_ids") or []]
+    if not entry_ids:
+        registry.invalidate(person_id)
+        return
+    if not registry.tracks(person_id):
+        return
+    try:
+        rows = await _load_entry_vectors(entry_ids)
+    except Exception as exc:
+        LOGGER.warning("[vector-index] refresh failed person=%s, dropping index: %s", person_id, exc)
+        registry.invalidate(person_id)
+        return
+    found = {str(row["id"]): row.get("vec") for row in rows or []}
+    for entry_id in entry_ids:
+        registry.apply(person_id, entry_id, found.get(entry_id))
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Subscribe to the invalidation channel until cancelled, reconnecting on
+    errors. Returns only when REDIS_URL is unset; while Redis is backing off
+    after a failure the listener waits and tries again.
+    """
+
+    try:
+        while True:
+            redis = _get_redis()
+            if redis is None:
+                if not os.getenv("REDIS_URL"):
+                    LOGGER.warning("[vector-index] REDIS_URL unset, invalidation listener exiting")
+                    return
+                await asyncio.sleep(max(_redis_down_until - time.monotonic(), 0.1))
+                continue
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        await handle_invalidation(json.loads(message["data"]))
+                    except Exception as exc:
+                        LOGGER.warning("[vector-index] bad invalidation message: %s", exc)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                LOGGER.warning("[vector-index] listener disconnected, dropping indexes: %s", exc)
+                # Missed messages cannot be replayed; re-warm from the database instead.
+                get_vector_index().clear()
+                await asyncio.sleep(_REDIS_RETRY_S)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+    except asyncio.CancelledError:
+        LOGGER.info("[vector-index] invalidation listener cancelled")
+        raise
+
+
+def start_invalidation_listener() -> Optional[asyncio.Task]:
+    if not ENABLED or _get_redis() is None:
+        return None
+    return asyncio.create_task(listen_for_invalidations())
+
+
+__all__ = [
+    "PersonVectorIndex",
+    "VectorIndexRegistry",
+    "forget_journal_vectors",
+    "get_vector_index",
+    "handle_invalidation",
+    "listen_for_invalidations",
+    "note_journal_vector",
+    "start_invalidation_listener",
+]
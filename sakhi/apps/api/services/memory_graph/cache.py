@@ -0,0 +1,362 @@
+"""
+Optional in-process cache of each active person's memory graph
+(SAKHI_GRAPH_CACHE=1).
+
+Nodes and edges are kept as flat lists that the bulk writers in graph.py
+update write-through. Queries run on a CSR adjacency (NumPy offset, neighbour,
+weight and relation arrays, both directions), rebuilt lazily after writes, so
+neighbourhoods, top neighbours and components cost no queries. Deletes
+(consolidation merges) drop the person's graph; writers on other replicas are
+picked up when the TTL expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from sakhi.apps.api.core.db import q
+from sakhi.apps.api.core.metrics import graph_cache_lookups, graph_cache_warm_latency
+
+LOGGER = logging.getLogger(__name__)
+
+ENABLED = os.getenv("SAKHI_GRAPH_CACHE", "0") == "1"
+
+Loader = Callable[[str], Awaitable[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]]
+_EPOCH = float("-inf")
+
+
+class _Adjacency:
+    """CSR view of an undirected edge list: row i's neighbours are indices[indptr[i]:indptr[i+1]]."""
+
+    __slots__ = ("indptr", "indices", "weights", "relations", "src", "dst")
+
+    def __init__(self, size: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray, relations: np.ndarray) -> None:
+        self.src = src
+        self.dst = dst
+        rows = np.concatenate([src, dst])
+        order = np.argsort(rows, kind="stable")
+        self.indices = np.concatenate([dst, src])[order]
+        self.weights = np.concatenate([weights, weights])[order]
+        self.relations = np.concatenate([relations, relations])[order]
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=self.indptr[1:])
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """Positions in `indices` of every neighbour slot of `rows`."""
+
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+        return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+
+class PersonGraph:
+    """One person's memory graph with k-hop, top-N and component queries."""
+
+    def __init__(self) -> None:
+        self.loaded_at = time.monotonic()
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._nodes: List[Dict[str, Any]] = []
+        self._edges: Dict[Tuple[int, int, str], float] = {}
+        self._relation_codes: Dict[str, int] = {}
+        self._adjacency: Optional[_Adjacency] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return str(node_id) in self._rows
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def add_nodes(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add nodes or refresh the fields present on already-known ones."""
+
+        for row in rows:
+            key = str(row["id"])
+            fields = {name: row[name] for name in ("node_kind", "label", "data", "created_at") if name in row}
+            index = self._rows.get(key)
+            if index is not None:
+                self._nodes[index].update(fields)
+                continue
+            self._rows[key] = len(self._ids)
+            self._ids.append(key)
+            self._nodes.append({"id": key, **fields})
+            self._adjacency = None
+
+    def add_edges(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert or re-weight edges; edges with an unknown endpoint are skipped and counted."""
+
+        skipped = 0
+        for row in rows:
+            src = self._rows.get(str(row["from_node"]))
+            dst = self._rows.get(str(row["to_node"]))
+            if src is None or dst is None:
+                skipped += 1
+                continue
+            relation = row.get("relation") or ""
+            self._relation_codes.setdefault(relation, len(self._relation_codes))
+            self._edges[(src, dst, relation)] = float(row.get("weight") or 0.0)
+            self._adjacency = None
+        return skipped
+
+    def _csr(self) -> _Adjacency:
+        if self._adjacency is None:
+            keys = list(self._edges)
+            count = len(keys)
+            src = np.fromiter((key[0] for key in keys), dtype=np.int64, count=count)
+            dst = np.fromiter((key[1] for key in keys), dtype=np.int64, count=count)
+            relations = np.fromiter((self._relation_codes[key[2]] for key in keys), dtype=np.int32, count=count)
+            weights = np.fromiter(self._edges.values(), dtype=np.float32, count=count)
+            self._adjacency = _Adjacency(len(self._ids), src, dst, weights, relations)
+        return self._adjacency
+
+    def neighborhood(self, node_id: Any, hops: int = 1) -> Dict[str, int]:
+        """Nodes within `hops` edges of `node_id` (either direction), mapped to their distance."""
+
+        start = self._rows.get(str(node_id))
+        if start is None:
+            return {}
+        adjacency = self._csr()
+        distance = np.full(len(self._ids), -1, dtype=np.int32)
+        distance[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        for hop in range(1, max(0, hops) + 1):
+            reached = adjacency.indices[adjacency.gather(frontier)]
+            frontier = np.unique(reached[distance[reached] < 0])
+            if not frontier.size:
+                break
+            distance[frontier] = hop
+        return {self._ids[row]: int(distance[row]) for row in np.flatnonzero(distance >= 0)}
+
+    def top_neighbors(self, node_id: Any, n: int = 5, *, relation: str | None = None) -> List[Tuple[str, float]]:
+        """The `n` most strongly linked neighbours as (node_id, weight), strongest edge per neighbour."""
+
+        row = self._rows.get(str(node_id))
+        if row is None or n <= 0:
+            return []
+        adjacency = self._csr()
+        start, stop = adjacency.indptr[row], adjacency.indptr[row + 1]
+        neighbours = adjacency.indices[start:stop]
+        weights = adjacency.weights[start:stop]
+        if relation is not None:
+            code = self._relation_codes.get(relation)
+            keep = adjacency.relations[start:stop] == code
+            neighbours, weights = neighbours[keep], weights[keep]
+        order = np.argsort(-weights, kind="stable")
+        neighbours, weights = neighbours[order], weights[order]
+        _, first = np.unique(neighbours, return_index=True)
+        first = np.sort(first)[:n]
+        return [(self._ids[neighbours[i]], float(weights[i])) for i in first]
+
+    def components(self, min_size: int = 1) -> List[List[str]]:
+        """Connected components (edges taken as undirected), largest first."""
+
+        size = len(self._ids)
+        if not size:
+            return []
+        adjacency = self._csr()
+        src, dst = adjacency.src, adjacency.dst
+        labels = np.arange(size, dtype=np.int64)
+        # Min-label propagation with pointer jumping: every node ends up
+        # labelled with the smallest row in its component.
+        while True:
+            lowest = np.minimum(labels[src], labels[dst])
+            updated = labels.copy()
+            np.minimum.at(updated, src, lowest)
+            np.minimum.at(updated, dst, lowest)
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        order = np.argsort(labels, kind="stable")
+        _, starts = np.unique(labels[order], return_index=True)
+        groups = [order[a:b] for a, b in zip(starts, list(starts[1:]) + [size])]
+        groups.sort(key=len, reverse=True)
+        return [[self._ids[row] for row in group] for group in groups if len(group) >= min_size]
+
+    def recent(self, n: int = 5) -> List[Dict[str, Any]]:
+        """The `n` newest nodes, like ORDER BY created_at DESC."""
+
+        def created(node: Dict[str, Any]) -> float:
+            value = node.get("created_at")
+            return value.timestamp() if hasattr(value, "timestamp") else _EPOCH
+
+        return [dict(node) for node in heapq.nlargest(n, self._nodes, key=created)]
+
+    def nodes(self) -> List[Dict[str, Any]]:
+        return [dict(node) for node in self._nodes]
+
+    def edges(self) -> List[Dict[str, Any]]:
+        return [
+            {"from_node": self._ids[src], "to_node": self._ids[dst], "relation": relation, "weight": weight}
+            for (src, dst, relation), weight in self._edges.items()
+        ]
+
+
+async def _load_graph(person_id: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    nodes = await q(
+        "SELECT id, node_kind, label, data, created_at FROM memory_nodes WHERE person_id = $1",
+        person_id,
+    )
+    edges = await q(
+        "SELECT from_node, to_node, relation, weight FROM memory_edges WHERE person_id = $1",
+        person_id,
+    )
+    return nodes, edges
+
+
+def _consume_result(task: "asyncio.Task[Any]") -> None:
+    """Mark a warm-up's failure as retrieved when every caller has gone."""
+
+    if not task.cancelled():
+        task.exception()
+
+
+class GraphCacheRegistry:
+    """
+    LRU of per-person graphs. Concurrent misses for one person share a warm;
+    writes that land while it runs are replayed onto the result.
+    """
+
+    def __init__(self, *, max_persons: int = 64, ttl_s: float = 300.0, loader: Loader | None = None) -> None:
+        self.max_persons = max_persons
+        self.ttl_s = ttl_s
+        self._loader = loader or _load_graph
+        self._graphs: OrderedDict[str, PersonGraph] = OrderedDict()
+        self._warming: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, List[Callable[[PersonGraph], Any]]] = {}
+        self._stale: set[str] = set()
+
+    @classmethod
+    def from_env(cls) -> "GraphCacheRegistry":
+        return cls(
+            max_persons=int(os.getenv("SAKHI_GRAPH_CACHE_PERSONS", "64")),
+            ttl_s=float(os.getenv("SAKHI_GRAPH_CACHE_TTL_S", "300")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    def peek(self, person_id: str) -> Optional[PersonGraph]:
+        graph = self._graphs.get(str(person_id))
+        if graph is not None and time.monotonic() - graph.loaded_at > self.ttl_s:
+            self._graphs.pop(str(person_id), None)
+            return None
+        return graph
+
+    async def get(self, person_id: str) -> PersonGraph:
+        key = str(person_id)
+        graph = self.peek(key)
+        if graph is not None:
+            self._graphs.move_to_end(key)
+            graph_cache_lookups.labels(result="hit").inc()
+            return graph
+        task = self._warming.get(key)
+        if task is not None:
+            graph_cache_lookups.labels(result="coalesced").inc()
+        else:
+            graph_cache_lookups.labels(result="warm").inc()
+            self._pending[key] = []
+            # Detached: a caller cancelled mid-warm (e.g. at a stage deadline)
+            # must not cancel the other callers waiting for the same person.
+            task = self._warming[key] = asyncio.get_running_loop().create_task(self._warm(key))
+            task.add_done_callback(_consume_result)
+        return await asyncio.shield(task)
+
+    async def _warm(self, key: str) -> PersonGraph:
+        started = time.perf_counter()
+        try:
+            nodes, edges = await self._loader(key)
+            graph = PersonGraph()
+            graph.add_nodes(nodes or [])
+            skipped = graph.add_edges(edges or [])
+            if skipped:
+                LOGGER.debug("[graph-cache] person=%s skipped %s edges with missing nodes", key, skipped)
+            for write in self._pending[key]:
+                write(graph)
+        finally:
+            self._warming.pop(key, None)
+            self._pending.pop(key, None)
+            graph_cache_warm_latency.observe(time.perf_counter() - started)
+
+        if key in self._stale:
+            self._stale.discard(key)
+        else:
+            self._graphs[key] = graph
+            while len(self._graphs) > self.max_persons:
+                self._graphs.popitem(last=False)
+        return graph
+
+    def apply(self, person_id: str, write: Callable[[PersonGraph], Any]) -> None:
+        """Write-through onto the person's graph, if loaded or being warmed."""
+
+        key = str(person_id)
+        if key in self._pending:
+            self._pending[key].append(write)
+        graph = self.peek(key)
+        if graph is not None:
+            write(graph)
+
+    def invalidate(self, person_id: str) -> None:
+        key = str(person_id)
+        self._graphs.pop(key, None)
+        if key in self._warming:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        self._graphs.clear()
+
+
+_REGISTRY: GraphCacheRegistry | None = None
+
+
+def get_graph_cache() -> GraphCacheRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = GraphCacheRegistry.from_env()
+    return _REGISTRY
+
+
+def note_nodes(person_id: Optional[str], rows: List[Dict[str, Any]]) -> None:
+    """Record nodes just written (rows as returned by upsert_nodes)."""
+
+    if ENABLED and person_id and rows:
+        get_graph_cache().apply(person_id, lambda graph: graph.add_nodes(rows))
+
+
+def note_edges(person_id: Optional[str], rows: List[Dict[str, Any]]) -> None:
+    """Record edges just written, with the weights the database settled on."""
+
+    if ENABLED and person_id and rows:
+        get_graph_cache().apply(person_id, lambda graph: graph.add_edges(rows))
+
+
+def invalidate_graph(person_id: Optional[str]) -> None:
+    """Drop the person's graph after writes the cache cannot replay (merges, deletes)."""
+
+    if ENABLED and person_id:
+        get_graph_cache().invalidate(person_id)
+
+
+__all__ = [
+    "GraphCacheRegistry",
+    "PersonGraph",
+    "get_graph_cache",
+    "invalidate_graph",
+    "note_edges",
+    "note_nodes",
+]
@@ -9,7 +9,9 @@ from __future__ import annotations
 
 import uuid
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sakhi.apps.api.services.memory_graph import cache as graph_cache
 
 
 def create_node(kind: str, label: str, data: Dict[str, Any] | None = None) -> Dict[str, Any]:
@@ -160,11 +162,114 @@ async def upsert_edge(
     return new_id
 
 
+# Bulk writes: one statement per call, keyed on the unique indexes from
+# infra/sql/20261017_memory_graph_unique_keys.sql.
+_UPSERT_NODES = """
+    WITH input AS (
+        SELECT *
+        FROM unnest($2::uuid[], $3::text[], $4::text[], $5::jsonb[]) AS t(id, node_kind, label, data)
+    ),
+    inserted AS (
+        INSERT INTO memory_nodes (id, person_id, node_kind, label, data)
+        SELECT id, $1, node_kind, label, data FROM input
+        ON CONFLICT (person_id, node_kind, label) DO NOTHING
+        RETURNING id, node_kind, label, data, created_at
+    )
+    SELECT id, node_kind, label, data, created_at FROM inserted
+    UNION ALL
+    SELECT n.id, n.node_kind, n.label, n.data, n.created_at
+    FROM memory_nodes n
+    JOIN input i ON n.node_kind = i.node_kind AND n.label = i.label
+    WHERE n.person_id = $1
+"""
+# Same weight blend as upsert_edge: 0.7 old + 0.3 new.
+_UPSERT_EDGES = """
+    INSERT INTO memory_edges (id, person_id, from_node, to_node, relation, weight)
+    SELECT id, $1, from_node, to_node, relation, weight
+    FROM unnest($2::uuid[], $3::uuid[], $4::uuid[], $5::text[], $6::float8[])
+        AS t(id, from_node, to_node, relation, weight)
+    ON CONFLICT (from_node, to_node, relation) DO UPDATE
+    SET weight = coalesce(memory_edges.weight, 0) * 0.7 + EXCLUDED.weight * 0.3
+    RETURNING from_node, to_node, relation, weight
+"""
+
+
+async def upsert_nodes(db, *, person_id: str, nodes: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    Get-or-create many nodes ({kind, label, data, optional id}) in one
+    statement, keyed on (person_id, kind, label). Returns ids in input order;
+    existing nodes keep their id and data. Kinds are stored as given.
+    """
+
+    if not nodes:
+        return []
+    keys = [(node["kind"], node["label"]) for node in nodes]
+    first: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for key, node in zip(keys, nodes):
+        first.setdefault(key, node)
+
+    ids: Dict[Tuple[str, str], str] = {}
+    written: List[Dict[str, Any]] = []
+    # A node committed concurrently after this statement's snapshot is skipped
+    # by DO NOTHING and invisible to the SELECT; the second pass picks it up.
+    for _ in range(2):
+        missing = [key for key in first if key not in ids]
+        if not missing:
+            break
+        rows = await db.fetch(
+            _UPSERT_NODES,
+            person_id,
+            [str(first[key].get("id") or uuid.uuid4()) for key in missing],
+            [kind for kind, _ in missing],
+            [label for _, label in missing],
+            [first[key].get("data") or {} for key in missing],
+        )
+        for row in rows:
+            ids[(row["node_kind"], row["label"])] = str(row["id"])
+        written.extend(rows)
+    graph_cache.note_nodes(person_id, written)
+
+    unresolved = [key for key in first if key not in ids]
+    if unresolved:
+        raise RuntimeError(f"memory node upsert returned no id for {unresolved[:3]}")
+    return [ids[key] for key in keys]
+
+
+async def upsert_edges(db, *, person_id: str, edges: Sequence[Dict[str, Any]]) -> int:
+    """
+    Insert or reinforce many edges ({from_node, to_node, relation, weight}) in
+    one statement. Repeats within the batch are blended in order first, since
+    one INSERT cannot update the same row twice. Returns the edges written.
+    """
+
+    merged: Dict[Tuple[str, str, str], float] = {}
+    for edge in edges:
+        key = (str(edge["from_node"]), str(edge["to_node"]), edge["relation"])
+        weight = float(edge["weight"])
+        merged[key] = merged[key] * 0.7 + weight * 0.3 if key in merged else weight
+    if not merged:
+        return 0
+
+    rows = await db.fetch(
+        _UPSERT_EDGES,
+        person_id,
+        [str(uuid.uuid4()) for _ in merged],
+        [src for src, _, _ in merged],
+        [dst for _, dst, _ in merged],
+        [relation for _, _, relation in merged],
+        list(merged.values()),
+    )
+    graph_cache.note_edges(person_id, rows)
+    return len(merged)
+
+
 __all__ = [
     "build_graph_from_enrichment",
     "reason_about_graph",
     "get_or_create_node",
     "upsert_edge",
+    "upsert_nodes",
+    "upsert_edges",
 ]
 VALID_KINDS = {"reflection", "thought", "plan", "insight", "event"}
 
@@ -11,6 +11,7 @@ import logging
 from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import get_db
+from sakhi.apps.api.services.memory_graph.graph import upsert_edges, upsert_nodes
 
 LOGGER = logging.getLogger(__name__)
 
@@ -60,42 +61,37 @@ async def persist_memory_graph(person_id: str, graph: Dict[str, Any]) -> None:
 
     db = await get_db()
     try:
-        for node in nodes:
-            try:
-                await db.execute(
-                    """
-                    INSERT INTO memory_nodes (id, person_id, node_kind, label, data)
-                    VALUES ($1, $2, $3, $4, $5::jsonb)
-                    ON CONFLICT (id) DO NOTHING
-                    """,
-                    node["id"],
-                    person_id,
-                    node.get("kind"),
-                    node.get("label"),
-                    node.get("data") or {},
-                )
-            except Exception as exc:  # pragma: no cover - best-effort persistence
-                LOGGER.error("[Patch V] Failed to insert node %s: %s", node.get("id"), exc)
-
-        for edge in edges:
-            try:
-                await db.execute(
-                    """
-                    INSERT INTO memory_edges (person_id, from_node, to_node, relation)
-                    VALUES ($1, $2, $3, $4)
-                    """,
-                    person_id,
-                    edge.get("src"),
-                    edge.get("dst"),
-                    edge.get("relation"),
-                )
-            except Exception as exc:  # pragma: no cover
-                LOGGER.error(
-                    "[Patch V] Failed to insert edge %s→%s: %s",
-                    edge.get("src"),
-                    edge.get("dst"),
-                    exc,
-                )
+        # Nodes matching an existing (kind, label) resolve to the stored node;
+        # edges are re-pointed at whichever id came back.
+        ids = await upsert_nodes(
+            db,
+            person_id=person_id,
+            nodes=[
+                {
+                    "id": node["id"],
+                    "kind": node.get("kind"),
+                    "label": node.get("label") or "",
+                    "data": node.get("data") or {},
+                }
+                for node in nodes
+            ],
+        )
+        resolved = {node["id"]: node_id for node, node_id in zip(nodes, ids)}
+        await upsert_edges(
+            db,
+            person_id=person_id,
+            edges=[
+                {
+                    "from_node": resolved.get(edge.get("src"), edge.get("src")),
+                    "to_node": resolved.get(edge.get("dst"), edge.get("dst")),
+                    "relation": edge.get("relation"),
+                    "weight": 0.5,
+                }
+                for edge in edges
+            ],
+        )
+    except Exception as exc:  # pragma: no cover - best-effort persistence
+        LOGGER.error("[Patch V] Failed to persist memory graph for %s: %s", person_id, exc)
     finally:
         await db.close()
 
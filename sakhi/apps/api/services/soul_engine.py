@@ -5,6 +5,7 @@ from collections import Counter
 from typing import Any, Dict, List, Tuple
 
 from sakhi.apps.api.core.db import q
+from sakhi.libs.phrase_index import register_phrases
 
 
 VALUE_MAP = {
@@ -26,6 +27,9 @@ THEME_MAP = {
     "creativity": ["creative", "creativity"],
 }
 
+_VALUE_SETS = {value: register_phrases(f"soul.value.{value}", keywords) for value, keywords in VALUE_MAP.items()}
+_THEME_SETS = {theme: register_phrases(f"soul.theme.{theme}", keywords) for theme, keywords in THEME_MAP.items()}
+
 
 def _normalize_text(text: str) -> str:
     return " ".join((text or "").lower().strip().split())
@@ -62,8 +66,8 @@ async def _fetch_observations(person_id: str) -> List[Dict[str, Any]]:
 def _detect_values(texts: List[str]) -> List[str]:
     counter = Counter()
     for text in texts:
-        for value, keywords in VALUE_MAP.items():
-            if any(k in text for k in keywords):
+        for value, keywords in _VALUE_SETS.items():
+            if keywords.search(text):
                 counter[value] += 1
     if not counter:
         return []
@@ -94,8 +98,8 @@ def _detect_themes(observations: List[Dict[str, Any]]) -> List[str]:
                 date_key = dt.datetime.fromisoformat(ts).date().isoformat()
             except Exception:
                 date_key = None
-        for theme, keywords in THEME_MAP.items():
-            if any(k in text for k in keywords):
+        for theme, keywords in _THEME_SETS.items():
+            if keywords.search(text):
                 counter[theme] += 1
                 if date_key:
                     date_map.setdefault(theme, set()).add(date_key)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from sakhi.apps.api.core.db import q
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SurfaceCache:
+    table: str
+    columns: Tuple[str, ...]
+    date_column: str | None = None
+    # Inclusive UTC hour window in which a turn surfaces the row; None = always.
+    hours: Tuple[int, int] | None = None
+
+
+# Column order matches what turn_v2 has always returned for each surface.
+SURFACE_CACHES: Dict[str, SurfaceCache] = {
+    "daily_reflection": SurfaceCache(
+        "daily_reflection_cache",
+        ("summary", "reflection_date", "generated_at"),
+        "reflection_date",
+    ),
+    "evening_closure": SurfaceCache(
+        "daily_closure_cache",
+        ("completed", "pending", "signals", "summary", "closure_date", "generated_at"),
+        "closure_date",
+        hours=(20, 23),
+    ),
+    "morning_preview": SurfaceCache(
+        "morning_preview_cache",
+        ("focus_areas", "key_tasks", "reminders", "rhythm_hint", "summary", "preview_date", "generated_at"),
+        "preview_date",
+        hours=(0, 11),
+    ),
+    "morning_ask": SurfaceCache(
+        "morning_ask_cache",
+        ("question", "reason", "ask_date", "generated_at"),
+        "ask_date",
+        hours=(0, 11),
+    ),
+    "morning_momentum": SurfaceCache(
+        "morning_momentum_cache",
+        ("momentum_hint", "suggested_start", "reason", "momentum_date", "generated_at"),
+        "momentum_date",
+        hours=(0, 11),
+    ),
+    "micro_momentum": SurfaceCache(
+        "micro_momentum_cache",
+        ("nudge", "reason", "nudge_date", "generated_at"),
+        "nudge_date",
+        hours=(0, 15),
+    ),
+    "micro_recovery": SurfaceCache(
+        "micro_recovery_cache",
+        ("nudge", "reason", "recovery_date", "generated_at"),
+        "recovery_date",
+    ),
+    "focus_path": SurfaceCache(
+        "focus_path_cache",
+        ("anchor_step", "progress_step", "closure_step", "intent_source", "path_date", "generated_at"),
+        "path_date",
+    ),
+    "mini_flow": SurfaceCache(
+        "mini_flow_cache",
+        (
+            "warmup_step",
+            "focus_block_step",
+            "closure_step",
+            "optional_reward",
+            "source",
+            "flow_date",
+            "generated_at",
+            "rhythm_slot",
+        ),
+        "flow_date",
+    ),
+    "micro_journey": SurfaceCache(
+        "micro_journey_cache",
+        ("flow_count", "rhythm_slot", "journey", "generated_at"),
+    ),
+}
+
+
+def _resolve_days(
+    names: Iterable[str],
+    day: datetime.date,
+    days: Mapping[str, datetime.date] | None,
+) -> Dict[str, datetime.date | None]:
+    resolved: Dict[str, datetime.date | None] = {}
+    for name in names:
+        if name not in SURFACE_CACHES:
+            raise KeyError(f"Unknown surface cache {name!r}")
+        spec = SURFACE_CACHES[name]
+        resolved[name] = (days or {}).get(name, day) if spec.date_column else None
+    return resolved
+
+
+def build_surface_cache_query(wanted: Mapping[str, datetime.date | None]) -> Tuple[str, List[Any]]:
+    """
+    Build one statement that LEFT JOINs a LATERAL lookup per surface cache.
+
+    Columns keep their native types (no json round-trip) and are aliased
+    `<surface>__<column>`; a `present` flag tells a missing row apart from a
+    row of NULLs. Returns the SQL and the date arguments after `$1`.
+    """
+
+    date_args: List[Any] = []
+    date_params: Dict[datetime.date, int] = {}
+    select_parts: List[str] = []
+    join_parts: List[str] = []
+    for name, day in wanted.items():
+        spec = SURFACE_CACHES[name]
+        where = "person_id = $1"
+        if spec.date_column:
+            if day not in date_params:
+                date_args.append(day)
+                date_params[day] = len(date_args) + 1
+            where += f" AND {spec.date_column} = ${date_params[day]}"
+        select_parts.append(f"{name}.present AS {name}__present")
+        select_parts.extend(f"{name}.{column} AS {name}__{column}" for column in spec.columns)
+        join_parts.append(
+            f"LEFT JOIN LATERAL (\n"
+            f"    SELECT TRUE AS present, {', '.join(spec.columns)}\n"
+            f"    FROM {spec.table}\n"
+            f"    WHERE {where}\n"
+            f"    LIMIT 1\n"
+            f") AS {name} ON TRUE"
+        )
+    sql = "SELECT\n    " + ",\n    ".join(select_parts) + "\nFROM (SELECT 1) AS anchor\n" + "\n".join(join_parts)
+    return sql, date_args
+
+
+def _split_row(row: Mapping[str, Any], names: Iterable[str]) -> Dict[str, Dict[str, Any] | None]:
+    caches: Dict[str, Dict[str, Any] | None] = {}
+    for name in names:
+        if not row.get(f"{name}__present"):
+            caches[name] = None
+            continue
+        caches[name] = {column: row.get(f"{name}__{column}") for column in SURFACE_CACHES[name].columns}
+    return caches
+
+
+async def _load_one(person_id: str, name: str, day: datetime.date | None) -> Dict[str, Any] | None:
+    spec = SURFACE_CACHES[name]
+    args: List[Any] = [person_id]
+    where = "person_id = $1"
+    if spec.date_column:
+        where += f" AND {spec.date_column} = $2"
+        args.append(day)
+    try:
+        rows = await q(f"SELECT {', '.join(spec.columns)} FROM {spec.table} WHERE {where}", *args)
+    except Exception as exc:
+        LOGGER.warning("[surface_caches] %s lookup failed person_id=%s: %s", spec.table, person_id, exc)
+        return None
+    return rows[0] if rows else None
+
+
+async def load_surface_caches(
+    person_id: str,
+    day: datetime.date | None = None,
+    *,
+    names: Iterable[str] | None = None,
+    days: Mapping[str, datetime.date] | None = None,
+) -> Dict[str, Dict[str, Any] | None]:
+    """
+    Fetch every requested per-day surface cache for `person_id` in one round trip.
+
+    `day` defaults to today; `days` overrides it per surface (e.g. yesterday's
+    closure). Missing rows come back as None. If the combined statement fails
+    (say one table is not migrated yet) each surface is read on its own, so a
+    single broken table never blanks the others.
+    """
+
+    wanted = _resolve_days(names or SURFACE_CACHES.keys(), day or datetime.date.today(), days)
+    sql, date_args = build_surface_cache_query(wanted)
+    try:
+        row = await q(sql, person_id, *date_args, one=True)
+    except Exception as exc:
+        LOGGER.warning("[surface_caches] bulk load failed person_id=%s, falling back per table: %s", person_id, exc)
+        results = await asyncio.gather(*(_load_one(person_id, name, d) for name, d in wanted.items()))
+        return dict(zip(wanted.keys(), results))
+    return _split_row(row or {}, wanted.keys())
+
+
+def apply_hour_gates(
+    caches: Mapping[str, Dict[str, Any] | None],
+    hour: int | None = None,
+) -> Dict[str, Dict[str, Any] | None]:
+    """Hide surfaces whose UTC hour window does not include `hour` (defaults to now)."""
+
+    if hour is None:
+        hour = datetime.datetime.utcnow().hour
+    gated: Dict[str, Dict[str, Any] | None] = {}
+    for name, row in caches.items():
+        window = SURFACE_CACHES[name].hours if name in SURFACE_CACHES else None
+        if window and not (window[0] <= hour <= window[1]):
+            gated[name] = None
+        else:
+            gated[name] = row
+    return gated
+
+
+__all__ = [
+    "SURFACE_CACHES",
+    "SurfaceCache",
+    "apply_hour_gates",
+    "build_surface_cache_query",
+    "load_surface_caches",
+]
@@ -3,5 +3,22 @@
 from .context_loader import load_memory_context
 from .reply_service import build_turn_reply
 from .async_triggers import enqueue_turn_jobs
+from .stages import TurnStage, StageReport, run_stages
+from .deadline import TurnDeadline, current_turn_deadline, request_tier, resolve_turn_budget, turn_deadline
+from .post_response import PostResponseSupervisor, post_response_supervisor
 
-__all__ = ["load_memory_context", "build_turn_reply", "enqueue_turn_jobs"]
+__all__ = [
+    "load_memory_context",
+    "build_turn_reply",
+    "enqueue_turn_jobs",
+    "TurnStage",
+    "StageReport",
+    "run_stages",
+    "TurnDeadline",
+    "current_turn_deadline",
+    "request_tier",
+    "resolve_turn_budget",
+    "turn_deadline",
+    "PostResponseSupervisor",
+    "post_response_supervisor",
+]
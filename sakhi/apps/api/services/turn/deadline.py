@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Iterator, TypeVar
+
+from sakhi.apps.api.core.config_loader import get_policy
+from sakhi.apps.api.core.metrics import turn_deadline_skips
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DEFAULT_BUDGET_MS = 6000.0
+
+_current_deadline: ContextVar["TurnDeadline | None"] = ContextVar("turn_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """An optional call was cut off because the turn budget ran out."""
+
+
+@dataclass(frozen=True)
+class TurnDeadline:
+    """Wall-clock budget for one turn, measured on the monotonic clock."""
+
+    budget_s: float
+    expires_at: float
+
+    @classmethod
+    def after(cls, budget_s: float) -> "TurnDeadline":
+        return cls(budget_s=budget_s, expires_at=time.monotonic() + budget_s)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def bound(self, timeout: float | None) -> float:
+        """`timeout` clamped to what is left of the budget."""
+
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    async def run(self, awaitable: Awaitable[T], *, stage: str) -> T:
+        """
+        Await an optional call within the remaining budget.
+
+        Raises DeadlineExceeded (and counts the skip) if the budget runs out
+        first; the call is cancelled.
+        """
+
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            turn_deadline_skips.labels(stage=stage).inc()
+            raise DeadlineExceeded(f"{stage} skipped: turn budget spent")
+        try:
+            return await asyncio.wait_for(awaitable, timeout=remaining)
+        except asyncio.TimeoutError as exc:
+            turn_deadline_skips.labels(stage=stage).inc()
+            raise DeadlineExceeded(f"{stage} cut off at the turn deadline") from exc
+
+
+def current_turn_deadline() -> TurnDeadline | None:
+    return _current_deadline.get()
+
+
+@contextmanager
+def turn_deadline(deadline: TurnDeadline | None) -> Iterator[TurnDeadline | None]:
+    """Make `deadline` the active turn budget (None clears it) for the current context."""
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def _budget_ms(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _trusted_proxies() -> list[ipaddress.IPv4Network | ipaddress.IPv6Network]:
+    networks = []
+    for item in os.getenv("SAKHI_TRUSTED_PROXIES", "").split(","):
+        if item.strip():
+            try:
+                networks.append(ipaddress.ip_network(item.strip(), strict=False))
+            except ValueError:
+                LOGGER.warning("[turn_budget] ignoring invalid SAKHI_TRUSTED_PROXIES entry %r", item)
+    return networks
+
+
+def request_tier(request: Any) -> str | None:
+    """
+    The caller's tier for budget lookup, from `X-Sakhi-Tier`.
+
+    Persons carry no tier yet, so the header is the only source; it is
+    honoured only when the connecting peer is one of SAKHI_TRUSTED_PROXIES
+    (IPs or CIDRs), i.e. the gateway that sets it after authentication.
+    Clients talking to the API directly get the default budget.
+    """
+
+    if request is None:
+        return None
+    tier = request.headers.get("x-sakhi-tier")
+    client = getattr(request, "client", None)
+    if not tier or client is None or not client.host:
+        return None
+    try:
+        peer = ipaddress.ip_address(client.host)
+    except ValueError:
+        return None
+    if any(peer in network for network in _trusted_proxies()):
+        return tier
+    return None
+
+
+def resolve_turn_budget(route: str, tier: str | None = None) -> float | None:
+    """
+    Budget in seconds for `route` and the caller's `tier`, or None when disabled.
+
+    Lookup order: SAKHI_TURN_BUDGET_MS (ops override), the tier entry, the
+    route entry, then `default_ms` from the `turn_budget` policy. A budget of
+    0 disables the deadline.
+    """
+
+    override = _budget_ms(os.getenv("SAKHI_TURN_BUDGET_MS"))
+    if override is not None:
+        budget_ms = override
+    else:
+        try:
+            policy = get_policy("turn_budget")
+        except Exception:
+            LOGGER.warning("[turn_budget] policy unavailable; using %sms", _DEFAULT_BUDGET_MS)
+            policy = {}
+        candidates = (
+            (policy.get("tiers") or {}).get(tier) if tier else None,
+            (policy.get("routes") or {}).get(route),
+            policy.get("default_ms"),
+        )
+        budget_ms = next(
+            (ms for ms in map(_budget_ms, candidates) if ms is not None),
+            _DEFAULT_BUDGET_MS,
+        )
+    if budget_ms <= 0:
+        return None
+    return budget_ms / 1000.0
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "TurnDeadline",
+    "current_turn_deadline",
+    "request_tier",
+    "resolve_turn_budget",
+    "turn_deadline",
+]
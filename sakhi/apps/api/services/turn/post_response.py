@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional, Sequence, Set
+
+from sakhi.apps.api.core.db import track_queries
+from sakhi.apps.api.core.metrics import (
+    post_response_dropped,
+    post_response_inflight,
+    post_response_queue_wait,
+    post_response_runs,
+)
+from sakhi.apps.api.middleware.query_budget import report_query_budget
+from sakhi.apps.api.services.turn.deadline import turn_deadline
+from sakhi.apps.api.services.turn.stages import StageReport, TurnStage, run_stages
+
+LOGGER = logging.getLogger(__name__)
+
+_MAX_CONCURRENCY = int(os.getenv("SAKHI_POST_RESPONSE_CONCURRENCY", "8"))
+# Pipelines running or waiting for a slot; beyond this new ones are skipped.
+_MAX_PENDING = int(os.getenv("SAKHI_POST_RESPONSE_MAX_PENDING", "256"))
+# Same per-request budget the query middleware applies (0 disables).
+_QUERY_BUDGET = int(os.getenv("SAKHI_DB_QUERY_BUDGET", "40"))
+
+
+class PostResponseSupervisor:
+    """
+    In-process runner for turn work that does not shape the reply.
+
+    Pipelines are `TurnStage` graphs started after the response is sent. At
+    most `max_concurrency` run at once and the rest wait for a slot, up to
+    `max_pending` in total; past that, new pipelines are skipped and counted.
+    A failing pipeline is logged and counted but never reaches the caller, and
+    `drain` lets shutdown wait for in-flight work.
+
+    Each pipeline counts its DB queries in its own tally, labelled with the
+    pipeline label and checked against `query_budget`: the copied request
+    context would otherwise add them to a tally that was already reported.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = _MAX_CONCURRENCY,
+        max_pending: int = _MAX_PENDING,
+        query_budget: int = _QUERY_BUDGET,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max(self.max_concurrency, max_pending)
+        self.query_budget = query_budget
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._tasks: Set["asyncio.Task[StageReport | None]"] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def submit(
+        self, stages: Sequence[TurnStage], *, label: str = "post_response"
+    ) -> Optional["asyncio.Task[StageReport | None]"]:
+        """Start a pipeline; returns None when it was skipped because the queue is full."""
+
+        if len(self._tasks) >= self.max_pending:
+            post_response_dropped.labels(label=label).inc()
+            LOGGER.warning("[%s] %s post-response pipelines pending, skipping this one", label, len(self._tasks))
+            return None
+        task = asyncio.create_task(self._run(list(stages), label, time.perf_counter()))
+        self._tasks.add(task)
+        post_response_inflight.inc()
+        task.add_done_callback(self._finished)
+        return task
+
+    async def start(self, stages: Sequence[TurnStage], *, label: str = "post_response") -> None:
+        """Awaitable `submit`, for use as a Starlette background task."""
+
+        self.submit(stages, label=label)
+
+    async def drain(self, timeout: float | None = None) -> int:
+        """Wait for in-flight pipelines; returns how many were still running at `timeout`."""
+
+        if not self._tasks:
+            return 0
+        _, still_running = await asyncio.wait(set(self._tasks), timeout=timeout)
+        return len(still_running)
+
+    def _finished(self, task: "asyncio.Task[StageReport | None]") -> None:
+        self._tasks.discard(task)
+        post_response_inflight.dec()
+
+    async def _run(self, stages: list[TurnStage], label: str, queued_at: float) -> StageReport | None:
+        async with self._slots:
+            post_response_queue_wait.observe(time.perf_counter() - queued_at)
+            try:
+                # The submitting turn's budgets cover its reply, not this work.
+                with turn_deadline(None), track_queries(label) as tally:
+                    try:
+                        report = await run_stages(stages, label=label)
+                    finally:
+                        report_query_budget(tally, self.query_budget)
+            except Exception:
+                post_response_runs.labels(label=label, status="error").inc()
+                LOGGER.exception("[%s] post-response pipeline failed", label)
+                return None
+        post_response_runs.labels(label=label, status="degraded" if report.failed() else "ok").inc()
+        return report
+
+
+post_response_supervisor = PostResponseSupervisor()
+
+
+__all__ = ["PostResponseSupervisor", "post_response_supervisor"]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from sakhi.apps.api.core.metrics import turn_deadline_skips, turn_stage_latency
+from sakhi.apps.api.services.turn.deadline import current_turn_deadline
+
+LOGGER = logging.getLogger(__name__)
+
+StageObserver = Callable[[str, "StageOutcome"], None]
+_stage_observers: ContextVar[tuple[StageObserver, ...]] = ContextVar("turn_stage_observers", default=())
+
+
+@contextmanager
+def observe_stages(observer: StageObserver) -> Iterator[None]:
+    """Call `observer(label, outcome)` for every stage finished in the current context."""
+    token = _stage_observers.set(_stage_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _stage_observers.reset(token)
+
+
+def _none() -> Any:
+    return None
+
+
+@dataclass(frozen=True)
+class TurnStage:
+    """
+    One unit of turn work.
+
+    `run` receives the values of every stage listed in `requires` as keyword
+    arguments. Failures and timeouts resolve to `default_factory()` unless the
+    stage is `critical`, in which case the error aborts the whole run. Under
+    an active turn deadline, non-critical stages are also cut off when the
+    budget runs out (status `deadline`).
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+    timeout: float | None = None
+    default_factory: Callable[[], Any] = _none
+    critical: bool = False
+
+
+@dataclass
+class StageOutcome:
+    name: str
+    value: Any
+    status: str  # ok | error | timeout | deadline
+    elapsed_ms: float
+    error: str | None = None
+
+
+@dataclass
+class StageReport:
+    outcomes: Dict[str, StageOutcome] = field(default_factory=dict)
+    wall_ms: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.outcomes[name].value
+
+    def timings_ms(self) -> Dict[str, float]:
+        return {name: outcome.elapsed_ms for name, outcome in self.outcomes.items()}
+
+    def failed(self) -> List[str]:
+        return [name for name, outcome in self.outcomes.items() if outcome.status != "ok"]
+
+    def degraded(self) -> List[str]:
+        """Stages whose fallback stands in because they ran out of time."""
+
+        return [name for name, outcome in self.outcomes.items() if outcome.status in {"timeout", "deadline"}]
+
+
+def _topological_order(stages: Sequence[TurnStage]) -> List[TurnStage]:
+    by_name: Dict[str, TurnStage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate turn stage {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for dep in stage.requires:
+            if dep not in by_name:
+                raise ValueError(f"Turn stage {stage.name!r} requires unknown stage {dep!r}")
+
+    pending = {stage.name: set(stage.requires) for stage in stages}
+    ordered: List[TurnStage] = []
+    while pending:
+        ready = [name for name, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Turn stages contain a dependency cycle: {sorted(pending)}")
+        for name in ready:
+            ordered.append(by_name[name])
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+    return ordered
+
+
+async def _run_stage(
+    stage: TurnStage,
+    tasks: Dict[str, "asyncio.Task[StageOutcome]"],
+    label: str,
+) -> StageOutcome:
+    kwargs: Dict[str, Any] = {}
+    for dep in stage.requires:
+        kwargs[dep] = (await tasks[dep]).value
+
+    timeout, by_deadline = stage.timeout, False
+    deadline = None if stage.critical else current_turn_deadline()
+    if deadline is not None:
+        timeout = deadline.bound(stage.timeout)
+        by_deadline = stage.timeout is None or timeout < stage.timeout
+
+    started = time.perf_counter()
+    try:
+        if by_deadline and timeout <= 0:
+            raise asyncio.TimeoutError
+        if timeout is not None:
+            value = await asyncio.wait_for(stage.run(**kwargs), timeout=timeout)
+        else:
+            value = await stage.run(**kwargs)
+        status, error = "ok", None
+    except asyncio.TimeoutError:
+        if stage.critical:
+            raise
+        if by_deadline:
+            turn_deadline_skips.labels(stage=stage.name).inc()
+            value, status, error = stage.default_factory(), "deadline", "turn budget spent"
+        else:
+            value, status, error = stage.default_factory(), "timeout", f"timed out after {stage.timeout}s"
+    except Exception as exc:
+        if stage.critical:
+            raise
+        value, status, error = stage.default_factory(), "error", str(exc)
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+    turn_stage_latency.labels(stage=stage.name, status=status).observe(elapsed_ms / 1000.0)
+    if error:
+        LOGGER.warning("[%s] stage %s %s: %s", label, stage.name, status, error)
+    outcome = StageOutcome(name=stage.name, value=value, status=status, elapsed_ms=round(elapsed_ms, 2), error=error)
+    for observer in _stage_observers.get():
+        observer(label, outcome)
+    return outcome
+
+
+async def run_stages(stages: Sequence[TurnStage], *, label: str = "turn_stages") -> StageReport:
+    """
+    Run `stages` concurrently, honouring their declared dependencies.
+
+    Independent stages start together, so wall-clock time tracks the longest
+    dependency chain instead of the sum of every stage.
+    """
+
+    ordered = _topological_order(stages)
+    started = time.perf_counter()
+    tasks: Dict[str, asyncio.Task[StageOutcome]] = {}
+    for stage in ordered:
+        tasks[stage.name] = asyncio.create_task(_run_stage(stage, tasks, label))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    report = StageReport(
+        outcomes={name: task.result() for name, task in tasks.items()},
+        wall_ms=round((time.perf_counter() - started) * 1000.0, 2),
+    )
+    LOGGER.info("[%s] wall_ms=%s stages=%s", label, report.wall_ms, report.timings_ms())
+    return report
+
+
+__all__ = ["TurnStage", "StageOutcome", "StageReport", "observe_stages", "run_stages"]
@@ -3,7 +3,10 @@ from __future__ import annotations
 import datetime as dt
 from typing import List, Dict
 
+import numpy as np
+
 from sakhi.apps.api.core.db import q, exec as dbexec
+from sakhi.libs.embeddings import parse_pgvector
 
 
 _DECAY_DAYS = 180
@@ -14,15 +17,11 @@ def _now() -> dt.datetime:
     return dt.datetime.utcnow()
 
 
-def _mean_vectors(vectors: List[List[float]]) -> List[float]:
+def _mean_vectors(vectors: List[np.ndarray]) -> List[float]:
     if not vectors:
         return []
-    length = min(len(v) for v in vectors if v) if vectors[0] else _VECTOR_DIM
-    acc = [0.0] * length
-    for vec in vectors:
-        for i in range(length):
-            acc[i] += float(vec[i])
-    return [value / len(vectors) for value in acc]
+    length = min(len(v) for v in vectors)
+    return np.mean([v[:length] for v in vectors], axis=0, dtype=np.float64).tolist()
 
 
 async def refresh_context(person_id: str) -> Dict[str, object]:
@@ -48,7 +47,7 @@ async def refresh_context(person_id: str) -> Dict[str, object]:
     )
 
     seen = set()
-    vectors: List[List[float]] = []
+    vectors: List[np.ndarray] = []
     for row in rows:
         content_hash = row.get("content_hash")
         if not content_hash or content_hash in seen:
@@ -56,10 +55,10 @@ async def refresh_context(person_id: str) -> Dict[str, object]:
         ts = row.get("updated_at")
         if ts and isinstance(ts, dt.datetime) and ts < cutoff:
             continue
-        vec = row.get("vec") or []
-        if vec:
+        vec = parse_pgvector(row.get("vec"))
+        if vec.size:
             seen.add(content_hash)
-            vectors.append(list(vec))
+            vectors.append(vec)
 
     merged = _mean_vectors(vectors)
 
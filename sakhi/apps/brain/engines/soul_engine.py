@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Sequence
 
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.libs.embeddings import embed_normalized, to_pgvector
+from sakhi.libs.phrase_index import PhraseSet, register_phrases
 
 VALUE_KEYWORDS = {
     "growth": ["learn", "improve", "practice", "better", "grow"],
@@ -15,11 +16,13 @@ VALUE_KEYWORDS = {
     "creativity": ["music", "guitar", "creative", "art"],
 }
 
-LONGING_KEYS = ["want to be", "wish", "hope to", "dream of"]
-AVERSION_KEYS = ["hate", "avoid", "draining", "exhausting"]
-COMMIT_KEYS = ["commit", "commitment", "promise", "will keep", "continue to"]
-SHADOW_KEYS = ["stuck", "avoid", "fear", "anxious"]
-LIGHT_KEYS = ["excited", "joy", "meaningful", "energized"]
+_VALUE_SETS = {value: register_phrases(f"brain_soul.value.{value}", keys) for value, keys in VALUE_KEYWORDS.items()}
+
+LONGING_KEYS = register_phrases("brain_soul.longing", ["want to be", "wish", "hope to", "dream of"])
+AVERSION_KEYS = register_phrases("brain_soul.aversion", ["hate", "avoid", "draining", "exhausting"])
+COMMIT_KEYS = register_phrases("brain_soul.commit", ["commit", "commitment", "promise", "will keep", "continue to"])
+SHADOW_KEYS = register_phrases("brain_soul.shadow", ["stuck", "avoid", "fear", "anxious"])
+LIGHT_KEYS = register_phrases("brain_soul.light", ["excited", "joy", "meaningful", "energized"])
 
 
 def _normalize(text: str) -> str:
@@ -29,18 +32,17 @@ def _normalize(text: str) -> str:
 def _extract_values(texts: Sequence[str]) -> List[str]:
     hits = []
     for text in texts:
-        for value, keys in VALUE_KEYWORDS.items():
-            if any(k in text for k in keys):
+        for value, keys in _VALUE_SETS.items():
+            if keys.search(text):
                 hits.append(value)
     return list(dict.fromkeys(hits))[:5]
 
 
-def _extract_list(texts: Sequence[str], keywords: Sequence[str]) -> List[str]:
+def _extract_list(texts: Sequence[str], keywords: PhraseSet) -> List[str]:
     results = []
     for text in texts:
-        for k in keywords:
-            if k in text:
-                results.append(text)
+        if keywords.search(text):
+            results.append(text)
     return list(dict.fromkeys(results))[:5]
 
 
@@ -5,6 +5,9 @@ from typing import Any, Dict
 
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.apps.api.core.person_utils import resolve_person_id
+from sakhi.apps.api.core.personal_model_memo import PersonalModelMemo, current_personal_model_memo
+
+_PM_COLUMNS = ("emotion_state", "forecast_state", "conflict_state", "coherence_state", "empathy_state")
 
 
 def _safe_float(val: Any, default: float = 0.0) -> float:
@@ -14,18 +17,27 @@ def _safe_float(val: Any, default: float = 0.0) -> float:
         return default
 
 
-async def compute_empathy(person_id: str, input_text: str | None = None) -> Dict[str, Any]:
+async def compute_empathy(
+    person_id: str,
+    input_text: str | None = None,
+    *,
+    memo: PersonalModelMemo | None = None,
+) -> Dict[str, Any]:
     person_id = await resolve_person_id(person_id) or person_id
 
-    pm_row = await q(
-        """
-        SELECT emotion_state, forecast_state, conflict_state, coherence_state, empathy_state
-        FROM personal_model
-        WHERE person_id = $1
-        """,
-        person_id,
-        one=True,
-    ) or {}
+    memo = memo or current_personal_model_memo(person_id)
+    if memo is not None:
+        pm_row = await memo.get(_PM_COLUMNS, fetch=q) or {}
+    else:
+        pm_row = await q(
+            """
+            SELECT emotion_state, forecast_state, conflict_state, coherence_state, empathy_state
+            FROM personal_model
+            WHERE person_id = $1
+            """,
+            person_id,
+            one=True,
+        ) or {}
     continuity_row = await q(
         "SELECT continuity_state FROM session_continuity WHERE person_id = $1",
         person_id,
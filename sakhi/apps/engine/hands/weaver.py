@@ -5,6 +5,14 @@ import uuid
 from typing import Any, Dict, List, Tuple
 
 from sakhi.apps.api.core.db import q, exec as dbexec
+from sakhi.libs.phrase_index import register_phrases
+
+_HORIZON_TODAY = register_phrases("weaver.horizon.today", ["today", "tonight", "now"])
+_HORIZON_WEEK = register_phrases("weaver.horizon.week", ["tomorrow", "this week"])
+_HORIZON_MONTH = register_phrases("weaver.horizon.month", ["next month", "this month"])
+_HORIZON_QUARTER = register_phrases("weaver.horizon.quarter", ["quarter", "q"])
+_HORIZON_YEAR = register_phrases("weaver.horizon.year", ["year", "long term", "long-term"])
+_DEEP_WORK = register_phrases("weaver.deep_work", ["deep", "write", "research", "analysis"])
 
 
 def _normalize(text: str) -> str:
@@ -17,15 +25,15 @@ def _hash(text: str) -> str:
 
 def classify_time_horizon(task: str, triage: Dict[str, Any] | None = None, sentiment: Dict[str, Any] | None = None) -> str:
     t = _normalize(task)
-    if any(k in t for k in ["today", "tonight", "now"]):
+    if _HORIZON_TODAY.search(t):
         return "today"
-    if "tomorrow" in t or "this week" in t:
+    if _HORIZON_WEEK.search(t):
         return "week"
-    if "next month" in t or "this month" in t:
+    if _HORIZON_MONTH.search(t):
         return "month"
-    if "quarter" in t or "q" in t:
+    if _HORIZON_QUARTER.search(t):
         return "quarter"
-    if "year" in t or "long term" in t or "long-term" in t:
+    if _HORIZON_YEAR.search(t):
         return "year"
     # fallback to sentiment/intent urgency
     intent = ""
@@ -39,7 +47,7 @@ def classify_time_horizon(task: str, triage: Dict[str, Any] | None = None, senti
 def compute_energy_cost(task_text: str, emotion_state: Dict[str, Any] | None = None) -> float:
     base = 0.5
     t = _normalize(task_text)
-    if any(k in t for k in ["deep", "write", "research", "analysis"]):
+    if _DEEP_WORK.search(t):
         base += 0.2
     if emotion_state and isinstance(emotion_state, dict):
         tone = (emotion_state.get("summary") or "").lower()
@@ -5,24 +5,42 @@ from typing import Any, Mapping
 
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.apps.api.core.person_utils import resolve_person_id
+from sakhi.apps.api.core.personal_model_memo import PersonalModelMemo, current_personal_model_memo
+from sakhi.libs.phrase_index import PhraseSet, register_phrases
 
+_PM_COLUMNS = ("emotion_state", "forecast_state", "conflict_state", "coherence_state")
 
-def _kw_score(text: str, keywords: list[str]) -> float:
-    lowered = text.lower()
-    return float(sum(1 for k in keywords if k in lowered)) / max(len(keywords), 1)
+_FATIGUE = register_phrases("microreg.fatigue", ["tired", "exhausted", "fatigue", "sleepy"])
+_IRRITABILITY = register_phrases("microreg.irritability", ["annoyed", "frustrated", "irritated", "angry"])
+_CONFUSION = register_phrases("microreg.confusion", ["confused", "lost", "unclear"])
+_MOTIVATION = register_phrases("microreg.motivation", ["excited", "motivated", "ready", "pumped"])
 
 
-async def compute_microreg(person_id: str, input_text: str) -> dict[str, Any]:
+def _kw_score(text: str, keywords: PhraseSet) -> float:
+    """Share of `keywords` present in `text`."""
+    return float(len(keywords.found(text.lower()))) / max(len(keywords), 1)
+
+
+async def compute_microreg(
+    person_id: str,
+    input_text: str,
+    *,
+    memo: PersonalModelMemo | None = None,
+) -> dict[str, Any]:
     """
     Deterministic micro-regulation state.
     """
     resolved = await resolve_person_id(person_id) or person_id
+    memo = memo or current_personal_model_memo(resolved)
     try:
-        row: Mapping[str, Any] = await q(
-            "SELECT emotion_state, forecast_state, conflict_state, coherence_state FROM personal_model WHERE person_id = $1",
-            resolved,
-            one=True,
-        ) or {}
+        if memo is not None:
+            row: Mapping[str, Any] = await memo.get(_PM_COLUMNS, fetch=q) or {}
+        else:
+            row = await q(
+                "SELECT emotion_state, forecast_state, conflict_state, coherence_state FROM personal_model WHERE person_id = $1",
+                resolved,
+                one=True,
+            ) or {}
     except Exception:
         row = {}
 
@@ -41,10 +59,10 @@ async def compute_microreg(person_id: str, input_text: str) -> dict[str, Any]:
     overwhelm_window = (forecast_state.get("risk_windows") or {}).get("overwhelm_window")
     confusion_score = (forecast_state.get("clarity_forecast") or {}).get("confusion_score") or 0.0
 
-    kw_fatigue = _kw_score(input_text, ["tired", "exhausted", "fatigue", "sleepy"])
-    kw_irritability = _kw_score(input_text, ["annoyed", "frustrated", "irritated", "angry"])
-    kw_confusion = _kw_score(input_text, ["confused", "lost", "unclear"])
-    kw_motivation = _kw_score(input_text, ["excited", "motivated", "ready", "pumped"])
+    kw_fatigue = _kw_score(input_text, _FATIGUE)
+    kw_irritability = _kw_score(input_text, _IRRITABILITY)
+    kw_confusion = _kw_score(input_text, _CONFUSION)
+    kw_motivation = _kw_score(input_text, _MOTIVATION)
 
     base_intensity = 0.5 + (kw_motivation * 0.2) - (kw_fatigue * 0.2) + (motivation_prob * 0.1) - (fatigue_prob * 0.1)
     base_intensity = min(1.0, max(0.0, base_intensity))
@@ -5,21 +5,28 @@ from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import q, exec as dbexec
 from sakhi.apps.api.core.person_utils import resolve_person_id
+from sakhi.apps.api.core.personal_model_memo import PersonalModelMemo, current_personal_model_memo
 
+_PM_COLUMNS = ("persona_state", "coherence_state", "conflict_state", "forecast_state", "emotion_state")
 
-async def compute_tone(person_id: str) -> Dict[str, Any]:
+
+async def compute_tone(person_id: str, *, memo: PersonalModelMemo | None = None) -> Dict[str, Any]:
     """Deterministic tone computation based on persona, coherence, conflict, forecast, and emotion."""
     resolved = await resolve_person_id(person_id) or person_id
 
-    pm_row = await q(
-        """
-        SELECT persona_state, coherence_state, conflict_state, forecast_state, emotion_state
-        FROM personal_model
-        WHERE person_id = $1
-        """,
-        resolved,
-        one=True,
-    ) or {}
+    memo = memo or current_personal_model_memo(resolved)
+    if memo is not None:
+        pm_row = await memo.get(_PM_COLUMNS, fetch=q) or {}
+    else:
+        pm_row = await q(
+            """
+            SELECT persona_state, coherence_state, conflict_state, forecast_state, emotion_state
+            FROM personal_model
+            WHERE person_id = $1
+            """,
+            resolved,
+            one=True,
+        ) or {}
     persona_state = pm_row.get("persona_state") or {}
     coherence_state = pm_row.get("coherence_state") or {}
     conflict_state = pm_row.get("conflict_state") or {}
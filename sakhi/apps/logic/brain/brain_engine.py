@@ -434,18 +434,6 @@ async def compute_brain_state(person_id: str) -> Dict[str, Any]:
 
 async def _persist_brain(person_id: str, brain: Dict[str, Any]) -> None:
     sanitized = _sanitize(brain)
-    goals_json = json.dumps(sanitized.get("goals_state", {}), ensure_ascii=False)
-    rhythm_json = json.dumps(sanitized.get("rhythm_state", {}), ensure_ascii=False)
-    emotional_json = json.dumps(sanitized.get("emotional_state", {}), ensure_ascii=False)
-    identity_json = json.dumps(sanitized.get("identity_state", {}), ensure_ascii=False)
-    relationship_json = json.dumps(sanitized.get("relationship_state", {}), ensure_ascii=False)
-    environment_json = json.dumps(sanitized.get("environment_state", {}), ensure_ascii=False)
-    habits_json = json.dumps(sanitized.get("habits_state", {}), ensure_ascii=False)
-    focus_json = json.dumps(sanitized.get("focus_state", {}), ensure_ascii=False)
-    friction_json = json.dumps(sanitized.get("friction_points", []), ensure_ascii=False)
-    priorities_json = json.dumps(sanitized.get("top_priorities", []), ensure_ascii=False)
-    life_json = json.dumps(sanitized.get("life_chapter", {}), ensure_ascii=False)
-    working_json = json.dumps(sanitized.get("working_memory", {}), ensure_ascii=False)
     await dbexec(
         """
         INSERT INTO personal_os_brain (
@@ -470,18 +458,18 @@ async def _persist_brain(person_id: str, brain: Dict[str, Any]) -> None:
             last_updated = NOW()
         """,
         person_id,
-        goals_json,
-        rhythm_json,
-        emotional_json,
-        identity_json,
-        relationship_json,
-        environment_json,
-        habits_json,
-        focus_json,
-        friction_json,
-        priorities_json,
-        life_json,
-        working_json,
+        sanitized.get("goals_state", {}),
+        sanitized.get("rhythm_state", {}),
+        sanitized.get("emotional_state", {}),
+        sanitized.get("identity_state", {}),
+        sanitized.get("relationship_state", {}),
+        sanitized.get("environment_state", {}),
+        sanitized.get("habits_state", {}),
+        sanitized.get("focus_state", {}),
+        sanitized.get("friction_points", []),
+        sanitized.get("top_priorities", []),
+        sanitized.get("life_chapter", {}),
+        sanitized.get("working_memory", {}),
     )
 
 
@@ -4,20 +4,28 @@ import asyncio
 import re
 from typing import Any, Dict
 
+from sakhi.apps.api.services.turn.deadline import DeadlineExceeded, TurnDeadline, current_turn_deadline
 from sakhi.apps.logic.brain import brain_engine
 from sakhi.apps.logic.brain.brain_engine import _ensure_dict
 from sakhi.apps.logic.companion.behavior_engine import compute_behavior_profile
 from sakhi.apps.logic.insight import insight_engine
+from sakhi.libs.phrase_index import register_phrases
+
+_INTENT_SIGNALS = register_phrases("triage.intent", ["plan", "schedule", "goal", "next step", "todo", "task"])
+_REFLECTIVE_SIGNALS = register_phrases("triage.reflective", ["why", "feel", "feeling", "reflect", "meaning", "insight"])
+_ENERGY_SIGNALS = register_phrases("triage.energy", ["tired", "energy", "fatigue", "exhaust", "drained"])
+_RELATIONSHIP_SIGNALS = register_phrases("triage.relationship", ["trust", "relationship", "you and i", "feel heard"])
+_IDENTITY_SIGNALS = register_phrases("triage.identity", ["identity", "values", "purpose", "who i am"])
 
 
 def triage_text(user_text: str, behavior_profile: Dict[str, Any]) -> Dict[str, Any]:
     """Light triage to inform which engines to activate."""
     text = (user_text or "").lower()
-    intent_signals = any(tok in text for tok in ["plan", "schedule", "goal", "next step", "todo", "task"])
-    reflective_signals = any(tok in text for tok in ["why", "feel", "feeling", "reflect", "meaning", "insight"])
-    energy_signals = any(tok in text for tok in ["tired", "energy", "fatigue", "exhaust", "drained"])
-    relationship_signals = any(tok in text for tok in ["trust", "relationship", "you and i", "feel heard"])
-    identity_signals = any(tok in text for tok in ["identity", "values", "purpose", "who i am"])
+    intent_signals = _INTENT_SIGNALS.search(text)
+    reflective_signals = _REFLECTIVE_SIGNALS.search(text)
+    energy_signals = _ENERGY_SIGNALS.search(text)
+    relationship_signals = _RELATIONSHIP_SIGNALS.search(text)
+    identity_signals = _IDENTITY_SIGNALS.search(text)
 
     depth = behavior_profile.get("conversation_depth", "surface")
     session_reason = (behavior_profile.get("session_context") or {}).get("reason")
@@ -58,10 +66,21 @@ def decide_activation(triage: Dict[str, Any], behavior_profile: Dict[str, Any])
     }
 
 
-async def run_unified_turn(person_id: str, user_text: str, *, mode: str = "today") -> Dict[str, Any]:
+async def run_unified_turn(
+    person_id: str,
+    user_text: str,
+    *,
+    mode: str = "today",
+    deadline: TurnDeadline | None = None,
+) -> Dict[str, Any]:
     """
     Harmony orchestrator: fetch brain, behavior, triage, decide activations, call engines.
+
+    Optional engines (insight) are bounded by the turn deadline; ones cut off
+    are listed under `degraded`.
     """
+    deadline = deadline or current_turn_deadline()
+    degraded: list[str] = []
     brain = await brain_engine.get_brain_state(person_id, force_refresh=False)
     behavior_profile = compute_behavior_profile(brain)
     triage = triage_text(user_text, behavior_profile)
@@ -75,7 +94,13 @@ async def run_unified_turn(person_id: str, user_text: str, *, mode: str = "today
     # Insight
     if activation["insight"]:
         try:
-            insight_bundle = await insight_engine.generate_insights(person_id, mode=mode, behavior_profile=behavior_profile)
+            insights = insight_engine.generate_insights(person_id, mode=mode, behavior_profile=behavior_profile)
+            if deadline is not None:
+                insight_bundle = await deadline.run(insights, stage="insight")
+            else:
+                insight_bundle = await insights
+        except DeadlineExceeded:
+            degraded.append("insight")
         except Exception:
             insight_bundle = {"error": "insight_unavailable"}
 
@@ -100,6 +125,7 @@ async def run_unified_turn(person_id: str, user_text: str, *, mode: str = "today
         "insight": insight_bundle,
         "rhythm_hint": rhythm_hint,
         "relationship_state": relationship_update,
+        "degraded": degraded,
     }
 
 
@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-import asyncio
+import os
+from typing import Any, Dict, List
 
 from sakhi.apps.api.services.memory.memory_ingest import ingest_journal_entry
 from sakhi.apps.worker.tasks.update_relationship_arcs import update_relationship_arcs
-from sakhi.apps.api.services.memory.graph_reinforcement import reinforce_recall_graph
 from sakhi.apps.api.services.memory.consolidation import consolidate_memory
+from sakhi.apps.worker.utils.coalesce import KeyedCoalescer
+
+# Quiet period after the last event before a person's runs start, and the cap
+# on how long a steady stream of events can hold them back.
+DEBOUNCE_S = float(os.getenv("SAKHI_FANOUT_DEBOUNCE_S", "2.0"))
+MAX_WAIT_S = float(os.getenv("SAKHI_FANOUT_MAX_WAIT_S", "30.0"))
+
+
+async def _consolidate(person_id: str, _events: List[Any]) -> None:
+    # Consolidation reads from the person's checkpoint, so one run covers every event.
+    await consolidate_memory(person_id)
+
+
+async def _relationship_arcs(person_id: str, texts: List[str]) -> None:
+    for text in texts:
+        await update_relationship_arcs(person_id, text)
+
+
+async def _ingest_journal(person_id: str, entries: List[Dict[str, Any]]) -> None:
+    for entry in entries:
+        await ingest_journal_entry(entry)
+
+
+consolidations = KeyedCoalescer("consolidate_memory", _consolidate, window_s=DEBOUNCE_S, max_wait_s=MAX_WAIT_S)
+relationship_arcs = KeyedCoalescer("relationship_arcs", _relationship_arcs, window_s=DEBOUNCE_S, max_wait_s=MAX_WAIT_S)
+journal_ingest = KeyedCoalescer(
+    "ingest_journal_entry",
+    _ingest_journal,
+    window_s=DEBOUNCE_S,
+    max_wait_s=MAX_WAIT_S,
+    dedupe=lambda entry: entry["id"],
+)
 
 
 async def memory_event_fanout(event: dict) -> None:
     """
     Fan-out handler for memory.entry.observed events.
+
+    Work is coalesced per person: a burst of events yields one consolidation
+    and one serial pass over the new texts, never overlapping runs.
     """
 
     person_id = event.get("person_id")
@@ -19,19 +54,24 @@ async def memory_event_fanout(event: dict) -> None:
     layer = event.get("layer")
 
     if person_id and text:
-        asyncio.create_task(update_relationship_arcs(person_id, text))
-        asyncio.create_task(consolidate_memory(person_id))
-
-    if person_id and entry_id:
-        asyncio.create_task(reinforce_recall_graph(person_id, text, []))
+        relationship_arcs.submit(person_id, text)
+        consolidations.submit(person_id)
 
     if layer == "journal" and entry_id and person_id:
-        asyncio.create_task(
-            ingest_journal_entry(
-                {
-                    "id": entry_id,
-                    "user_id": person_id,
-                    "content": text,
-                }
-            )
+        journal_ingest.submit(
+            person_id,
+            {
+                "id": entry_id,
+                "user_id": person_id,
+                "content": text,
+            },
         )
+
+
+async def drain(timeout: float | None = None) -> int:
+    """Run everything still debounced and wait for it; returns keys left busy."""
+
+    left = 0
+    for coalescer in (consolidations, relationship_arcs, journal_ingest):
+        left += await coalescer.drain(timeout)
+    return left
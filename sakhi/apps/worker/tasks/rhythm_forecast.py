@@ -292,8 +292,8 @@ def normalize_recommendation(val: Any) -> str | None:
 def sanitize_embedding(raw: Any) -> List[float]:
     import re
 
-    if isinstance(raw, list):
-        return [float(x) for x in raw]
+    if isinstance(raw, (list, tuple, np.ndarray)):
+        return parse_pgvector(raw).tolist()
     if raw is None:
         return []
     cleaned = re.sub(r"[^0-9eE\.\-,]+", " ", str(raw))
@@ -334,7 +334,7 @@ async def compute_coherence(db: Any, person_id: str, new_vector: List[float]) ->
         parsed = parse_pgvector(row.get("forecast_vector"))
         if len(parsed) != 1536:
             continue
-        vectors.append(np.array(parsed, dtype=float))
+        vectors.append(parsed)
     if not vectors:
         return 1.0
     prev = np.mean(vectors, axis=0)
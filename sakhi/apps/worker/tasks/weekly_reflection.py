@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from sakhi.apps.api.core.db import q
 from sakhi.apps.api.core.llm import call_llm
+from sakhi.libs.phrase_index import register_phrases
 from sakhi.libs.schemas.settings import get_settings
 
 # Weekly Reflection Renderer (ephemeral, language-only)
@@ -32,6 +33,7 @@ FORBIDDEN_PATTERNS = [
     r"\bmust\b",
     r"\badvice\b",
 ]
+_FORBIDDEN_RE = re.compile("|".join(f"(?:{pattern})" for pattern in FORBIDDEN_PATTERNS))
 logger = logging.getLogger(__name__)
 settings = get_settings()
 TARGET_WEEK_START_ENV = os.getenv("WEEKLY_REFLECTION_TARGET_WEEK_START")
@@ -490,7 +492,7 @@ async def assemble_reflection_input(
 
 def _contains_forbidden_v3(text: str) -> bool:
     lowered = text.lower()
-    return any(phrase in lowered for phrase in FORBIDDEN_TEXT_V3)
+    return FORBIDDEN_TEXT_V3.search(lowered)
 
 
 def _tokenize(content: str) -> List[str]:
@@ -584,11 +586,11 @@ def judge_reflection_v1(text: str, assembled_input: Dict[str, Any]) -> Tuple[boo
         return False, reasons
 
     lowered = text.lower()
-    if any(phrase in lowered for phrase in FORBIDDEN_TEXT_V3):
+    if FORBIDDEN_TEXT_V3.search(lowered):
         reasons.append("forbidden_phrase")
-    if any(ph in lowered for ph in ADVICE_CAUSALITY):
+    if ADVICE_CAUSALITY.search(lowered):
         reasons.append("advice_or_causality")
-    if any(ph in lowered for ph in PATTERN_LANGUAGE):
+    if PATTERN_LANGUAGE.search(lowered):
         reasons.append("pattern_language")
 
     if re.search(r"^\s*[-*]", text, re.MULTILINE):
@@ -611,7 +613,7 @@ def judge_reflection_v1(text: str, assembled_input: Dict[str, Any]) -> Tuple[boo
 
 def _contains_forbidden(text: str) -> bool:
     lowered = text.lower()
-    return any(re.search(pattern, lowered) for pattern in FORBIDDEN_PATTERNS)
+    return _FORBIDDEN_RE.search(lowered) is not None
 
 
 def _lint_reflection(
@@ -1015,16 +1017,25 @@ __all__ = [
     "assemble_reflection_input",
     "generate_weekly_reflection_single_text",
 ]
-FORBIDDEN_TEXT_V3 = [
-    "ups and downs",
-    "mixed",
-    "small victories",
-    "on the bright side",
-    "should",
-    "lesson",
-    "growth",
-    "led to",
-    "took a back seat",
-]
-ADVICE_CAUSALITY = ["should", "need to", "must", "because", "therefore", "resulted in", "led to"]
-PATTERN_LANGUAGE = ["pattern", "trend", "trajectory", "signal", "dimension", "delta"]
+FORBIDDEN_TEXT_V3 = register_phrases(
+    "weekly_reflection.forbidden",
+    [
+        "ups and downs",
+        "mixed",
+        "small victories",
+        "on the bright side",
+        "should",
+        "lesson",
+        "growth",
+        "led to",
+        "took a back seat",
+    ],
+)
+ADVICE_CAUSALITY = register_phrases(
+    "weekly_reflection.advice_causality",
+    ["should", "need to", "must", "because", "therefore", "resulted in", "led to"],
+)
+PATTERN_LANGUAGE = register_phrases(
+    "weekly_reflection.pattern_language",
+    ["pattern", "trend", "trajectory", "signal", "dimension", "delta"],
+)
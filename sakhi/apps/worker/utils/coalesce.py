@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from sakhi.apps.api.core.metrics import coalesced_runs, coalesced_triggers
+
+LOGGER = logging.getLogger(__name__)
+
+Runner = Callable[[Hashable, List[Any]], Awaitable[Any]]
+
+
+@dataclass
+class _Slot:
+    pending: List[Any] = field(default_factory=list)
+    first_at: Optional[float] = None
+    timer: Optional[asyncio.TimerHandle] = None
+    running: Optional["asyncio.Task[None]"] = None
+
+
+class KeyedCoalescer:
+    """
+    Per-key trailing-edge debounce with at most one run in flight per key.
+
+    `submit(key, payload)` queues a payload. The run for a key starts once
+    `window_s` passes without a new trigger, or `max_wait_s` after the first
+    one, and receives every payload queued since the last run. Triggers during
+    a run queue up for the next one. Exceptions are logged and counted, never
+    lost in an unobserved task.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        runner: Runner,
+        *,
+        window_s: float = 2.0,
+        max_wait_s: float = 30.0,
+        max_pending: int = 100,
+        dedupe: Callable[[Any], Hashable] | None = None,
+    ) -> None:
+        self.name = name
+        self._runner = runner
+        self.window_s = max(0.0, window_s)
+        self.max_wait_s = max(self.window_s, max_wait_s)
+        self.max_pending = max(1, max_pending)
+        self._dedupe = dedupe
+        self._slots: Dict[Hashable, _Slot] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def pending(self) -> int:
+        """Keys with queued payloads or a run in flight."""
+
+        return len(self._slots)
+
+    def submit(self, key: Hashable, payload: Any = None) -> None:
+        slot = self._slots.setdefault(key, _Slot())
+        if self._dedupe is not None:
+            marker = self._dedupe(payload)
+            if any(self._dedupe(queued) == marker for queued in slot.pending):
+                coalesced_triggers.labels(task=self.name, outcome="dropped").inc()
+                return
+        outcome = "merged" if slot.pending or slot.running is not None else "scheduled"
+        coalesced_triggers.labels(task=self.name, outcome=outcome).inc()
+        slot.pending.append(payload)
+        if len(slot.pending) > self.max_pending:
+            slot.pending.pop(0)
+            coalesced_triggers.labels(task=self.name, outcome="dropped").inc()
+            LOGGER.warning("[%s] backlog for %s over %s, dropped the oldest trigger", self.name, key, self.max_pending)
+        if slot.first_at is None:
+            slot.first_at = time.monotonic()
+        if slot.running is None:
+            self._arm(key, slot)
+
+    def _arm(self, key: Hashable, slot: _Slot) -> None:
+        if slot.timer is not None:
+            slot.timer.cancel()
+        waited = time.monotonic() - (slot.first_at or time.monotonic())
+        delay = max(0.0, min(self.window_s, self.max_wait_s - waited))
+        slot.timer = asyncio.get_running_loop().call_later(delay, self._fire, key)
+
+    def _fire(self, key: Hashable) -> None:
+        slot = self._slots.get(key)
+        if slot is None or slot.running is not None or not slot.pending:
+            return
+        slot.timer = None
+        batch, slot.pending, slot.first_at = slot.pending, [], None
+        task = asyncio.create_task(self._run(key, batch))
+        slot.running = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finished(key, done))
+
+    def _finished(self, key: Hashable, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        slot = self._slots.get(key)
+        if slot is None:
+            return
+        slot.running = None
+        if slot.pending:
+            self._arm(key, slot)
+        else:
+            self._slots.pop(key, None)
+
+    async def _run(self, key: Hashable, batch: List[Any]) -> None:
+        try:
+            await self._runner(key, batch)
+        except Exception:
+            coalesced_runs.labels(task=self.name, status="error").inc()
+            LOGGER.exception("[%s] run for %s failed (%s triggers)", self.name, key, len(batch))
+            return
+        coalesced_runs.labels(task=self.name, status="ok").inc()
+
+    async def drain(self, timeout: float | None = None) -> int:
+        """
+        Start every debounced run now and wait for all runs, including ones
+        queued meanwhile; returns how many keys were still busy at `timeout`.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._slots:
+            for key, slot in list(self._slots.items()):
+                if slot.timer is not None and slot.running is None:
+                    slot.timer.cancel()
+                    self._fire(key)
+            running = set(self._tasks)
+            if not running:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            await asyncio.wait(running, timeout=remaining)
+        return len(self._slots)
+
+
+__all__ = ["KeyedCoalescer"]
@@ -0,0 +1,212 @@
+"""Two-tier embedding cache: an in-process LRU in front of Redis, keyed by model + sha256(text)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Sequence, Set
+
+import numpy as np
+
+from sakhi.apps.api.core.metrics import embedding_cache_lookups, embedding_requests_coalesced
+
+LOGGER = logging.getLogger(__name__)
+
+# Vectors are stored as little-endian float16: 3 KB for 1536 dims, well inside
+# the precision cosine ranking needs.
+_STORE_DTYPE = np.dtype("<f2")
+_REDIS_RETRY_S = 30.0
+
+Fetch = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    return np.asarray(vector, dtype=_STORE_DTYPE).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    return np.frombuffer(data, dtype=_STORE_DTYPE).astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """
+    Resolve embeddings memory -> Redis -> `fetch`, coalescing concurrent misses
+    for the same text into one fetch. All-zero vectors (API fallbacks) are
+    returned but never cached.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 4096,
+        ttl_s: int = 30 * 24 * 3600,
+        redis_url: str | None = None,
+        prefix: str = "sakhi:emb",
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.prefix = prefix
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._fetches: Set[asyncio.Task] = set()
+        self._redis_url = redis_url
+        self._redis = None
+        self._redis_down_until = 0.0
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        redis_url = os.getenv("REDIS_URL") if os.getenv("SAKHI_EMBED_CACHE_REDIS", "1") != "0" else None
+        return cls(
+            max_entries=int(os.getenv("SAKHI_EMBED_CACHE_SIZE", "4096")),
+            ttl_s=int(os.getenv("SAKHI_EMBED_CACHE_TTL_S", str(30 * 24 * 3600))),
+            redis_url=redis_url,
+        )
+
+    def key(self, model: str, text: str) -> str:
+        return f"{self.prefix}:{model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get_local(self, key: str) -> bytes | None:
+        packed = self._entries.get(key)
+        if packed is not None:
+            self._entries.move_to_end(key)
+        return packed
+
+    def _put_local(self, key: str, packed: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = packed
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_redis(self):
+        if not self._redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            from redis import asyncio as aioredis
+
+            # Binary client: the shared helpers decode responses to str.
+            self._redis = aioredis.from_url(self._redis_url)
+        return self._redis
+
+    def _redis_failed(self, exc: Exception) -> None:
+        LOGGER.warning("[embed-cache] redis unavailable, memory tier only for %ss: %s", _REDIS_RETRY_S, exc)
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_S
+
+    async def _redis_get(self, keys: List[str]) -> Dict[str, bytes]:
+        redis = self._get_redis()
+        if redis is None or not keys:
+            return {}
+        try:
+            values = await redis.mget(keys) or []
+        except Exception as exc:
+            self._redis_failed(exc)
+            return {}
+        return {key: value for key, value in zip(keys, values) if value}
+
+    async def _redis_set(self, entries: Dict[str, bytes]) -> None:
+        redis = self._get_redis()
+        if redis is None or not entries:
+            return
+        try:
+            await asyncio.gather(*(redis.set(key, value, ex=self.ttl_s) for key, value in entries.items()))
+        except Exception as exc:
+            self._redis_failed(exc)
+
+    async def resolve(self, model: str, texts: Sequence[str], fetch: Fetch) -> List[List[float]]:
+        """Vectors for `texts`, in order; only misses nobody is already fetching reach `fetch`."""
+
+        keys = [self.key(model, text) for text in texts]
+        found: Dict[str, bytes] = {}
+        for key in dict.fromkeys(keys):
+            packed = self._get_local(key)
+            if packed is not None:
+                found[key] = packed
+        local_misses = [key for key in dict.fromkeys(keys) if key not in found]
+        embedding_cache_lookups.labels(tier="memory", result="hit").inc(len(found))
+        embedding_cache_lookups.labels(tier="memory", result="miss").inc(len(local_misses))
+
+        if local_misses and self._get_redis() is not None:
+            remote = await self._redis_get(local_misses)
+            for key, packed in remote.items():
+                self._put_local(key, packed)
+            found.update(remote)
+            embedding_cache_lookups.labels(tier="redis", result="hit").inc(len(remote))
+            embedding_cache_lookups.labels(tier="redis", result="miss").inc(len(local_misses) - len(remote))
+
+        waiting: Dict[str, asyncio.Future] = {}
+        owned: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in waiting:
+                continue
+            future = self._inflight.get(key)
+            if future is not None:
+                embedding_requests_coalesced.inc()
+            else:
+                owned[key] = text
+                future = self._inflight[key] = asyncio.get_running_loop().create_future()
+            waiting[key] = future
+
+        task = None
+        if owned:
+            # Detached, so a caller that is cancelled (e.g. a stage timeout)
+            # does not take the fetch down for everyone waiting on it.
+            task = asyncio.get_running_loop().create_task(self._fetch(owned, fetch))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+
+        for key, future in waiting.items():
+            found[key] = await asyncio.shield(future)
+        if task is not None:
+            await asyncio.shield(task)  # the owner returns once the results are stored
+        return [unpack_vector(found[key]) for key in keys]
+
+    async def _fetch(self, owned: Dict[str, str], fetch: Fetch) -> None:
+        """Fetch `owned` texts and settle their in-flight futures, then store the results."""
+
+        try:
+            vectors = await fetch(list(owned.values()))
+            if len(vectors) != len(owned):
+                raise RuntimeError(f"embedding fetch returned {len(vectors)} vectors for {len(owned)} texts")
+        except BaseException as exc:
+            for key in owned:
+                future = self._inflight.pop(key)
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+                    future.exception()  # retrieved here; waiters still see it
+            if not isinstance(exc, Exception):
+                raise
+            return
+        fresh: Dict[str, bytes] = {}
+        for key, vector in zip(owned, vectors):
+            packed = pack_vector(vector)
+            self._inflight.pop(key).set_result(packed)
+            if np.frombuffer(packed, dtype=_STORE_DTYPE).any():
+                self._put_local(key, packed)
+                fresh[key] = packed
+        await self._redis_set(fresh)
+
+
+_CACHE: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = EmbeddingCache.from_env()
+    return _CACHE
+
+
+__all__ = ["EmbeddingCache", "get_embedding_cache", "pack_vector", "unpack_vector"]
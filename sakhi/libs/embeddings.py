@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Any, Iterable, List, Sequence
+import time
+from typing import Any, Iterable, List, Sequence, Set, Tuple
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, BadRequestError, UnprocessableEntityError
+
+from sakhi.apps.api.core.metrics import (
+    embedding_batch_latency,
+    embedding_batch_queue_wait,
+    embedding_batch_size,
+)
+from sakhi.libs.embedding_cache import get_embedding_cache
+from sakhi.libs.pgvector import PgVector, as_vector, fit_vector
 
 LOGGER = logging.getLogger(__name__)
 _CLIENT: AsyncOpenAI | None = None
@@ -60,13 +70,152 @@ async def _call_openai(texts: Sequence[str]) -> List[List[float]]:
     return [item.embedding for item in response.data]
 
 
+# Errors caused by the input itself (e.g. one text over the token limit): the
+# rest of a batch is still embeddable, so the batch is split to isolate it.
+_INPUT_ERRORS = (BadRequestError, UnprocessableEntityError)
+
+
+async def _isolate_bad_inputs(payload: List[str]) -> List[List[float]]:
+    """Embed `payload` in halves until the rejected texts are found; only they get zero vectors."""
+
+    if len(payload) == 1:
+        LOGGER.error("embed_text: input rejected by the API; using a zero vector (%s chars)", len(payload[0]))
+        return [_zero_vector()]
+    middle = len(payload) // 2
+    vectors: List[List[float]] = []
+    for half in (payload[:middle], payload[middle:]):
+        try:
+            vectors.extend(await _call_openai(half))
+        except _INPUT_ERRORS:
+            vectors.extend(await _isolate_bad_inputs(half))
+        except Exception as exc:
+            LOGGER.error("embed_text: request for %s texts failed: %s", len(half), exc)
+            vectors.extend(_zero_vector() for _ in half)
+    return vectors
+
+
+async def _fetch_vectors(payload: List[str]) -> List[List[float]]:
+    try:
+        vectors = await _call_openai(payload)
+    except _INPUT_ERRORS as exc:
+        LOGGER.error("embed_text: batch of %s rejected: %s", len(payload), exc)
+        vectors = await _isolate_bad_inputs(payload)
+    except Exception as exc:
+        LOGGER.error("embed_text: first attempt failed: %s", exc)
+        try:
+            vectors = await _call_openai(payload)
+        except _INPUT_ERRORS as retry_exc:
+            LOGGER.error("embed_text: batch of %s rejected: %s", len(payload), retry_exc)
+            vectors = await _isolate_bad_inputs(payload)
+        except Exception as retry_exc:
+            LOGGER.error("embed_text: retry failed: %s", retry_exc)
+            vectors = [_zero_vector() for _ in payload]
+
+    if len(vectors) < len(payload):
+        LOGGER.warning(
+            "embed_text: missing vectors (%s of %s). Padding with zeros.",
+            len(vectors),
+            len(payload),
+        )
+        vectors.extend([_zero_vector() for _ in range(len(payload) - len(vectors))])
+
+    return [_coerce_vector(vec) for vec in vectors]
+
+
+class _MicroBatcher:
+    """
+    Coalesce concurrent embedding requests into batched API calls.
+
+    Texts wait up to `window_s` (or until `max_batch` are queued) and are
+    sent together; each caller gets its own vectors back. A batch the API
+    rejects is split to find the offending texts, so only those fall back to
+    zero vectors. A window of 0 disables batching.
+    """
+
+    def __init__(self, *, window_s: float, max_batch: int) -> None:
+        self.window_s = window_s
+        self.max_batch = max(1, max_batch)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if self.window_s <= 0:
+            return await self._send(texts)
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending, self._timer = loop, [], None
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future, time.perf_counter()))
+            futures.append(future)
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        sent_at = time.perf_counter()
+        for _, _, queued_at in batch:
+            embedding_batch_queue_wait.observe(sent_at - queued_at)
+        try:
+            vectors = await self._send([text for text, _, _ in batch])
+        except BaseException as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    async def _send(self, texts: List[str]) -> List[List[float]]:
+        embedding_batch_size.observe(len(texts))
+        started = time.perf_counter()
+        try:
+            return await _fetch_vectors(texts)
+        finally:
+            embedding_batch_latency.observe(time.perf_counter() - started)
+
+
+_BATCHER: _MicroBatcher | None = None
+
+
+def _get_batcher() -> _MicroBatcher:
+    global _BATCHER
+    if _BATCHER is None:
+        _BATCHER = _MicroBatcher(
+            window_s=float(os.getenv("SAKHI_EMBED_BATCH_WINDOW_MS", "5")) / 1000.0,
+            max_batch=int(os.getenv("SAKHI_EMBED_BATCH_MAX", "64")),
+        )
+    return _BATCHER
+
+
 async def embed_text(text: str | Sequence[str]) -> List[float] | List[List[float]]:
     """
     Canonical embedding entry point.
     - Accepts a string or a list of strings.
     - Always returns vectors of length 1536.
     - Retries once on OpenAI failure, logging errors.
-    - Falls back to zero-vectors when the API cannot be reached.
+    - Falls back to zero-vectors when the API cannot be reached; texts the API
+      rejects get zero vectors without affecting the rest of their batch.
+    - Serves repeats from the embedding cache (memory, then Redis) and
+      coalesces concurrent requests for the same text.
+    - Batches concurrent misses into one API request (SAKHI_EMBED_BATCH_WINDOW_MS,
+      SAKHI_EMBED_BATCH_MAX).
     """
 
     # Explicit kill-switch for embeddings (useful for local/dev cost control).
@@ -96,25 +245,7 @@ async def embed_text(text: str | Sequence[str]) -> List[float] | List[List[float
     payload = [value for _, value in non_empty_pairs]
     payload_positions = [idx for idx, _ in non_empty_pairs]
 
-    try:
-        vectors = await _call_openai(payload)
-    except Exception as exc:
-        LOGGER.error("embed_text: first attempt failed: %s", exc)
-        try:
-            vectors = await _call_openai(payload)
-        except Exception as retry_exc:
-            LOGGER.error("embed_text: retry failed: %s", retry_exc)
-            vectors = [_zero_vector() for _ in payload]
-
-    if len(vectors) < len(payload):
-        LOGGER.warning(
-            "embed_text: missing vectors (%s of %s). Padding with zeros.",
-            len(vectors),
-            len(payload),
-        )
-        vectors.extend([_zero_vector() for _ in range(len(payload) - len(vectors))])
-
-    coerced = [_coerce_vector(vec) for vec in vectors]
+    coerced = await get_embedding_cache().resolve(_MODEL_NAME, payload, _get_batcher().embed)
 
     mapped: List[List[float]] = []
     vector_iter = iter(coerced)
@@ -152,44 +283,19 @@ async def embed_normalized(text: str) -> List[float]:
     return _zero_vector()
 
 
-def to_pgvector(vec: Sequence[Any] | None, *, length: int | None = None) -> str:
+def to_pgvector(vec: Sequence[Any] | None, *, length: int | None = None) -> PgVector:
     """
-    Render a Python sequence as a pgvector literal.
+    Fit a Python sequence to a float32 array for a `vector` parameter.
+    The pool's binary codec sends it as-is; no text literal is built.
     """
-    floats = _coerce_float_list(vec or [])
-    if length is not None:
-        if not floats:
-            floats = [0.0] * length
-        elif len(floats) < length:
-            floats = floats + [0.0] * (length - len(floats))
-        else:
-            floats = floats[:length]
-    if not floats:
-        return "[]"
-    return "[" + ",".join(f"{value:.6f}" for value in floats) + "]"
+    return fit_vector(vec, length)
 
 
-def parse_pgvector(value: Any) -> List[float]:
+def parse_pgvector(value: Any) -> PgVector:
     """
-    Parse a pgvector column (list, tuple, or string literal) into floats.
+    Parse a pgvector column (decoded array, list, tuple, or string literal) into float32.
     """
-    if value is None:
-        return []
-    if isinstance(value, (list, tuple)):
-        return _coerce_float_list(value)
-    if isinstance(value, memoryview):
-        value = value.tobytes()
-    if isinstance(value, (bytes, bytearray)):
-        value = value.decode("utf-8", errors="ignore")
-    if isinstance(value, str):
-        text = value.strip()
-        if not text:
-            return []
-        if text.startswith("[") and text.endswith("]"):
-            text = text[1:-1]
-        parts = [part.strip() for part in text.split(",") if part.strip()]
-        return _coerce_float_list(parts)
-    return []
+    return as_vector(value)
 
 
 __all__ = ["embed_text", "embed_normalized", "parse_pgvector", "to_pgvector"]
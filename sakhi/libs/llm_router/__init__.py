@@ -3,12 +3,14 @@
 from .base import BaseProvider
 from .openrouter import OPENROUTER_DEFAULT_BASE_URL, OpenRouterProvider
 from .router import BudgetExceededError, DailyBudget, LLMRouteConfig, LLMRouter
+from .streaming import ChatStreamAccumulator, TokenCallback
 from .tool_runner import run_tool
 from .types import LLMResponse, Task
 
 __all__ = [
     "BaseProvider",
     "BudgetExceededError",
+    "ChatStreamAccumulator",
     "DailyBudget",
     "LLMResponse",
     "LLMRouteConfig",
@@ -17,4 +19,5 @@ __all__ = [
     "OpenRouterProvider",
     "run_tool",
     "Task",
+    "TokenCallback",
 ]
@@ -5,6 +5,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any, Mapping, Sequence
 
+from .streaming import TokenCallback
 from .types import LLMResponse
 
 
@@ -25,6 +26,26 @@ class BaseProvider(ABC):
     ) -> LLMResponse:
         """Perform a chat completion request."""
 
+    async def chat_stream(
+        self,
+        *,
+        messages: Sequence[Mapping[str, Any]],
+        model: str,
+        on_token: TokenCallback,
+        tools: Sequence[Mapping[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """
+        Perform a chat completion, passing text deltas to `on_token` as they arrive.
+
+        Providers without native streaming emit the whole reply as one delta.
+        """
+
+        response = await self.chat(messages=messages, model=model, tools=tools, **kwargs)
+        if response.text:
+            await on_token(response.text)
+        return response
+
     async def embed(self, *args: Any, **kwargs: Any) -> LLMResponse:  # pragma: no cover
         """Embeddings are handled outside the router."""
         raise NotImplementedError(
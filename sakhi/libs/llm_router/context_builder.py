@@ -6,10 +6,13 @@ from decimal import Decimal
 from typing import Any, Dict, List
 
 from sakhi.apps.api.core.db import get_db
+from sakhi.apps.api.core.personal_model_memo import current_personal_model_memo
 from sakhi.apps.api.middleware.auth_pilot import _mask_pii
 
 LOGGER = logging.getLogger(__name__)
 
+_MODEL_COLUMNS = ("body_state", "mind_state", "emotion_state", "rhythm_state", "soul_state", "goals_state")
+
 
 async def build_meta_context(person_id: str) -> Dict[str, Any]:
     """
@@ -20,10 +23,14 @@ async def build_meta_context(person_id: str) -> Dict[str, Any]:
     db = await get_db()
     context: Dict[str, Any] = {}
     try:
-        model = await db.fetchrow(
-            "SELECT * FROM personal_model WHERE person_id = $1",
-            person_id,
-        )
+        memo = current_personal_model_memo(person_id)
+        if memo is not None:
+            model = await memo.get(_MODEL_COLUMNS)
+        else:
+            model = await db.fetchrow(
+                "SELECT * FROM personal_model WHERE person_id = $1",
+                person_id,
+            )
         if model:
             context["body"] = _ensure_mapping(model.get("body_state"))
             context["mind"] = _ensure_mapping(model.get("mind_state"))
@@ -7,9 +7,14 @@ import json
 from typing import Any
 
 from sakhi.apps.api.core.llm import call_llm
+from sakhi.apps.api.services.memory_graph import cache as graph_cache
 
 
-async def reason_over_graph(person_id: str, question: str, db: Any):
+async def _graph_context(person_id: str, db: Any) -> tuple[list, list]:
+    if graph_cache.ENABLED:
+        graph = await graph_cache.get_graph_cache().get(person_id)
+        nodes = [{"label": n.get("label"), "node_kind": n.get("node_kind"), "data": n.get("data")} for n in graph.nodes()]
+        return nodes, graph.edges()
     nodes = await db.fetch(
         "SELECT label, node_kind, data FROM memory_nodes WHERE person_id = $1",
         person_id,
@@ -18,6 +23,11 @@ async def reason_over_graph(person_id: str, question: str, db: Any):
         "SELECT relation, weight, from_node, to_node FROM memory_edges WHERE person_id = $1",
         person_id,
     )
+    return nodes, edges
+
+
+async def reason_over_graph(person_id: str, question: str, db: Any):
+    nodes, edges = await _graph_context(person_id, db)
     context = {"nodes": nodes, "edges": edges}
     prompt = f"""
 You are Sakhi's integrative intelligence.
@@ -15,6 +15,7 @@ except ModuleNotFoundError:  # pragma: no cover - provide graceful fallback
 
 
 from .base import BaseProvider
+from .streaming import ChatStreamAccumulator, TokenCallback
 from .types import LLMResponse, Task
 
 if openai is not None:
@@ -27,6 +28,9 @@ else:  # pragma: no cover - fallback types when dependency missing
 
     AuthenticationError = RateLimitError = APIConnectionError = _MissingDependencyError
 
+# Upper bound for one chat call; for streams it covers opening and reading the stream.
+_CHAT_TIMEOUT_S = 45.0
+
 _OPENAI_CLIENT: Optional[AsyncOpenAI] = None
 _OPENAI_CLIENT_KEY: Optional[str] = None
 
@@ -49,6 +53,36 @@ def _get_openai_client() -> AsyncOpenAI:
 
     return _OPENAI_CLIENT
 
+
+async def _create_completion(payload: dict[str, Any]) -> Any:
+    """Call chat.completions.create, mapping client errors to RuntimeError."""
+
+    try:
+        client = _get_openai_client()
+        try:
+            return await asyncio.wait_for(
+                client.chat.completions.create(**payload),
+                timeout=_CHAT_TIMEOUT_S,
+            )
+        except Exception as inner_exc:
+            raise RuntimeError(f"OpenAI chat failed: {inner_exc}") from inner_exc
+    except AuthenticationError as e:
+        print("❌ OpenAI Authentication Error:", e)
+        raise RuntimeError("OpenAI connection error: Invalid API key or unauthorized request") from e
+    except RateLimitError as e:
+        print("⚠️ OpenAI Rate Limit:", e)
+        raise RuntimeError("OpenAI connection error: Rate limit reached") from e
+    except APIConnectionError as e:
+        print("🌐 Network error talking to OpenAI:", e)
+        raise RuntimeError("OpenAI connection error: Network failure") from e
+    except asyncio.TimeoutError as e:
+        print("⏱️ OpenAI call timed out")
+        raise RuntimeError("OpenAI connection error: Timeout") from e
+    except Exception as e:  # pragma: no cover - defensive
+        print("💥 LLM call failed:", repr(e))
+        raise RuntimeError(f"OpenAI connection error: {e}") from e
+
+
 class OpenAIProvider(BaseProvider):
     """Provider that talks directly to OpenAI's REST API."""
 
@@ -79,6 +113,93 @@ class OpenAIProvider(BaseProvider):
         tools: Sequence[dict[str, Any]] | None = None,
         **kwargs: Any,
     ) -> LLMResponse:
+        payload = self._build_payload(messages, model, tools, kwargs)
+        response = await _create_completion(payload)
+
+        choice = response.choices[0] if response.choices else None
+        message = getattr(choice, "message", None)
+        text_content = ""
+        if message is not None:
+            text_content = getattr(message, "content", "") or ""
+        raw_tool_calls = getattr(message, "tool_calls", None) if message is not None else None
+        tool_calls_list: list[dict[str, Any]] = []
+        if raw_tool_calls:
+            for call in raw_tool_calls:
+                if hasattr(call, "model_dump"):
+                    tool_calls_list.append(call.model_dump())
+                elif isinstance(call, Mapping):
+                    tool_calls_list.append(dict(call))
+
+        usage = response.usage
+        if usage and hasattr(usage, "model_dump"):
+            usage_dict = usage.model_dump()
+        elif isinstance(usage, Mapping):
+            usage_dict = dict(usage)
+        else:
+            usage_dict = {}
+
+        raw_response = response.model_dump() if hasattr(response, "model_dump") else response
+
+        return LLMResponse(
+            model=getattr(response, "model", payload["model"]),
+            task=Task.TOOL if tool_calls_list else Task.CHAT,
+            text=text_content,
+            provider=self.name,
+            usage=usage_dict,
+            tool_calls=tool_calls_list or None,
+            raw=raw_response,
+        )
+
+    async def chat_stream(
+        self,
+        *,
+        messages: Sequence[dict[str, Any]],
+        model: str | None = None,
+        on_token: TokenCallback,
+        tools: Sequence[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        payload = self._build_payload(messages, model, tools, kwargs)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        accumulator = ChatStreamAccumulator(payload["model"])
+        try:
+            async with asyncio.timeout(_CHAT_TIMEOUT_S):
+                stream = await _create_completion(payload)
+                try:
+                    async for chunk in stream:
+                        data = chunk.model_dump() if hasattr(chunk, "model_dump") else dict(chunk)
+                        delta = accumulator.add(data)
+                        if delta:
+                            await on_token(delta)
+                except Exception as exc:
+                    raise RuntimeError(f"OpenAI connection error: stream interrupted: {exc}") from exc
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close is not None:
+                        await close()
+        except TimeoutError as exc:
+            print("⏱️ OpenAI stream timed out")
+            raise RuntimeError("OpenAI connection error: Timeout") from exc
+
+        tool_calls_list = accumulator.tool_calls()
+        return LLMResponse(
+            model=accumulator.model or payload["model"],
+            task=Task.TOOL if tool_calls_list else Task.CHAT,
+            text=accumulator.text,
+            provider=self.name,
+            usage=accumulator.usage,
+            tool_calls=tool_calls_list or None,
+            raw=accumulator.as_raw(),
+        )
+
+    def _build_payload(
+        self,
+        messages: Sequence[dict[str, Any]],
+        model: str | None,
+        tools: Sequence[dict[str, Any]] | None,
+        kwargs: Mapping[str, Any],
+    ) -> dict[str, Any]:
         if not isinstance(messages, Sequence) or not messages:
             raise ValueError("OpenAI provider: 'messages' must be a non-empty sequence.")
 
@@ -138,65 +259,7 @@ class OpenAIProvider(BaseProvider):
             payload["tool_choice"] = tool_choice
         if response_format:
             payload["response_format"] = response_format
-
-        try:
-            client = _get_openai_client()
-            try:
-                response = await asyncio.wait_for(
-                    client.chat.completions.create(**payload),
-                    timeout=45,
-                )
-            except Exception as inner_exc:
-                raise RuntimeError(f"OpenAI chat failed: {inner_exc}") from inner_exc
-        except AuthenticationError as e:
-            print("❌ OpenAI Authentication Error:", e)
-            raise RuntimeError("OpenAI connection error: Invalid API key or unauthorized request") from e
-        except RateLimitError as e:
-            print("⚠️ OpenAI Rate Limit:", e)
-            raise RuntimeError("OpenAI connection error: Rate limit reached") from e
-        except APIConnectionError as e:
-            print("🌐 Network error talking to OpenAI:", e)
-            raise RuntimeError("OpenAI connection error: Network failure") from e
-        except asyncio.TimeoutError as e:
-            print("⏱️ OpenAI call timed out")
-            raise RuntimeError("OpenAI connection error: Timeout") from e
-        except Exception as e:  # pragma: no cover - defensive
-            print("💥 LLM call failed:", repr(e))
-            raise RuntimeError(f"OpenAI connection error: {e}") from e
-
-        choice = response.choices[0] if response.choices else None
-        message = getattr(choice, "message", None)
-        text_content = ""
-        if message is not None:
-            text_content = getattr(message, "content", "") or ""
-        raw_tool_calls = getattr(message, "tool_calls", None) if message is not None else None
-        tool_calls_list: list[dict[str, Any]] = []
-        if raw_tool_calls:
-            for call in raw_tool_calls:
-                if hasattr(call, "model_dump"):
-                    tool_calls_list.append(call.model_dump())
-                elif isinstance(call, Mapping):
-                    tool_calls_list.append(dict(call))
-
-        usage = response.usage
-        if usage and hasattr(usage, "model_dump"):
-            usage_dict = usage.model_dump()
-        elif isinstance(usage, Mapping):
-            usage_dict = dict(usage)
-        else:
-            usage_dict = {}
-
-        raw_response = response.model_dump() if hasattr(response, "model_dump") else response
-
-        return LLMResponse(
-            model=getattr(response, "model", payload["model"]),
-            task=Task.TOOL if tool_calls_list else Task.CHAT,
-            text=text_content,
-            provider=self.name,
-            usage=usage_dict,
-            tool_calls=tool_calls_list or None,
-            raw=raw_response,
-        )
+        return payload
 
     async def embed(self, *args: Any, **kwargs: Any) -> LLMResponse:  # pragma: no cover
         raise RuntimeError("Embedding is handled by sakhi.libs.embeddings.embed_text().")
@@ -11,6 +11,7 @@ from jsonschema import Draft7Validator, ValidationError
 from jsonschema.exceptions import SchemaError
 
 from .base import BaseProvider
+from .streaming import ChatStreamAccumulator, TokenCallback, iter_sse_json
 from .types import LLMResponse, Task
 
 OPENROUTER_DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
@@ -80,18 +81,78 @@ class OpenRouterProvider(BaseProvider):
             raw=response_json,
         )
 
+    async def chat_stream(
+        self,
+        *,
+        messages: Sequence[Mapping[str, Any]],
+        model: str,
+        on_token: TokenCallback,
+        tools: Sequence[Mapping[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> LLMResponse:
+        """Execute a streamed chat completion, forwarding text deltas to `on_token`."""
+
+        kwargs.pop("force_json", None)
+        kwargs.pop("response_format", None)
+
+        payload_tools, validators = self._prepare_tools(tools)
+        payload = {
+            "model": model,
+            "messages": [self._serialise_message(message) for message in messages],
+            **kwargs,
+            "stream": True,
+        }
+        if payload_tools:
+            payload["tools"] = payload_tools
+
+        url = f"{self._base_url.rstrip('/')}/chat/completions"
+        accumulator = ChatStreamAccumulator(model)
+        async with httpx.AsyncClient(timeout=self._timeout) as client:
+            try:
+                async with client.stream("POST", url, headers=self._headers(), json=payload) as response:
+                    if not response.is_success:
+                        body = (await response.aread()).decode(errors="replace")
+                        raise RuntimeError(f"OpenRouter {response.status_code} on {url}. Body: {body[:400]}")
+                    headers = response.headers
+                    async for chunk in iter_sse_json(response.aiter_lines()):
+                        if chunk.get("error"):
+                            raise RuntimeError(f"OpenRouter stream error on {url}: {chunk['error']}")
+                        delta = accumulator.add(chunk)
+                        if delta:
+                            await on_token(delta)
+            except httpx.RequestError as exc:
+                raise RuntimeError(
+                    f"OpenRouter network error: {exc}. Check API key or connectivity."
+                ) from exc
+
+        raw = accumulator.as_raw()
+        normalized_tools = self._normalise_tool_calls(accumulator.message(), validators)
+        return LLMResponse(
+            model=accumulator.model or model,
+            task=Task.CHAT if not normalized_tools else Task.TOOL,
+            text=accumulator.text,
+            tool_calls=normalized_tools.get("tool_calls") if normalized_tools else None,
+            usage=accumulator.usage,
+            cost=self._extract_cost(raw, headers),
+            provider=self.name,
+            raw=raw,
+        )
+
     async def embed(self, *args: Any, **kwargs: Any) -> LLMResponse:  # pragma: no cover
         raise RuntimeError("Embedding is handled by sakhi.libs.embeddings.embed_text().")
 
-    async def _post(self, path: str, payload: Mapping[str, Any]) -> tuple[dict[str, Any], Mapping[str, str]]:
-        url = f"{self._base_url.rstrip('/')}{path}"
-        headers = {
+    def _headers(self) -> dict[str, str]:
+        return {
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": self._tenant or "http://localhost:3000",
             "X-Title": "Sakhi",
         }
 
+    async def _post(self, path: str, payload: Mapping[str, Any]) -> tuple[dict[str, Any], Mapping[str, str]]:
+        url = f"{self._base_url.rstrip('/')}{path}"
+        headers = self._headers()
+
         async with httpx.AsyncClient(timeout=self._timeout) as client:
             try:
                 response = await client.post(url, headers=headers, json=payload)
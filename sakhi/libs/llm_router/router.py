@@ -8,6 +8,7 @@ from datetime import date
 from typing import Any, Mapping, MutableMapping, Sequence
 
 from .base import BaseProvider
+from .streaming import TokenCallback
 from .types import LLMResponse, Task
 
 
@@ -20,6 +21,18 @@ def _format_persona_prompt(persona: str) -> str:
     )
 
 
+class _TrackedSink:
+    """Token callback wrapper remembering whether anything was emitted."""
+
+    def __init__(self, callback: TokenCallback) -> None:
+        self._callback = callback
+        self.emitted = False
+
+    async def __call__(self, delta: str) -> None:
+        self.emitted = True
+        await self._callback(delta)
+
+
 class BudgetExceededError(RuntimeError):
     """Raised when a provider's daily budget has been exhausted."""
 
@@ -109,9 +122,17 @@ class LLMRouter:
         model: str,
         tools: Sequence[Mapping[str, Any]] | None = None,
         provider: str | None = None,
+        on_token: TokenCallback | None = None,
         **kwargs: Any,
     ) -> LLMResponse:
-        """Execute a chat request with automatic provider failover."""
+        """
+        Execute a chat request with automatic provider failover.
+
+        With `on_token`, the reply is streamed: each text delta is awaited
+        through the callback as the provider produces it and the assembled
+        response is still returned. Failover only happens before the first
+        delta has been emitted.
+        """
 
         message_payload = [dict(message) for message in messages]
         persona = kwargs.pop("persona", None)
@@ -130,13 +151,18 @@ class LLMRouter:
         task = Task.TOOL if tools else Task.CHAT
         errors: list[str] = []
         for candidate in self._resolve_candidates(task, provider_override=provider):
+            sink = _TrackedSink(on_token) if on_token is not None else None
             try:
                 return await self._execute(
                     task,
                     candidate,
                     call_kwargs={"messages": message_payload, "model": model, "tools": tool_payload, **kwargs},
+                    on_token=sink,
                 )
             except Exception as exc:
+                if sink is not None and sink.emitted:
+                    # Part of the reply already reached the caller; a retry would duplicate it.
+                    raise
                 self._logger.warning(
                     "Provider %s failed for %s task: %s", candidate, task.value, exc, exc_info=True
                 )
@@ -165,12 +191,16 @@ class LLMRouter:
         provider_key: str,
         *,
         call_kwargs: dict[str, Any],
+        on_token: TokenCallback | None = None,
     ) -> LLMResponse:
         provider = self._providers.get(provider_key)
         if provider is None:
             raise ValueError(f"Provider '{provider_key}' is not registered")
 
-        response = await provider.chat(**call_kwargs)
+        if on_token is None:
+            response = await provider.chat(**call_kwargs)
+        else:
+            response = await provider.chat_stream(on_token=on_token, **call_kwargs)
 
         if response.provider is None:
             response.provider = provider_key
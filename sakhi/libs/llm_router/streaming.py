@@ -0,0 +1,98 @@
+"""Helpers for streamed (token-by-token) chat completions."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
+
+TokenCallback = Callable[[str], Awaitable[None]]
+
+
+class ChatStreamAccumulator:
+    """
+    Fold OpenAI-compatible `chat.completion.chunk` payloads into one response.
+
+    Text deltas are concatenated, tool-call fragments are stitched together by
+    their `index`, and the final usage block (if the provider sends one) is kept.
+    """
+
+    def __init__(self, model: str | None = None) -> None:
+        self.model = model
+        self.usage: dict[str, Any] = {}
+        self.finish_reason: str | None = None
+        self._parts: list[str] = []
+        self._tool_calls: dict[int, dict[str, Any]] = {}
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def add(self, chunk: Mapping[str, Any]) -> str:
+        """Merge one chunk and return its text delta ("" if none)."""
+
+        if chunk.get("model"):
+            self.model = chunk["model"]
+        if chunk.get("usage"):
+            self.usage = dict(chunk["usage"])
+
+        delta_text = ""
+        for choice in chunk.get("choices") or []:
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+            delta = choice.get("delta") or {}
+            content = delta.get("content")
+            if content:
+                self._parts.append(content)
+                delta_text += content
+            for fragment in delta.get("tool_calls") or []:
+                call = self._tool_calls.setdefault(
+                    fragment.get("index", len(self._tool_calls)),
+                    {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+                )
+                if fragment.get("id"):
+                    call["id"] = fragment["id"]
+                function = fragment.get("function") or {}
+                if function.get("name"):
+                    call["function"]["name"] += function["name"]
+                if function.get("arguments"):
+                    call["function"]["arguments"] += function["arguments"]
+        return delta_text
+
+    def tool_calls(self) -> list[dict[str, Any]]:
+        return [self._tool_calls[index] for index in sorted(self._tool_calls)]
+
+    def message(self) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": self.text}
+        tool_calls = self.tool_calls()
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return message
+
+    def as_raw(self) -> dict[str, Any]:
+        """The equivalent non-streamed `chat.completion` payload."""
+
+        return {
+            "object": "chat.completion",
+            "model": self.model,
+            "choices": [{"index": 0, "message": self.message(), "finish_reason": self.finish_reason}],
+            "usage": self.usage,
+        }
+
+
+async def iter_sse_json(lines: AsyncIterator[str]) -> AsyncIterator[dict[str, Any]]:
+    """Yield the JSON `data:` payloads of an SSE body until `[DONE]`."""
+
+    async for line in lines:
+        line = line.strip()
+        if not line or line.startswith(":") or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            continue
+
+
+__all__ = ["ChatStreamAccumulator", "TokenCallback", "iter_sse_json"]
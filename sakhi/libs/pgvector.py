@@ -0,0 +1,123 @@
+"""Binary pgvector codec: `vector` columns read as float32 arrays and accept arrays on write."""
+
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+import numpy as np
+
+VECTOR_DTYPE = np.float32
+_WIRE_DTYPE = np.dtype(">f4")
+_HEADER = struct.Struct(">HH")  # dimensions, unused
+
+# Schema the `vector` type lives in, looked up once per process
+# (None: not looked up yet, "": extension not installed).
+_vector_schema: str | None = None
+
+
+class PgVector(np.ndarray):
+    """
+    float32 array decoded from a `vector` column.
+
+    Truthy when non-empty, like the lists readers used to get, so
+    `row["vec"] or []` and `if not vec` keep working. Arithmetic on it
+    returns plain ndarrays.
+    """
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __array_wrap__(self, array, context=None, return_scalar=False):
+        result = super().__array_wrap__(array, context, return_scalar)
+        return result.view(np.ndarray) if isinstance(result, np.ndarray) else result
+
+
+def as_vector(value: Any) -> PgVector:
+    """
+    Coerce a decoded column, a Python sequence or a `[1,2,3]` text literal
+    to a float32 PgVector. Unparseable input gives an empty vector.
+    """
+
+    if isinstance(value, PgVector):
+        return value
+    if value is None:
+        return np.empty(0, dtype=VECTOR_DTYPE).view(PgVector)
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8", errors="ignore")
+    try:
+        if isinstance(value, str):
+            text = value.strip()
+            if text.startswith("[") and text.endswith("]"):
+                text = text[1:-1]
+            array = np.array([piece for piece in text.split(",") if piece.strip()], dtype=VECTOR_DTYPE)
+        else:
+            array = np.asarray(value, dtype=VECTOR_DTYPE).ravel()
+    except (TypeError, ValueError):
+        array = np.empty(0, dtype=VECTOR_DTYPE)
+    return array.view(PgVector)
+
+
+def fit_vector(value: Any, length: int | None = None) -> PgVector:
+    """`as_vector`, zero-padded or truncated to `length` when given."""
+
+    array = as_vector(value)
+    if length is None or array.size == length:
+        return array
+    fitted = np.zeros(length, dtype=VECTOR_DTYPE)
+    count = min(length, array.size)
+    fitted[:count] = array[:count]
+    return fitted.view(PgVector)
+
+
+def encode_vector(value: Any) -> bytes:
+    array = np.asarray(as_vector(value), dtype=_WIRE_DTYPE)
+    return _HEADER.pack(array.size, 0) + array.tobytes()
+
+
+def decode_vector(data: bytes) -> PgVector:
+    dimensions, _ = _HEADER.unpack_from(data)
+    array = np.frombuffer(data, dtype=_WIRE_DTYPE, count=dimensions, offset=_HEADER.size)
+    return array.astype(VECTOR_DTYPE).view(PgVector)
+
+
+async def register_vector_codec(connection: Any) -> bool:
+    """Install the binary codec on `connection`; False when pgvector is not installed."""
+
+    global _vector_schema
+    if _vector_schema is None:
+        _vector_schema = (
+            await connection.fetchval(
+                """
+                SELECT n.nspname
+                FROM pg_type t
+                JOIN pg_namespace n ON n.oid = t.typnamespace
+                WHERE t.typname = 'vector'
+                LIMIT 1
+                """
+            )
+            or ""
+        )
+    if not _vector_schema:
+        return False
+    await connection.set_type_codec(
+        "vector",
+        schema=_vector_schema,
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format="binary",
+    )
+    return True
+
+
+__all__ = [
+    "PgVector",
+    "VECTOR_DTYPE",
+    "as_vector",
+    "decode_vector",
+    "encode_vector",
+    "fit_vector",
+    "register_vector_codec",
+]
@@ -0,0 +1,194 @@
+"""Shared multi-pattern phrase matching for keyword triggers."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# node -> (transitions, failure link, outputs as (phrase, set names))
+_Automaton = Tuple[List[Dict[str, int]], List[int], List[Tuple[Tuple[str, Tuple[str, ...]], ...]]]
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    set_name: str
+    phrase: str
+    start: int
+    end: int
+
+
+class PhraseMatches:
+    """Every registered phrase set that matched one text, with positions."""
+
+    __slots__ = ("_by_set",)
+
+    def __init__(self, by_set: Mapping[str, Tuple[PhraseMatch, ...]]) -> None:
+        self._by_set = dict(by_set)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_set
+
+    def get(self, name: str) -> Tuple[PhraseMatch, ...]:
+        return self._by_set.get(name, ())
+
+    def phrases(self, name: str) -> frozenset[str]:
+        """Distinct phrases of set `name` found in the text."""
+
+        return frozenset(match.phrase for match in self.get(name))
+
+    def sets(self) -> List[str]:
+        return sorted(self._by_set)
+
+
+class PhraseSet:
+    """Handle for one registered phrase list; lookups go through the shared index."""
+
+    __slots__ = ("index", "name", "phrases")
+
+    def __init__(self, index: "PhraseIndex", name: str, phrases: Tuple[str, ...]) -> None:
+        self.index = index
+        self.name = name
+        self.phrases = phrases
+
+    def search(self, text: str) -> bool:
+        """Same as `any(p in text for p in phrases)`."""
+
+        return self.name in self.index.scan(text)
+
+    def find(self, text: str) -> Tuple[PhraseMatch, ...]:
+        return self.index.scan(text).get(self.name)
+
+    def found(self, text: str) -> List[str]:
+        """Matched phrases in registration order."""
+
+        hits = self.index.scan(text).phrases(self.name)
+        return [phrase for phrase in self.phrases if phrase in hits]
+
+    def __iter__(self):
+        return iter(self.phrases)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def __repr__(self) -> str:
+        return f"PhraseSet({self.name!r}, {len(self.phrases)} phrases)"
+
+
+class PhraseIndex:
+    """
+    Aho-Corasick automaton over every registered phrase set.
+
+    Modules register their keyword lists once at import; `scan` then walks a
+    text a single time and reports every set with a phrase in it (plain
+    substring semantics, like `phrase in text`). Results are memoized per
+    text, so the triage, engine and route checks of one turn share one pass.
+    """
+
+    def __init__(self, *, cache_size: int = 256) -> None:
+        self._sets: Dict[str, Tuple[str, ...]] = {}
+        self._automaton: _Automaton | None = None
+        self._lock = threading.Lock()
+        self._cached_scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def register(self, name: str, phrases: Iterable[str]) -> PhraseSet:
+        """Add a named phrase list; re-registering the same list is a no-op."""
+
+        cleaned = tuple(dict.fromkeys(phrase for phrase in phrases if phrase))
+        with self._lock:
+            existing = self._sets.get(name)
+            if existing is not None and existing != cleaned:
+                raise ValueError(f"Phrase set {name!r} is already registered with different phrases")
+            if existing is None:
+                self._sets[name] = cleaned
+                self._automaton = None
+                self._cached_scan.cache_clear()
+        return PhraseSet(self, name, cleaned)
+
+    def scan(self, text: str) -> PhraseMatches:
+        return self._cached_scan(text or "")
+
+    def _compiled(self) -> _Automaton:
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = _compile(self._sets)
+                automaton = self._automaton
+        return automaton
+
+    def _scan(self, text: str) -> PhraseMatches:
+        goto, fail, out = self._compiled()
+        hits: Dict[str, List[PhraseMatch]] = {}
+        node = 0
+        for end, char in enumerate(text, start=1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for phrase, names in out[node]:
+                for name in names:
+                    hits.setdefault(name, []).append(PhraseMatch(name, phrase, end - len(phrase), end))
+        return PhraseMatches({name: tuple(matches) for name, matches in hits.items()})
+
+
+def _compile(sets: Mapping[str, Tuple[str, ...]]) -> _Automaton:
+    owners: Dict[str, List[str]] = {}
+    for name, phrases in sets.items():
+        for phrase in phrases:
+            owners.setdefault(phrase, []).append(name)
+
+    goto: List[Dict[str, int]] = [{}]
+    terminal: List[List[Tuple[str, Tuple[str, ...]]]] = [[]]
+    for phrase, names in owners.items():
+        node = 0
+        for char in phrase:
+            nxt = goto[node].get(char)
+            if nxt is None:
+                nxt = len(goto)
+                goto[node][char] = nxt
+                goto.append({})
+                terminal.append([])
+            node = nxt
+        terminal[node].append((phrase, tuple(names)))
+
+    fail = [0] * len(goto)
+    out: List[Tuple[Tuple[str, Tuple[str, ...]], ...]] = [()] * len(goto)
+    queue = deque()
+    for child in goto[0].values():
+        out[child] = tuple(terminal[child])
+        queue.append(child)
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            link = fail[node]
+            while link and char not in goto[link]:
+                link = fail[link]
+            fail[child] = goto[link].get(char, 0)
+            out[child] = tuple(terminal[child]) + out[fail[child]]
+            queue.append(child)
+    return goto, fail, out
+
+
+# Process-wide index shared by all keyword triggers.
+PHRASES = PhraseIndex()
+
+
+def register_phrases(name: str, phrases: Iterable[str]) -> PhraseSet:
+    return PHRASES.register(name, phrases)
+
+
+def scan_phrases(text: str) -> PhraseMatches:
+    return PHRASES.scan(text)
+
+
+__all__ = [
+    "PHRASES",
+    "PhraseIndex",
+    "PhraseMatch",
+    "PhraseMatches",
+    "PhraseSet",
+    "register_phrases",
+    "scan_phrases",
+]
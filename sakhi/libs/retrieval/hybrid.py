@@ -7,6 +7,8 @@ from typing import Any
 
 import asyncpg
 
+from sakhi.apps.api.core.db import get_pool
+
 
 @dataclass(slots=True)
 class RetrieverConfig:
@@ -16,6 +18,10 @@ class RetrieverConfig:
     text_column: str = "content"
     embedding_column: str = "embedding"
     match_count: int = 5
+    # Stored tsvector column (GIN-indexed); None computes to_tsvector(text_column) per row.
+    tsvector_column: str | None = None
+    # Each ranking contributes 1 / (rrf_k + rank) to the fused score.
+    rrf_k: int = 60
 
 
 class HybridRetriever:
@@ -26,10 +32,10 @@ class HybridRetriever:
         self._config = config or RetrieverConfig()
 
     @classmethod
-    async def create(cls, dsn: str, config: RetrieverConfig | None = None) -> "HybridRetriever":
-        """Connect to Postgres and return a retriever instance."""
+    async def create(cls, dsn: str | None = None, config: RetrieverConfig | None = None) -> "HybridRetriever":
+        """Return a retriever on the shared pool (opened from `dsn` if not yet open)."""
 
-        pool = await asyncpg.create_pool(dsn)
+        pool = await get_pool(dsn)
         return cls(pool=pool, config=config)
 
     async def search(self, query: str, embedding: list[float] | None = None) -> list[dict[str, Any]]:
@@ -45,37 +51,54 @@ class HybridRetriever:
                 }
             ]
 
+        config = self._config
+        tsv = config.tsvector_column or f"to_tsvector('english', {config.text_column})"
         if embedding is None:
             sql = f"""
-                with ranked as (
-                    select
-                        id,
-                        {self._config.text_column} as content,
-                        ts_rank_cd(to_tsvector('english', {self._config.text_column}), plainto_tsquery($1)) as score
-                    from {self._config.table_name}
-                )
-                select id, content, score
-                from ranked
-                order by score desc nulls last
+                select id, {config.text_column} as content, ts_rank_cd({tsv}, terms) as score
+                from {config.table_name}, plainto_tsquery('english', $1) terms
+                where {tsv} @@ terms
+                order by score desc
                 limit $2
             """
-            params: list[Any] = [query, self._config.match_count]
+            params: list[Any] = [query, config.match_count]
         else:
+            # Reciprocal-rank fusion of the full-text and nearest-neighbour lists;
+            # each leg reads only its own top candidates through its index.
             sql = f"""
-                with ranked as (
-                    select
-                        id,
-                        {self._config.text_column} as content,
-                        ts_rank_cd(to_tsvector('english', {self._config.text_column}), plainto_tsquery($1))
-                        + coalesce(1 - ({self._config.embedding_column} <=> $2::vector), 0) as score
-                    from {self._config.table_name}
+                with lexical as (
+                    select id, row_number() over (order by relevance desc) as rank
+                    from (
+                        select id, ts_rank_cd({tsv}, terms) as relevance
+                        from {config.table_name}, plainto_tsquery('english', $1) terms
+                        where {tsv} @@ terms
+                        order by relevance desc
+                        limit $3
+                    ) matched
+                ),
+                semantic as (
+                    select id, row_number() over (order by distance) as rank
+                    from (
+                        select id, {config.embedding_column} <=> $2::vector as distance
+                        from {config.table_name}
+                        where {config.embedding_column} is not null
+                        order by distance
+                        limit $3
+                    ) nearest
+                ),
+                fused as (
+                    select coalesce(l.id, s.id) as id,
+                           coalesce(1.0 / ($4 + l.rank), 0) + coalesce(1.0 / ($4 + s.rank), 0) as score
+                    from lexical l
+                    full outer join semantic s on s.id = l.id
                 )
-                select id, content, score
-                from ranked
-                order by score desc nulls last
-                limit $3
+                select d.id, d.{config.text_column} as content, fused.score
+                from fused
+                join {config.table_name} d on d.id = fused.id
+                order by fused.score desc
+                limit $5
             """
-            params = [query, embedding, self._config.match_count]
+            params = [query, embedding, config.match_count * 4, config.rrf_k, config.match_count]
 
         async with self._pool.acquire() as connection:
             try:
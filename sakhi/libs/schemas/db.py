@@ -2,35 +2,19 @@
 
 from __future__ import annotations
 
-import asyncio
 from typing import Any
 
 import asyncpg
 
+from sakhi.apps.api.core.db import InstrumentedPool, get_pool
+
 from .settings import get_settings
 
-_POOL: asyncpg.Pool | None = None
-_POOL_LOCK = asyncio.Lock()
-
-
-async def get_async_pool() -> asyncpg.Pool:
-    """Return a shared asyncpg connection pool, creating it on demand."""
-
-    global _POOL
-    if _POOL is None:
-        async with _POOL_LOCK:
-            if _POOL is None:
-                settings = get_settings()
-                _POOL = await asyncpg.create_pool(
-                    dsn=settings.database_url,
-                    min_size=1,
-                    max_size=10,
-                    command_timeout=60,
-                    statement_cache_size=0,
-                    max_inactive_connection_lifetime=300,
-                    max_cached_statement_lifetime=0,
-                )
-    return _POOL
+
+async def get_async_pool() -> InstrumentedPool:
+    """Return the process-wide instrumented pool shared with the API helpers."""
+
+    return await get_pool(get_settings().database_url)
 
 
 async def fetch_one(query: str, *args: Any) -> asyncpg.Record | None:
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from sakhi.apps.api.core import metrics
+from sakhi.libs import embedding_cache, embeddings
+from sakhi.libs.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    calls = []
+
+    async def call_openai(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(0.001)
+        return [[float(len(text))] * 1536 for text in texts]
+
+    monkeypatch.delenv("SAKHI_DISABLE_EMBEDDINGS", raising=False)
+    monkeypatch.setattr(embeddings, "_call_openai", call_openai)
+    monkeypatch.setattr(embedding_cache, "_CACHE", EmbeddingCache(redis_url=None))
+    return calls
+
+
+def _use_batcher(monkeypatch, **kwargs):
+    monkeypatch.setattr(embeddings, "_BATCHER", embeddings._MicroBatcher(**kwargs))
+
+
+def _batches_observed():
+    for family in metrics.embedding_batch_size.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_count"):
+                return sample.value
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_single_texts_share_one_request(api_calls, monkeypatch) -> None:
+    _use_batcher(monkeypatch, window_s=0.01, max_batch=64)
+    before = _batches_observed()
+
+    texts = [f"text {i}{'x' * i}" for i in range(10)]
+    vectors = await asyncio.gather(*(embeddings.embed_text(text) for text in texts))
+
+    assert len(api_calls) == 1 and sorted(api_calls[0]) == sorted(texts)
+    assert [vector[0] for vector in vectors] == [float(len(text)) for text in texts]
+    assert _batches_observed() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_size(api_calls, monkeypatch) -> None:
+    _use_batcher(monkeypatch, window_s=0.05, max_batch=4)
+
+    vectors = await embeddings.embed_text([f"t{i}" for i in range(10)])
+
+    assert [len(call) for call in api_calls] == [4, 4, 2]
+    assert len(vectors) == 10 and all(len(vector) == 1536 for vector in vectors)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_zero_vectors_per_item(api_calls, monkeypatch) -> None:
+    _use_batcher(monkeypatch, window_s=0.01, max_batch=64)
+
+    async def down(texts):
+        api_calls.append(list(texts))
+        raise RuntimeError("api down")
+
+    monkeypatch.setattr(embeddings, "_call_openai", down)
+    vectors = await asyncio.gather(embeddings.embed_text("a"), embeddings.embed_text("b"))
+
+    assert len(api_calls) == 2  # one batch, retried once
+    assert vectors == [[0.0] * 1536, [0.0] * 1536]
+
+
+@pytest.mark.asyncio
+async def test_zero_window_sends_immediately(api_calls, monkeypatch) -> None:
+    _use_batcher(monkeypatch, window_s=0, max_batch=64)
+
+    await asyncio.gather(embeddings.embed_text("one"), embeddings.embed_text("two"))
+
+    assert sorted(api_calls) == [["one"], ["two"]]
+
+
+@pytest.mark.asyncio
+async def test_rejected_text_does_not_zero_its_batch_mates(api_calls, monkeypatch) -> None:
+    _use_batcher(monkeypatch, window_s=0.01, max_batch=64)
+
+    class Rejected(Exception):
+        pass
+
+    async def picky(texts):
+        api_calls.append(list(texts))
+        if "poison" in texts:
+            raise Rejected("input too long")
+        return [[float(len(text))] * 1536 for text in texts]
+
+    monkeypatch.setattr(embeddings, "_call_openai", picky)
+    monkeypatch.setattr(embeddings, "_INPUT_ERRORS", (Rejected,))
+    texts = ["alpha", "be", "poison", "delta", "e"]
+    vectors = await asyncio.gather(*(embeddings.embed_text(text) for text in texts))
+
+    assert [vector[0] for vector in vectors] == [5.0, 2.0, 0.0, 5.0, 1.0]
+    assert vectors[2] == [0.0] * 1536
+    assert len(api_calls) <= 1 + 2 * 3  # the batch, then at most two halves per level
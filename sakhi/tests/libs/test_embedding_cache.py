@@ -0,0 +1,147 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from sakhi.apps.api.core import metrics
+from sakhi.libs import embedding_cache, embeddings
+from sakhi.libs.embedding_cache import EmbeddingCache
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store = {}
+        self.ttls = {}
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+
+def _counting_fetch(calls, delay=0.0):
+    async def fetch(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(delay)
+        return [[float(len(text)), 0.5, -0.25] for text in texts]
+
+    return fetch
+
+
+def _lookups(tier, result):
+    return metrics.embedding_cache_lookups.labels(tier=tier, result=result)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_repeats_are_served_from_memory() -> None:
+    cache = EmbeddingCache(redis_url=None)
+    calls = []
+    hits = _lookups("memory", "hit")
+
+    first = await cache.resolve("m", ["alpha", "beta", "alpha"], _counting_fetch(calls))
+    again = await cache.resolve("m", ["beta"], _counting_fetch(calls))
+
+    assert calls == [["alpha", "beta"]]
+    assert first == [[5.0, 0.5, -0.25], [4.0, 0.5, -0.25], [5.0, 0.5, -0.25]]
+    assert again == [first[1]]
+    assert _lookups("memory", "hit") == hits + 1
+    assert cache.key("m", "alpha") != cache.key("other-model", "alpha")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_fetch() -> None:
+    cache = EmbeddingCache(redis_url=None)
+    calls = []
+    coalesced = metrics.embedding_requests_coalesced._value.get()
+
+    results = await asyncio.gather(*(cache.resolve("m", ["same"], _counting_fetch(calls, 0.01)) for _ in range(5)))
+
+    assert calls == [["same"]]
+    assert all(result == results[0] for result in results)
+    assert metrics.embedding_requests_coalesced._value.get() == coalesced + 4
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_stores_float16_and_warms_other_processes() -> None:
+    redis = _FakeRedis()
+    writer = EmbeddingCache(redis_url="redis://fake", ttl_s=60)
+    writer._redis = redis
+    await writer.resolve("m", ["text"], _counting_fetch([]))
+
+    (key, value), = redis.store.items()
+    assert len(value) == 3 * 2 and redis.ttls[key] == 60
+
+    reader = EmbeddingCache(redis_url="redis://fake")
+    reader._redis = redis
+    calls = []
+    assert await reader.resolve("m", ["text"], _counting_fetch(calls)) == [[4.0, 0.5, -0.25]]
+    assert calls == [] and len(reader) == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_fallbacks_and_failures_are_not_cached() -> None:
+    cache = EmbeddingCache(redis_url=None)
+
+    async def zeros(texts):
+        return [[0.0, 0.0] for _ in texts]
+
+    async def boom(texts):
+        raise RuntimeError("down")
+
+    assert await cache.resolve("m", ["x"], zeros) == [[0.0, 0.0]]
+    assert len(cache) == 0
+    with pytest.raises(RuntimeError):
+        await cache.resolve("m", ["y"], boom)
+    assert not cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_embed_text_calls_the_api_once_per_text(monkeypatch) -> None:
+    monkeypatch.delenv("SAKHI_DISABLE_EMBEDDINGS", raising=False)
+    monkeypatch.setattr(embedding_cache, "_CACHE", EmbeddingCache(redis_url=None))
+    calls = []
+
+    async def call_openai(texts):
+        calls.append(list(texts))
+        return [np.linspace(0, 1, 1536).tolist() for _ in texts]
+
+    monkeypatch.setattr(embeddings, "_call_openai", call_openai)
+
+    single = await embeddings.embed_text("  hello  ")
+    batch = await embeddings.embed_text(["hello", "", "world"])
+
+    assert calls == [["hello"], ["world"]]
+    assert len(single) == 1536 and batch[0] == single
+    assert batch[1] == [0.0] * 1536
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_cancel_other_waiters() -> None:
+    cache = EmbeddingCache(redis_url=None)
+    calls = []
+    fetch = _counting_fetch(calls, 0.05)
+
+    owner = asyncio.create_task(asyncio.wait_for(cache.resolve("m", ["same"], fetch), 0.01))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.resolve("m", ["same", "other"], fetch))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await owner
+    assert await waiter == [[4.0, 0.5, -0.25], [5.0, 0.5, -0.25]]
+    assert calls == [["same"], ["other"]]
+    assert await cache.resolve("m", ["same"], fetch) == [[4.0, 0.5, -0.25]]
+    assert len(calls) == 2 and not cache._inflight
+
+
+@pytest.mark.asyncio
+async def test_short_fetch_fails_instead_of_hanging() -> None:
+    cache = EmbeddingCache(redis_url=None)
+
+    async def short(texts):
+        return [[1.0, 1.0]]
+
+    with pytest.raises(RuntimeError, match="1 vectors for 2 texts"):
+        await asyncio.wait_for(cache.resolve("m", ["a", "b"], short), 1)
+    assert not cache._inflight
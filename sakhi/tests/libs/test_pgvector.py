@@ -0,0 +1,67 @@
+import struct
+
+import numpy as np
+import pytest
+
+from sakhi.libs import pgvector
+from sakhi.libs.embeddings import parse_pgvector, to_pgvector
+from sakhi.libs.pgvector import PgVector, as_vector, decode_vector, encode_vector
+
+
+def test_binary_roundtrip_is_float32() -> None:
+    values = np.linspace(-1, 1, 1536, dtype=np.float32)
+    data = encode_vector(values)
+    assert len(data) == 4 + 4 * 1536
+    assert struct.unpack_from(">HH", data) == (1536, 0)
+
+    decoded = decode_vector(data)
+    assert isinstance(decoded, PgVector) and decoded.dtype == np.float32
+    assert np.array_equal(decoded, values)
+
+
+def test_encoder_accepts_lists_and_text_literals() -> None:
+    assert encode_vector([1, 2.5, -3]) == encode_vector("[1,2.5,-3]")
+    assert np.array_equal(decode_vector(encode_vector(" [0.5, 1e-3] ")), np.float32([0.5, 1e-3]))
+
+
+def test_vectors_keep_list_truthiness() -> None:
+    vec = as_vector([0.0, 1.0])
+    assert vec and not as_vector(None) and not as_vector("[]")
+    assert (vec or [9.0]) is vec
+    assert type(vec * 2) is np.ndarray
+    assert not as_vector("[not, a, vector]")
+
+
+def test_embedding_helpers_use_arrays() -> None:
+    assert np.array_equal(parse_pgvector("[1,2,3]"), [1, 2, 3])
+    assert parse_pgvector(decode_vector(encode_vector([1, 2]))).tolist() == [1.0, 2.0]
+    fitted = to_pgvector([1, 2], length=4)
+    assert fitted.dtype == np.float32 and fitted.tolist() == [1.0, 2.0, 0.0, 0.0]
+    assert to_pgvector(range(6), length=3).tolist() == [0.0, 1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_codec_registers_in_the_vector_schema(monkeypatch) -> None:
+    monkeypatch.setattr(pgvector, "_vector_schema", None)
+    registered = {}
+
+    class _Connection:
+        lookups = 0
+
+        async def fetchval(self, sql):
+            _Connection.lookups += 1
+            return "extensions"
+
+        async def set_type_codec(self, name, **kwargs):
+            registered[name] = kwargs
+
+    assert await pgvector.register_vector_codec(_Connection())
+    assert await pgvector.register_vector_codec(_Connection())
+    assert _Connection.lookups == 1
+    assert registered["vector"]["schema"] == "extensions"
+    assert registered["vector"]["format"] == "binary"
+
+    monkeypatch.setattr(pgvector, "_vector_schema", "")
+    registered.clear()
+    assert not await pgvector.register_vector_codec(_Connection())
+    assert not registered
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from sakhi.libs.phrase_index import PhraseIndex, PhraseMatch
+
+
+def test_matches_every_set_with_positions() -> None:
+    index = PhraseIndex()
+    focus = index.register("focus", ["help me focus", "focus on", "work on"])
+    restart = index.register("restart", ["restart", "where were we", "start"])
+
+    text = "where were we? help me focus on restarting"
+    matches = index.scan(text)
+    assert matches.sets() == ["focus", "restart"]
+    assert [(m.phrase, m.start, m.end) for m in matches.get("focus")] == [
+        ("help me focus", 15, 28),
+        ("focus on", 23, 31),
+    ]
+    assert matches.phrases("restart") == {"where were we", "restart", "start"}
+    for match in matches.get("restart"):
+        assert text[match.start : match.end] == match.phrase
+    assert focus.search(text) and restart.search(text)
+    assert restart.found(text) == ["restart", "where were we", "start"]
+    assert not focus.search("nothing here")
+
+
+def test_phrase_shared_between_sets() -> None:
+    index = PhraseIndex()
+    index.register("a", ["should", "must"])
+    index.register("b", ["should", "because"])
+    matches = index.scan("you should")
+    assert matches.get("a") == (PhraseMatch("a", "should", 4, 10),)
+    assert matches.get("b") == (PhraseMatch("b", "should", 4, 10),)
+
+
+def test_same_answers_as_substring_scans() -> None:
+    rng = random.Random(7)
+    alphabet = "abc "
+    sets = {
+        f"set{i}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        for i in range(12)
+    }
+    index = PhraseIndex()
+    handles = {name: index.register(name, phrases) for name, phrases in sets.items()}
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        for name, phrases in sets.items():
+            assert handles[name].search(text) == any(p in text for p in phrases)
+            expected = sum(text.count(p, i, i + len(p)) for p in set(phrases) for i in range(len(text)))
+            assert len(index.scan(text).get(name)) == expected
+
+
+def test_registration_rules_and_cache_refresh() -> None:
+    index = PhraseIndex()
+    first = index.register("x", ["alpha"])
+    assert index.register("x", ["alpha"]).phrases == first.phrases
+    with pytest.raises(ValueError):
+        index.register("x", ["beta"])
+
+    assert index.scan("alpha beta").sets() == ["x"]
+    index.register("y", ["beta", ""])
+    assert index.scan("alpha beta").sets() == ["x", "y"]
+    assert index.scan("").sets() == []
@@ -14,3 +14,48 @@ async def test_hybrid_retriever_returns_stub_when_pool_missing() -> None:
     result = results[0]
     assert result["id"] == "stub"
     assert "breathing practice" in result["content"]
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, tuple]] = []
+
+    async def fetch(self, sql, *params):
+        self.calls.append((sql, params))
+        return [{"id": 1, "content": "box breathing", "score": 0.03}]
+
+
+class _Acquire:
+    def __init__(self, connection: _Connection) -> None:
+        self._connection = connection
+
+    async def __aenter__(self) -> _Connection:
+        return self._connection
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _Pool:
+    def __init__(self) -> None:
+        self.connection = _Connection()
+
+    def acquire(self) -> _Acquire:
+        return _Acquire(self.connection)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_retriever_fuses_ranks_over_the_stored_tsvector() -> None:
+    pool = _Pool()
+    config = RetrieverConfig(table_name="journal_documents", match_count=3, tsvector_column="fts")
+    retriever = HybridRetriever(pool=pool, config=config)
+
+    results = await retriever.search("breathing practice", embedding=[0.1, 0.2])
+    await retriever.search("breathing practice")
+
+    (fused_sql, fused_params), (lexical_sql, lexical_params) = pool.connection.calls
+    assert results == [{"id": 1, "content": "box breathing", "score": 0.03}]
+    assert "to_tsvector" not in fused_sql and "fts @@ terms" in fused_sql
+    assert "full outer join" in fused_sql
+    assert fused_params == ("breathing practice", [0.1, 0.2], 12, 60, 3)
+    assert "to_tsvector" not in lexical_sql and lexical_params == ("breathing practice", 3)
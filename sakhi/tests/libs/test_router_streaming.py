@@ -0,0 +1,196 @@
+from typing import Any, List
+
+import pytest
+
+from sakhi.libs.llm_router.base import BaseProvider
+from sakhi.libs.llm_router.router import LLMRouter
+from sakhi.libs.llm_router.streaming import ChatStreamAccumulator, iter_sse_json
+from sakhi.libs.llm_router.types import LLMResponse, Task
+
+
+class ChunkProvider(BaseProvider):
+    def __init__(self, name: str, chunks: List[str], fail_after: int | None = None) -> None:
+        super().__init__(name=name)
+        self._chunks = chunks
+        self._fail_after = fail_after
+
+    async def chat(self, *, messages, model: str, tools=None, **kwargs: Any) -> LLMResponse:
+        return LLMResponse(model=model, task=Task.CHAT, text="".join(self._chunks), provider=self.name)
+
+    async def chat_stream(self, *, messages, model: str, on_token, tools=None, **kwargs: Any) -> LLMResponse:
+        for index, chunk in enumerate(self._chunks):
+            if self._fail_after is not None and index >= self._fail_after:
+                raise RuntimeError("stream dropped")
+            await on_token(chunk)
+        return LLMResponse(model=model, task=Task.CHAT, text="".join(self._chunks), provider=self.name)
+
+
+class PlainProvider(BaseProvider):
+    async def chat(self, *, messages, model: str, tools=None, **kwargs: Any) -> LLMResponse:
+        return LLMResponse(model=model, task=Task.CHAT, text="whole reply", provider=self.name)
+
+
+def _router(*providers: BaseProvider) -> LLMRouter:
+    router = LLMRouter()
+    for provider in providers:
+        router.register_provider(provider.name, provider)
+    router.set_policy(Task.CHAT, [provider.name for provider in providers])
+    return router
+
+
+@pytest.mark.asyncio
+async def test_router_streams_deltas_and_returns_full_response() -> None:
+    tokens: List[str] = []
+
+    async def on_token(delta: str) -> None:
+        tokens.append(delta)
+
+    router = _router(ChunkProvider("a", ["Hel", "lo", "!"]))
+    response = await router.chat(messages=[{"role": "user", "content": "hi"}], model="m", on_token=on_token)
+    assert tokens == ["Hel", "lo", "!"]
+    assert response.text == "Hello!"
+
+
+@pytest.mark.asyncio
+async def test_failover_only_before_first_token() -> None:
+    tokens: List[str] = []
+
+    async def on_token(delta: str) -> None:
+        tokens.append(delta)
+
+    router = _router(ChunkProvider("a", ["x"], fail_after=0), ChunkProvider("b", ["ok"]))
+    response = await router.chat(messages=[{"role": "user", "content": "hi"}], model="m", on_token=on_token)
+    assert response.provider == "b" and tokens == ["ok"]
+
+    tokens.clear()
+    router = _router(ChunkProvider("a", ["par", "tial"], fail_after=1), ChunkProvider("b", ["ok"]))
+    with pytest.raises(RuntimeError, match="stream dropped"):
+        await router.chat(messages=[{"role": "user", "content": "hi"}], model="m", on_token=on_token)
+    assert tokens == ["par"]
+
+
+@pytest.mark.asyncio
+async def test_providers_without_streaming_emit_one_delta() -> None:
+    tokens: List[str] = []
+
+    async def on_token(delta: str) -> None:
+        tokens.append(delta)
+
+    router = _router(PlainProvider("plain"))
+    response = await router.chat(messages=[{"role": "user", "content": "hi"}], model="m", on_token=on_token)
+    assert tokens == ["whole reply"] and response.text == "whole reply"
+
+
+def test_accumulator_stitches_text_tool_calls_and_usage() -> None:
+    acc = ChatStreamAccumulator("m")
+    assert acc.add({"choices": [{"delta": {"role": "assistant", "content": "Sure"}}]}) == "Sure"
+    acc.add(
+        {
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {"index": 0, "id": "call_1", "function": {"name": "create_plan", "arguments": '{"objec'}}
+                        ]
+                    }
+                }
+            ]
+        }
+    )
+    acc.add({"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": 'tive": "x"}'}}]}}]})
+    acc.add({"choices": [{"delta": {}, "finish_reason": "tool_calls"}], "usage": {"total_tokens": 7}})
+
+    assert acc.text == "Sure"
+    assert acc.tool_calls() == [
+        {"id": "call_1", "type": "function", "function": {"name": "create_plan", "arguments": '{"objective": "x"}'}}
+    ]
+    raw = acc.as_raw()
+    assert raw["usage"] == {"total_tokens": 7}
+    assert raw["choices"][0]["finish_reason"] == "tool_calls"
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_json_skips_comments_and_stops_at_done() -> None:
+    async def lines():
+        for line in [": OPENROUTER PROCESSING", "", 'data: {"a": 1}', "data: not-json", 'data: {"b": 2}', "data: [DONE]", 'data: {"c": 3}']:
+            yield line
+
+    assert [item async for item in iter_sse_json(lines())] == [{"a": 1}, {"b": 2}]
+
+
+@pytest.mark.asyncio
+async def test_openrouter_stream_parses_sse(monkeypatch) -> None:
+    import httpx
+
+    from sakhi.libs.llm_router import openrouter
+
+    body = (
+        ": OPENROUTER PROCESSING\n\n"
+        'data: {"model": "deepseek/deepseek-chat", "choices": [{"delta": {"content": "Hel"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}], "usage": {"cost": 0.002}}\n\n'
+        "data: [DONE]\n\n"
+    )
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = request.read()
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        openrouter.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    )
+
+    tokens: List[str] = []
+
+    async def on_token(delta: str) -> None:
+        tokens.append(delta)
+
+    provider = openrouter.OpenRouterProvider(api_key="k")
+    response = await provider.chat_stream(
+        messages=[{"role": "user", "content": "hi"}], model="deepseek/deepseek-chat", on_token=on_token
+    )
+    assert b'"stream": true' in seen["payload"] or b'"stream":true' in seen["payload"]
+    assert tokens == ["Hel", "lo"]
+    assert response.text == "Hello" and response.cost == 0.002
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_is_bounded_after_it_opens(monkeypatch) -> None:
+    import asyncio
+
+    from sakhi.libs.llm_router import openai_provider
+
+    class _StalledStream:
+        closed = False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if getattr(self, "sent", False):
+                await asyncio.sleep(10)
+            self.sent = True
+            return {"choices": [{"delta": {"content": "Hel"}}]}
+
+        async def close(self):
+            self.closed = True
+
+    stream = _StalledStream()
+
+    async def create(payload):
+        return stream
+
+    monkeypatch.setattr(openai_provider, "_create_completion", create)
+    monkeypatch.setattr(openai_provider, "_CHAT_TIMEOUT_S", 0.05)
+    tokens: List[str] = []
+
+    async def on_token(delta: str) -> None:
+        tokens.append(delta)
+
+    provider = openai_provider.OpenAIProvider(api_key="k", model_chat="m")
+    with pytest.raises(RuntimeError, match="OpenAI connection error: Timeout"):
+        await provider.chat_stream(messages=[{"role": "user", "content": "hi"}], on_token=on_token)
+    assert tokens == ["Hel"] and stream.closed
@@ -9,5 +9,7 @@ if "openai" not in sys.modules:
         OpenAIError=Exception,
         RateLimitError=Exception,
         APIConnectionError=Exception,
+        BadRequestError=type("BadRequestError", (Exception,), {}),
+        UnprocessableEntityError=type("UnprocessableEntityError", (Exception,), {}),
     )
     sys.modules["openai"] = stub
@@ -0,0 +1,155 @@
+import asyncio
+import datetime as dt
+import json
+
+import pytest
+
+from sakhi.apps.api.core import db
+from sakhi.apps.api.core import metrics
+from sakhi.libs import pgvector
+from sakhi.libs.schemas.db import get_async_pool
+
+
+class _FakeConnection:
+    async def fetch(self, sql, *args):
+        return [{"sql": sql, "args": args}]
+
+    async def execute(self, sql, *args):
+        return "OK"
+
+
+class _FakeRawPool:
+    def __init__(self, size):
+        self._free = [_FakeConnection() for _ in range(size)]
+        self._size = size
+        self.closed = False
+
+    async def acquire(self, timeout=None):
+        async def wait():
+            while not self._free:
+                await asyncio.sleep(0.005)
+            return self._free.pop()
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    async def release(self, connection):
+        self._free.append(connection)
+
+    def get_size(self):
+        return self._size
+
+    def get_idle_size(self):
+        return len(self._free)
+
+    async def close(self):
+        self.closed = True
+
+
+def _value(metric, **labels):
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.labels == labels and not sample.name.endswith("_created"):
+                if sample.name.endswith(("_count", "_total")) or sample.name == family.name:
+                    return sample.value
+    return 0.0
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    created = {}
+
+    async def create_pool(dsn, **kwargs):
+        created.update(kwargs, dsn=dsn)
+        return _FakeRawPool(kwargs["max_size"])
+
+    monkeypatch.setattr(db.asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(db, "POOL", None)
+    monkeypatch.setenv("DATABASE_URL", "postgres://example/db")
+    monkeypatch.setenv("SAKHI_DB_POOL_MIN", "1")
+    monkeypatch.setenv("SAKHI_DB_POOL_MAX", "2")
+    monkeypatch.setenv("SAKHI_DB_ACQUIRE_TIMEOUT_S", "0.05")
+    return created
+
+
+@pytest.mark.asyncio
+async def test_helpers_share_one_configured_pool(fake_pool):
+    pool = await db.get_pool()
+    assert await get_async_pool() is pool
+    assert fake_pool["min_size"] == 1 and fake_pool["max_size"] == 2
+    assert fake_pool["dsn"] == "postgres://example/db"
+    assert fake_pool["statement_cache_size"] == 0
+    assert fake_pool["init"] is db._init_connection
+
+    rows = await db.q("select 1 where $1", "x")
+    assert rows == [{"sql": "select 1 where $1", "args": ("x",)}]
+    assert await db.exec("update t set x = 1") == "OK"
+
+    session = await db.get_db()
+    assert pool.in_use() == 1 and pool.idle() == 1
+    assert _value(metrics.db_pool_connections, state="in_use") == 1
+    await session.close()
+    assert pool.in_use() == 0
+
+    await db.close_pool()
+    assert db.POOL is None and pool.raw.closed
+
+
+@pytest.mark.asyncio
+async def test_acquire_records_queue_wait_and_timeouts(fake_pool):
+    pool = await db.get_pool()
+    waits_before = _value(metrics.db_pool_queue_wait)
+    timeouts_before = _value(metrics.db_pool_acquire_timeouts)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    with pytest.raises(asyncio.TimeoutError):
+        async with pool.acquire():
+            pass
+    assert _value(metrics.db_pool_acquire_timeouts) == timeouts_before + 1
+    assert _value(metrics.db_pool_waiting) == 0
+
+    async def release_soon():
+        await asyncio.sleep(0.01)
+        await pool.release(first)
+
+    asyncio.get_running_loop().create_task(release_soon())
+    async with pool.acquire(timeout=1) as connection:
+        assert connection is first
+    await pool.release(second)
+    assert _value(metrics.db_pool_queue_wait) == waits_before + 4
+
+
+@pytest.mark.asyncio
+async def test_connections_get_native_json_codecs(monkeypatch):
+    registered = {}
+    monkeypatch.setattr(pgvector, "_vector_schema", "public")
+
+    class _Connection:
+        async def set_type_codec(self, name, *, encoder, decoder, schema, format="text"):
+            registered[name] = (encoder, decoder, schema)
+
+    await db._init_connection(_Connection())
+    assert sorted(registered) == ["json", "jsonb", "vector"]
+    assert registered["vector"][1] is pgvector.decode_vector
+    encoder, decoder, schema = registered["jsonb"]
+    assert schema == "pg_catalog"
+
+    value = {"layers": [1, 2.5, None], "at": dt.datetime(2026, 1, 1), "name": "सखी"}
+    assert decoder(encoder(value)) == {"layers": [1, 2.5, None], "at": "2026-01-01T00:00:00", "name": "सखी"}
+    # Writers that still pre-serialize with json.dumps keep working unchanged.
+    legacy = json.dumps({"a": 1})
+    assert encoder(legacy) == legacy
+    assert encoder(b'{"a":1}') == '{"a":1}'
+    assert decoder("[1,2]") == [1, 2]
+
+
+def test_default_sizing_covers_the_pools_it_replaced(monkeypatch):
+    for name in ("SAKHI_DB_POOL_MIN", "SAKHI_DB_POOL_MAX", "SAKHI_DB_ACQUIRE_TIMEOUT_S", "SAKHI_POST_RESPONSE_CONCURRENCY"):
+        monkeypatch.delenv(name, raising=False)
+    settings = db.pool_settings()
+    assert settings["max_size"] == 46 and settings["acquire_timeout"] is None
+
+    monkeypatch.setenv("SAKHI_POST_RESPONSE_CONCURRENCY", "16")
+    assert db.pool_settings()["max_size"] == 62
+    monkeypatch.setenv("SAKHI_DB_POOL_MAX", "12")
+    assert db.pool_settings()["max_size"] == 12
@@ -0,0 +1,139 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from sakhi.apps.api.core import db
+from sakhi.apps.api.core import metrics
+from sakhi.apps.api.middleware.query_budget import QueryBudgetMiddleware, report_query_budget
+
+
+class _Connection:
+    async def fetch(self, sql, *args):
+        return [{"n": 1}, {"n": 2}]
+
+    async def execute(self, sql, *args):
+        return "UPDATE 3"
+
+
+class _Acquire:
+    async def __aenter__(self):
+        return _Connection()
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class _Pool:
+    def acquire(self):
+        return _Acquire()
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    monkeypatch.setattr(db, "POOL", _Pool())
+
+
+def _count(metric, **labels):
+    for family in metric.collect():
+        for sample in family.samples:
+            if sample.name.endswith("_count") and sample.labels == labels:
+                return sample.value
+    return 0.0
+
+
+def test_fingerprint_normalizes_literals():
+    a = db.fingerprint("SELECT * FROM journal_entries WHERE id IN (1, 2, 3) AND kind = 'x' -- note\n LIMIT 5")
+    b = db.fingerprint("select *\n  from journal_entries where id in (7) and kind = 'it''s'  limit 50")
+    assert a == b
+    assert a.text == "select * from journal_entries where id in (?) and kind = ? limit ?"
+    assert a.statement == "select journal_entries"
+
+    c = db.fingerprint("select * from t1 where a = $1 and b = $2")
+    assert c.text == "select * from t1 where a = $1 and b = $2"
+    assert c.id != a.id
+
+
+@pytest.mark.asyncio
+async def test_helpers_record_latency_rows_and_tally(fake_pool):
+    fp = db.fingerprint("select n from numbers where id = $1")
+    labels = {"fingerprint": fp.id, "statement": "select numbers"}
+    before = _count(metrics.db_query_latency, **labels)
+    rows_before = _count(metrics.db_query_rows, **labels)
+
+    with db.track_queries("test") as tally:
+        for _ in range(3):
+            await db.q("select n from numbers where id = $1", 1)
+        await db.exec("update numbers set n = 1")
+
+    assert _count(metrics.db_query_latency, **labels) == before + 3
+    assert _count(metrics.db_query_rows, **labels) == rows_before + 3
+    assert tally.count == 4
+    (top, repeats), _ = tally.top(2)
+    assert top == fp and repeats == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_with_sampling(fake_pool, monkeypatch, caplog):
+    monkeypatch.setattr(db, "SLOW_QUERY_MS", 0.0)
+    monkeypatch.setattr(db, "SLOW_QUERY_SAMPLE", 1.0)
+    with caplog.at_level(logging.WARNING, logger=db.LOGGER.name):
+        await db.q("select n from numbers where id = 42")
+    assert "slow query" in caplog.text and "id = ?" in caplog.text
+
+    caplog.clear()
+    monkeypatch.setattr(db, "SLOW_QUERY_SAMPLE", 0.0)
+    with caplog.at_level(logging.WARNING, logger=db.LOGGER.name):
+        await db.q("select n from numbers where id = 42")
+    assert "slow query" not in caplog.text
+
+
+def test_budget_report_lists_repeated_fingerprints(caplog):
+    tally = db.QueryTally(label="POST /v2/turn")
+    repeated = db.fingerprint("select * from personal_model where person_id = $1")
+    for _ in range(4):
+        tally.add(repeated, 0.001)
+    tally.add(db.fingerprint("select 1"), 0.001)
+
+    assert not report_query_budget(tally, 5)
+    with caplog.at_level(logging.WARNING):
+        assert report_query_budget(tally, 4)
+    assert "issued 5 queries" in caplog.text and f"4x {repeated.id}" in caplog.text
+
+
+def test_middleware_flags_fan_out_per_route(fake_pool, caplog):
+    app = FastAPI()
+
+    @app.get("/people/{pid}")
+    async def person(pid: str):
+        for _ in range(3):
+            await db.q("select * from personal_model where person_id = $1", pid)
+        return {"ok": True}
+
+    app.add_middleware(QueryBudgetMiddleware, budget=2)
+    before = metrics.db_query_budget_exceeded.labels(route="GET /people/{pid}")._value.get()
+    with caplog.at_level(logging.WARNING):
+        assert TestClient(app).get("/people/p1").status_code == 200
+    assert "GET /people/{pid} issued 3 queries" in caplog.text
+    assert metrics.db_query_budget_exceeded.labels(route="GET /people/{pid}")._value.get() == before + 1
+
+
+def test_middleware_counts_queries_made_while_streaming(fake_pool, caplog):
+    app = FastAPI()
+
+    @app.get("/stream/{pid}")
+    async def stream(pid: str):
+        async def chunks():
+            for n in range(3):
+                await db.q("select * from journal_entries where user_id = $1", pid)
+                yield f"chunk {n}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(QueryBudgetMiddleware, budget=2)
+    with caplog.at_level(logging.WARNING):
+        response = TestClient(app).get("/stream/p1")
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+    assert "GET /stream/{pid} issued 3 queries" in caplog.text
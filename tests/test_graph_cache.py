@@ -0,0 +1,152 @@
+import asyncio
+import datetime as dt
+
+import pytest
+
+from sakhi.apps.api.services.memory_graph import cache as graph_cache
+from sakhi.apps.api.services.memory_graph.cache import GraphCacheRegistry, PersonGraph
+
+
+def _graph(edges, extra_nodes=()):
+    graph = PersonGraph()
+    names = sorted({name for edge in edges for name in edge[:2]} | set(extra_nodes))
+    base = dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc)
+    graph.add_nodes(
+        {"id": name, "node_kind": "theme", "label": name, "created_at": base + dt.timedelta(minutes=i)}
+        for i, name in enumerate(names)
+    )
+    graph.add_edges(
+        {"from_node": src, "to_node": dst, "relation": relation, "weight": weight}
+        for src, dst, relation, weight in edges
+    )
+    return graph
+
+
+CHAIN = [
+    ("a", "b", "supports", 0.9),
+    ("b", "c", "supports", 0.5),
+    ("c", "d", "relates_to", 0.4),
+    ("x", "y", "supports", 0.2),
+]
+
+
+def test_neighborhood_follows_edges_both_ways():
+    graph = _graph(CHAIN, extra_nodes=["lonely"])
+    assert graph.neighborhood("a", hops=2) == {"a": 0, "b": 1, "c": 2}
+    assert graph.neighborhood("d", hops=5) == {"d": 0, "c": 1, "b": 2, "a": 3}
+    assert graph.neighborhood("lonely", hops=3) == {"lonely": 0}
+    assert graph.neighborhood("missing") == {}
+
+
+def test_top_neighbors_orders_by_weight_and_filters_relation():
+    graph = _graph(CHAIN + [("b", "a", "relates_to", 0.1), ("b", "x", "supports", 0.7)])
+    assert graph.top_neighbors("b", n=2) == [("a", pytest.approx(0.9)), ("x", pytest.approx(0.7))]
+    assert [node for node, _ in graph.top_neighbors("b", n=5)] == ["a", "x", "c"]
+    assert graph.top_neighbors("b", relation="relates_to") == [("a", pytest.approx(0.1))]
+
+
+def test_components_largest_first():
+    graph = _graph(CHAIN, extra_nodes=["lonely"])
+    components = graph.components()
+    assert [sorted(c) for c in components] == [["a", "b", "c", "d"], ["x", "y"], ["lonely"]]
+    assert len(graph.components(min_size=2)) == 2
+
+
+def test_incremental_writes_rebuild_adjacency():
+    graph = _graph(CHAIN)
+    assert graph.neighborhood("d", hops=1) == {"d": 0, "c": 1}
+    graph.add_nodes([{"id": "e", "node_kind": "theme", "label": "e"}])
+    skipped = graph.add_edges(
+        [
+            {"from_node": "d", "to_node": "e", "relation": "supports", "weight": 0.3},
+            {"from_node": "d", "to_node": "ghost", "relation": "supports", "weight": 0.3},
+        ]
+    )
+    assert skipped == 1
+    assert graph.neighborhood("d", hops=1) == {"d": 0, "c": 1, "e": 1}
+    graph.add_edges([{"from_node": "a", "to_node": "b", "relation": "supports", "weight": 0.1}])
+    assert graph.edge_count == 5
+    assert graph.top_neighbors("a") == [("b", pytest.approx(0.1))]
+
+
+def test_recent_matches_created_at_desc():
+    graph = _graph(CHAIN)
+    assert [node["id"] for node in graph.recent(2)] == ["y", "x"]
+
+
+@pytest.mark.asyncio
+async def test_registry_warms_once_and_replays_writes():
+    loads = []
+    release = asyncio.Event()
+
+    async def loader(person_id):
+        loads.append(person_id)
+        await release.wait()
+        return [{"id": "a"}, {"id": "b"}], [{"from_node": "a", "to_node": "b", "relation": "r", "weight": 0.5}]
+
+    registry = GraphCacheRegistry(loader=loader)
+    first = asyncio.create_task(registry.get("p1"))
+    second = asyncio.create_task(registry.get("p1"))
+    await asyncio.sleep(0)
+    registry.apply("p1", lambda graph: graph.add_nodes([{"id": "c"}]))
+    release.set()
+    graph_a, graph_b = await asyncio.gather(first, second)
+
+    assert loads == ["p1"]
+    assert graph_a is graph_b
+    assert "c" in graph_a
+    registry.invalidate("p1")
+    assert registry.peek("p1") is None
+
+
+
+@pytest.mark.asyncio
+async def test_cancelled_warm_caller_does_not_cancel_other_waiters():
+    release = asyncio.Event()
+    loads = []
+
+    async def loader(person_id):
+        loads.append(person_id)
+        await release.wait()
+        return [{"id": "a"}], []
+
+    registry = GraphCacheRegistry(loader=loader)
+    owner = asyncio.create_task(asyncio.wait_for(registry.get("p1"), 0.01))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(registry.get("p1"))
+    with pytest.raises(asyncio.TimeoutError):
+        await owner
+    release.set()
+
+    graph = await waiter
+    assert "a" in graph and loads == ["p1"]
+    assert await registry.get("p1") is graph
+
+@pytest.mark.asyncio
+async def test_bulk_writes_feed_the_cache(monkeypatch):
+    from sakhi.apps.api.services.memory_graph import graph as graph_module
+
+    async def loader(person_id):
+        return [], []
+
+    registry = GraphCacheRegistry(loader=loader)
+    monkeypatch.setattr(graph_cache, "ENABLED", True)
+    monkeypatch.setattr(graph_cache, "_REGISTRY", registry)
+    cached = await registry.get("p1")
+
+    class DB:
+        async def fetch(self, sql, *args):
+            if len(args) == 6:
+                return [{"from_node": args[2][0], "to_node": args[3][0], "relation": args[4][0], "weight": 0.42}]
+            return [
+                {"id": node_id, "node_kind": kind, "label": label, "data": {}, "created_at": None}
+                for node_id, kind, label in zip(args[1], args[2], args[3])
+            ]
+
+    nodes = [{"kind": "theme", "label": "a"}, {"kind": "theme", "label": "b"}]
+    ids = await graph_module.upsert_nodes(DB(), person_id="p1", nodes=nodes)
+    edge = {"from_node": ids[0], "to_node": ids[1], "relation": "supports", "weight": 0.9}
+    await graph_module.upsert_edges(DB(), person_id="p1", edges=[edge])
+
+    assert len(cached) == 2
+    assert cached.top_neighbors(ids[0]) == [(ids[1], pytest.approx(0.42))]
@@ -0,0 +1,206 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from sakhi.apps.api.services.memory import consolidation
+
+NOW = dt.datetime(2026, 10, 17, 12, tzinfo=dt.timezone.utc)
+
+
+def _node(node_id, vec, label="x", minutes_ago=60):
+    return {
+        "id": node_id,
+        "kind": "theme",
+        "label": label,
+        "vec": np.asarray(vec, dtype=np.float32),
+        "created_at": NOW - dt.timedelta(minutes=minutes_ago),
+    }
+
+
+def test_only_pairs_involving_new_nodes_are_scored():
+    old_a = _node("a", [1.0, 0.0, 0.0])
+    old_b = _node("b", [0.999, 0.01, 0.0])  # near-duplicate of a, but both old
+    new_c = _node("c", [0.99, 0.05, 0.0])
+    new_d = _node("d", [0.98, 0.08, 0.0])
+    far = _node("e", [0.0, 0.0, 1.0])
+
+    pairs = consolidation.similar_pairs([new_c, new_d], [old_a, old_b, new_c, new_d, far])
+    keys = [frozenset((new["id"], other["id"])) for _, new, other in pairs]
+
+    assert frozenset("ab") not in keys
+    assert sorted(map(sorted, keys)) == [["a", "c"], ["a", "d"], ["b", "c"], ["b", "d"], ["c", "d"]]
+    assert len(keys) == len(set(keys))
+    assert [sim for sim, _, _ in pairs] == sorted((sim for sim, _, _ in pairs), reverse=True)
+
+
+def test_merge_chains_collapse_onto_one_survivor():
+    a = _node("a", [1.0], label="morning runs")
+    b = _node("b", [1.0], label="runs")
+    c = _node("c", [1.0], label="run")
+    merges = consolidation.plan_merges([(0.97, b, a), (0.95, c, b), (0.90, c, a)])
+    assert merges == {"b": "a", "c": "a"}
+
+
+def test_cursor_waits_for_missing_vectors_within_the_grace_period():
+    nodes = [
+        _node("a", [1.0], minutes_ago=120),
+        _node("b", [], minutes_ago=90 * 60),  # never embedded: passed over
+        _node("c", [1.0], minutes_ago=30),
+        _node("d", [], minutes_ago=10),  # embedding pending
+        _node("e", [1.0], minutes_ago=5),
+    ]
+    assert consolidation.advance_cursor((None, None), nodes, now=NOW) == (nodes[2]["created_at"], "c")
+
+
+class _Connection:
+    def __init__(self):
+        self.executed = []
+        self.edges = []
+        self.in_transaction = False
+
+    def transaction(self):
+        connection = self
+
+        class _Tx:
+            async def __aenter__(self):
+                connection.in_transaction = True
+
+            async def __aexit__(self, *exc):
+                connection.in_transaction = False
+
+        return _Tx()
+
+    async def execute(self, sql, *args):
+        assert self.in_transaction
+        self.executed.append((sql, args))
+        return "UPDATE 1"
+
+    async def fetch(self, sql, *args):
+        assert self.in_transaction
+        self.executed.append((sql, args))
+        if sql.split()[0] == "SELECT":
+            return self.edges
+        return []
+
+
+class _Pool:
+    def __init__(self):
+        self.connection = _Connection()
+
+    def acquire(self):
+        connection = self.connection
+
+        class _Acquire:
+            async def __aenter__(self):
+                return connection
+
+            async def __aexit__(self, *exc):
+                return None
+
+        return _Acquire()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    state = {
+        "checkpoint": None,
+        "nodes": [
+            {"id": "a", "node_kind": "theme", "label": "evening anxiety", "embed_vec": [1.0, 0.0], "created_at": NOW - dt.timedelta(days=3)},
+            {"id": "b", "node_kind": "theme", "label": "work", "embed_vec": [0.0, 1.0], "created_at": NOW - dt.timedelta(days=2)},
+        ],
+        "queries": [],
+    }
+    pool = _Pool()
+
+    async def q(sql, *args, one=False):
+        state["queries"].append(sql)
+        if "memory_consolidation_checkpoints" in sql:
+            return state["checkpoint"]
+        rows = [row for row in state["nodes"] if "embed_vec IS NOT NULL" not in sql or row["embed_vec"]]
+        if "created_at, id) >" in sql and args[1] is not None:
+            rows = [row for row in rows if (row["created_at"], row["id"]) > (args[1], args[2])]
+        return rows
+
+    async def get_pool():
+        return pool
+
+    monkeypatch.setattr(consolidation, "q", q)
+    monkeypatch.setattr(consolidation, "get_pool", get_pool)
+    state["pool"] = pool
+    return state
+
+
+@pytest.mark.asyncio
+async def test_incremental_runs_merge_in_one_transaction_and_checkpoint(store):
+    first = await consolidation.consolidate_memory("p1")
+    assert first["merged"] == 0 and first["compared"] == 2
+    (sql, args), = store["pool"].connection.executed
+    assert "memory_consolidation_checkpoints" in sql and args == ("p1", store["nodes"][1]["created_at"], "b")
+
+    store["checkpoint"] = {"last_created_at": args[1], "last_node_id": args[2]}
+    store["pool"].connection.executed.clear()
+    store["nodes"].append(
+        {"id": "c", "node_kind": "theme", "label": "anxiety", "embed_vec": [0.99, 0.02], "created_at": NOW - dt.timedelta(hours=1)}
+    )
+
+    second = await consolidation.consolidate_memory("p1")
+
+    assert second["compared"] == 1 and second["merged"] == 1
+    assert [(c["a"]["id"], c["b"]["id"]) for c in second["candidates"]] == [("c", "a")]
+    executed = store["pool"].connection.executed
+    # No edges to move: read them, drop them, fold data, drop the node, checkpoint.
+    assert [sql.split()[0] for sql, _ in executed] == ["SELECT", "DELETE", "UPDATE", "DELETE", "INSERT"]
+    assert executed[0][1] == ("p1", ["c"])
+    assert executed[2][1] == ("p1", ["c"], ["a"])
+    assert executed[3][1] == ("p1", ["c"])
+    assert executed[4][1][2] == "c"
+
+
+def test_repointed_edges_fold_onto_the_survivor():
+    edges = [
+        {"from_node": "c", "to_node": "n", "relation": "related_to", "weight": 0.8},
+        {"from_node": "d", "to_node": "n", "relation": "related_to", "weight": 0.6},
+        {"from_node": "n", "to_node": "c", "relation": "mentions", "weight": 0.5},
+        {"from_node": "c", "to_node": "a", "relation": "related_to", "weight": 0.9},
+    ]
+    moved = consolidation.repoint_edges(edges, {"c": "a", "d": "a"})
+    assert moved == [
+        {"from_node": "a", "to_node": "n", "relation": "related_to", "weight": 0.8},
+        {"from_node": "n", "to_node": "a", "relation": "mentions", "weight": 0.5},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_merge_with_a_shared_neighbour_upserts_instead_of_updating(store):
+    connection = store["pool"].connection
+    # a and c both point at n; c also points at a, which the merge would make a self-loop.
+    connection.edges = [
+        {"from_node": "c", "to_node": "n", "relation": "related_to", "weight": 0.8},
+        {"from_node": "n", "to_node": "c", "relation": "mentions", "weight": 0.5},
+        {"from_node": "c", "to_node": "a", "relation": "related_to", "weight": 0.9},
+    ]
+
+    await consolidation.apply_merges("p1", {"c": "a"}, (None, None))
+
+    kinds = [sql.split()[0] for sql, _ in connection.executed]
+    assert kinds == ["SELECT", "DELETE", "INSERT", "UPDATE", "DELETE"]
+    assert not any(sql.split()[0] == "UPDATE" and "memory_edges" in sql for sql, _ in connection.executed)
+    drop_sql, drop_args = connection.executed[1]
+    assert "memory_edges" in drop_sql and drop_args == ("p1", ["c"])
+    upsert_sql, upsert_args = connection.executed[2]
+    assert "ON CONFLICT (from_node, to_node, relation) DO UPDATE" in upsert_sql
+    assert "0.7" in upsert_sql and "0.3" in upsert_sql
+    _, _, froms, tos, relations, weights = upsert_args
+    assert list(zip(froms, tos, relations, weights)) == [
+        ("a", "n", "related_to", 0.8),
+        ("n", "a", "mentions", 0.5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_no_new_nodes_means_no_writes(store):
+    store["checkpoint"] = {"last_created_at": NOW, "last_node_id": "z"}
+    assert await consolidation.consolidate_memory("p1") == {"merged": 0, "candidates": [], "compared": 0}
+    assert store["pool"].connection.executed == []
+    assert not any("embed_vec IS NOT NULL" in sql for sql in store["queries"])
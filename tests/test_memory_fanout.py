@@ -0,0 +1,142 @@
+import asyncio
+import logging
+
+import pytest
+
+from sakhi.apps.api.core.metrics import coalesced_runs, coalesced_triggers
+from sakhi.apps.worker.tasks import memory_fanout
+from sakhi.apps.worker.utils.coalesce import KeyedCoalescer
+
+
+def _count(metric, **labels):
+    return metric.labels(**labels)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_burst_collapses_into_one_run():
+    calls = []
+
+    async def run(key, batch):
+        calls.append((key, list(batch)))
+
+    coalescer = KeyedCoalescer("test_burst", run, window_s=0.05, max_wait_s=1.0)
+    merged = _count(coalesced_triggers, task="test_burst", outcome="merged")
+    for i in range(20):
+        coalescer.submit("p1", i)
+    coalescer.submit("p2", "x")
+    await asyncio.sleep(0.15)
+
+    assert sorted(calls) == [("p1", list(range(20))), ("p2", ["x"])]
+    assert _count(coalesced_triggers, task="test_burst", outcome="merged") - merged == 19
+    assert coalescer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_one_run_in_flight_per_key():
+    running = 0
+    peak = 0
+    batches = []
+    release = asyncio.Event()
+
+    async def run(key, batch):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        batches.append(list(batch))
+        await release.wait()
+        running -= 1
+
+    coalescer = KeyedCoalescer("test_inflight", run, window_s=0.0)
+    coalescer.submit("p1", 1)
+    await asyncio.sleep(0.01)
+    coalescer.submit("p1", 2)
+    coalescer.submit("p1", 3)
+    await asyncio.sleep(0.01)
+    assert batches == [[1]]
+
+    release.set()
+    assert await coalescer.drain(timeout=1) == 0
+    assert batches == [[1], [2, 3]]
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_max_wait_bounds_a_steady_stream():
+    calls = []
+
+    async def run(key, batch):
+        calls.append(len(batch))
+
+    coalescer = KeyedCoalescer("test_max_wait", run, window_s=0.05, max_wait_s=0.1)
+    for _ in range(8):
+        coalescer.submit("p1")
+        await asyncio.sleep(0.03)
+    assert calls, "a steady stream must not postpone the run forever"
+    await coalescer.drain(timeout=1)
+    assert sum(calls) == 8
+
+
+@pytest.mark.asyncio
+async def test_duplicates_and_overflow_are_dropped_and_counted():
+    calls = []
+
+    async def run(key, batch):
+        calls.extend(batch)
+
+    coalescer = KeyedCoalescer("test_drop", run, window_s=1.0, max_pending=2, dedupe=lambda item: item)
+    dropped = _count(coalesced_triggers, task="test_drop", outcome="dropped")
+    for item in ("a", "a", "b", "c"):
+        coalescer.submit("p1", item)
+    await coalescer.drain(timeout=1)
+
+    assert calls == ["b", "c"]
+    assert _count(coalesced_triggers, task="test_drop", outcome="dropped") - dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_logged_and_counted(caplog):
+    async def run(key, batch):
+        raise RuntimeError("db down")
+
+    coalescer = KeyedCoalescer("test_error", run, window_s=0.0)
+    errors = _count(coalesced_runs, task="test_error", status="error")
+    with caplog.at_level(logging.ERROR):
+        coalescer.submit("p1")
+        assert await coalescer.drain(timeout=1) == 0
+
+    assert _count(coalesced_runs, task="test_error", status="error") - errors == 1
+    assert "db down" in caplog.text
+    # The key is free again after a failure.
+    coalescer.submit("p1")
+    await coalescer.drain(timeout=1)
+    assert _count(coalesced_runs, task="test_error", status="error") - errors == 2
+
+
+@pytest.mark.asyncio
+async def test_fanout_coalesces_per_person(monkeypatch):
+    consolidated = []
+    arcs = []
+    ingested = []
+
+    async def fake_consolidate(person_id):
+        consolidated.append(person_id)
+
+    async def fake_arcs(person_id, text):
+        arcs.append((person_id, text))
+
+    async def fake_ingest(entry):
+        ingested.append(entry["id"])
+
+    monkeypatch.setattr(memory_fanout, "consolidate_memory", fake_consolidate)
+    monkeypatch.setattr(memory_fanout, "update_relationship_arcs", fake_arcs)
+    monkeypatch.setattr(memory_fanout, "ingest_journal_entry", fake_ingest)
+
+    for i in range(20):
+        await memory_fanout.memory_event_fanout(
+            {"person_id": "p1", "entry_id": f"e{i % 10}", "text": f"t{i}", "layer": "journal"}
+        )
+    assert await memory_fanout.drain(timeout=2) == 0
+
+    assert consolidated == ["p1"]
+    assert arcs == [("p1", f"t{i}") for i in range(20)]
+    assert ingested == [f"e{i}" for i in range(10)]
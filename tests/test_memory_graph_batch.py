@@ -0,0 +1,141 @@
+import pytest
+
+from sakhi.apps.api.services.memory import graph_reinforcement
+from sakhi.apps.api.services.memory_graph import graph, persist
+
+
+class FakeDB:
+    """Resolves node upserts against an in-memory table and records every statement."""
+
+    def __init__(self, existing=None, hide_once=()):
+        self.nodes = dict(existing or {})
+        self.hide_once = set(hide_once)
+        self.calls = []
+        self.closed = False
+
+    async def fetch(self, sql, *args):
+        if len(args) == 6:
+            self.calls.append(("edges", args))
+            _, _, srcs, dsts, relations, weights = args
+            return [
+                {"from_node": src, "to_node": dst, "relation": relation, "weight": weight}
+                for src, dst, relation, weight in zip(srcs, dsts, relations, weights)
+            ]
+        self.calls.append(("nodes", args))
+        _, ids, kinds, labels, _ = args
+        rows = []
+        for node_id, kind, label in zip(ids, kinds, labels):
+            if (kind, label) in self.hide_once:
+                # Committed concurrently: neither inserted nor visible this time.
+                self.hide_once.discard((kind, label))
+                self.nodes.setdefault((kind, label), "concurrent-id")
+                continue
+            stored = self.nodes.setdefault((kind, label), node_id)
+            rows.append({"id": stored, "node_kind": kind, "label": label})
+        return rows
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_upsert_nodes_returns_ids_in_input_order():
+    db = FakeDB(existing={("theme", "work"): "existing-id"})
+    ids = await graph.upsert_nodes(
+        db,
+        person_id="p1",
+        nodes=[
+            {"kind": "reflection", "label": "a"},
+            {"kind": "theme", "label": "work"},
+            {"kind": "reflection", "label": "a"},
+        ],
+    )
+    assert ids[1] == "existing-id"
+    assert ids[0] == ids[2]
+    assert len(db.calls) == 1
+    # Repeated keys are sent once.
+    assert db.calls[0][1][3] == ["a", "work"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_nodes_picks_up_concurrent_inserts():
+    db = FakeDB(hide_once={("theme", "late")})
+    ids = await graph.upsert_nodes(db, person_id="p1", nodes=[{"kind": "theme", "label": "late"}])
+    assert ids == ["concurrent-id"]
+    assert len(db.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_upsert_edges_blends_repeats_into_one_row():
+    db = FakeDB()
+    written = await graph.upsert_edges(
+        db,
+        person_id="p1",
+        edges=[
+            {"from_node": "a", "to_node": "q", "relation": "supports", "weight": 1.0},
+            {"from_node": "a", "to_node": "q", "relation": "supports", "weight": 0.0},
+            {"from_node": "b", "to_node": "q", "relation": "supports", "weight": 0.4},
+        ],
+    )
+    assert written == 2
+    (kind, args), = db.calls
+    assert kind == "edges"
+    assert args[2] == ["a", "b"]
+    assert args[5] == pytest.approx([0.7, 0.4])
+
+
+@pytest.mark.asyncio
+async def test_reinforce_recall_graph_uses_two_round_trips(monkeypatch):
+    db = FakeDB()
+
+    async def fake_get_db():
+        return db
+
+    monkeypatch.setattr(graph_reinforcement, "get_db", fake_get_db)
+    items = [{"type": "insight", "text": f"memory {i}", "score": 0.9} for i in range(25)]
+    await graph_reinforcement.reinforce_recall_graph("p1", "what did I plan", items)
+
+    assert [kind for kind, _ in db.calls] == ["nodes", "edges"]
+    edge_args = db.calls[1][1]
+    query_id = db.nodes[("reflection", "what did I plan")]
+    assert set(edge_args[3]) == {query_id}
+    assert len(edge_args[2]) == 25
+    assert db.closed
+
+
+@pytest.mark.asyncio
+async def test_persist_memory_graph_repoints_edges_at_existing_nodes(monkeypatch):
+    db = FakeDB(existing={("theme", "work"): "stored-theme"})
+
+    async def fake_get_db():
+        return db
+
+    monkeypatch.setattr(persist, "get_db", fake_get_db)
+    memory_graph = graph.build_graph_from_enrichment({"themes": ["work"], "meaning": "busy week"})
+    await persist.persist_memory_graph("p1", memory_graph)
+
+    assert [kind for kind, _ in db.calls] == ["nodes", "edges"]
+    edge_args = db.calls[1][1]
+    assert edge_args[3] == ["stored-theme"]
+
+
+@pytest.mark.asyncio
+async def test_reasoning_ingest_reuses_existing_nodes(monkeypatch):
+    from sakhi.apps.api.services.memory import ingest_reasoning
+
+    db = FakeDB(existing={("insight", "sleep matters"): "known-insight"})
+
+    async def fake_get_db():
+        return db
+
+    monkeypatch.setattr(ingest_reasoning, "get_db", fake_get_db)
+    result = await ingest_reasoning.ingest_reasoning_to_memory(
+        "p1",
+        {"insights": ["sleep matters"], "open_loops": [{"summary": "call mom"}]},
+        source_turn_id="turn-1",
+    )
+
+    assert result["insight_nodes"] == ["known-insight"]
+    assert len(result["open_loop_nodes"]) == 1
+    assert [kind for kind, _ in db.calls] == ["nodes", "edges"]
+    assert db.calls[1][1][4] == ["reflects", "extends"]
@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from sakhi.apps.api.services.memory import integrity_daemon
+
+GOOD = np.ones(1536, dtype=np.float32)
+
+
+def test_invalid_vector_rows_checks_size_and_finiteness():
+    nan = GOOD.copy()
+    nan[3] = np.nan
+    rows = [GOOD, None, [1.0, 2.0], nan, GOOD]
+    assert integrity_daemon.invalid_vector_rows(rows).tolist() == [1, 2, 3]
+
+
+class _Connection:
+    def __init__(self, store):
+        self.store = store
+
+    def transaction(self):
+        store = self.store
+
+        class _Tx:
+            async def __aenter__(self):
+                store["staged"] = []
+
+            async def __aexit__(self, exc_type, *exc):
+                if exc_type is None:
+                    for apply in store["staged"]:
+                        apply()
+
+        return _Tx()
+
+    async def executemany(self, sql, rows):
+        self.store["executemany"].append((sql, list(rows)))
+        if "journal_embeddings" in sql:
+            ids = [row[0] for row in rows]
+            self.store["staged"].append(lambda: self.store["embedded"].update(ids))
+
+    async def execute(self, sql, *args):
+        assert "memory_integrity_checkpoints" in sql
+        person_id, phase, last_id, report = args
+        if self.store["fail_on_commit"] == (phase, last_id):
+            self.store["fail_on_commit"] = None
+            raise RuntimeError("connection lost")
+        checkpoint = {"phase": phase, "last_id": last_id, "report": json.loads(report)}
+        self.store["staged"].append(lambda: self.store.__setitem__("checkpoint", checkpoint))
+
+
+class _Pool:
+    def __init__(self, store):
+        self.connection = _Connection(store)
+
+    def acquire(self):
+        connection = self.connection
+
+        class _Acquire:
+            async def __aenter__(self):
+                return connection
+
+            async def __aexit__(self, *exc):
+                return None
+
+        return _Acquire()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    state = {
+        "nodes": [
+            {"id": "n1", "embed_vec": GOOD, "linked": True},
+            {"id": "n2", "embed_vec": None, "linked": False},
+            {"id": "n3", "embed_vec": [0.5], "linked": True},
+            {"id": "n4", "embed_vec": GOOD, "linked": True},
+            {"id": "n5", "embed_vec": GOOD, "linked": False},
+        ],
+        "edges": [
+            {"id": "e1", "invalid": False},
+            {"id": "e2", "invalid": True},
+            {"id": "e3", "invalid": False},
+        ],
+        "journal": [{"id": f"j{i}", "content": f"entry {i}"} for i in range(5)],
+        "embedded": {"j1"},
+        "checkpoint": None,
+        "executemany": [],
+        "pages": [],
+        "embed_calls": [],
+        "fail_on_commit": None,
+    }
+    pool = _Pool(state)
+
+    def page(rows, after, limit):
+        rows = [row for row in rows if after is None or row["id"] > after]
+        return rows[:limit]
+
+    async def q(sql, *args, one=False):
+        if "FROM memory_integrity_checkpoints WHERE" in sql:
+            return state["checkpoint"]
+        if "count(DISTINCT" in sql:
+            return {"duplicates": 1}
+        _, after, limit = args
+        if "FROM memory_nodes n" in sql:
+            state["pages"].append(("nodes", after))
+            return page(state["nodes"], after, limit)
+        if "FROM memory_edges e" in sql:
+            state["pages"].append(("edges", after))
+            return page(state["edges"], after, limit)
+        if "FROM journal_entries je" in sql:
+            state["pages"].append(("journal", after))
+            missing = [row for row in state["journal"] if row["id"] not in state["embedded"]]
+            return page(missing, after, limit)
+        raise AssertionError(sql)
+
+    async def get_pool():
+        return pool
+
+    async def embed_text(texts):
+        state["embed_calls"].append(list(texts))
+        return [GOOD for _ in texts]
+
+    async def note_journal_vector(person_id, entry_id, vector):
+        return None
+
+    monkeypatch.setattr(integrity_daemon, "q", q)
+    monkeypatch.setattr(integrity_daemon, "get_pool", get_pool)
+    monkeypatch.setattr(integrity_daemon, "embed_text", embed_text)
+    monkeypatch.setattr(integrity_daemon, "note_journal_vector", note_journal_vector)
+    monkeypatch.setattr(integrity_daemon, "CHUNK", 2)
+    return state
+
+
+EXPECTED = {
+    "nodes_checked": 5,
+    "edges_checked": 3,
+    "fixed_vectors": 2,
+    "invalid_edges": 1,
+    "duplicate_nodes": 1,
+    "dangling_nodes": 2,
+    "journal_embedding_mismatches": 4,
+}
+
+
+@pytest.mark.asyncio
+async def test_full_scan_pages_and_batches_repairs(store):
+    report = await integrity_daemon.run_memory_integrity("p1", fix_missing_embeddings=True)
+
+    assert {name: report[name] for name in EXPECTED} == EXPECTED
+    assert report["warnings"] == ["Invalid edge e2: missing from_node/to_node"]
+    repaired = [rows for sql, rows in store["executemany"] if "memory_nodes" in sql]
+    assert [[row[0] for row in rows] for rows in repaired] == [["n2"], ["n3"]]
+    assert all(row[1].shape == (1536,) for rows in repaired for row in rows)
+    # Missing embeddings are embedded a page at a time, content read with the page.
+    assert store["embed_calls"] == [["entry 0", "entry 2"], ["entry 3", "entry 4"]]
+    assert store["embedded"] == {f"j{i}" for i in range(5)}
+    assert store["checkpoint"]["phase"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_scan_resumes_without_double_counting(store):
+    store["fail_on_commit"] = ("edges", "e3")
+    with pytest.raises(RuntimeError):
+        await integrity_daemon.run_memory_integrity("p1")
+    assert store["checkpoint"]["phase"] == "edges" and store["checkpoint"]["last_id"] == "e2"
+
+    store["pages"].clear()
+    report = await integrity_daemon.run_memory_integrity("p1")
+
+    assert store["pages"][0] == ("edges", "e2")
+    assert ("nodes", None) not in store["pages"]
+    assert {name: report[name] for name in EXPECTED} == EXPECTED
+    assert report["warnings"][-1].startswith("4 journal entries missing embeddings")
+
+
+@pytest.mark.asyncio
+async def test_global_scan_bounds_concurrency_and_isolates_failures(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def run(person_id, *, fix_missing_embeddings=False):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.01)
+            if person_id == "p3":
+                raise RuntimeError("boom")
+            return {"nodes_checked": 2, "invalid_edges": 1}
+        finally:
+            running -= 1
+
+    persons = [{"id": f"p{i}"} for i in range(7)]
+
+    async def q(sql, *args, one=False):
+        after, limit, _ = args
+        return [row for row in persons if after is None or row["id"] > after][:limit]
+
+    monkeypatch.setattr(integrity_daemon, "run_memory_integrity", run)
+    monkeypatch.setattr(integrity_daemon, "q", q)
+    monkeypatch.setattr(integrity_daemon, "CHUNK", 3)
+
+    summary = await integrity_daemon.run_global_integrity(concurrency=2)
+
+    assert peak == 2
+    assert summary["persons"] == 7 and summary["failed"] == 1
+    assert summary["nodes_checked"] == 12 and summary["invalid_edges"] == 6
@@ -0,0 +1,215 @@
+import asyncio
+
+import pytest
+
+from sakhi.apps.api.core import db
+from sakhi.apps.api.core import personal_model_memo as pmm
+from sakhi.apps.engine.microreg import engine as microreg_engine
+from sakhi.apps.engine.tone import engine as tone_engine
+
+
+class _FakeDB:
+    def __init__(self):
+        self.row = {
+            "long_term": {"layers": {}},
+            "emotion_state": {"mode": "falling"},
+            "forecast_state": {},
+            "conflict_state": {},
+            "coherence_state": {"coherence_score": 0.9, "coherence_map": {"thought": 0.8}},
+            "persona_state": {"custom_tone": "calm"},
+        }
+        self.selects = 0
+        self.writes = []
+
+    async def q(self, sql, *args, one=False):
+        db._notify_write(sql)
+        if sql.lstrip().upper().startswith("SELECT") and "personal_model" in sql:
+            self.selects += 1
+            await asyncio.sleep(0.01)
+            return dict(self.row) if one else [dict(self.row)]
+        return None if one else []
+
+    async def exec(self, sql, *args):
+        db._notify_write(sql)
+        self.writes.append(sql)
+        return "UPDATE 1"
+
+
+async def _resolve(pid):
+    return pid
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_fetch():
+    fake = _FakeDB()
+    async with pmm.personal_model_scope("p1") as memo:
+        rows = await asyncio.gather(
+            memo.get(("emotion_state",), fetch=fake.q),
+            memo.get(("long_term",), fetch=fake.q),
+            memo.get(("forecast_state", "coherence_state"), fetch=fake.q),
+        )
+    assert fake.selects == 1
+    assert rows[0] == {"emotion_state": {"mode": "falling"}}
+    assert list(rows[2]) == ["forecast_state", "coherence_state"]
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_only_touched_columns():
+    fake = _FakeDB()
+    async with pmm.personal_model_scope("p1") as memo:
+        await memo.get(("emotion_state",), fetch=fake.q)
+        await fake.exec("UPDATE personal_model SET tone_state = $2::jsonb, updated_at = NOW() WHERE person_id = $1")
+        await memo.get(("emotion_state",), fetch=fake.q)
+        assert fake.selects == 1
+
+        fake.row["emotion_state"] = {"mode": "rising"}
+        await fake.exec("UPDATE personal_model SET emotion_state = $2 WHERE person_id = $1")
+        row = await memo.get(("emotion_state",), fetch=fake.q)
+        assert fake.selects == 2
+        assert row == {"emotion_state": {"mode": "rising"}}
+
+        await fake.exec("INSERT INTO personal_model (person_id) VALUES ($1) ON CONFLICT DO NOTHING")
+        await memo.get(("long_term",), fetch=fake.q)
+        assert fake.selects == 3
+
+
+
+@pytest.mark.asyncio
+async def test_upsert_during_a_fetch_keeps_the_row_unloaded():
+    fake = _FakeDB()
+    async with pmm.personal_model_scope("p1") as memo:
+        reader = asyncio.create_task(memo.get(("emotion_state",), fetch=fake.q))
+        await asyncio.sleep(0.001)  # the SELECT is in flight with the old row
+        fake.row["emotion_state"] = {"mode": "rising"}
+        await fake.exec(
+            "INSERT INTO personal_model (person_id, emotion_state) VALUES ($1, $2) "
+            "ON CONFLICT (person_id) DO UPDATE SET emotion_state = EXCLUDED.emotion_state"
+        )
+        await reader
+
+        row = await memo.get(("emotion_state",), fetch=fake.q)
+    assert fake.selects == 2
+    assert row == {"emotion_state": {"mode": "rising"}}
+
+@pytest.mark.asyncio
+async def test_engines_read_through_active_memo(monkeypatch):
+    fake = _FakeDB()
+    for module in (tone_engine, microreg_engine):
+        monkeypatch.setattr(module, "q", fake.q)
+        monkeypatch.setattr(module, "dbexec", fake.exec)
+        monkeypatch.setattr(module, "resolve_person_id", _resolve)
+
+    async with pmm.personal_model_scope("p1") as memo:
+        tone = await tone_engine.compute_tone("p1")
+        await microreg_engine.compute_microreg("p1", "so tired today")
+    assert memo.closed
+    assert fake.selects == 1
+    assert tone["base"] == "calm" and "soft" in tone["modifiers"]
+    assert len(fake.writes) == 2
+
+    # Outside a scope the engines query directly again.
+    await tone_engine.compute_tone("p1")
+    assert fake.selects == 2
+
+
+@pytest.mark.asyncio
+async def test_memo_is_person_scoped_and_schema_fallback(monkeypatch):
+    class UndefinedColumn(Exception):
+        sqlstate = "42703"
+
+    calls = []
+
+    async def q(sql, *args, one=False):
+        calls.append(sql)
+        if "SELECT *" not in sql:
+            raise UndefinedColumn("column persona_state does not exist")
+        return {"emotion_state": {"mode": "steady"}}
+
+    monkeypatch.setattr(pmm, "_SELECT_STAR", False)
+    async with pmm.personal_model_scope("p1") as memo:
+        assert pmm.current_personal_model_memo("p2") is None
+        assert await memo.get(("emotion_state", "persona_state"), fetch=q) == {
+            "emotion_state": {"mode": "steady"},
+            "persona_state": None,
+        }
+    assert len(calls) == 2 and "SELECT *" in calls[1]
+    assert pmm.current_personal_model_memo() is None
+
+
+class _SlowWritePool:
+    """Pool whose UPDATE takes a while; reads see the row as stored at that moment."""
+
+    def __init__(self, row):
+        self.row = row
+        self.write_started = asyncio.Event()
+
+    def acquire(self):
+        pool = self
+
+        class _Connection:
+            async def execute(self, sql, *args):
+                pool.write_started.set()
+                await asyncio.sleep(0.02)
+                pool.row = {**pool.row, "emotion_state": {"mode": "rising"}}
+                return "UPDATE 1"
+
+        class _Acquire:
+            async def __aenter__(self):
+                return _Connection()
+
+            async def __aexit__(self, *exc):
+                return None
+
+        return _Acquire()
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_slow_write_is_not_cached_as_fresh(monkeypatch):
+    pool = _SlowWritePool({"emotion_state": {"mode": "falling"}})
+
+    async def get_pool():
+        return pool
+
+    async def fetch(sql, *args, one=False):
+        return dict(pool.row)
+
+    monkeypatch.setattr(db, "get_pool", get_pool)
+    async with pmm.personal_model_scope("p1") as memo:
+        await memo.get(("emotion_state",), fetch=fetch)
+        write = asyncio.create_task(
+            db.exec("UPDATE personal_model SET emotion_state = $2 WHERE person_id = $1", "p1", {})
+        )
+        await pool.write_started.wait()
+        # Re-fetches mid-write and sees the old row.
+        assert await memo.get(("emotion_state",), fetch=fetch) == {"emotion_state": {"mode": "falling"}}
+        await write
+        assert await memo.get(("emotion_state",), fetch=fetch) == {"emotion_state": {"mode": "rising"}}
+
+
+class _TxConnection:
+    def __init__(self):
+        self.in_tx = False
+
+    def is_in_transaction(self):
+        return self.in_tx
+
+    async def execute(self, sql, *args):
+        verb = sql.strip().upper()
+        if verb == "BEGIN":
+            self.in_tx = True
+        elif verb == "COMMIT":
+            self.in_tx = False
+        return verb
+
+
+@pytest.mark.asyncio
+async def test_session_writes_are_announced_again_on_commit():
+    seen = []
+    connection = _TxConnection()
+    session = db.DBSession(pool=None, connection=connection)
+    with db.observe_writes(seen.append):
+        await session.execute("BEGIN")
+        await session.execute("UPDATE personal_model SET goals_state = $2 WHERE person_id = $1")
+        assert len(seen) == 1  # before the statement only; not committed yet
+        await session.execute("COMMIT")
+    assert len(seen) == 2
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.testclient import TestClient
+
+from sakhi.apps.api.services.turn.post_response import PostResponseSupervisor
+from sakhi.apps.api.services.turn.stages import TurnStage
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    supervisor = PostResponseSupervisor(max_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    for _ in range(6):
+        supervisor.submit([TurnStage("work", work)], label="test")
+    assert supervisor.pending == 6
+    assert await supervisor.drain(timeout=2) == 0
+    assert peak == 2
+    assert supervisor.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated():
+    supervisor = PostResponseSupervisor(max_concurrency=1)
+    done = []
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    async def critical_boom():
+        raise RuntimeError("write failed")
+
+    async def ok():
+        done.append("ok")
+
+    degraded = supervisor.submit([TurnStage("boom", boom), TurnStage("ok", ok)], label="test")
+    failed = supervisor.submit([TurnStage("write", critical_boom, critical=True)], label="test")
+    after = supervisor.submit([TurnStage("ok", ok)], label="test")
+    await supervisor.drain(timeout=2)
+
+    assert degraded.result().failed() == ["boom"]
+    assert failed.result() is None
+    assert after.result().failed() == []
+    assert done == ["ok", "ok"]
+
+
+def test_background_start_runs_after_response():
+    supervisor = PostResponseSupervisor()
+    events = []
+    app = FastAPI()
+
+    async def bookkeeping():
+        events.append("bookkeeping")
+
+    @app.post("/turn")
+    async def turn(background_tasks: BackgroundTasks = None):
+        background_tasks.add_task(supervisor.start, [TurnStage("bookkeeping", bookkeeping)], label="test")
+        events.append("reply")
+        return {"reply": "hi"}
+
+    with TestClient(app) as client:
+        assert client.post("/turn").json() == {"reply": "hi"}
+        client.portal.call(supervisor.drain)
+    assert events == ["reply", "bookkeeping"]
+
+
+@pytest.mark.asyncio
+async def test_pending_queue_is_bounded_and_drops_are_counted():
+    from sakhi.apps.api.core.metrics import post_response_dropped
+
+    supervisor = PostResponseSupervisor(max_concurrency=1, max_pending=3)
+    release = asyncio.Event()
+    ran = []
+
+    async def work():
+        await release.wait()
+        ran.append(1)
+
+    before = post_response_dropped.labels(label="bounded")._value.get()
+    tasks = [supervisor.submit([TurnStage("work", work)], label="bounded") for _ in range(5)]
+    assert [task is None for task in tasks] == [False, False, False, True, True]
+    assert supervisor.pending == 3
+    assert post_response_dropped.labels(label="bounded")._value.get() - before == 2
+
+    release.set()
+    assert await supervisor.drain(timeout=2) == 0
+    assert len(ran) == 3
+
+
+@pytest.mark.asyncio
+async def test_pipeline_queries_get_their_own_tally_and_budget(caplog):
+    import logging
+
+    from sakhi.apps.api.core import db
+    from sakhi.apps.api.core.metrics import db_query_budget_exceeded
+
+    supervisor = PostResponseSupervisor(query_budget=2)
+
+    async def fan_out():
+        for _ in range(3):
+            db._record_query("select * from personal_model where person_id = $1", 0.001, None)
+
+    before = db_query_budget_exceeded.labels(route="post_budget")._value.get()
+    with db.track_queries("POST /v2/turn") as request_tally:
+        supervisor.submit([TurnStage("fan_out", fan_out)], label="post_budget")
+    with caplog.at_level(logging.WARNING):
+        assert await supervisor.drain(timeout=2) == 0
+
+    assert request_tally.count == 0
+    assert "post_budget issued 3 queries" in caplog.text
+    assert db_query_budget_exceeded.labels(route="post_budget")._value.get() == before + 1
@@ -0,0 +1,83 @@
+import datetime as dt
+
+import pytest
+
+from sakhi.apps.api.core.recall_scoring import reciprocal_rank_fusion
+from sakhi.apps.api.services.memory import recall
+
+
+def test_rrf_rewards_agreement_and_scales_to_one():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+    assert fused["b"] > fused["a"] > fused["c"]
+    assert reciprocal_rank_fusion([["a"], ["a"]])["a"] == pytest.approx(1.0)
+    assert fused["d"] == pytest.approx(fused["a"] * 61 / 62)
+
+
+@pytest.fixture
+def hybrid(monkeypatch):
+    calls = []
+    now = dt.datetime.now(dt.timezone.utc)
+
+    async def fetch_sources(person_id):
+        return [
+            {"type": "journal", "id": "j1", "text": "slept badly after coffee", "vec": [1.0, 0.0, 0.0], "ts": now},
+            {"type": "journal", "id": "j2", "text": "long walk in the park", "vec": [0.0, 1.0, 0.0], "ts": now},
+        ]
+
+    async def q(sql, *args, **kwargs):
+        calls.append((sql, args))
+        return [
+            {"type": "fact", "id": "7", "text": "caffeine: keeps me up", "ts": None, "rank": 0.4},
+            {"type": "journal", "id": "j1", "text": "slept badly after coffee", "ts": now, "rank": 0.2},
+            {"type": "reflection", "id": "3", "text": "coffee late again [sleep]", "ts": now, "rank": 0.1},
+        ]
+
+    async def reinforce(*args):
+        return None
+
+    monkeypatch.setattr(recall, "RECALL_MODE", "python")
+    monkeypatch.setattr(recall, "LEXICAL_RECALL", True)
+    monkeypatch.setattr(recall, "_fetch_sources", fetch_sources)
+    monkeypatch.setattr(recall, "q", q)
+    monkeypatch.setattr(recall, "reinforce_recall_graph", reinforce)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unembedded_surfaces_join_through_the_lexical_leg(hybrid):
+    items = await recall.recall_advanced("p1", "coffee sleep", k=4, query_vec=[1.0, 0.0, 0.0])
+
+    (sql, args), = hybrid
+    assert args == ("p1", "coffee sleep", recall.LEXICAL_CANDIDATES)
+    assert "to_tsvector" not in sql and sql.count("fts @@") == 5
+
+    by_id = {item["id"]: item for item in items}
+    assert items[0]["id"] == "j1" and items[0]["score"] > by_id["7"]["score"]
+    assert by_id["j1"]["vector_rank"] == 1 and by_id["j1"]["lexical_rank"] == 2
+    assert by_id["j1"]["vec"] is not None  # kept the vector leg's item
+    assert by_id["7"]["type"] == "fact" and by_id["7"]["vector_rank"] is None
+    assert {"j2", "3"} <= set(by_id)
+    assert all(0.0 < item["score"] <= 1.0 for item in items)
+
+
+@pytest.mark.asyncio
+async def test_lexical_failure_keeps_the_vector_ranking(hybrid, monkeypatch):
+    async def broken(sql, *args, **kwargs):
+        raise RuntimeError("column fts does not exist")
+
+    monkeypatch.setattr(recall, "q", broken)
+    items = await recall.recall_advanced("p1", "coffee", k=2, query_vec=[1.0, 0.0, 0.0])
+    assert [item["id"] for item in items] == ["j1", "j2"]
+
+
+@pytest.mark.asyncio
+async def test_python_mode_reads_only_journal_vectors(monkeypatch):
+    calls = []
+
+    async def q(sql, *args, **kwargs):
+        calls.append(sql)
+        return []
+
+    monkeypatch.setattr(recall, "q", q)
+    assert await recall._fetch_sources("p1") == []
+    assert len(calls) == 1 and "journal_embeddings" in calls[0]
@@ -0,0 +1,111 @@
+import pytest
+
+from sakhi.apps.api.services.memory import recall
+
+
+class _Connection:
+    def __init__(self, calls, rows):
+        self.calls = calls
+        self.rows = rows
+        self.in_transaction = False
+
+    def transaction(self):
+        connection = self
+
+        class _Transaction:
+            async def __aenter__(self):
+                connection.in_transaction = True
+
+            async def __aexit__(self, *exc):
+                connection.in_transaction = False
+
+        return _Transaction()
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args, self.in_transaction))
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args, self.in_transaction))
+        return self.rows
+
+
+class _Pool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def acquire(self):
+        connection = self.connection
+
+        class _Acquire:
+            async def __aenter__(self):
+                return connection
+
+            async def __aexit__(self, *exc):
+                return None
+
+        return _Acquire()
+
+
+@pytest.fixture
+def sql_recall(monkeypatch):
+    calls = []
+    rows = [
+            {"id": "j1", "content": "slept badly", "ts": None, "vec": [1.0, 0.0, 0.0], "similarity": 0.9, "surface_weight": 1.0, "recency_weight": 0.5, "score": 0.45},
+            {"id": "j2", "content": "slept badly again", "ts": None, "vec": [0.99, 0.01, 0.0], "similarity": 0.88, "surface_weight": 1.0, "recency_weight": 0.5, "score": 0.44},
+            {"id": "j3", "content": "long walk", "ts": None, "vec": [0.0, 1.0, 0.0], "similarity": 0.2, "surface_weight": 1.0, "recency_weight": 1.0, "score": 0.2},
+    ]
+    pool = _Pool(_Connection(calls, rows))
+
+    async def get_pool():
+        return pool
+
+    async def no_sources(person_id):
+        raise AssertionError("sql mode must not load every source")
+
+    async def reinforce(*args):
+        return None
+
+    monkeypatch.setattr(recall, "RECALL_MODE", "sql")
+    monkeypatch.setattr(recall, "LEXICAL_RECALL", False)
+    monkeypatch.setattr(recall, "get_pool", get_pool)
+    monkeypatch.setattr(recall, "_fetch_sources", no_sources)
+    monkeypatch.setattr(recall, "reinforce_recall_graph", reinforce)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_sql_mode_ranks_in_postgres(sql_recall):
+    items = await recall.recall_advanced("p1", "sleep", k=2, query_vec=[1.0, 0.0, 0.0])
+
+    settings, (kind, sql, args, in_transaction) = sql_recall
+    assert kind == "fetch" and in_transaction
+    assert "<=> $2::vector" in sql and "recency_weight" in sql
+    assert args == ("p1", [1.0, 0.0, 0.0], recall.ANN_CANDIDATES, recall.SURFACE_WEIGHTS["journal"], 45.0, 8)
+    # The HNSW search is widened to the candidate count for this transaction only.
+    assert settings[0] == "execute" and settings[3]
+    assert "set_config('hnsw.ef_search', $1, true)" in settings[1]
+    assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in settings[1]
+    assert settings[2] == (str(recall.ANN_CANDIDATES),)
+    # j2 is a near-duplicate of j1, so the diversity filter prefers j3.
+    assert [item["id"] for item in items] == ["j1", "j3"]
+    assert items[0]["score"] == 0.45 and items[0]["recency_weight"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_zero_query_vector_falls_back_to_python(sql_recall, monkeypatch):
+    async def sources(person_id):
+        return []
+
+    monkeypatch.setattr(recall, "_fetch_sources", sources)
+    assert await recall.recall_advanced("p1", "sleep", query_vec=[0.0, 0.0, 0.0]) == []
+    assert sql_recall == []
+
+
+@pytest.mark.asyncio
+async def test_ef_search_is_capped_at_the_pgvector_limit(sql_recall, monkeypatch):
+    monkeypatch.setattr(recall, "ANN_CANDIDATES", 5000)
+    await recall.recall_advanced("p1", "sleep", k=2, query_vec=[1.0, 0.0, 0.0])
+
+    settings, fetch = sql_recall
+    assert settings[2] == (str(recall.MAX_EF_SEARCH),)
+    assert fetch[2][2] == 5000
@@ -0,0 +1,55 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from sakhi.apps.api.bench import recall_scoring as bench
+from sakhi.apps.api.core.recall_scoring import cosine_scores, mmr_select, recency_weights, stack_vectors
+from sakhi.apps.api.services.memory import recall
+
+
+def test_stack_vectors_pads_normalizes_and_keeps_zero_rows():
+    matrix = stack_vectors([[3.0, 4.0], [0.0, 0.0, 0.0], [1.0]])
+    assert matrix.shape == (3, 3) and matrix.dtype == np.float32
+    np.testing.assert_allclose(matrix[0], [0.6, 0.8, 0.0], rtol=1e-6)
+    assert not matrix[1].any()
+    np.testing.assert_allclose(cosine_scores([0.0, 2.0, 0.0], matrix), [0.8, 0.0, 0.0], rtol=1e-6)
+
+
+def test_recency_weights_use_whole_days():
+    now = dt.datetime(2026, 10, 17, tzinfo=dt.timezone.utc)
+    weights = recency_weights(
+        [now - dt.timedelta(days=45, hours=20), None, "not a date", "2026-10-17T00:00:00Z", dt.datetime(2026, 9, 2)],
+        45,
+        now=now,
+    )
+    np.testing.assert_allclose(weights, [0.5, 1.0, 1.0, 1.0, 0.5])
+
+
+def test_mmr_skips_near_duplicates_then_fills_up():
+    matrix = stack_vectors([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+    similarity = matrix @ matrix.T
+    assert mmr_select(np.array([0.9, 0.88, 0.2]), similarity, 2) == [0, 2]
+    assert mmr_select(np.array([0.9, 0.88, 0.2]), similarity, 3) == [0, 2, 1]
+
+
+def test_lower_lambda_trades_relevance_for_novelty():
+    matrix = stack_vectors([[1.0, 0.0, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 1.0]])
+    similarity = matrix @ matrix.T
+    relevance = np.array([0.9, 0.85, 0.6])
+    assert mmr_select(relevance, similarity, 2, lambda_=1.0) == [0, 1]
+    assert mmr_select(relevance, similarity, 2, lambda_=0.5) == [0, 2]
+
+
+@pytest.mark.parametrize("top_k", [1, 4, 8])
+def test_lambda_one_matches_the_previous_filter(monkeypatch, top_k):
+    monkeypatch.setattr(recall, "MMR_LAMBDA", 1.0)
+    sources = bench.synthetic_sources(300, dim=32, duplicate_share=0.5, seed=3)
+    query = np.random.default_rng(4).standard_normal(32).tolist()
+
+    legacy = sorted(bench.legacy_score(sources, query), key=lambda item: item[0], reverse=True)
+    vectorized = sorted(recall._score_sources(sources, query), key=lambda item: item[0], reverse=True)
+    np.testing.assert_allclose([s for s, _ in vectorized], [s for s, _ in legacy], rtol=1e-4, atol=1e-6)
+
+    expected = [item["id"] for item in bench.legacy_diversity(legacy, top_k)]
+    assert [item["id"] for item in recall._diversity_filter(vectorized, top_k)] == expected
@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from sakhi.apps.api.core.reply_stream import current_reply_sink, stream_reply, wants_event_stream
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/reply")
+    async def reply(request: Request):
+        async def handler():
+            sink = current_reply_sink()
+            if sink is not None:
+                for delta in ("Hi ", "there"):
+                    await sink(delta)
+            return {"reply": "Hi there", "debug": {"stage": "done"}}
+
+        if wants_event_stream(request):
+            return stream_reply(handler)
+        return await handler()
+
+    @app.post("/boom")
+    async def boom():
+        async def handler():
+            raise HTTPException(status_code=400, detail="Empty text")
+
+        return stream_reply(handler)
+
+    return app
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_tokens_then_done_envelope():
+    client = TestClient(_app())
+    resp = client.post("/reply?stream=1")
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert _events(resp.text) == [
+        ("token", {"text": "Hi "}),
+        ("token", {"text": "there"}),
+        ("done", {"reply": "Hi there", "debug": {"stage": "done"}}),
+    ]
+
+
+def test_accept_header_opts_in_and_plain_json_is_default():
+    client = TestClient(_app())
+    streamed = client.post("/reply", headers={"Accept": "text/event-stream"})
+    assert _events(streamed.text)[-1][0] == "done"
+
+    plain = client.post("/reply")
+    assert plain.json() == {"reply": "Hi there", "debug": {"stage": "done"}}
+
+
+def test_handler_errors_become_error_event():
+    client = TestClient(_app())
+    resp = client.post("/boom")
+    assert _events(resp.text) == [("error", {"status": 400, "detail": "Empty text"})]
+
+
+@pytest.mark.asyncio
+async def test_turn_bookkeeping_survives_a_mid_stream_disconnect(monkeypatch):
+    from sakhi.apps.api.routes import turn_v2
+    from sakhi.apps.api.services.turn.post_response import PostResponseSupervisor
+    from sakhi.apps.api.services.turn.stages import TurnStage
+
+    supervisor = PostResponseSupervisor()
+    booked = []
+    first_token = asyncio.Event()
+
+    async def bookkeeping():
+        booked.append("write_turn_memory")
+
+    async def fake_turn(body, request, user, *, person, defer, shape):
+        await current_reply_sink()("Hi ")
+        first_token.set()
+        await asyncio.sleep(0.05)  # the client hangs up meanwhile
+        defer([TurnStage("bookkeeping", bookkeeping)])
+        return {"reply": "Hi there"}
+
+    monkeypatch.setattr(turn_v2, "_turn_v2", fake_turn)
+    monkeypatch.setattr(turn_v2, "resolve_person", lambda request, user: ("p1", "p1", "p1"))
+    monkeypatch.setattr(turn_v2, "post_response_supervisor", supervisor)
+    app = FastAPI()
+    app.include_router(turn_v2.router)
+
+    body = json.dumps({"text": "hello"}).encode()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await first_token.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        return None
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "path": "/v2/turn",
+        "raw_path": b"/v2/turn",
+        "query_string": b"stream=1",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+        "scheme": "http",
+        "root_path": "",
+    }
+    await app(scope, receive, send)
+    await asyncio.sleep(0.1)
+    assert await supervisor.drain(timeout=1) == 0
+    assert booked == ["write_turn_memory"]
@@ -0,0 +1,97 @@
+import datetime as dt
+import json
+import subprocess
+import sys
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from sakhi.apps.api.core.response_shape import (
+    LEAN_FIELDS,
+    FastJSONResponse,
+    ResponseShape,
+    dump_json,
+    response_shape,
+)
+
+PAYLOAD = {
+    "reply": "hi",
+    "sessionId": "p1",
+    "entry_id": "e1",
+    "tone": "warm",
+    "mood": None,
+    "micro_journey": {"step": 1},
+    "degraded": True,
+    "internal_state": {"cognitive_load": 0.4},
+    "debug": {"engine_raw": {"reply": "hi"}},
+}
+
+
+def _request(**params):
+    return SimpleNamespace(query_params=params, headers={})
+
+
+def test_profiles_and_fields():
+    lean = response_shape(_request(profile="lean"))
+    assert not lean.wants_debug
+    assert list(lean.project(PAYLOAD)) == list(LEAN_FIELDS)
+
+    full = response_shape(_request(profile="full"))
+    assert not full.wants_debug and full.project(PAYLOAD) is PAYLOAD
+
+    assert response_shape(_request(profile="DEBUG")).wants_debug
+
+    picked = response_shape(_request(fields="reply, tone,reply,missing", profile="lean"))
+    assert picked.fields == ("reply", "tone", "missing")
+    assert picked.project(PAYLOAD) == {"reply": "hi", "tone": "warm"}
+    assert response_shape(_request(fields="reply,debug")).wants_debug
+
+
+def test_default_shape_keeps_everything():
+    assert response_shape(None) == ResponseShape()
+    assert ResponseShape(profile="debug").project(PAYLOAD) is PAYLOAD
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        response_shape(_request(profile="tiny"))
+    assert exc.value.status_code == 400
+
+
+def test_dump_json_handles_db_and_numpy_values():
+    payload = {
+        "at": dt.datetime(2026, 1, 1, 10, 0, 0, 123),
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "score": Decimal("0.5"),
+        "vec": np.array([0.25, 0.5], dtype=np.float32),
+        1: "non-str key",
+        "big": 2**70,
+        "text": "नमस्ते",
+    }
+    decoded = json.loads(dump_json(payload))
+    assert decoded["at"] == "2026-01-01T10:00:00.000123"
+    assert decoded["id"] == "12345678-1234-5678-1234-567812345678"
+    assert decoded["score"] == 0.5
+    assert decoded["vec"] == [0.25, 0.5]
+    assert decoded["1"] == "non-str key"
+    assert decoded["big"] == 2**70
+    assert decoded["text"] == "नमस्ते"
+
+
+def test_fast_json_response_renders_body():
+    response = FastJSONResponse({"reply": "hi"})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"reply": "hi"}
+
+
+def test_db_layer_does_not_import_the_web_stack():
+    code = (
+        "import sys, sakhi.apps.api.core.db; "
+        "print(any(m.split('.')[0] in ('starlette', 'fastapi') for m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,76 @@
+import datetime
+
+import pytest
+
+from sakhi.apps.api.services import surface_caches
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_is_one_query_and_splits_rows(monkeypatch):
+    calls = []
+
+    async def fake_q(sql, *args, **kwargs):
+        calls.append((sql, args))
+        return {
+            "daily_reflection__present": True,
+            "daily_reflection__summary": "calm day",
+            "daily_reflection__reflection_date": datetime.date(2026, 1, 2),
+            "daily_reflection__generated_at": None,
+            "micro_journey__present": None,
+        }
+
+    monkeypatch.setattr(surface_caches, "q", fake_q)
+    today = datetime.date(2026, 1, 2)
+    caches = await surface_caches.load_surface_caches("p1", today, names=["daily_reflection", "micro_journey"])
+
+    assert len(calls) == 1
+    assert "LEFT JOIN LATERAL" in calls[0][0]
+    assert calls[0][1] == ("p1", today)
+    assert list(caches["daily_reflection"]) == ["summary", "reflection_date", "generated_at"]
+    assert caches["daily_reflection"]["summary"] == "calm day"
+    assert caches["micro_journey"] is None
+
+
+def test_per_surface_days_get_their_own_parameter():
+    today = datetime.date(2026, 1, 2)
+    yesterday = today - datetime.timedelta(days=1)
+    wanted = surface_caches._resolve_days(
+        ["morning_preview", "evening_closure", "micro_journey"], today, {"evening_closure": yesterday}
+    )
+    sql, args = surface_caches.build_surface_cache_query(wanted)
+    assert args == [today, yesterday]
+    assert "closure_date = $3" in sql
+    assert "micro_journey_cache\n    WHERE person_id = $1\n" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_failure_falls_back_per_table(monkeypatch):
+    async def fake_q(sql, *args, **kwargs):
+        if "LATERAL" in sql:
+            raise RuntimeError("relation does not exist")
+        if "morning_ask_cache" in sql:
+            raise RuntimeError("relation does not exist")
+        return [{"nudge": "stretch"}]
+
+    monkeypatch.setattr(surface_caches, "q", fake_q)
+    caches = await surface_caches.load_surface_caches("p1", names=["morning_ask", "micro_momentum"])
+    assert caches == {"morning_ask": None, "micro_momentum": {"nudge": "stretch"}}
+
+
+def test_hour_gates():
+    rows = {name: {"x": 1} for name in surface_caches.SURFACE_CACHES}
+    morning = surface_caches.apply_hour_gates(rows, hour=9)
+    assert morning["morning_preview"] and morning["micro_momentum"]
+    assert morning["evening_closure"] is None
+
+    afternoon = surface_caches.apply_hour_gates(rows, hour=16)
+    assert afternoon["morning_ask"] is None and afternoon["micro_momentum"] is None
+    assert afternoon["daily_reflection"] and afternoon["micro_recovery"]
+
+    night = surface_caches.apply_hour_gates(rows, hour=21)
+    assert night["evening_closure"]
+
+
+def test_unknown_surface_rejected():
+    with pytest.raises(KeyError):
+        surface_caches._resolve_days(["nope"], datetime.date.today(), None)
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from sakhi.apps.api.services.turn import deadline as deadline_mod
+from sakhi.apps.api.services.turn.deadline import (
+    DeadlineExceeded,
+    TurnDeadline,
+    current_turn_deadline,
+    request_tier,
+    resolve_turn_budget,
+    turn_deadline,
+)
+from sakhi.apps.api.services.turn.post_response import PostResponseSupervisor
+from sakhi.apps.api.services.turn.stages import TurnStage, run_stages
+from sakhi.apps.logic.harmony import orchestrator
+
+
+async def _slow():
+    await asyncio.sleep(1)
+    return {"slow": True}
+
+
+async def _fast():
+    return {"fast": True}
+
+
+@pytest.mark.asyncio
+async def test_optional_stages_are_cut_at_the_deadline():
+    stages = [
+        TurnStage("slow", _slow, timeout=5, default_factory=dict),
+        TurnStage("unbounded", _slow, default_factory=dict),
+        TurnStage("fast", _fast),
+        TurnStage("after", lambda fast: _fast(), requires=("fast",)),
+    ]
+    with turn_deadline(TurnDeadline.after(0.05)):
+        report = await run_stages(stages, label="test")
+
+    assert report.wall_ms < 500
+    assert report["slow"] == {} and report["unbounded"] == {}
+    assert report.outcomes["slow"].status == "deadline"
+    assert report["fast"] == {"fast": True} and report["after"] == {"fast": True}
+    assert sorted(report.degraded()) == ["slow", "unbounded"]
+
+
+@pytest.mark.asyncio
+async def test_critical_stages_ignore_the_deadline():
+    async def critical():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    with turn_deadline(TurnDeadline.after(0.01)):
+        report = await run_stages([TurnStage("critical", critical, critical=True)], label="test")
+    assert report["critical"] == "done" and report.degraded() == []
+
+
+@pytest.mark.asyncio
+async def test_stage_timeout_below_budget_stays_a_timeout():
+    with turn_deadline(TurnDeadline.after(5)):
+        report = await run_stages([TurnStage("slow", _slow, timeout=0.01)], label="test")
+    assert report.outcomes["slow"].status == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_spent_budget_skips_without_running():
+    calls = []
+
+    async def never():
+        calls.append(1)
+
+    spent = TurnDeadline.after(0)
+    with pytest.raises(DeadlineExceeded):
+        await spent.run(never(), stage="never")
+    with turn_deadline(spent):
+        report = await run_stages([TurnStage("never", never)], label="test")
+    assert calls == [] and report.outcomes["never"].status == "deadline"
+
+
+@pytest.mark.asyncio
+async def test_unified_turn_marks_insight_degraded(monkeypatch):
+    async def brain_state(person_id, force_refresh=False):
+        return {}
+
+    async def slow_insights(person_id, mode, behavior_profile):
+        await asyncio.sleep(1)
+        return {"insights": []}
+
+    monkeypatch.setattr(orchestrator.brain_engine, "get_brain_state", brain_state)
+    monkeypatch.setattr(orchestrator, "compute_behavior_profile", lambda brain: {"conversation_depth": "reflective"})
+    monkeypatch.setattr(orchestrator.insight_engine, "generate_insights", slow_insights)
+
+    result = await orchestrator.run_unified_turn("p1", "why do I feel this", deadline=TurnDeadline.after(0.05))
+    assert result["insight"] is None and result["degraded"] == ["insight"]
+
+    result = await orchestrator.run_unified_turn("p1", "hello")
+    assert result["degraded"] == []
+
+
+@pytest.mark.asyncio
+async def test_post_response_runs_outside_the_turn_budget():
+    seen = []
+
+    async def record():
+        seen.append(current_turn_deadline())
+
+    supervisor = PostResponseSupervisor()
+    with turn_deadline(TurnDeadline.after(0)):
+        supervisor.submit([TurnStage("record", record)], label="test")
+    await supervisor.drain(timeout=1)
+    assert seen == [None]
+
+
+def test_budget_resolution(monkeypatch):
+    policy = {"default_ms": 4000, "routes": {"turn_v2": 3000}, "tiers": {"plus": 9000, "off": 0}}
+    monkeypatch.setattr(deadline_mod, "get_policy", lambda name: policy)
+    monkeypatch.delenv("SAKHI_TURN_BUDGET_MS", raising=False)
+
+    assert resolve_turn_budget("turn_v2") == 3.0
+    assert resolve_turn_budget("turn_v2", "plus") == 9.0
+    assert resolve_turn_budget("turn_v2", "unknown") == 3.0
+    assert resolve_turn_budget("chat") == 4.0
+    assert resolve_turn_budget("turn_v2", "off") is None
+
+    monkeypatch.setenv("SAKHI_TURN_BUDGET_MS", "250")
+    assert resolve_turn_budget("turn_v2", "plus") == 0.25
+    monkeypatch.setenv("SAKHI_TURN_BUDGET_MS", "0")
+    assert resolve_turn_budget("turn_v2") is None
+
+
+def test_tier_header_needs_a_trusted_proxy(monkeypatch):
+    def request(host, tier="plus"):
+        return SimpleNamespace(headers={"x-sakhi-tier": tier}, client=SimpleNamespace(host=host))
+
+    monkeypatch.delenv("SAKHI_TRUSTED_PROXIES", raising=False)
+    assert request_tier(request("10.0.0.5")) is None
+
+    monkeypatch.setenv("SAKHI_TRUSTED_PROXIES", "10.0.0.0/24, ::1, bogus")
+    assert request_tier(request("10.0.0.5")) == "plus"
+    assert request_tier(request("::1")) == "plus"
+    assert request_tier(request("203.0.113.9")) is None
+    assert request_tier(request("testclient")) is None
+    assert request_tier(request("10.0.0.5", tier="")) is None
+    assert request_tier(None) is None
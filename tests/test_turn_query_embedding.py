@@ -0,0 +1,83 @@
+import asyncio
+import datetime as dt
+
+import pytest
+
+from sakhi.apps.api.core import query_embedding
+from sakhi.apps.api.core.query_embedding import current_turn_embeddings, embed_query, turn_embedding_scope
+from sakhi.apps.api.services.memory import embedding as journal_embedding
+from sakhi.apps.api.services.memory import recall
+
+
+@pytest.fixture
+def embed_calls(monkeypatch):
+    calls = []
+
+    async def embed_text(text):
+        calls.append(text)
+        await asyncio.sleep(0.001)
+        return [1.0, 0.0, 0.0]
+
+    monkeypatch.setattr(query_embedding, "embed_text", embed_text)
+    return calls
+
+
+@pytest.fixture
+def recall_sources(monkeypatch):
+    async def fetch_sources(person_id):
+        return [
+            {"type": "journal", "id": "j1", "text": "slept badly", "vec": [1.0, 0.0, 0.0], "ts": dt.datetime.now(dt.timezone.utc)},
+            {"type": "journal", "id": "j2", "text": "long walk", "vec": [0.0, 1.0, 0.0], "ts": None},
+        ]
+
+    async def reinforce(*args):
+        return None
+
+    monkeypatch.setattr(recall, "RECALL_MODE", "python")
+    monkeypatch.setattr(recall, "LEXICAL_RECALL", False)
+    monkeypatch.setattr(recall, "_fetch_sources", fetch_sources)
+    monkeypatch.setattr(recall, "reinforce_recall_graph", reinforce)
+
+
+class _Db:
+    async def execute(self, sql, *args):
+        return "INSERT 0 1"
+
+    async def close(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_one_embedding_call_per_turn(embed_calls, recall_sources, monkeypatch):
+    async def get_db():
+        return _Db()
+
+    monkeypatch.setattr(journal_embedding, "get_db", get_db)
+    text = "I slept badly again "
+
+    with turn_embedding_scope() as memo:
+        stored, items = await asyncio.gather(
+            journal_embedding.generate_journal_embedding("entry-1", text),
+            recall.recall_advanced("p1", text, k=2),
+        )
+        context = await recall.build_recall_context("p1", text)
+        await recall.memory_recall("p1", text, limit=5)
+
+    assert embed_calls == ["I slept badly again"]
+    assert memo.computed == 1 and current_turn_embeddings() is None
+    assert stored == [1.0, 0.0, 0.0]
+    assert items[0]["id"] == "j1" and "slept badly" in context
+
+
+@pytest.mark.asyncio
+async def test_recall_uses_a_precomputed_vector(embed_calls, recall_sources):
+    items = await recall.memory_recall("p1", "walk", limit=1, query_vec=[0.0, 1.0, 0.0])
+    assert embed_calls == []
+    assert [item["id"] for item in items] == ["j2"]
+
+
+@pytest.mark.asyncio
+async def test_without_a_scope_every_call_embeds(embed_calls):
+    await embed_query("hello")
+    await embed_query("hello")
+    assert embed_calls == ["hello", "hello"]
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from sakhi.apps.api.bench.standins import StandInConfig, statement_kind
+from sakhi.apps.api.bench.turn_replay import load_turns, pseudonym, replay_turns, scrub_text
+
+SAMPLE = Path(__file__).parent / "fixtures" / "turn_replay_sample.jsonl"
+
+
+def test_recorded_turns_are_anonymized():
+    text = "mail me at a.b@example.com or call +91 98765 43210, see https://x.io/p?id=42 at 10"
+    assert scrub_text(text) == "mail me at <email> or call <phone>, see <url> at <n>"
+    assert pseudonym("user-1", "salt") == pseudonym("user-1", "salt")
+    assert pseudonym("user-1", "salt") != pseudonym("user-1", "other")
+
+
+def test_statement_kind_labels():
+    assert statement_kind("SELECT * FROM personal_model WHERE person_id = $1") == "select personal_model"
+    assert statement_kind("INSERT INTO journal_entries (x) VALUES ($1) ON CONFLICT DO UPDATE SET x = 1") == "insert journal_entries"
+    assert statement_kind("\n  UPDATE personal_model SET x = $1") == "update personal_model"
+
+
+@pytest.mark.asyncio
+async def test_replay_reports_stage_percentiles_and_round_trips(monkeypatch):
+    for key, value in {
+        "SUPABASE_URL": "http://localhost",
+        "SUPABASE_SERVICE_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+        "SAKHI_TURN_BUDGET_MS": "0",
+    }.items():
+        monkeypatch.setenv(key, value)
+
+    config = StandInConfig(db_latency_s=0, redis_latency_s=0, llm_latency_s=0.001, embed_latency_s=0)
+    report = await replay_turns(load_turns(SAMPLE, limit=3), config=config, concurrency=2)
+
+    assert report.turns == 3 and report.errors == 0
+    spans = report.span_percentiles()
+    assert spans["turn.total"]["n"] == 3
+    assert "turn_v2.orchestration" in spans and "turn.generate_reply" in spans
+    assert any(name.startswith("turn_v2_post.") for name in spans)
+    reply_trips = report.round_trip_percentiles(reply_path=True)
+    assert 0 < reply_trips["p50"] <= report.round_trip_percentiles()["p50"]
+    assert report.p95() >= spans["turn.total"]["p50"]
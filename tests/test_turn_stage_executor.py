@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from sakhi.apps.api.services.turn.stages import TurnStage, run_stages
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    stages = [TurnStage(f"s{i}", slow) for i in range(5)]
+    started = time.perf_counter()
+    report = await run_stages(stages)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3
+    assert all(report[f"s{i}"] == "done" for i in range(5))
+    assert set(report.timings_ms()) == {f"s{i}" for i in range(5)}
+
+
+@pytest.mark.asyncio
+async def test_dependencies_receive_upstream_values():
+    async def base():
+        return 2
+
+    async def double(base):
+        return base * 2
+
+    async def combine(base, double):
+        return base + double
+
+    report = await run_stages(
+        [
+            TurnStage("combine", combine, requires=("base", "double")),
+            TurnStage("double", double, requires=("base",)),
+            TurnStage("base", base),
+        ]
+    )
+    assert report["combine"] == 6
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_error_fall_back_to_default():
+    async def hang():
+        await asyncio.sleep(5)
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    report = await run_stages(
+        [
+            TurnStage("hang", hang, timeout=0.05, default_factory=dict),
+            TurnStage("boom", boom, default_factory=list),
+        ]
+    )
+    assert report["hang"] == {}
+    assert report.outcomes["hang"].status == "timeout"
+    assert report["boom"] == []
+    assert report.outcomes["boom"].status == "error"
+    assert sorted(report.failed()) == ["boom", "hang"]
+
+
+@pytest.mark.asyncio
+async def test_critical_stage_failure_propagates():
+    async def boom():
+        raise RuntimeError("orchestration failed")
+
+    async def other():
+        await asyncio.sleep(1)
+
+    with pytest.raises(RuntimeError):
+        await run_stages([TurnStage("boom", boom, critical=True), TurnStage("other", other)])
+
+
+@pytest.mark.asyncio
+async def test_invalid_graphs_are_rejected():
+    async def noop(**_):
+        return None
+
+    with pytest.raises(ValueError):
+        await run_stages([TurnStage("a", noop, requires=("missing",))])
+    with pytest.raises(ValueError):
+        await run_stages([TurnStage("a", noop, requires=("b",)), TurnStage("b", noop, requires=("a",))])
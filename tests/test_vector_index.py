@@ -0,0 +1,227 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from sakhi.apps.api.services.memory import context_select, recall, vector_index
+from sakhi.apps.api.services.memory.vector_index import PersonVectorIndex, VectorIndexRegistry
+
+
+def _rows(*pairs):
+    return [{"id": entry_id, "vec": vec} for entry_id, vec in pairs]
+
+
+def test_search_ranks_by_cosine_and_tracks_updates():
+    index = PersonVectorIndex(dim=3)
+    index.upsert("a", [1.0, 0.0, 0.0])
+    index.upsert("b", [0.0, 2.0, 0.0])
+    index.upsert("c", [1.0, 1.0, 0.0])
+    assert [entry_id for entry_id, _ in index.search([1.0, 0.1, 0.0], 2)] == ["a", "c"]
+
+    index.remove(["a"])
+    index.upsert("b", [3.0, 0.0, 0.0])
+    index.upsert("c", [0.0, 0.0, 0.0])  # fallback zero vector: dropped
+    assert len(index) == 1 and "c" not in index
+    (entry_id, similarity), = index.search([1.0, 0.0, 0.0], 5)
+    assert entry_id == "b" and similarity == pytest.approx(1.0, abs=1e-3)
+    np.testing.assert_allclose(index.vector("b"), [1.0, 0.0, 0.0], atol=1e-3)
+
+
+def test_index_grows_past_initial_capacity():
+    index = PersonVectorIndex(dim=4)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, 4))
+    for row, vec in enumerate(vectors):
+        index.upsert(f"e{row}", vec)
+    assert len(index) == 200
+    assert index.search(vectors[137], 1)[0][0] == "e137"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_warm_and_keep_racing_writes():
+    loads = []
+    gate = asyncio.Event()
+
+    async def loader(person_id):
+        loads.append(person_id)
+        await gate.wait()
+        return _rows(("a", [1.0, 0.0]))
+
+    registry = VectorIndexRegistry(dim=2, loader=loader)
+    first = asyncio.create_task(registry.get("p1"))
+    second = asyncio.create_task(registry.get("p1"))
+    await asyncio.sleep(0)
+    registry.apply("p1", "b", [0.0, 1.0])  # lands mid-warm
+    gate.set()
+    one, two = await asyncio.gather(first, second)
+
+    assert loads == ["p1"] and one is two
+    assert "a" in one and "b" in one
+    assert await registry.get("p1") is one
+
+
+
+@pytest.mark.asyncio
+async def test_cancelled_warm_caller_does_not_cancel_other_waiters():
+    gate = asyncio.Event()
+    loads = []
+
+    async def loader(person_id):
+        loads.append(person_id)
+        await gate.wait()
+        return _rows(("a", [1.0, 0.0]))
+
+    registry = VectorIndexRegistry(dim=2, loader=loader)
+    owner = asyncio.create_task(asyncio.wait_for(registry.get("p1"), 0.01))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(registry.get("p1"))
+    with pytest.raises(asyncio.TimeoutError):
+        await owner
+    gate.set()
+
+    index = await waiter
+    assert "a" in index and loads == ["p1"]
+    assert await registry.get("p1") is index
+
+@pytest.mark.asyncio
+async def test_lru_ttl_and_invalidation(monkeypatch):
+    async def loader(person_id):
+        return _rows((f"{person_id}-e", [1.0, 0.0]))
+
+    registry = VectorIndexRegistry(dim=2, max_persons=2, loader=loader)
+    for person in ("p1", "p2", "p3"):
+        await registry.get(person)
+    assert registry.peek("p1") is None and len(registry) == 2
+
+    registry.invalidate("p2")
+    assert registry.peek("p2") is None
+
+    index = registry.peek("p3")
+    index.loaded_at -= registry.ttl_s + 1
+    assert registry.peek("p3") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_from_another_replica_rereads_entries(monkeypatch):
+    registry = VectorIndexRegistry(dim=2, loader=lambda person_id: asyncio.sleep(0, _rows(("a", [1.0, 0.0]), ("b", [0.0, 1.0]))))
+    monkeypatch.setattr(vector_index, "_REGISTRY", registry)
+    index = await registry.get("p1")
+    reads = []
+
+    async def load_entries(entry_ids):
+        reads.append(entry_ids)
+        return _rows(("c", [1.0, 1.0]))
+
+    monkeypatch.setattr(vector_index, "_load_entry_vectors", load_entries)
+    await vector_index.handle_invalidation({"origin": vector_index._REPLICA_ID, "person_id": "p1", "entry_ids": ["x"]})
+    await vector_index.handle_invalidation({"origin": "other", "person_id": "p2", "entry_ids": ["x"]})
+    assert reads == []
+
+    await vector_index.handle_invalidation({"origin": "other", "person_id": "p1", "entry_ids": ["b", "c"]})
+    assert reads == [["b", "c"]]
+    assert "b" not in index and "c" in index
+
+    await vector_index.handle_invalidation({"origin": "other", "person_id": "p1", "entry_ids": None})
+    assert registry.peek("p1") is None
+
+
+
+@pytest.mark.asyncio
+async def test_listener_waits_out_redis_backoff(monkeypatch):
+    handled = []
+    subscribed = asyncio.Event()
+
+    class _PubSub:
+        async def subscribe(self, channel):
+            subscribed.set()
+
+        async def listen(self):
+            yield {"type": "subscribe"}
+            yield {"type": "message", "data": '{"origin": "other", "person_id": "p1", "entry_ids": null}'}
+            await asyncio.Event().wait()
+
+        async def aclose(self):
+            return None
+
+    class _Redis:
+        def pubsub(self):
+            return _PubSub()
+
+    attempts = iter([None, _Redis()])
+
+    async def handle(message):
+        handled.append(message)
+
+    monkeypatch.setenv("REDIS_URL", "redis://replica")
+    monkeypatch.setattr(vector_index, "_get_redis", lambda: next(attempts))
+    monkeypatch.setattr(vector_index, "_redis_down_until", 0.0)
+    monkeypatch.setattr(vector_index, "handle_invalidation", handle)
+
+    task = asyncio.create_task(vector_index.listen_for_invalidations())
+    await asyncio.wait_for(subscribed.wait(), timeout=2)
+    for _ in range(10):
+        if handled:
+            break
+        await asyncio.sleep(0.01)
+    assert handled == [{"origin": "other", "person_id": "p1", "entry_ids": None}]
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_listener_exits_without_redis_url(monkeypatch, caplog):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.setattr(vector_index, "_get_redis", lambda: None)
+    with caplog.at_level("WARNING"):
+        await asyncio.wait_for(vector_index.listen_for_invalidations(), timeout=1)
+    assert "invalidation listener exiting" in caplog.text
+
+@pytest.fixture
+def indexed_person(monkeypatch):
+    async def loader(person_id):
+        return _rows(("j1", [1.0, 0.0, 0.0]), ("j2", [0.0, 1.0, 0.0]), ("j3", [0.7, 0.7, 0.0]))
+
+    calls = []
+
+    async def q(sql, *args, **kwargs):
+        calls.append((sql, args))
+        texts = {"j1": "slept badly", "j2": "long walk", "j3": "tired walk", "j4": "new entry"}
+        return [{"id": entry_id, "content": texts[entry_id], "ts": None} for entry_id in args[1]]
+
+    async def reinforce(*args):
+        return None
+
+    async def publish(*args):
+        return None
+
+    monkeypatch.setattr(vector_index, "ENABLED", True)
+    monkeypatch.setattr(recall, "LEXICAL_RECALL", False)
+    monkeypatch.setattr(vector_index, "_REGISTRY", VectorIndexRegistry(dim=3, loader=loader))
+    monkeypatch.setattr(vector_index, "_publish", publish)
+    monkeypatch.setattr(recall, "q", q)
+    monkeypatch.setattr(recall, "reinforce_recall_graph", reinforce)
+    monkeypatch.setattr(context_select, "dbfetch", q)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_recall_queries_the_index(indexed_person):
+    items = await recall.recall_advanced("p1", "sleep", k=2, query_vec=[1.0, 0.0, 0.0])
+
+    assert [item["id"] for item in items] == ["j1", "j3"]
+    (sql, args), = indexed_person
+    assert "<=>" not in sql and args[0] == "p1"
+
+
+@pytest.mark.asyncio
+async def test_context_select_sees_write_through_vectors(indexed_person, monkeypatch):
+    async def embed(text):
+        return [0.0, 0.1, 1.0]
+
+    monkeypatch.setattr(context_select, "embed_query", embed)
+    await vector_index.get_vector_index().get("p1")
+    await vector_index.note_journal_vector("p1", "j4", [0.0, 0.0, 1.0])
+
+    rows = await context_select.fetch_relevant_long_term("p1", "something new", limit=1)
+    assert [(row["id"], row["type"], row["content"]) for row in rows] == [("j4", "journal", "new entry")]